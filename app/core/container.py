@@ -1,10 +1,51 @@
+from typing import Any, Callable, Dict
+import importlib
 import json
 from dependency_injector import containers, providers
 from app.core.models.normativa import Normativa
-from app.core.services.lector_datos import LectorDatosCSV
-from app.core.services.escritor_resultados import EscritorResultadosCSV
-from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
-from app.core.motor import MotorAsignacion
+from app.core.models.registro_incidencias import RegistroIncidencias
+
+def cargar_config(ruta: str = 'config.json') -> Dict[str, Any]:
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def diferido(ruta_clase: str) -> Callable[..., Any]:
+    """
+    Constructor de 'modulo.Clase' que importa el módulo recién al crear el
+    objeto. Así importar el contenedor no carga pandas ni los servicios y
+    estrategias que la ejecución no usa.
+    """
+    modulo, nombre = ruta_clase.rsplit('.', 1)
+
+    def crear(*args, **kwargs):
+        return getattr(importlib.import_module(modulo), nombre)(*args, **kwargs)
+
+    crear.__name__ = crear.__qualname__ = nombre
+    return crear
+
+# Servicios y estrategias: se importan al construirlos
+CacheEntradas = diferido('app.core.services.cache_entradas.CacheEntradas')
+LectorDatosCSV = diferido('app.core.services.lector_datos.LectorDatosCSV')
+LectorDatosCSVColumnar = diferido('app.core.services.lector_datos_columnar.LectorDatosCSVColumnar')
+LectorDatosCSVPorBloques = diferido('app.core.services.lector_datos_bloques.LectorDatosCSVPorBloques')
+LectorDatosSQLite = diferido('app.core.services.lector_datos_sqlite.LectorDatosSQLite')
+EscritorResultadosCSV = diferido('app.core.services.escritor_resultados.EscritorResultadosCSV')
+EscritorResultadosSQLite = diferido('app.core.services.escritor_resultados_sqlite.EscritorResultadosSQLite')
+Instrumentador = diferido('app.core.services.instrumentador.Instrumentador')
+InstrumentadorNulo = diferido('app.core.services.instrumentador.InstrumentadorNulo')
+AlmacenEstadoAsignacion = diferido('app.core.services.almacen_estado.AlmacenEstadoAsignacion')
+AlmacenIndiceCortes = diferido('app.core.services.almacen_indice_cortes.AlmacenIndiceCortes')
+DiarioPuntosControl = diferido('app.core.services.puntos_control.DiarioPuntosControl')
+EstrategiaAsignacionArt52 = diferido('app.core.strategy.estrategia_art_52.EstrategiaAsignacionArt52')
+EstrategiaAsignacionVectorizada = diferido('app.core.strategy.estrategia_vectorizada.EstrategiaAsignacionVectorizada')
+EstrategiaAsignacionAceptacionDiferida = diferido('app.core.strategy.estrategia_aceptacion_diferida.EstrategiaAsignacionAceptacionDiferida')
+MotorAsignacion = diferido('app.core.motor.MotorAsignacion')
+ServicioReasignacionIncremental = diferido('app.core.services.reasignacion_incremental.ServicioReasignacionIncremental')
+ServicioDeclinaciones = diferido('app.core.services.declinaciones.ServicioDeclinaciones')
+SimuladorNormativas = diferido('app.core.services.simulador_normativas.SimuladorNormativas')
+ValidadorProceso = diferido('app.core.services.validador_proceso.ValidadorProceso')
+ServicioLoteInstituciones = diferido('app.core.services.lote_instituciones.ServicioLoteInstituciones')
+ServicioResidente = diferido('app.core.services.servicio_residente.ServicioResidente')
 
 class Container(containers.DeclarativeContainer):
     """
@@ -14,10 +55,15 @@ class Container(containers.DeclarativeContainer):
     """
     
     # 1. Configuración (Normativa) - Cargada como Singleton
-    config = providers.Singleton(
-        lambda: json.load(open('config.json', 'r', encoding='utf-8'))
-    )
+    config = providers.Singleton(cargar_config)
     
+    # 'modo_incidencias': 'consola' (una línea por advertencia) o 'resumen' (conteos al final)
+    incidencias = providers.Singleton(
+        RegistroIncidencias,
+        modo=config.provided['parametros_proceso']['modo_incidencias'],
+        ruta=config.provided['rutas_archivos']['incidencias']
+    )
+
     normativa = providers.Singleton(
         Normativa,
         ponderadores=config.provided['ponderadores'],
@@ -26,23 +72,139 @@ class Container(containers.DeclarativeContainer):
         rutas=config.provided['rutas_archivos'],
         mapeo_columnas_oferta=config.provided['mapeo_columnas']['oferta'],
         mapeo_columnas_postulaciones=config.provided['mapeo_columnas']['postulaciones'],
-        mapeo_segmentos_cupos=config.provided['mapeo_columnas']['segmentos_cupos']
+        mapeo_segmentos_cupos=config.provided['mapeo_columnas']['segmentos_cupos'],
+        # Las advertencias quedan en 'incidencias' (y su archivo); no se duplican en memoria
+        log_reporte=None,
+        incidencias=incidencias,
+        criterios_desempate=config.provided['parametros_proceso']['criterios_desempate'],
+        periodo=config.provided['parametros_proceso']['periodo'],
+        id_ies=config.provided['parametros_proceso']['id_ies'],
+        rango_puntajes=config.provided['parametros_proceso']['rango_puntajes'],
+        puntajes_invalidos=config.provided['parametros_proceso']['puntajes_invalidos']
     )
 
     # 2. Proveedores de Servicios (Implementaciones)
-    lector_datos = providers.Factory(
-        LectorDatosCSV,
-        normativa=normativa
+    cache_entradas = providers.Singleton(
+        CacheEntradas,
+        directorio=config.provided['rutas_archivos']['cache_entradas'],
+        habilitada=config.provided['parametros_proceso']['usar_cache_entradas']
+    )
+
+    # 'modo_carga' elige entre la carga por aspirante (clasico), la vectorizada
+    # (columnar), la vectorizada por bloques de 'tamano_bloque' filas (bloques)
+    # y la lectura de las tablas de una base SQLite (sqlite).
+    # La carga clásica valida en 'procesos_carga' procesos; los demás modos lo ignoran
+    # (main.py lo advierte)
+    lector_datos = providers.Selector(
+        config.provided['parametros_proceso']['modo_carga'],
+        clasico=providers.Factory(
+            LectorDatosCSV,
+            normativa=normativa,
+            procesos=config.provided['parametros_proceso']['procesos_carga']
+        ),
+        columnar=providers.Factory(
+            LectorDatosCSVColumnar,
+            normativa=normativa,
+            cache=cache_entradas
+        ),
+        bloques=providers.Factory(
+            LectorDatosCSVPorBloques,
+            normativa=normativa,
+            tamano_bloque=config.provided['parametros_proceso']['tamano_bloque'],
+            cache=cache_entradas
+        ),
+        sqlite=providers.Factory(
+            LectorDatosSQLite,
+            normativa=normativa,
+            tabla_oferta=config.provided['sqlite']['tabla_oferta'],
+            tabla_postulaciones=config.provided['sqlite']['tabla_postulaciones'],
+            tamano_bloque=config.provided['parametros_proceso']['tamano_bloque']
+        )
     )
     
-    escritor_resultados = providers.Factory(
-        EscritorResultadosCSV,
-        normativa=normativa
+    # 'formato_resultados': archivo CSV (csv, csv_gzip), Parquet o tabla SQLite
+    escritor_resultados = providers.Selector(
+        config.provided['parametros_proceso']['formato_resultados'],
+        csv=providers.Factory(EscritorResultadosCSV, normativa=normativa, formato='csv'),
+        csv_gzip=providers.Factory(EscritorResultadosCSV, normativa=normativa, formato='csv_gzip'),
+        parquet=providers.Factory(EscritorResultadosCSV, normativa=normativa, formato='parquet'),
+        sqlite=providers.Factory(
+            EscritorResultadosSQLite,
+            normativa=normativa,
+            tabla=config.provided['sqlite']['tabla_resultados']
+        )
+    )
+
+    # 'instrumentacion' activa la medición por fase y el reporte JSON de ejecución
+    instrumentador = providers.Selector(
+        config.provided['parametros_proceso']['instrumentacion'],
+        activada=providers.Singleton(Instrumentador),
+        desactivada=providers.Singleton(InstrumentadorNulo)
+    )
+
+    almacen_estado_asignacion = providers.Singleton(
+        AlmacenEstadoAsignacion,
+        ruta=config.provided['rutas_archivos']['estado_asignacion']
+    )
+
+    # 'guardar_estado' deja el estado de cada ejecución para la reasignación incremental
+    almacen_estado = providers.Selector(
+        config.provided['parametros_proceso']['guardar_estado'],
+        activado=almacen_estado_asignacion,
+        desactivado=providers.Object(None)
+    )
+
+    almacen_indice_cortes = providers.Singleton(
+        AlmacenIndiceCortes,
+        ruta=config.provided['rutas_archivos']['indice_cortes']
+    )
+
+    # 'indice_cortes' (desactivado por omisión) guarda el corte, la ocupación y la lista de
+    # espera por carrera y segmento para --consultar-corte
+    almacen_cortes = providers.Selector(
+        config.provided['parametros_proceso']['indice_cortes'],
+        activado=almacen_indice_cortes,
+        desactivado=providers.Object(None)
+    )
+
+    # 'puntos_control' (desactivado por omisión) guarda la carga, los puntajes y cada segmento para
+    # reanudar con --reanudar; 'sincronizar_puntos_control' hace fsync de cada registro (durable
+    # ante caídas del sistema)
+    puntos_control = providers.Selector(
+        config.provided['parametros_proceso']['puntos_control'],
+        activado=providers.Singleton(
+            DiarioPuntosControl,
+            ruta=config.provided['rutas_archivos']['puntos_control'],
+            sincronizar=config.provided['parametros_proceso']['sincronizar_puntos_control']
+        ),
+        desactivado=providers.Object(None)
     )
 
     # 3. Proveedor de Estrategia
-    estrategia_asignacion = providers.Factory(
-        EstrategiaAsignacionArt52
+    # 'estrategia' elige la implementación del Art. 52 (objetos o arreglos NumPy)
+    # o la aceptación diferida en rondas con reciclaje de cupos; el Art. 52
+    # reparte las componentes conexas en 'procesos_asignacion' procesos
+    estrategia_asignacion = providers.Selector(
+        config.provided['parametros_proceso']['estrategia'],
+        art52=providers.Factory(
+            EstrategiaAsignacionArt52,
+            instrumentador=instrumentador,
+            procesos=config.provided['parametros_proceso']['procesos_asignacion'],
+            puntos_control=puntos_control
+        ),
+        vectorizada=providers.Factory(
+            EstrategiaAsignacionVectorizada,
+            instrumentador=instrumentador,
+            procesos=config.provided['parametros_proceso']['procesos_asignacion'],
+            puntos_control=puntos_control
+        ),
+        aceptacion_diferida=providers.Factory(
+            EstrategiaAsignacionAceptacionDiferida,
+            instrumentador=instrumentador,
+            orden_preferencias=config.provided['aceptacion_diferida']['orden_preferencias'],
+            reciclaje_cupos=config.provided['aceptacion_diferida']['reciclaje_cupos'],
+            max_rondas=config.provided['aceptacion_diferida']['max_rondas']
+        )
     )
 
     # 4. Proveedor del Motor
@@ -51,5 +213,64 @@ class Container(containers.DeclarativeContainer):
         lector=lector_datos,
         escritor=escritor_resultados,
         estrategia=estrategia_asignacion,
+        normativa=normativa,
+        instrumentador=instrumentador,
+        almacen_estado=almacen_estado,
+        almacen_cortes=almacen_cortes,
+        profundidad_listas_espera=config.provided['parametros_proceso']['profundidad_listas_espera'],
+        puntos_control=puntos_control
+    )
+
+    # 5. Reasignación incremental a partir del estado guardado
+    reasignacion_incremental = providers.Factory(
+        ServicioReasignacionIncremental,
+        normativa=normativa,
+        lector=providers.Factory(LectorDatosCSVColumnar, normativa=normativa),
+        escritor=escritor_resultados,
+        almacen=almacen_estado_asignacion,
+        instrumentador=instrumentador
+    )
+
+    # 6. Declinaciones cubiertas desde las listas de espera del estado guardado
+    declinaciones = providers.Factory(
+        ServicioDeclinaciones,
+        normativa=normativa,
+        escritor=escritor_resultados,
+        almacen=almacen_estado_asignacion,
+        instrumentador=instrumentador
+    )
+
+    # 7. Simulación de escenarios de normativa en paralelo
+    simulador_normativas = providers.Factory(
+        SimuladorNormativas,
+        normativa=normativa,
+        lector=providers.Factory(LectorDatosCSVColumnar, normativa=normativa, cache=cache_entradas),
+        procesos=config.provided['parametros_proceso']['procesos_simulacion'],
+        instrumentador=instrumentador
+    )
+
+    # 8. Validación de la configuración y de los encabezados de entrada, sin cargar datos
+    validador_proceso = providers.Factory(
+        ValidadorProceso,
         normativa=normativa
     )
+
+    # 9. Proceso completo de varias instituciones (IES) desde un manifiesto
+    lote_instituciones = providers.Factory(
+        ServicioLoteInstituciones,
+        normativa=normativa,
+        config=config,
+        procesos=config.provided['parametros_proceso']['procesos_lote']
+    )
+
+    # 10. Servicio local que conserva las entradas cargadas y atiende asignaciones y consultas por HTTP
+    servicio_residente = providers.Factory(
+        ServicioResidente,
+        normativa=normativa,
+        lector=providers.Factory(LectorDatosCSVColumnar, normativa=normativa, cache=cache_entradas),
+        host=config.provided['servicio']['host'],
+        puerto=config.provided['servicio']['puerto'],
+        socket_unix=config.provided['servicio']['socket_unix'],
+        procesos=config.provided['servicio']['procesos'],
+        max_ejecuciones=config.provided['servicio']['max_ejecuciones']
+    )
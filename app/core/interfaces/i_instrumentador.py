@@ -0,0 +1,21 @@
+import abc
+from typing import Protocol, ContextManager, Union
+
+class IInstrumentador(Protocol):
+    """
+    Interfaz para un servicio que mide tiempo y memoria por fase del proceso
+    y acumula contadores para el reporte de ejecución.
+    """
+    @abc.abstractmethod
+    def fase(self, nombre: str) -> ContextManager:
+        """Mide el bloque 'with'; las fases pueden anidarse."""
+        ...
+
+    @abc.abstractmethod
+    def contar(self, nombre: str, valor: Union[int, float] = 1) -> None:
+        """Suma 'valor' al contador 'nombre' de la fase en curso."""
+        ...
+
+    @abc.abstractmethod
+    def escribir_reporte(self, ruta: str) -> None:
+        ...
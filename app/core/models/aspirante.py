@@ -1,21 +1,96 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping, Optional
 from app.core.models.postulacion import Postulacion
 from app.core.models.normativa import Normativa
+from app.core.models.registro_condiciones import RegistroCondiciones
 
-@dataclass
+# Condiciones que otorgan puntos de acción afirmativa: condición -> clave de puntos en la normativa
+MAPEO_PUNTOS = {
+    "CONDICION_SOCIOECONOMICA_POBREZA": "CONDICION_SOCIOECONOMICA_POBREZA",
+    "RURALIDAD": "RURALIDAD",
+    "TERRITORIALIDAD": "TERRITORIALIDAD",
+    "PUEBLO_NACIONALIDAD": "PUEBLO_NACIONALIDAD"
+}
+
+# Condiciones de vulnerabilidad (Art. 49, literal e), acumulables hasta VULNERABILIDAD_MAX
+CLAVES_VULNERABILIDAD = [
+    "PERSONA_CON_DISCAPACIDAD", "BENEFICIARIO_BONO_JOAQUIN",
+    "VICTIMA_VIOLENCIA_GENERO", "MIGRANTE_RETORNADO",
+    "HIJO_VICTIMA_FEMICIDIO", "ENFERMEDAD_CATASTROFICA",
+    "ACOGIMIENTO_INSTITUCIONAL"
+]
+
+@dataclass(slots=True, init=False)
 class Aspirante:
     """Representa a un aspirante con sus datos y postulaciones."""
     id: str
     puntaje_antecedentes: float
     puntaje_evaluacion: float
     
-    # Almacena todas las columnas booleanas (CONDICION_SOCIO..., RURALIDAD, etc.)
-    condiciones: Dict[str, bool] = field(default_factory=dict)
+    # Todas las columnas booleanas (CONDICION_SOCIO..., RURALIDAD, etc.) como
+    # máscara de bits; el RegistroCondiciones compartido define cada bit
+    mascara_condiciones: int = 0
+    registro: Optional[RegistroCondiciones] = field(default=None, repr=False)
     
     postulaciones: List[Postulacion] = field(default_factory=list)
     puntaje_postulacion: float = 0.0
 
+    def __init__(
+        self,
+        id: str,
+        puntaje_antecedentes: float,
+        puntaje_evaluacion: float,
+        condiciones: Optional[Mapping[str, bool]] = None,
+        postulaciones: Optional[List[Postulacion]] = None,
+        puntaje_postulacion: float = 0.0,
+        mascara_condiciones: int = 0,
+        registro: Optional[RegistroCondiciones] = None
+    ):
+        """
+        Se conserva la firma original: 'condiciones' como diccionario
+        {columna: bool} se traduce a máscara con 'registro' o, si no se
+        indica, con un registro de sus propias columnas.
+        """
+        if condiciones is not None:
+            if registro is None:
+                registro = RegistroCondiciones(list(condiciones))
+            mascara_condiciones = registro.mascara(condiciones)
+        self.id = id
+        self.puntaje_antecedentes = puntaje_antecedentes
+        self.puntaje_evaluacion = puntaje_evaluacion
+        self.mascara_condiciones = mascara_condiciones
+        self.registro = registro
+        self.postulaciones = [] if postulaciones is None else postulaciones
+        self.puntaje_postulacion = puntaje_postulacion
+
+    @classmethod
+    def desde_condiciones(
+        cls,
+        id: str,
+        puntaje_antecedentes: float,
+        puntaje_evaluacion: float,
+        condiciones: Mapping[str, bool],
+        registro: RegistroCondiciones
+    ) -> 'Aspirante':
+        """Crea un aspirante a partir de un diccionario {columna: bool}."""
+        return cls(
+            id=id,
+            puntaje_antecedentes=puntaje_antecedentes,
+            puntaje_evaluacion=puntaje_evaluacion,
+            condiciones=condiciones,
+            registro=registro
+        )
+
+    @property
+    def condiciones(self) -> Dict[str, bool]:
+        """Vista de las condiciones como diccionario (para depuración y reportes)."""
+        if self.registro is None:
+            return {}
+        return self.registro.a_dict(self.mascara_condiciones)
+
+    def tiene_condicion(self, columna: str) -> bool:
+        return self.registro is not None and self.registro.tiene(self.mascara_condiciones, columna)
+
     def calcular_puntaje_postulacion(self, normativa: Normativa) -> None:
         """
         Calcula el puntaje final de postulación según la normativa (Art. 47 y 49).
@@ -28,31 +103,16 @@ class Aspirante:
         # 2. Puntos Adicionales (Acción Afirmativa)
         puntos_adicionales = 0.0
         
-        # Mapeo de condiciones del aspirante a claves de puntos en la normativa
-        mapeo_puntos = {
-            "CONDICION_SOCIOECONOMICA_POBREZA": "CONDICION_SOCIOECONOMICA_POBREZA",
-            "RURALIDAD": "RURALIDAD",
-            "TERRITORIALIDAD": "TERRITORIALIDAD",
-            "PUEBLO_NACIONALIDAD": "PUEBLO_NACIONALIDAD"
-        }
-        
-        for key_condicion, key_puntos in mapeo_puntos.items():
-             if self.condiciones.get(key_condicion, False):
+        for key_condicion, key_puntos in MAPEO_PUNTOS.items():
+             if self.tiene_condicion(key_condicion):
                 puntos_adicionales += normativa.puntos_adicionales.get(key_puntos, 0)
 
         # 2.e. Condiciones de Vulnerabilidad (Máx 35 pts)
         puntos_vulnerabilidad = 0.0
         base_vulnerabilidad = normativa.puntos_adicionales.get("VULNERABILIDAD_BASE", 5)
         
-        claves_vulnerabilidad = [
-            "PERSONA_CON_DISCAPACIDAD", "BENEFICIARIO_BONO_JOAQUIN",
-            "VICTIMA_VIOLENCIA_GENERO", "MIGRANTE_RETORNADO",
-            "HIJO_VICTIMA_FEMICIDIO", "ENFERMEDAD_CATASTROFICA",
-            "ACOGIMIENTO_INSTITUCIONAL"
-        ]
-        
-        for key in claves_vulnerabilidad:
-            if self.condiciones.get(key, False):
+        for key in CLAVES_VULNERABILIDAD:
+            if self.tiene_condicion(key):
                 puntos_vulnerabilidad += base_vulnerabilidad
         
         max_vulnerabilidad = normativa.puntos_adicionales.get("VULNERABILIDAD_MAX", 35)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Dict
 
-@dataclass
+@dataclass(slots=True)
 class Carrera:
     """Representa una carrera y sus cupos segmentados."""
     id: str
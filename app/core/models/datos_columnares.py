@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+import numpy as np
+
+@dataclass
+class DatosColumnares:
+    """
+    Entradas ya validadas en formato columnar (arreglos NumPy).
+    Las postulaciones están ordenadas por (aspirante, prioridad) y las del
+    aspirante k ocupan el rango [inicio_postulaciones[k], inicio_postulaciones[k+1]).
+    """
+    # Oferta académica: una fila por carrera
+    ids_carrera: np.ndarray
+    nombres_carrera: np.ndarray
+    cupos: np.ndarray  # Matriz [carrera x segmento], en el orden de mapeo_segmentos_cupos
+    segmentos: List[str]
+
+    # Aspirantes: una fila por aspirante
+    ids_aspirante: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+    antecedentes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    evaluacion: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    condiciones: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    # Postulaciones: una fila por elección de carrera
+    inicio_postulaciones: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int64))
+    postulacion_carrera: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+    postulacion_prioridad: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    @property
+    def num_aspirantes(self) -> int:
+        return len(self.ids_aspirante)
+
+    @property
+    def num_carreras(self) -> int:
+        return len(self.ids_carrera)
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+from app.core.models.listas_espera import ListasEspera
+
+@dataclass
+class EstadoAsignacion:
+    """
+    Estado de una ejecución del Art. 52, suficiente para reasignar de forma
+    incremental: insumos codificados de cada aspirante (en orden de carga)
+    y la asignación obtenida.
+
+    'elecciones' y 'prioridades' son matrices (A, K) por orden de prioridad;
+    'elecciones' usa los códigos de motor_arreglos (SIN_ELECCION,
+    CARRERA_INEXISTENTE). Las asignaciones valen -1 para quien no obtuvo cupo.
+    'rango_merito' es la posición de cada aspirante en el orden de mérito
+    (puntaje y criterios de desempate); evaluación y antecedentes se
+    conservan para volver a desempatar tras una corrección.
+    """
+    huella_normativa: str
+    criterios_desempate: List[str]
+    segmentos: List[str]
+    ids_carrera: np.ndarray
+    nombres_carrera: np.ndarray
+    cupos_iniciales: np.ndarray  # [carrera x segmento], antes de asignar
+
+    ids_aspirante: np.ndarray
+    puntajes: np.ndarray
+    evaluacion: np.ndarray
+    antecedentes: np.ndarray
+    rango_merito: np.ndarray
+    elegibilidad: np.ndarray
+    elecciones: np.ndarray
+    prioridades: np.ndarray
+
+    carrera_asignada: np.ndarray
+    segmento_asignado: np.ndarray
+    posicion_asignada: np.ndarray
+
+    # Listas de espera de la ejecución (opcionales; ver construir_listas_espera)
+    listas_espera: Optional[ListasEspera] = None
+
+    @property
+    def num_aspirantes(self) -> int:
+        return len(self.ids_aspirante)
+
+    def elecciones_preferidas(self) -> np.ndarray:
+        """
+        Máscara (A, K) de las elecciones válidas que cada aspirante prefiere a
+        la obtenida (todas, para quien no obtuvo cupo).
+        """
+        limite = np.where(self.carrera_asignada >= 0, self.posicion_asignada, self.elecciones.shape[1])
+        return (np.arange(self.elecciones.shape[1]) < limite[:, None]) & (self.elecciones >= 0)
+
+    @property
+    def cupos_restantes(self) -> np.ndarray:
+        """Cupos por carrera y segmento que quedan tras la asignación."""
+        restantes = self.cupos_iniciales.copy()
+        asignados = self.carrera_asignada >= 0
+        np.subtract.at(restantes, (self.carrera_asignada[asignados], self.segmento_asignado[asignados]), 1)
+        return restantes
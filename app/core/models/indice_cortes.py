@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import math
+import numpy as np
+from app.core.models.estado_asignacion import EstadoAsignacion
+
+@dataclass
+class IndiceCortes:
+    """
+    Resumen por carrera y segmento de una asignación terminada: puntaje de
+    corte (el menor puntaje admitido; NaN si no admitió a nadie), cupos
+    ocupados, cupos restantes y profundidad de la lista de espera
+    (aspirantes elegibles en el segmento que prefieren la carrera a la que
+    obtuvieron, incluidos quienes quedaron sin cupo).
+
+    Las matrices son [carrera x segmento]; la búsqueda por OFA_ID es O(1).
+    """
+    segmentos: List[str]
+    ids_carrera: np.ndarray
+    nombres_carrera: np.ndarray
+    corte: np.ndarray
+    ocupados: np.ndarray
+    restantes: np.ndarray
+    en_espera: np.ndarray
+    _fila: Dict[str, int] = field(init=False, repr=False)
+    _columna: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._fila = {id_carrera: i for i, id_carrera in enumerate(self.ids_carrera.tolist())}
+        self._columna = {segmento: j for j, segmento in enumerate(self.segmentos)}
+
+    @classmethod
+    def desde_estado(cls, estado: EstadoAsignacion) -> 'IndiceCortes':
+        num_carreras, num_segmentos = estado.cupos_iniciales.shape
+        carrera = estado.carrera_asignada
+        segmento = estado.segmento_asignado
+        asignados = carrera >= 0
+
+        corte = np.full((num_carreras, num_segmentos), np.inf)
+        np.minimum.at(corte, (carrera[asignados], segmento[asignados]), estado.puntajes[asignados])
+        ocupados = np.zeros((num_carreras, num_segmentos), dtype=np.int64)
+        np.add.at(ocupados, (carrera[asignados], segmento[asignados]), 1)
+
+        elecciones = estado.elecciones
+        preferidas = estado.elecciones_preferidas()
+        en_espera = np.zeros((num_carreras, num_segmentos), dtype=np.int64)
+        for s in range(num_segmentos):
+            elegibles = ((estado.elegibilidad >> s) & 1).astype(bool)
+            carreras_preferidas = elecciones[preferidas & elegibles[:, None]]
+            en_espera[:, s] = np.bincount(carreras_preferidas, minlength=num_carreras)
+
+        return cls(
+            segmentos=list(estado.segmentos),
+            ids_carrera=estado.ids_carrera,
+            nombres_carrera=estado.nombres_carrera,
+            corte=np.where(np.isinf(corte), np.nan, corte),
+            ocupados=ocupados,
+            restantes=estado.cupos_restantes,
+            en_espera=en_espera,
+        )
+
+    def _posicion(self, id_carrera: str, segmento: str):
+        fila = self._fila.get(str(id_carrera))
+        if fila is None:
+            raise KeyError(f"La carrera {id_carrera} no existe en el índice de cortes.")
+        columna = self._columna.get(segmento)
+        if columna is None:
+            raise KeyError(f"El segmento {segmento} no existe en el índice de cortes.")
+        return fila, columna
+
+    def consultar(self, id_carrera: str, segmento: str) -> Dict[str, Any]:
+        """Corte, cupos ocupados y restantes y lista de espera de la carrera en el segmento."""
+        fila, columna = self._posicion(id_carrera, segmento)
+        corte = float(self.corte[fila, columna])
+        return {
+            'id_carrera': str(self.ids_carrera[fila]),
+            'nombre_carrera': str(self.nombres_carrera[fila]),
+            'segmento': segmento,
+            'puntaje_corte': None if math.isnan(corte) else corte,
+            'cupos_ocupados': int(self.ocupados[fila, columna]),
+            'cupos_restantes': int(self.restantes[fila, columna]),
+            'en_espera': int(self.en_espera[fila, columna]),
+        }
+
+    def seria_admitido(self, puntaje: float, id_carrera: str, segmento: str) -> bool:
+        """
+        Indica si un aspirante elegible en el segmento, con 'puntaje' y la
+        carrera como su elección disponible, habría obtenido cupo: hay cupos
+        restantes o supera al último admitido. A igual puntaje deciden los
+        criterios de desempate y el orden de carga, por lo que el empate se
+        responde como no admitido.
+        """
+        fila, columna = self._posicion(id_carrera, segmento)
+        if self.restantes[fila, columna] > 0:
+            return True
+        corte = self.corte[fila, columna]
+        return bool(not np.isnan(corte) and puntaje > corte)
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class ListasEspera:
+    """
+    Listas de espera por bolsa (carrera, segmento), con bolsa = carrera * S + segmento,
+    en formato comprimido: la lista de la bolsa b ocupa
+    [inicio[b], inicio[b+1]) en 'aspirantes' (índices en orden de carga,
+    por puntaje descendente) y 'posiciones' (posición de la carrera entre
+    las elecciones del aspirante). Cada lista tiene a lo sumo 'profundidad'
+    aspirantes. 'siguiente[b]' es la primera entrada aún no consumida por
+    una promoción.
+    """
+    profundidad: int
+    inicio: np.ndarray
+    aspirantes: np.ndarray
+    posiciones: np.ndarray
+    siguiente: np.ndarray
+
+    @property
+    def num_entradas(self) -> int:
+        return len(self.aspirantes)
+
+    def pendientes(self, bolsa: int) -> np.ndarray:
+        """Aspirantes de la lista de la bolsa que aún no se han consumido."""
+        return self.aspirantes[self.siguiente[bolsa]:self.inicio[bolsa + 1]]
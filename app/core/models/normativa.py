@@ -1,5 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Optional
+from app.core.models.registro_condiciones import RegistroCondiciones
+from app.core.models.registro_incidencias import RegistroIncidencias, CATEGORIA_GENERAL
+
+# Criterios admitidos para desempatar aspirantes con igual puntaje de postulación
+CRITERIOS_DESEMPATE = ('evaluacion', 'antecedentes', 'id_aspirante')
+# Qué hacer con un aspirante de evaluación o antecedentes no numéricos o fuera de rango_puntajes
+POLITICAS_PUNTAJES_INVALIDOS = ('observar', 'excluir')
 
 @dataclass
 class Normativa:
@@ -11,9 +18,47 @@ class Normativa:
     mapeo_columnas_oferta: Dict[str, str]
     mapeo_columnas_postulaciones: Dict[str, str]
     mapeo_segmentos_cupos: List[str]
-    log_reporte: List[str] = field(default_factory=list)
+    # Mensaje de cada advertencia reportada, en orden; con None no se conservan
+    # (p. ej. en el proceso principal, que los deja en el archivo de incidencias)
+    log_reporte: Optional[List[str]] = field(default_factory=list)
+    incidencias: RegistroIncidencias = field(default_factory=RegistroIncidencias)
+    # A igual puntaje, en este orden; al final decide el orden de carga
+    criterios_desempate: List[str] = field(default_factory=list)
+    # Identificación del proceso en el archivo de resultados (None conserva el valor del resultado)
+    periodo: Optional[str] = None
+    id_ies: Optional[str] = None
+    # [mínimo, máximo] admitidos para evaluación y antecedentes (None: solo se rechazan los no numéricos)
+    rango_puntajes: Optional[List[float]] = None
+    # 'observar' reporta al aspirante y lo conserva; 'excluir' retira todas sus postulaciones
+    puntajes_invalidos: str = 'observar'
+    # Bits de las condiciones booleanas, compartido por todos los aspirantes
+    registro_condiciones: RegistroCondiciones = field(init=False, repr=False)
+
+    def __post_init__(self):
+        desconocidos = [c for c in self.criterios_desempate if c not in CRITERIOS_DESEMPATE]
+        if desconocidos or len(set(self.criterios_desempate)) != len(self.criterios_desempate):
+            raise ValueError(
+                f"Criterios de desempate inválidos: {self.criterios_desempate} "
+                f"(admitidos, sin repetir: {list(CRITERIOS_DESEMPATE)})."
+            )
+        if self.rango_puntajes is not None and (
+            len(self.rango_puntajes) != 2 or self.rango_puntajes[0] > self.rango_puntajes[1]
+        ):
+            raise ValueError(f"rango_puntajes inválido: {self.rango_puntajes} (se espera [mínimo, máximo]).")
+        if self.puntajes_invalidos not in POLITICAS_PUNTAJES_INVALIDOS:
+            raise ValueError(
+                f"puntajes_invalidos no soportado: {self.puntajes_invalidos} "
+                f"(admitidos: {list(POLITICAS_PUNTAJES_INVALIDOS)})."
+            )
+        self.registro_condiciones = RegistroCondiciones.desde_mapeo(self.mapeo_columnas_postulaciones)
 
-    def reportar_incidencia(self, mensaje: str):
-        """Añade un mensaje de advertencia al log (ej. postulaciones ignoradas)."""
-        print(f"[ADVERTENCIA] {mensaje}")
-        self.log_reporte.append(mensaje)
+    def reportar_incidencia(
+        self,
+        mensaje: str,
+        categoria: str = CATEGORIA_GENERAL,
+        id_aspirante: Optional[str] = None
+    ):
+        """Añade una advertencia (ej. postulaciones ignoradas) al log y al colector de incidencias."""
+        if self.log_reporte is not None:
+            self.log_reporte.append(mensaje)
+        self.incidencias.registrar(mensaje, categoria, id_aspirante)
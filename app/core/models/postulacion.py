@@ -1,8 +1,12 @@
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Postulacion:
-    """Representa una única elección de carrera de un aspirante."""
+    """
+    Representa una única elección de carrera de un aspirante.
+    Es inmutable: los lectores comparten una misma instancia entre todos
+    los aspirantes con la misma (carrera, prioridad).
+    """
     id_carrera: str
     prioridad: int
     nombre_carrera_debug: str # Para facilitar la depuración
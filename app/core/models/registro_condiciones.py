@@ -0,0 +1,53 @@
+from typing import Dict, List, Mapping
+
+# Claves de mapeo_columnas.postulaciones que no son condiciones booleanas
+CLAVES_NO_CONDICION = ['id_aspirante', 'id_carrera', 'prioridad', 'antecedentes', 'evaluacion']
+
+class RegistroCondiciones:
+    """
+    Registro compartido que asigna un bit a cada columna de condición del CSV.
+    Cada Aspirante guarda sus condiciones como un entero (máscara de bits)
+    en lugar de un diccionario con ~14 claves de texto.
+    """
+    __slots__ = ('columnas', '_bits')
+
+    def __init__(self, columnas: List[str]):
+        self.columnas = list(columnas)
+        self._bits: Dict[str, int] = {col: i for i, col in enumerate(self.columnas)}
+
+    @classmethod
+    def desde_mapeo(cls, mapeo_columnas_postulaciones: Mapping[str, str]) -> 'RegistroCondiciones':
+        return cls([
+            col_csv for key_mapeo, col_csv in mapeo_columnas_postulaciones.items()
+            if key_mapeo not in CLAVES_NO_CONDICION
+        ])
+
+    def bit(self, columna: str) -> int:
+        return self._bits[columna]
+
+    def mascara(self, condiciones: Mapping[str, bool]) -> int:
+        """Convierte un diccionario {columna: bool} en máscara; ignora columnas no registradas."""
+        mascara = 0
+        for columna, valor in condiciones.items():
+            if valor and columna in self._bits:
+                mascara |= 1 << self._bits[columna]
+        return mascara
+
+    def tiene(self, mascara: int, columna: str) -> bool:
+        bit = self._bits.get(columna)
+        return bit is not None and bool((mascara >> bit) & 1)
+
+    def a_dict(self, mascara: int) -> Dict[str, bool]:
+        return {col: bool((mascara >> i) & 1) for i, col in enumerate(self.columnas)}
+
+    def __contains__(self, columna: str) -> bool:
+        return columna in self._bits
+
+    def __len__(self) -> int:
+        return len(self.columnas)
+
+    def __eq__(self, other):
+        return isinstance(other, RegistroCondiciones) and self.columnas == other.columnas
+
+    def __hash__(self):
+        return hash(tuple(self.columnas))
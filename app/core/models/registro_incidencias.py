@@ -0,0 +1,148 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import csv
+import json
+import os
+
+# Categorías de incidencia
+CATEGORIA_GENERAL = "general"
+CATEGORIA_POSTULACIONES_EXCEDENTES = "postulaciones_excedentes"
+CATEGORIA_CARRERA_INEXISTENTE = "carrera_inexistente"
+CATEGORIA_CARRERA_REPETIDA = "carrera_repetida"
+CATEGORIA_PRIORIDAD_REPETIDA = "prioridad_repetida"
+CATEGORIA_PUNTAJE_FUERA_DE_RANGO = "puntaje_fuera_de_rango"
+CATEGORIA_PUNTAJES_INCONSISTENTES = "puntajes_inconsistentes"
+
+class RegistroIncidencias:
+    """
+    Colector de incidencias (advertencias) del proceso.
+
+    Cada incidencia tiene categoría, aspirante y mensaje.
+
+    Modos:
+    - 'consola': imprime cada incidencia al reportarla y las lista al final,
+      sin omitir repetidas (como el log original).
+    - 'resumen': no imprime por línea; al final muestra conteos por categoría
+      y algunos ejemplos. Las repetidas (misma categoría y mensaje) se
+      cuentan pero no se vuelven a registrar; se reconocen entre las
+      primeras MAX_VISTAS incidencias distintas, para acotar la memoria
+      ('max_vistas' lo reemplaza; con 0 no se omite ninguna, como en los
+      colectores auxiliares cuyas incidencias se reportan luego en otro).
+    Si se indica 'ruta' (.jsonl o .csv), las incidencias se escriben en ese
+    archivo en bloques de 'tamano_buffer'.
+    """
+    EJEMPLOS_POR_CATEGORIA = 3
+    MAX_VISTAS = 100_000
+
+    def __init__(
+        self,
+        modo: str = 'consola',
+        ruta: Optional[str] = None,
+        tamano_buffer: int = 10_000,
+        max_vistas: Optional[int] = None
+    ):
+        if modo not in ('consola', 'resumen'):
+            raise ValueError(f"Modo de incidencias no soportado: {modo}")
+        self.modo = modo
+        self.ruta = ruta
+        self.tamano_buffer = tamano_buffer
+        self.max_vistas = self.MAX_VISTAS if max_vistas is None else max_vistas
+        self.conteo: Dict[str, int] = {}
+        self.repetidas = 0
+        self.ejemplos: Dict[str, List[str]] = {}
+        # Solo en modo 'consola' se conservan todos los mensajes
+        self.mensajes: List[str] = []
+        self._vistas: Set[Tuple[str, str]] = set()
+        self._buffer: List[Dict[str, Any]] = []
+        self._capturas: List[List[Dict[str, Any]]] = []
+        self._archivo = None
+        self._escritor_csv = None
+        self._finalizado = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.conteo.values())
+
+    def registrar(self, mensaje: str, categoria: str = CATEGORIA_GENERAL, id_aspirante: Optional[str] = None) -> None:
+        if self.modo == 'resumen':
+            clave = (categoria, mensaje)
+            if clave in self._vistas:
+                self.repetidas += 1
+                return
+            if len(self._vistas) < self.max_vistas:
+                self._vistas.add(clave)
+
+        self.conteo[categoria] = self.conteo.get(categoria, 0) + 1
+        ejemplos = self.ejemplos.setdefault(categoria, [])
+        if len(ejemplos) < self.EJEMPLOS_POR_CATEGORIA:
+            ejemplos.append(mensaje)
+        if self.modo == 'consola':
+            print(f"[ADVERTENCIA] {mensaje}")
+            self.mensajes.append(mensaje)
+
+        registro = {
+            'categoria': categoria,
+            'id_aspirante': None if id_aspirante is None else str(id_aspirante),
+            'mensaje': mensaje
+        }
+        for captura in self._capturas:
+            captura.append(registro)
+        if self.ruta:
+            self._buffer.append(registro)
+            if len(self._buffer) >= self.tamano_buffer:
+                self._vaciar_buffer()
+
+    @contextmanager
+    def capturar(self) -> Iterator[List[Dict[str, Any]]]:
+        """Reúne en una lista las incidencias nuevas registradas dentro del bloque."""
+        captura: List[Dict[str, Any]] = []
+        self._capturas.append(captura)
+        try:
+            yield captura
+        finally:
+            self._capturas.remove(captura)
+
+    def finalizar(self) -> None:
+        """Escribe las incidencias pendientes y cierra el archivo."""
+        if not self.ruta or self._finalizado:
+            return
+        self._vaciar_buffer()
+        self._archivo.close()
+        self._archivo = None
+        self._escritor_csv = None
+        self._finalizado = True
+
+    def imprimir_resumen(self) -> None:
+        if self.modo == 'consola':
+            if self.mensajes:
+                print("\nSe generaron las siguientes advertencias durante el proceso:")
+                for msg in self.mensajes:
+                    print(f"- {msg}")
+            return
+
+        if not self.total:
+            return
+        print(f"\nSe registraron {self.total} incidencias ({self.repetidas} repetidas omitidas):")
+        for categoria, cantidad in self.conteo.items():
+            print(f"- {categoria}: {cantidad}")
+            for mensaje in self.ejemplos[categoria]:
+                print(f"    {mensaje}")
+        if self.ruta:
+            print(f"Detalle de incidencias en: {self.ruta}")
+
+    def _vaciar_buffer(self) -> None:
+        if self._archivo is None:
+            # Se abre (y trunca) al primer uso para no mezclar ejecuciones anteriores
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            self._archivo = open(self.ruta, 'w', encoding='utf-8', newline='')
+            if self.ruta.endswith('.csv'):
+                self._escritor_csv = csv.DictWriter(self._archivo, fieldnames=['categoria', 'id_aspirante', 'mensaje'])
+                self._escritor_csv.writeheader()
+
+        if self._escritor_csv is not None:
+            self._escritor_csv.writerows(self._buffer)
+        else:
+            self._archivo.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self._buffer))
+        self._buffer = []
@@ -1,7 +1,16 @@
 from app.core.interfaces.i_lector_datos import ILectorDatos
 from app.core.interfaces.i_escritor_resultados import IEscritorResultados
 from app.core.interfaces.i_strategy_asignacion import IStrategyAsignacion
+from app.core.interfaces.i_instrumentador import IInstrumentador
 from app.core.models.normativa import Normativa
+from app.core.models.indice_cortes import IndiceCortes
+from app.core.services.almacen_estado import AlmacenEstadoAsignacion, huella_normativa
+from app.core.services.almacen_indice_cortes import AlmacenIndiceCortes
+from app.core.services.instrumentador import InstrumentadorNulo, ruta_reporte
+from app.core.services.puntos_control import DiarioPuntosControl, huella_ejecucion
+from app.core.strategy.listas_espera import construir_listas_espera
+from app.core.strategy.reasignador_incremental import construir_estado
+from typing import Optional
 import traceback
 
 class MotorAsignacion:
@@ -14,35 +23,135 @@ class MotorAsignacion:
         lector: ILectorDatos,
         escritor: IEscritorResultados,
         estrategia: IStrategyAsignacion,
-        normativa: Normativa
+        normativa: Normativa,
+        instrumentador: Optional[IInstrumentador] = None,
+        almacen_estado: Optional[AlmacenEstadoAsignacion] = None,
+        almacen_cortes: Optional[AlmacenIndiceCortes] = None,
+        profundidad_listas_espera: int = 0,
+        puntos_control: Optional[DiarioPuntosControl] = None
     ):
         self.lector = lector
         self.escritor = escritor
         self.estrategia = estrategia
         self.normativa = normativa
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+        self.almacen_estado = almacen_estado
+        self.almacen_cortes = almacen_cortes
+        self.profundidad_listas_espera = profundidad_listas_espera
+        self.puntos_control = puntos_control
+        if profundidad_listas_espera > 0 and almacen_estado is None:
+            print("Las listas de espera se guardan con el estado de asignación: active 'guardar_estado'.")
         print("Motor de Asignación inicializado.")
 
-    def ejecutar_proceso(self):
-        """Ejecuta el proceso completo de asignación."""
+    def ejecutar_proceso(self, reanudar: bool = False) -> bool:
+        """
+        Ejecuta el proceso completo de asignación. Retorna si terminó sin errores.
+        Con 'reanudar', parte del último punto de control válido de una
+        ejecución interrumpida con las mismas entradas y configuración.
+        """
+        instrumentador = self.instrumentador
         try:
+            self._abrir_puntos_control(reanudar)
+
             print("\n[PASO 1] Cargando datos de entrada...")
-            aspirantes, carreras = self.lector.cargar_datos()
+            with instrumentador.fase("carga"):
+                aspirantes, carreras, datos = self._cargar_datos()
+                instrumentador.contar("aspirantes", len(aspirantes))
+                instrumentador.contar("carreras", len(carreras))
 
             print("\n[PASO 2] Ejecutando estrategia de asignación...")
-            resultados = self.estrategia.ejecutar_asignacion(
-                aspirantes, carreras, self.normativa
-            )
+            with instrumentador.fase("asignacion"):
+                if datos is not None and getattr(self.estrategia, 'admite_columnas', False):
+                    resultados = self.estrategia.ejecutar_asignacion(
+                        aspirantes, carreras, self.normativa, datos=datos
+                    )
+                else:
+                    resultados = self.estrategia.ejecutar_asignacion(
+                        aspirantes, carreras, self.normativa
+                    )
+                instrumentador.contar("cupos_asignados", len(resultados))
+
+            if self.almacen_estado is not None or self.almacen_cortes is not None:
+                self._guardar_estado(aspirantes, carreras, resultados)
 
             print("\n[PASO 3] Escribiendo resultados de salida...")
-            self.escritor.escribir_resultados(resultados)
+            with instrumentador.fase("escritura"):
+                self.escritor.escribir_resultados(resultados)
             
+            if self.puntos_control is not None:
+                self.puntos_control.cerrar(completado=True)
             print("\n[PROCESO FINALIZADO] El proceso se completó exitosamente.")
-            
-            if self.normativa.log_reporte:
-                print("\nSe generaron las siguientes advertencias durante el proceso:")
-                for msg in self.normativa.log_reporte:
-                    print(f"- {msg}")
+            self.normativa.incidencias.finalizar()
+            instrumentador.contar("incidencias", self.normativa.incidencias.total)
+            instrumentador.escribir_reporte(ruta_reporte(self.normativa.rutas['resultados_asignacion']))
+            self.normativa.incidencias.imprimir_resumen()
+            return True
 
         except Exception as e:
             print(f"\n[ERROR FATAL] El proceso falló: {e}")
             traceback.print_exc()
+            if self.puntos_control is not None:
+                # El diario queda para reanudar con --reanudar
+                self.puntos_control.cerrar()
+            # Se conservan en el archivo las incidencias registradas hasta el fallo
+            self.normativa.incidencias.finalizar()
+            return False
+
+    def _abrir_puntos_control(self, reanudar: bool) -> None:
+        if self.puntos_control is None:
+            if reanudar:
+                print("Para reanudar active 'puntos_control' en config.json; se ejecuta el proceso completo.")
+            return
+        huella = huella_ejecucion(self.normativa, self.lector, self.estrategia)
+        self.puntos_control.abrir(huella, reanudar)
+
+    def _cargar_datos(self):
+        """
+        Carga las entradas. Con un lector columnar retorna también sus
+        DatosColumnares (None con la carga clásica). Con puntos de control,
+        las entradas validadas (y sus incidencias) se guardan en el diario o
+        se restauran desde él. La carga clásica no tiene punto de control: al
+        reanudar se vuelve a leer.
+        """
+        puntos_control = self.puntos_control
+        if not hasattr(self.lector, 'cargar_columnas_validadas'):
+            aspirantes, carreras = self.lector.cargar_datos()
+            return aspirantes, carreras, None
+        if puntos_control is None:
+            datos = self.lector.cargar_columnas_validadas()
+            return (*self.lector.construir_modelos(datos), datos)
+
+        datos = puntos_control.recuperar_carga(self.normativa)
+        if datos is not None:
+            print("Entradas restauradas desde el punto de control.")
+        else:
+            with puntos_control.capturar_incidencias(self.normativa.incidencias) as meta:
+                datos = self.lector.cargar_columnas_validadas()
+            puntos_control.guardar_carga(datos, meta)
+        return (*self.lector.construir_modelos(datos), datos)
+
+    def _guardar_estado(self, aspirantes, carreras, resultados) -> None:
+        """
+        Guarda el estado para una posterior reasignación incremental (con las
+        listas de espera, si se pidieron) y/o el índice de cortes por carrera
+        y segmento.
+        """
+        guardar_estado = self.almacen_estado is not None
+        if guardar_estado and not getattr(self.estrategia, 'admite_reasignacion_incremental', False):
+            print("La estrategia configurada no admite reasignación incremental; no se guarda el estado.")
+            guardar_estado = False
+        if not guardar_estado and self.almacen_cortes is None:
+            return
+        with self.instrumentador.fase("estado"):
+            estado = construir_estado(
+                aspirantes, carreras, resultados,
+                self.estrategia.manejadores_segmento, huella_normativa(self.normativa),
+                self.normativa.criterios_desempate
+            )
+            if guardar_estado:
+                if self.profundidad_listas_espera > 0:
+                    estado.listas_espera = construir_listas_espera(estado, self.profundidad_listas_espera)
+                    self.instrumentador.contar("entradas_listas_espera", estado.listas_espera.num_entradas)
+                self.almacen_estado.guardar(estado)
+            if self.almacen_cortes is not None:
+                self.almacen_cortes.guardar(IndiceCortes.desde_estado(estado))
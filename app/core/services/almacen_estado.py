@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import numpy as np
+from app.core.models.estado_asignacion import EstadoAsignacion
+from app.core.models.listas_espera import ListasEspera
+from app.core.models.normativa import Normativa
+
+# Se incrementa cuando cambia el contenido del archivo de estado
+VERSION_ESTADO = 2
+
+def huella_normativa(normativa: Normativa) -> str:
+    """Resumen de las reglas que determinan puntajes y segmentos."""
+    descriptor = {
+        'version': VERSION_ESTADO,
+        'ponderadores': normativa.ponderadores,
+        'puntos_adicionales': normativa.puntos_adicionales,
+        'max_postulaciones': normativa.max_postulaciones,
+        'criterios_desempate': normativa.criterios_desempate,
+        'segmentos': normativa.mapeo_segmentos_cupos,
+        'mapeo_postulaciones': normativa.mapeo_columnas_postulaciones,
+    }
+    texto = json.dumps(descriptor, sort_keys=True)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:32]
+
+class AlmacenEstadoAsignacion:
+    """Guarda y recupera el EstadoAsignacion en un único archivo .npz."""
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+
+    def guardar(self, estado: EstadoAsignacion) -> None:
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta + '.tmp.npz'
+        listas = {}
+        if estado.listas_espera is not None:
+            listas = {
+                'listas_profundidad': np.array(estado.listas_espera.profundidad),
+                'listas_inicio': estado.listas_espera.inicio,
+                'listas_aspirantes': estado.listas_espera.aspirantes,
+                'listas_posiciones': estado.listas_espera.posiciones,
+                'listas_siguiente': estado.listas_espera.siguiente,
+            }
+        np.savez(
+            temporal,
+            **listas,
+            huella_normativa=np.array(estado.huella_normativa),
+            criterios_desempate=np.array(estado.criterios_desempate, dtype=str),
+            segmentos=np.array(estado.segmentos, dtype=str),
+            ids_carrera=estado.ids_carrera.astype(str),
+            nombres_carrera=estado.nombres_carrera.astype(str),
+            cupos_iniciales=estado.cupos_iniciales,
+            ids_aspirante=estado.ids_aspirante.astype(str),
+            puntajes=estado.puntajes,
+            evaluacion=estado.evaluacion,
+            antecedentes=estado.antecedentes,
+            rango_merito=estado.rango_merito,
+            elegibilidad=estado.elegibilidad,
+            elecciones=estado.elecciones,
+            prioridades=estado.prioridades,
+            carrera_asignada=estado.carrera_asignada,
+            segmento_asignado=estado.segmento_asignado,
+            posicion_asignada=estado.posicion_asignada,
+        )
+        os.replace(temporal, self.ruta)
+        print(f"Estado de asignación guardado en: {self.ruta}")
+
+    def cargar(self) -> EstadoAsignacion:
+        if not os.path.exists(self.ruta):
+            raise FileNotFoundError(
+                f"No existe el estado de asignación '{self.ruta}'. "
+                "Ejecute primero el proceso completo con 'guardar_estado' activado."
+            )
+        with np.load(self.ruta, allow_pickle=False) as datos:
+            if 'rango_merito' not in datos:
+                raise ValueError(
+                    f"El estado '{self.ruta}' es de una versión anterior; ejecute el proceso completo."
+                )
+            listas = None
+            if 'listas_inicio' in datos:
+                listas = ListasEspera(
+                    profundidad=int(datos['listas_profundidad']),
+                    inicio=datos['listas_inicio'],
+                    aspirantes=datos['listas_aspirantes'],
+                    posiciones=datos['listas_posiciones'],
+                    siguiente=datos['listas_siguiente'],
+                )
+            return EstadoAsignacion(
+                huella_normativa=str(datos['huella_normativa']),
+                criterios_desempate=datos['criterios_desempate'].tolist(),
+                segmentos=datos['segmentos'].tolist(),
+                ids_carrera=datos['ids_carrera'].astype(object),
+                nombres_carrera=datos['nombres_carrera'].astype(object),
+                cupos_iniciales=datos['cupos_iniciales'],
+                ids_aspirante=datos['ids_aspirante'].astype(object),
+                puntajes=datos['puntajes'],
+                evaluacion=datos['evaluacion'],
+                antecedentes=datos['antecedentes'],
+                rango_merito=datos['rango_merito'],
+                elegibilidad=datos['elegibilidad'],
+                elecciones=datos['elecciones'],
+                prioridades=datos['prioridades'],
+                carrera_asignada=datos['carrera_asignada'],
+                segmento_asignado=datos['segmento_asignado'],
+                posicion_asignada=datos['posicion_asignada'],
+                listas_espera=listas,
+            )
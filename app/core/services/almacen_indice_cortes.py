@@ -0,0 +1,43 @@
+import os
+import numpy as np
+from app.core.models.indice_cortes import IndiceCortes
+
+class AlmacenIndiceCortes:
+    """Guarda y recupera el IndiceCortes de la última ejecución en un único archivo .npz."""
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+
+    def guardar(self, indice: IndiceCortes) -> None:
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta + '.tmp.npz'
+        np.savez(
+            temporal,
+            segmentos=np.array(indice.segmentos, dtype=str),
+            ids_carrera=indice.ids_carrera.astype(str),
+            nombres_carrera=indice.nombres_carrera.astype(str),
+            corte=indice.corte,
+            ocupados=indice.ocupados,
+            restantes=indice.restantes,
+            en_espera=indice.en_espera,
+        )
+        os.replace(temporal, self.ruta)
+        print(f"Índice de cortes guardado en: {self.ruta}")
+
+    def cargar(self) -> IndiceCortes:
+        if not os.path.exists(self.ruta):
+            raise FileNotFoundError(
+                f"No existe el índice de cortes '{self.ruta}'. "
+                "Ejecute primero el proceso completo con 'indice_cortes' activado."
+            )
+        with np.load(self.ruta, allow_pickle=False) as datos:
+            return IndiceCortes(
+                segmentos=datos['segmentos'].tolist(),
+                ids_carrera=datos['ids_carrera'].astype(object),
+                nombres_carrera=datos['nombres_carrera'].astype(object),
+                corte=datos['corte'],
+                ocupados=datos['ocupados'],
+                restantes=datos['restantes'],
+                en_espera=datos['en_espera'],
+            )
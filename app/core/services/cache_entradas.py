@@ -0,0 +1,178 @@
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+
+# Se incrementa cuando cambia el formato o el contenido de los archivos guardados
+VERSION_FORMATO = 4
+
+def arreglos_columnares(datos: DatosColumnares) -> Dict[str, np.ndarray]:
+    """
+    Columnas de DatosColumnares como arreglos sin objetos (se guardan sin
+    pickle); los segmentos y el nombre de las condiciones van aparte.
+    """
+    # Los OFA_ID postulados se guardan como códigos sobre la lista de valores distintos
+    # (factorize agrupa por hash, sin ordenar el texto)
+    codigos, carreras_postuladas = pd.factorize(datos.postulacion_carrera)
+    carreras_postuladas = np.asarray(carreras_postuladas).astype(str)
+    arreglos = {
+        'ids_carrera': datos.ids_carrera.astype(str),
+        'nombres_carrera': datos.nombres_carrera.astype(str),
+        'cupos': datos.cupos,
+        'ids_aspirante': datos.ids_aspirante.astype(str),
+        'antecedentes': datos.antecedentes,
+        'evaluacion': datos.evaluacion,
+    }
+    for i, valores in enumerate(datos.condiciones.values()):
+        arreglos[f"condicion_{i}"] = valores
+    arreglos.update({
+        'inicio_postulaciones': datos.inicio_postulaciones,
+        'carreras_postuladas': carreras_postuladas,
+        'postulacion_codigo': codigos.astype(np.int32),
+        'postulacion_prioridad': datos.postulacion_prioridad,
+    })
+    return arreglos
+
+def columnas_desde_arreglos(
+    cargar: Callable[[str], np.ndarray],
+    segmentos: List[str],
+    condiciones: List[str]
+) -> DatosColumnares:
+    """Inverso de arreglos_columnares; 'cargar(nombre)' entrega cada arreglo guardado."""
+    carreras_postuladas = _textos(cargar('carreras_postuladas'), internar=True)
+    return DatosColumnares(
+        ids_carrera=_textos(cargar('ids_carrera'), internar=True),
+        nombres_carrera=_textos(cargar('nombres_carrera'), internar=True),
+        cupos=cargar('cupos'),
+        segmentos=segmentos,
+        ids_aspirante=_textos(cargar('ids_aspirante')),
+        antecedentes=cargar('antecedentes'),
+        evaluacion=cargar('evaluacion'),
+        condiciones={col: cargar(f"condicion_{i}") for i, col in enumerate(condiciones)},
+        inicio_postulaciones=cargar('inicio_postulaciones'),
+        postulacion_carrera=carreras_postuladas[cargar('postulacion_codigo')],
+        postulacion_prioridad=cargar('postulacion_prioridad'),
+    )
+
+def _textos(valores: np.ndarray, internar: bool = False) -> np.ndarray:
+    """Convierte un arreglo de texto de ancho fijo en objetos str (compartidos si 'internar')."""
+    if internar:
+        return np.array([sys.intern(v) for v in valores.tolist()], dtype=object)
+    return valores.astype(object)
+
+class CacheEntradas:
+    """
+    Caché binaria de las entradas ya validadas (DatosColumnares).
+
+    Cada entrada es un directorio con un .npy por columna, las filas de la
+    revisión de calidad (rechazos.csv) y un meta.json. La clave combina
+    tamaño y fecha de modificación de ambos CSV, el mapeo de columnas,
+    max_postulaciones, rango_puntajes, puntajes_invalidos y el lector que
+    la generó, de modo que cualquier cambio en esos datos invalida la
+    entrada automáticamente.
+    Al leer, los arreglos se abren con memoria mapeada.
+    """
+    def __init__(self, directorio: str, habilitada: bool = True, max_entradas: int = 4):
+        self.directorio = directorio
+        self.habilitada = habilitada
+        self.max_entradas = max_entradas
+
+    def clave(self, normativa: Normativa, origen: str) -> str:
+        def huella(ruta: str) -> List[Any]:
+            info = os.stat(ruta)
+            return [os.path.abspath(ruta), info.st_size, info.st_mtime_ns]
+
+        descriptor = {
+            'version': VERSION_FORMATO,
+            'origen': origen,
+            'oferta': huella(normativa.rutas['oferta_academica']),
+            'postulaciones': huella(normativa.rutas['matriz_postulaciones']),
+            'mapeo_oferta': normativa.mapeo_columnas_oferta,
+            'mapeo_postulaciones': normativa.mapeo_columnas_postulaciones,
+            'segmentos': normativa.mapeo_segmentos_cupos,
+            'max_postulaciones': normativa.max_postulaciones,
+            'rango_puntajes': normativa.rango_puntajes,
+            'puntajes_invalidos': normativa.puntajes_invalidos,
+        }
+        texto = json.dumps(descriptor, sort_keys=True)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:32]
+
+    def obtener(self, clave: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna {'datos': DatosColumnares, 'incidencias': [...], 'rechazos': DataFrame o None}
+        o None si no hay entrada válida.
+        """
+        if not self.habilitada:
+            return None
+        ruta = os.path.join(self.directorio, clave)
+        ruta_meta = os.path.join(ruta, 'meta.json')
+        if not os.path.exists(ruta_meta):
+            return None
+
+        with open(ruta_meta, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        # Marca la entrada como usada recientemente para la poda
+        os.utime(ruta)
+
+        def cargar(nombre: str) -> np.ndarray:
+            return np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode='r')
+
+        datos = columnas_desde_arreglos(cargar, meta['segmentos'], meta['condiciones'])
+        # Las filas rechazadas se conservan como texto, tal como se escribieron
+        ruta_rechazos = os.path.join(ruta, 'rechazos.csv')
+        rechazos = None
+        if os.path.exists(ruta_rechazos):
+            rechazos = pd.read_csv(ruta_rechazos, dtype=str, keep_default_na=False)
+        return {'datos': datos, 'incidencias': meta['incidencias'], 'rechazos': rechazos}
+
+    def guardar(
+        self,
+        clave: str,
+        datos: DatosColumnares,
+        incidencias: List[Dict[str, Any]],
+        rechazos: Optional[pd.DataFrame] = None
+    ) -> None:
+        if not self.habilitada:
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        destino = os.path.join(self.directorio, clave)
+        temporal = tempfile.mkdtemp(prefix=f".{clave}-", dir=self.directorio)
+        try:
+            for nombre, arreglo in arreglos_columnares(datos).items():
+                np.save(os.path.join(temporal, f"{nombre}.npy"), arreglo, allow_pickle=False)
+            if rechazos is not None:
+                rechazos.to_csv(os.path.join(temporal, 'rechazos.csv'), index=False)
+
+            meta = {
+                'segmentos': datos.segmentos,
+                'condiciones': list(datos.condiciones),
+                'incidencias': incidencias,
+            }
+            # meta.json se escribe al final: su presencia marca la entrada como completa
+            with open(os.path.join(temporal, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            if os.path.exists(destino):
+                shutil.rmtree(destino)
+            os.replace(temporal, destino)
+        except Exception:
+            shutil.rmtree(temporal, ignore_errors=True)
+            raise
+        self._podar()
+
+    def _podar(self) -> None:
+        """Conserva solo las 'max_entradas' entradas más recientes."""
+        entradas = [
+            os.path.join(self.directorio, nombre) for nombre in os.listdir(self.directorio)
+            if not nombre.startswith('.') and os.path.isdir(os.path.join(self.directorio, nombre))
+        ]
+        entradas.sort(key=os.path.getmtime, reverse=True)
+        for ruta in entradas[self.max_entradas:]:
+            shutil.rmtree(ruta, ignore_errors=True)
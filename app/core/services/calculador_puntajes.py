@@ -0,0 +1,140 @@
+from typing import List, Mapping, Optional, Tuple
+import numpy as np
+from app.core.models.aspirante import Aspirante, MAPEO_PUNTOS, CLAVES_VULNERABILIDAD
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+from app.core.strategy.orden_merito import orden_merito, codigos_identificacion
+
+class CalculadorPuntajes:
+    """
+    Calcula el puntaje de postulación (Art. 47 y 49) de toda la cohorte a la vez.
+    Reproduce bit a bit Aspirante.calcular_puntaje_postulacion: mismas sumas
+    en el mismo orden, tope de vulnerabilidad, redondeo a 2 decimales y tope de 1000.
+    """
+    def __init__(self, normativa: Normativa):
+        self.peso_evaluacion = normativa.ponderadores.get("EVALUACION_CAPACIDAD", 0.5)
+        self.peso_antecedentes = normativa.ponderadores.get("ANTECEDENTE_ACADEMICO", 0.5)
+        self.puntos_condicion = [
+            (key_condicion, normativa.puntos_adicionales.get(key_puntos, 0))
+            for key_condicion, key_puntos in MAPEO_PUNTOS.items()
+        ]
+        self.base_vulnerabilidad = normativa.puntos_adicionales.get("VULNERABILIDAD_BASE", 5)
+        self.max_vulnerabilidad = normativa.puntos_adicionales.get("VULNERABILIDAD_MAX", 35)
+        self.criterios_desempate = list(normativa.criterios_desempate)
+
+    @staticmethod
+    def condiciones_requeridas() -> List[str]:
+        """Columnas de condiciones que intervienen en el puntaje."""
+        return list(MAPEO_PUNTOS) + CLAVES_VULNERABILIDAD
+
+    def calcular(
+        self,
+        evaluacion: np.ndarray,
+        antecedentes: np.ndarray,
+        condiciones: Mapping[str, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Retorna el puntaje de postulación de cada aspirante.
+        'condiciones' asocia cada columna de condición a un arreglo booleano;
+        las columnas ausentes se consideran falsas.
+        """
+        evaluacion = np.asarray(evaluacion, dtype=np.float64)
+        antecedentes = np.asarray(antecedentes, dtype=np.float64)
+        cero = np.zeros(len(evaluacion), dtype=np.float64)
+
+        # 1. Componente Ponderado
+        puntaje_base = evaluacion * self.peso_evaluacion + antecedentes * self.peso_antecedentes
+
+        # 2. Puntos Adicionales (Acción Afirmativa); sumar 0.0 no altera el acumulado
+        puntos_adicionales = cero.copy()
+        for key_condicion, puntos in self.puntos_condicion:
+            if key_condicion in condiciones:
+                puntos_adicionales += np.where(condiciones[key_condicion], float(puntos), 0.0)
+
+        # 2.e. Condiciones de Vulnerabilidad, acumuladas en el mismo orden que el cálculo individual
+        puntos_vulnerabilidad = cero.copy()
+        for key in CLAVES_VULNERABILIDAD:
+            if key in condiciones:
+                puntos_vulnerabilidad += np.where(condiciones[key], float(self.base_vulnerabilidad), 0.0)
+        puntos_adicionales += np.minimum(puntos_vulnerabilidad, float(self.max_vulnerabilidad))
+
+        # 3. Cálculo Final
+        return np.minimum(self._redondear_2(puntaje_base + puntos_adicionales), 1000.0)
+
+    def asignar_puntajes(self, aspirantes: List[Aspirante]) -> np.ndarray:
+        """Calcula y guarda puntaje_postulacion en cada aspirante; retorna el arreglo."""
+        n = len(aspirantes)
+        evaluacion = np.fromiter((a.puntaje_evaluacion for a in aspirantes), dtype=np.float64, count=n)
+        antecedentes = np.fromiter((a.puntaje_antecedentes for a in aspirantes), dtype=np.float64, count=n)
+        mascaras = np.fromiter((a.mascara_condiciones for a in aspirantes), dtype=np.int64, count=n)
+        condiciones = {}
+        if aspirantes and aspirantes[0].registro is not None:
+            registro = aspirantes[0].registro
+            for key in self.condiciones_requeridas():
+                if key in registro:
+                    condiciones[key] = ((mascaras >> registro.bit(key)) & 1).astype(bool)
+
+        puntajes = self.calcular(evaluacion, antecedentes, condiciones)
+        for aspirante, puntaje in zip(aspirantes, puntajes.tolist()):
+            aspirante.puntaje_postulacion = puntaje
+        return puntajes
+
+    def orden_merito(self, aspirantes: List[Aspirante], puntajes: np.ndarray) -> np.ndarray:
+        """
+        Orden de mérito de los aspirantes (ver orden_merito) con los criterios
+        de desempate de la normativa; se calcula una vez y lo recorren todos
+        los segmentos.
+        """
+        criterios = self.criterios_desempate
+        n = len(aspirantes)
+        evaluacion = antecedentes = codigos_id = None
+        if 'evaluacion' in criterios:
+            evaluacion = np.fromiter((a.puntaje_evaluacion for a in aspirantes), dtype=np.float64, count=n)
+        if 'antecedentes' in criterios:
+            antecedentes = np.fromiter((a.puntaje_antecedentes for a in aspirantes), dtype=np.float64, count=n)
+        if 'id_aspirante' in criterios:
+            codigos_id = codigos_identificacion(np.array([a.id for a in aspirantes], dtype=object))
+        return orden_merito(puntajes, criterios, evaluacion, antecedentes, codigos_id)
+
+    def orden_merito_columnas(self, datos: DatosColumnares, puntajes: np.ndarray) -> np.ndarray:
+        """Como orden_merito, a partir de DatosColumnares."""
+        codigos_id = None
+        if 'id_aspirante' in self.criterios_desempate:
+            codigos_id = codigos_identificacion(datos.ids_aspirante)
+        return orden_merito(puntajes, self.criterios_desempate, datos.evaluacion, datos.antecedentes, codigos_id)
+
+    @staticmethod
+    def _redondear_2(valores: np.ndarray) -> np.ndarray:
+        """
+        Redondeo a 2 decimales idéntico a round(x, 2) de Python.
+        np.round escala por 100 y usa rint, lo que solo puede diferir del redondeo
+        decimal exacto cuando x*100 queda prácticamente en .5; esos casos se
+        recalculan con round().
+        """
+        escalados = valores * 100.0
+        redondeados = np.round(valores, 2)
+        distancia = np.abs(escalados - np.floor(escalados) - 0.5)
+        dudosos = np.flatnonzero(distancia < 1e-6 * np.maximum(1.0, np.abs(escalados)))
+        for i in dudosos.tolist():
+            redondeados[i] = round(float(valores[i]), 2)
+        return redondeados
+
+def calcular_puntajes(
+    aspirantes: List[Aspirante],
+    normativa: Normativa,
+    datos: Optional[DatosColumnares] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Puntaje de postulación (guardado también en cada aspirante) y orden de
+    mérito con los criterios de desempate de la normativa. Con 'datos' (las
+    columnas de las que se construyeron los aspirantes) se calculan sobre
+    las columnas, sin recorrer los objetos.
+    """
+    calculador = CalculadorPuntajes(normativa)
+    if datos is None:
+        puntajes = calculador.asignar_puntajes(aspirantes)
+        return puntajes, calculador.orden_merito(aspirantes, puntajes)
+    puntajes = calculador.calcular(datos.evaluacion, datos.antecedentes, datos.condiciones)
+    for aspirante, puntaje in zip(aspirantes, puntajes.tolist()):
+        aspirante.puntaje_postulacion = puntaje
+    return puntajes, calculador.orden_merito_columnas(datos, puntajes)
@@ -0,0 +1,86 @@
+from typing import Optional
+import traceback
+import numpy as np
+import pandas as pd
+from app.core.interfaces.i_escritor_resultados import IEscritorResultados
+from app.core.interfaces.i_instrumentador import IInstrumentador
+from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import CATEGORIA_GENERAL
+from app.core.services.almacen_estado import AlmacenEstadoAsignacion
+from app.core.services.instrumentador import InstrumentadorNulo, ruta_reporte
+from app.core.strategy.listas_espera import ProcesadorDeclinaciones
+from app.core.strategy.reasignador_incremental import resultados_desde_estado
+
+class ServicioDeclinaciones:
+    """
+    Procesa un lote de declinaciones (CSV con la columna de identificación
+    de la matriz de postulaciones) sobre el estado guardado: libera los
+    cupos, los cubre desde las listas de espera en cascada, escribe los
+    resultados y guarda el nuevo estado para lotes posteriores.
+    """
+    def __init__(
+        self,
+        normativa: Normativa,
+        escritor: IEscritorResultados,
+        almacen: AlmacenEstadoAsignacion,
+        instrumentador: Optional[IInstrumentador] = None
+    ):
+        self.normativa = normativa
+        self.escritor = escritor
+        self.almacen = almacen
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+
+    def ejecutar(self, ruta_declinaciones: str) -> None:
+        instrumentador = self.instrumentador
+        normativa = self.normativa
+        try:
+            print("\n[PASO 1] Cargando estado y listas de espera de la ejecución anterior...")
+            with instrumentador.fase("carga_estado"):
+                estado = self.almacen.cargar()
+                procesador = ProcesadorDeclinaciones(estado)
+            print(f"Estado cargado: {estado.num_aspirantes} aspirantes; "
+                  f"{estado.listas_espera.num_entradas} entradas en listas de espera.")
+
+            print("\n[PASO 2] Leyendo declinaciones...")
+            with instrumentador.fase("declinaciones"):
+                id_col = normativa.mapeo_columnas_postulaciones['id_aspirante']
+                df = pd.read_csv(ruta_declinaciones, dtype={id_col: str})
+                if id_col not in df.columns:
+                    raise ValueError(f"Archivo de declinaciones inválido. Falta la columna: {id_col}")
+
+                posicion_de = {id_aspirante: i for i, id_aspirante in enumerate(estado.ids_aspirante.tolist())}
+                declinan = []
+                for id_aspirante in df[id_col].dropna().str.strip().drop_duplicates().tolist():
+                    i = posicion_de.get(id_aspirante)
+                    if i is None or estado.carrera_asignada[i] < 0:
+                        normativa.reportar_incidencia(
+                            f"Aspirante {id_aspirante}: Declinación ignorada; no existe en la ejecución anterior o no tiene cupo asignado.",
+                            CATEGORIA_GENERAL, id_aspirante
+                        )
+                        continue
+                    declinan.append(i)
+            print(f"Declinaciones válidas: {len(declinan)}")
+
+            print("\n[PASO 3] Promoviendo desde las listas de espera...")
+            with instrumentador.fase("promocion"):
+                nuevo_estado = procesador.procesar(np.array(declinan, dtype=np.int64))
+                instrumentador.contar("promovidos", procesador.promovidos)
+                instrumentador.contar("cupos_vacantes", procesador.vacantes)
+            print(f"Aspirantes promovidos: {procesador.promovidos}")
+            print(f"Cupos sin aspirantes en espera (vacantes): {procesador.vacantes}")
+
+            print("\n[PASO 4] Escribiendo resultados de salida...")
+            with instrumentador.fase("escritura"):
+                self.escritor.escribir_resultados(resultados_desde_estado(nuevo_estado))
+                self.almacen.guardar(nuevo_estado)
+
+            print("\n[PROCESO FINALIZADO] Las declinaciones se procesaron exitosamente.")
+            normativa.incidencias.finalizar()
+            instrumentador.contar("incidencias", normativa.incidencias.total)
+            instrumentador.escribir_reporte(ruta_reporte(normativa.rutas['resultados_asignacion']))
+            normativa.incidencias.imprimir_resumen()
+
+        except Exception as e:
+            print(f"\n[ERROR FATAL] El procesamiento de declinaciones falló: {e}")
+            traceback.print_exc()
+            normativa.incidencias.finalizar()
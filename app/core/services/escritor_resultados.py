@@ -1,32 +1,56 @@
-from typing import List
-import pandas as pd
+from typing import IO, Iterable, Iterator, List, Sequence, Any
+import csv
+import gzip
+import os
 from app.core.interfaces.i_escritor_resultados import IEscritorResultados
 from app.core.models.postulacion import AsignacionResultado
 from app.core.models.normativa import Normativa
 
+# Filas por lote al escribir Parquet
+TAMANO_LOTE_PARQUET = 100_000
+
 class EscritorResultadosCSV(IEscritorResultados):
-    """Implementación que escribe los resultados en el formato de monitoreo CSV."""
-    
-    def __init__(self, normativa: Normativa):
-        self.ruta_salida = normativa.rutas['resultados_asignacion']
+    """
+    Implementación que escribe los resultados en el formato de monitoreo CSV.
+    Las filas se escriben a medida que se generan, sin construir un DataFrame,
+    por lo que la memoria adicional no depende del número de asignaciones.
+    Formatos: 'csv', 'csv_gzip' (agrega .gz a la ruta) y 'parquet'
+    (requiere pyarrow; cambia la extensión a .parquet).
+    """
 
-    def escribir_resultados(self, resultados: List[AsignacionResultado]) -> None:
-        if not resultados:
-            print("No se generaron asignaciones. El archivo de salida estará vacío.")
-            columnas = self._get_columnas_formato()
-            pd.DataFrame(columns=columnas).to_csv(self.ruta_salida, index=False)
-            return
-            
-        df = pd.DataFrame([r.__dict__ for r in resultados])
-        df_formateado = self._formatear_para_salida(df)
-        
+    def __init__(self, normativa: Normativa, formato: str = 'csv'):
+        if formato not in ('csv', 'csv_gzip', 'parquet'):
+            raise ValueError(f"Formato de resultados no soportado: {formato}")
+        self.formato = formato
+        self.periodo = normativa.periodo
+        self.id_ies = normativa.id_ies
+        self.ruta_salida = self._ruta_para_formato(normativa.rutas['resultados_asignacion'], formato)
+
+    def escribir_resultados(self, resultados: Iterable[AsignacionResultado]) -> None:
+        self.escribir_filas(self.filas(resultados))
+
+    def escribir_filas(self, filas: Iterable[Sequence[Any]]) -> None:
+        """
+        Escribe filas ya ordenadas según _get_columnas_formato (por ejemplo,
+        generadas directamente desde los arreglos del motor de asignación).
+        """
         try:
-            df_formateado.to_csv(self.ruta_salida, index=False)
-            print(f"Resultados guardados exitosamente en: {self.ruta_salida}")
+            total = self._escribir(filas)
         except Exception as e:
             print(f"Error fatal al escribir el archivo de resultados: {e}")
             raise
 
+        if total == 0:
+            print("No se generaron asignaciones. El archivo de salida estará vacío.")
+        else:
+            print(f"Resultados guardados exitosamente en: {self.ruta_salida}")
+
+    def _escribir(self, filas: Iterable[Sequence[Any]]) -> int:
+        """Escribe las filas en el formato configurado y retorna cuántas escribió."""
+        if self.formato == 'parquet':
+            return self._escribir_parquet(filas)
+        return self._escribir_csv(filas)
+
     def _get_columnas_formato(self) -> List[str]:
         # Columnas según el formato de salida de monitoreo especificado
         return [
@@ -35,22 +59,74 @@ class EscritorResultadosCSV(IEscritorResultados):
             "PRIORIDAD_ELECCION_CARRERA", "NOMBRE_CARRERA", "OFA_ID", "CUS_ID"
         ]
 
-    def _formatear_para_salida(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Ajusta el DataFrame interno al formato de salida."""
-        mapeo_nombres = {
-            "periodo": "PERIODO", "id_ies": "IES_ID", "id_aspirante": "IDENTIFICACION",
-            "fecha_postulacion": "FECHA_POSTULACION", "puntaje_postulacion": "PUNTAJE_POSTULACION",
-            "segmento_asignado": "SEGMENTO_ASPIRANTE", "instancia_postulacion": "INSTANCIA_POSTULACION",
-            "prioridad_asignada": "PRIORIDAD_ELECCION_CARRERA",
-            "nombre_carrera_asignada": "NOMBRE_CARRERA", "id_carrera_asignada": "OFA_ID",
-            "cus_id": "CUS_ID"
-        }
-        
-        df_renombrado = df.rename(columns=mapeo_nombres)
-        columnas_finales = self._get_columnas_formato()
-        
-        for col in columnas_finales:
-            if col not in df_renombrado:
-                df_renombrado[col] = None
-        
-        return df_renombrado[columnas_finales]
+    def filas(self, resultados: Iterable[AsignacionResultado]) -> Iterator[tuple]:
+        """Convierte cada resultado en una fila con el orden de columnas de monitoreo."""
+        periodo, id_ies = self.periodo, self.id_ies
+        for r in resultados:
+            yield (
+                periodo or r.periodo, id_ies or r.id_ies, r.id_aspirante, r.fecha_postulacion,
+                r.puntaje_postulacion, r.segmento_asignado, r.instancia_postulacion,
+                r.prioridad_asignada, r.nombre_carrera_asignada, r.id_carrera_asignada,
+                r.cus_id
+            )
+
+    def _escribir_csv(self, filas: Iterable[Sequence[Any]]) -> int:
+        if self.formato == 'csv_gzip':
+            archivo = gzip.open(self.ruta_salida, 'wt', encoding='utf-8', newline='')
+        else:
+            archivo = open(self.ruta_salida, 'w', encoding='utf-8', newline='')
+        with archivo:
+            return self.volcar_csv(archivo, filas)
+
+    def volcar_csv(self, archivo: IO[str], filas: Iterable[Sequence[Any]]) -> int:
+        """Escribe encabezado y filas en un archivo de texto ya abierto; retorna cuántas filas escribió."""
+        total = 0
+        escritor = csv.writer(archivo, lineterminator=os.linesep)
+        escritor.writerow(self._get_columnas_formato())
+        for fila in filas:
+            escritor.writerow(fila)
+            total += 1
+        return total
+
+    def _escribir_parquet(self, filas: Iterable[Sequence[Any]]) -> int:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("El formato 'parquet' requiere el paquete opcional 'pyarrow'.") from e
+
+        columnas = self._get_columnas_formato()
+        esquema = pa.schema([
+            (col, pa.float64() if col == "PUNTAJE_POSTULACION"
+             else pa.int64() if col in ("INSTANCIA_POSTULACION", "PRIORIDAD_ELECCION_CARRERA")
+             else pa.string())
+            for col in columnas
+        ])
+        total = 0
+        with pq.ParquetWriter(self.ruta_salida, esquema) as escritor:
+            lote: List[Sequence[Any]] = []
+            for fila in filas:
+                lote.append(fila)
+                if len(lote) == TAMANO_LOTE_PARQUET:
+                    escritor.write_table(self._tabla_parquet(pa, esquema, lote))
+                    total += len(lote)
+                    lote = []
+            if lote or total == 0:
+                escritor.write_table(self._tabla_parquet(pa, esquema, lote))
+                total += len(lote)
+        return total
+
+    def _tabla_parquet(self, pa, esquema, lote: List[Sequence[Any]]):
+        columnas = list(zip(*lote)) if lote else [[] for _ in esquema]
+        return pa.Table.from_arrays(
+            [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+            schema=esquema
+        )
+
+    @staticmethod
+    def _ruta_para_formato(ruta: str, formato: str) -> str:
+        if formato == 'csv_gzip' and not ruta.endswith('.gz'):
+            return ruta + '.gz'
+        if formato == 'parquet':
+            return os.path.splitext(ruta)[0] + '.parquet'
+        return ruta
@@ -0,0 +1,56 @@
+from contextlib import closing
+from typing import Any, Iterable, Sequence
+import os
+import sqlite3
+from app.core.models.normativa import Normativa
+from app.core.services.escritor_resultados import EscritorResultadosCSV
+from app.core.services.lector_datos_sqlite import identificador_sql
+
+# Columnas indexadas una vez insertadas todas las filas
+COLUMNAS_INDICE = ('IDENTIFICACION', 'OFA_ID')
+
+class EscritorResultadosSQLite(EscritorResultadosCSV):
+    """
+    Escribe los resultados, con las columnas de monitoreo, en la tabla
+    'tabla' de una base SQLite junto al archivo de resultados configurado
+    (con extensión .sqlite). La tabla se reemplaza en cada ejecución.
+
+    Las filas se insertan con executemany a medida que se generan, en una
+    sola transacción; los índices se crean después de insertar, lo que es
+    más rápido que mantenerlos fila a fila.
+    """
+    def __init__(self, normativa: Normativa, tabla: str = 'asignacion_resultados'):
+        self.formato = 'sqlite'
+        self.periodo = normativa.periodo
+        self.id_ies = normativa.id_ies
+        self.tabla = tabla
+        self.ruta_salida = os.path.splitext(normativa.rutas['resultados_asignacion'])[0] + '.sqlite'
+
+    def _escribir(self, filas: Iterable[Sequence[Any]]) -> int:
+        columnas = self._get_columnas_formato()
+        tabla = identificador_sql(self.tabla)
+        tipos = {"PUNTAJE_POSTULACION": "REAL", "INSTANCIA_POSTULACION": "INTEGER", "PRIORIDAD_ELECCION_CARRERA": "INTEGER"}
+
+        # isolation_level=None: la transacción se controla explícitamente
+        with closing(sqlite3.connect(self.ruta_salida, isolation_level=None)) as conexion:
+            conexion.execute("BEGIN")
+            try:
+                conexion.execute(f"DROP TABLE IF EXISTS {tabla}")
+                conexion.execute(
+                    f"CREATE TABLE {tabla} ("
+                    + ", ".join(f"{identificador_sql(c)} {tipos.get(c, 'TEXT')}" for c in columnas) + ")"
+                )
+                cursor = conexion.executemany(
+                    f"INSERT INTO {tabla} VALUES ({', '.join('?' * len(columnas))})", filas
+                )
+                total = max(cursor.rowcount, 0)
+                for columna in COLUMNAS_INDICE:
+                    conexion.execute(
+                        f"CREATE INDEX {identificador_sql(f'idx_{self.tabla}_{columna.lower()}')} "
+                        f"ON {tabla} ({identificador_sql(columna)})"
+                    )
+                conexion.execute("COMMIT")
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+        return total
@@ -0,0 +1,107 @@
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Union
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from app.core.interfaces.i_instrumentador import IInstrumentador
+
+def _rss_actual_mb() -> Optional[float]:
+    """Memoria residente actual del proceso (solo Linux, vía /proc)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            paginas = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return paginas * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def _rss_pico_mb() -> Optional[float]:
+    """Pico histórico de memoria residente del proceso."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    return pico / 2**20 if sys.platform == 'darwin' else pico / 2**10
+
+def ruta_reporte(ruta_resultados: str) -> str:
+    """Ruta del reporte de ejecución junto al archivo de resultados."""
+    base = ruta_resultados[:-3] if ruta_resultados.endswith('.gz') else ruta_resultados
+    return os.path.splitext(base)[0] + '_reporte.json'
+
+class Instrumentador(IInstrumentador):
+    """
+    Registra por fase el tiempo de reloj, el tiempo de CPU y la memoria
+    residente (al inicio, al final y el pico del proceso al cerrar la fase),
+    junto con los contadores que reporten los servicios.
+
+    Las fases anidadas se nombran con su ruta completa ('asignacion/segmento/X').
+    El pico de memoria es un máximo acumulado del proceso: una fase elevó el
+    pico si su 'rss_pico_mb' es mayor que el de la fase anterior.
+    """
+    def __init__(self):
+        self.inicio = datetime.now()
+        self._reloj_inicio = time.perf_counter()
+        self.fases: List[Dict[str, Any]] = []
+        self.contadores: Dict[str, Union[int, float]] = {}
+        self._pila: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def fase(self, nombre: str) -> Iterator[None]:
+        ruta = "/".join([f['nombre'] for f in self._pila[-1:]] + [nombre])
+        registro: Dict[str, Any] = {'nombre': ruta, 'contadores': {}}
+        self.fases.append(registro)
+        self._pila.append(registro)
+        rss_inicio = _rss_actual_mb()
+        reloj = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            registro['tiempo_s'] = round(time.perf_counter() - reloj, 6)
+            registro['cpu_s'] = round(time.process_time() - cpu, 6)
+            registro['rss_inicio_mb'] = self._redondear(rss_inicio)
+            registro['rss_fin_mb'] = self._redondear(_rss_actual_mb())
+            registro['rss_pico_mb'] = self._redondear(_rss_pico_mb())
+            self._pila.pop()
+
+    def contar(self, nombre: str, valor: Union[int, float] = 1) -> None:
+        destino = self._pila[-1]['contadores'] if self._pila else self.contadores
+        destino[nombre] = destino.get(nombre, 0) + valor
+
+    def reporte(self) -> Dict[str, Any]:
+        return {
+            'inicio': self.inicio.isoformat(timespec='seconds'),
+            'duracion_total_s': round(time.perf_counter() - self._reloj_inicio, 6),
+            'rss_pico_mb': self._redondear(_rss_pico_mb()),
+            'contadores': self.contadores,
+            'fases': self.fases,
+        }
+
+    def escribir_reporte(self, ruta: str) -> None:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.reporte(), f, ensure_ascii=False, indent=2)
+        print(f"Reporte de ejecución guardado en: {ruta}")
+
+    @staticmethod
+    def _redondear(valor: Optional[float]) -> Optional[float]:
+        return None if valor is None else round(valor, 1)
+
+class InstrumentadorNulo(IInstrumentador):
+    """Instrumentación desactivada: no mide nada ni escribe reporte."""
+    _contexto = nullcontext()
+
+    def fase(self, nombre: str) -> ContextManager:
+        return self._contexto
+
+    def contar(self, nombre: str, valor: Union[int, float] = 1) -> None:
+        pass
+
+    def escribir_reporte(self, ruta: str) -> None:
+        pass
@@ -1,17 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from typing import Tuple, List, Dict, Any
+import sys
+import numpy as np
 import pandas as pd
 from app.core.interfaces.i_lector_datos import ILectorDatos
 from app.core.models.aspirante import Aspirante
 from app.core.models.carrera import Carrera
 from app.core.models.postulacion import Postulacion
 from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import RegistroIncidencias
 from app.core.services.validador_proceso import ValidadorProceso
 
+# Aspirante validado en forma primitiva (se envía entre procesos):
+# (id, antecedentes, evaluacion, condiciones, [(id_carrera, prioridad), ...])
+AspiranteValidado = Tuple[str, float, float, Dict[str, bool], List[Tuple[str, int]]]
+# Incidencias de una fase de la validación, agrupadas por aspirante: [(clave, [incidencia, ...]), ...]
+IncidenciasPorAspirante = List[Tuple[Any, List[Dict[str, Any]]]]
+# Resultado de validar una partición: aspirantes (con su clave de grupo),
+# incidencias de cada fase (truncamiento y depuración) y tabla de rechazos
+ParticionValidada = Tuple[List[Tuple[Any, AspiranteValidado]], List[IncidenciasPorAspirante], pd.DataFrame]
+
+def _validar_particion(normativa: Normativa, df_particion: pd.DataFrame, ids_carrera: np.ndarray) -> ParticionValidada:
+    """
+    Valida los aspirantes de una partición (en el proceso actual o en uno
+    auxiliar). 'normativa' debe tener un colector de incidencias propio: las
+    incidencias y los rechazos se devuelven para combinarlos en el proceso principal.
+    """
+    return LectorDatosCSV(normativa)._validar_postulaciones(df_particion, ids_carrera)
+
 class LectorDatosCSV(ILectorDatos):
-    """Implementación de ILectorDatos que lee desde archivos CSV."""
+    """
+    Implementación de ILectorDatos que lee desde archivos CSV.
+    Con 'procesos' > 1, la matriz de postulaciones se reparte en un pool de
+    procesos por hash de la identificación: cada uno ordena, trunca, depura
+    y arma sus aspirantes. Los aspirantes, las incidencias y los rechazos se
+    combinan por identificación, así que el resultado y el orden de las
+    incidencias son los mismos que en el recorrido secuencial.
+    """
     
-    def __init__(self, normativa: Normativa):
+    def __init__(self, normativa: Normativa, procesos: int = 1):
+        if procesos < 1:
+            raise ValueError(f"procesos debe ser al menos 1 (recibido: {procesos}).")
         self.normativa = normativa
+        self.procesos = procesos
         self.validador = ValidadorProceso(normativa)
         self.ruta_oferta = normativa.rutas['oferta_academica']
         self.ruta_postulaciones = normativa.rutas['matriz_postulaciones']
@@ -20,6 +52,17 @@ class LectorDatosCSV(ILectorDatos):
         self.mapeo_segmentos = normativa.mapeo_segmentos_cupos
 
     def cargar_datos(self) -> Tuple[List[Aspirante], List[Carrera]]:
+        df_oferta, df_postulaciones = self._leer_archivos()
+        
+        carreras = self._crear_carreras(df_oferta)
+        aspirantes = self._crear_aspirantes(df_postulaciones, df_oferta)
+        self.validador.escribir_rechazos()
+        
+        print(f"Carga de datos finalizada: {len(aspirantes)} aspirantes y {len(carreras)} carreras.")
+        return aspirantes, carreras
+
+    def _leer_archivos(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Lee ambos CSV y valida que contengan las columnas del mapeo."""
         try:
             df_oferta = pd.read_csv(self.ruta_oferta)
             df_postulaciones = pd.read_csv(self.ruta_postulaciones)
@@ -29,12 +72,35 @@ class LectorDatosCSV(ILectorDatos):
         
         self.validador.validar_columnas_oferta(df_oferta)
         self.validador.validar_columnas_postulaciones(df_postulaciones)
-        
-        carreras = self._crear_carreras(df_oferta)
-        aspirantes = self._crear_aspirantes(df_postulaciones, df_oferta)
-        
-        print(f"Carga de datos finalizada: {len(aspirantes)} aspirantes y {len(carreras)} carreras.")
-        return aspirantes, carreras
+        return df_oferta, df_postulaciones
+
+    def _columnas_condiciones(self) -> List[str]:
+        """Columnas booleanas del CSV que se guardan en la máscara de condiciones."""
+        return self.normativa.registro_condiciones.columnas
+
+    def _postulacion(
+        self,
+        cache: Dict[Tuple[str, int], Postulacion],
+        id_carrera: str,
+        prioridad: int,
+        mapa_nombres_carrera: Dict[str, str]
+    ) -> Postulacion:
+        """Retorna la instancia compartida de Postulacion para (carrera, prioridad)."""
+        clave = (id_carrera, prioridad)
+        postulacion = cache.get(clave)
+        if postulacion is None:
+            postulacion = Postulacion(
+                id_carrera=sys.intern(id_carrera),
+                prioridad=prioridad,
+                nombre_carrera_debug=mapa_nombres_carrera.get(id_carrera, "CARRERA_DESCONOCIDA")
+            )
+            cache[clave] = postulacion
+        return postulacion
+
+    def _mapa_nombres_carrera(self, df_oferta: pd.DataFrame) -> Dict[str, str]:
+        # Las claves se normalizan a str, igual que Postulacion.id_carrera
+        ids = df_oferta[self.mapeo_oferta['id_carrera']].astype(str)
+        return dict(zip(ids, df_oferta[self.mapeo_oferta['nombre_carrera']]))
 
     def _crear_carreras(self, df_oferta: pd.DataFrame) -> List[Carrera]:
         carreras = []
@@ -52,34 +118,138 @@ class LectorDatosCSV(ILectorDatos):
         return carreras
 
     def _crear_aspirantes(self, df_postulaciones: pd.DataFrame, df_oferta: pd.DataFrame) -> List[Aspirante]:
+        ids_carrera = df_oferta[self.mapeo_oferta['id_carrera']].astype(str).to_numpy(dtype=object)
+        normativa = self._normativa_auxiliar()
+        if self.procesos > 1:
+            validados, fases, rechazos = self._validar_en_paralelo(normativa, df_postulaciones, ids_carrera)
+        else:
+            validados, fases, rechazos = _validar_particion(normativa, df_postulaciones, ids_carrera)
+
+        # Las incidencias se registran por fase y, dentro de cada una, en el orden de los aspirantes
+        for fase in fases:
+            for _, incidencias in fase:
+                for incidencia in incidencias:
+                    self.normativa.reportar_incidencia(
+                        incidencia['mensaje'], incidencia['categoria'], incidencia['id_aspirante']
+                    )
+        self.validador.rechazos = [rechazos] if len(rechazos) else []
+
+        mapa_nombres_carrera = self._mapa_nombres_carrera(df_oferta)
+        registro = self.normativa.registro_condiciones
+        cache_postulaciones: Dict[Tuple[str, int], Postulacion] = {}
+
         aspirantes = []
-        mapa_nombres_carrera = df_oferta.set_index(self.mapeo_oferta['id_carrera'])[self.mapeo_oferta['nombre_carrera']].to_dict()
+        for _, (id_aspirante, antecedentes, evaluacion, condiciones, elecciones) in validados:
+            aspirante = Aspirante.desde_condiciones(
+                id=id_aspirante,
+                puntaje_antecedentes=antecedentes,
+                puntaje_evaluacion=evaluacion,
+                condiciones=condiciones,
+                registro=registro
+            )
+            for id_carrera, prioridad in elecciones:
+                aspirante.postulaciones.append(
+                    self._postulacion(cache_postulaciones, id_carrera, prioridad, mapa_nombres_carrera)
+                )
+            aspirantes.append(aspirante)
+        return aspirantes
+
+    def _validar_postulaciones(self, df_postulaciones: pd.DataFrame, ids_carrera: np.ndarray) -> ParticionValidada:
+        """
+        Orden, truncamiento y revisiones de calidad de las postulaciones (ver
+        ValidadorProceso) y armado de cada aspirante con las filas depuradas.
+        """
+        with self.normativa.incidencias.capturar() as truncamiento:
+            df_postulaciones = self.validador.limpiar_y_validar_postulaciones(df_postulaciones)
+        claves = df_postulaciones[self.mapeo_post['id_aspirante']].drop_duplicates().tolist()
+        with self.normativa.incidencias.capturar() as depuracion:
+            df_postulaciones = self.validador.depurar_postulaciones(df_postulaciones, ids_carrera)
+        fases = [self._agrupar_por_aspirante(incidencias, claves) for incidencias in (truncamiento, depuracion)]
+        return self._validar_grupos(df_postulaciones), fases, self.validador.tabla_rechazos()
+
+    @staticmethod
+    def _agrupar_por_aspirante(incidencias: List[Dict[str, Any]], claves: List[Any]) -> IncidenciasPorAspirante:
+        """
+        Agrupa incidencias reportadas en el orden de los aspirantes; cada grupo
+        lleva la clave del aspirante (su identificación tal como se leyó).
+        """
+        por_texto = {str(clave): clave for clave in claves}
+        grupos: List[Tuple[str, List[Dict[str, Any]]]] = []
+        for incidencia in incidencias:
+            if not grupos or grupos[-1][0] != incidencia['id_aspirante']:
+                grupos.append((incidencia['id_aspirante'], []))
+            grupos[-1][1].append(incidencia)
+        return [(por_texto[id_aspirante], grupo) for id_aspirante, grupo in grupos]
+
+    def _validar_grupos(self, df_postulaciones: pd.DataFrame) -> List[Tuple[Any, AspiranteValidado]]:
+        """
+        Arma cada aspirante (grupo de filas por identificación, ya ordenadas,
+        truncadas y depuradas) en forma primitiva, junto con la clave del grupo.
+        """
         id_aspirante_col = self.mapeo_post['id_aspirante']
+        columnas_condiciones = self._columnas_condiciones()
+        validados = []
 
         for id_aspirante, grupo in df_postulaciones.groupby(id_aspirante_col):
-            grupo_validado = self.validador.limpiar_y_validar_postulacion_aspirante(grupo)
-            fila_base = grupo_validado.iloc[0]
+            fila_base = grupo.iloc[0]
             
             condiciones = {}
-            for key_mapeo, col_csv in self.mapeo_post.items():
-                if key_mapeo not in ['id_aspirante', 'id_carrera', 'prioridad', 'antecedentes', 'evaluacion']:
-                    condiciones[col_csv] = self.validador.str_a_bool(fila_base.get(col_csv, False))
+            for col_csv in columnas_condiciones:
+                condiciones[col_csv] = self.validador.str_a_bool(fila_base.get(col_csv, False))
             
-            aspirante = Aspirante(
-                id=str(id_aspirante),
-                puntaje_antecedentes=float(fila_base[self.mapeo_post['antecedentes']]),
-                puntaje_evaluacion=float(fila_base[self.mapeo_post['evaluacion']]),
-                condiciones=condiciones
+            elecciones = [
+                (str(fila_postulacion[self.mapeo_post['id_carrera']]), int(fila_postulacion[self.mapeo_post['prioridad']]))
+                for _, fila_postulacion in grupo.iterrows()
+            ]
+            validados.append((id_aspirante, (
+                str(id_aspirante),
+                float(fila_base[self.mapeo_post['antecedentes']]),
+                float(fila_base[self.mapeo_post['evaluacion']]),
+                condiciones,
+                elecciones
+            )))
+        return validados
+
+    def _validar_en_paralelo(
+        self,
+        normativa: Normativa,
+        df_postulaciones: pd.DataFrame,
+        ids_carrera: np.ndarray
+    ) -> ParticionValidada:
+        """
+        Reparte los aspirantes en 'procesos' particiones por hash de la
+        identificación (las filas de un aspirante quedan juntas) y las valida
+        en un pool. Los aspirantes y los grupos de incidencias de cada fase se
+        reordenan por clave, que es el orden en que los recorre el camino
+        secuencial; los rechazos, por identificación (orden estable).
+        """
+        ids = df_postulaciones[self.mapeo_post['id_aspirante']]
+        particion = pd.util.hash_pandas_object(ids, index=False).to_numpy() % np.uint64(self.procesos)
+        particiones = [df_postulaciones[particion == p] for p in range(self.procesos)]
+
+        with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+            futuros = [pool.submit(_validar_particion, normativa, df, ids_carrera) for df in particiones if len(df)]
+            resultados = [futuro.result() for futuro in futuros]
+
+        def por_clave(elementos: List[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+            orden = pd.Index([clave for clave, _ in elementos]).argsort()
+            return [elementos[i] for i in orden]
+
+        validados = por_clave([v for r in resultados for v in r[0]])
+        fases = [por_clave([g for r in resultados for g in r[1][f]]) for f in range(len(resultados[0][1]))] if resultados else []
+        tablas = [r[2] for r in resultados if len(r[2])]
+        if len(tablas) > 1:
+            rechazos = pd.concat(tablas, ignore_index=True).sort_values(
+                self.mapeo_post['id_aspirante'], kind='stable', ignore_index=True
             )
-            
-            for _, fila_postulacion in grupo_validado.iterrows():
-                id_carrera = str(fila_postulacion[self.mapeo_post['id_carrera']])
-                aspirante.postulaciones.append(
-                    Postulacion(
-                        id_carrera=id_carrera,
-                        prioridad=int(fila_postulacion[self.mapeo_post['prioridad']]),
-                        nombre_carrera_debug=mapa_nombres_carrera.get(id_carrera, "CARRERA_DESCONOCIDA")
-                    )
-                )
-            aspirantes.append(aspirante)
-        return aspirantes
+        else:
+            rechazos = tablas[0] if tablas else self.validador.tabla_rechazos()
+        return validados, fases, rechazos
+
+    def _normativa_auxiliar(self) -> Normativa:
+        """
+        Copia de la normativa con un colector de incidencias propio, sin
+        archivos abiertos ni log (las incidencias se reportan luego en la normativa
+        principal, que es la que omite las repetidas).
+        """
+        return replace(self.normativa, log_reporte=None, incidencias=RegistroIncidencias(modo='resumen', max_vistas=0))
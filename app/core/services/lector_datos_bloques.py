@@ -0,0 +1,125 @@
+from typing import List, Optional
+import sys
+import numpy as np
+import pandas as pd
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+from app.core.services.cache_entradas import CacheEntradas
+
+class LectorDatosCSVPorBloques(LectorDatosCSVColumnar):
+    """
+    Variante columnar que lee la matriz de postulaciones por bloques de
+    'tamano_bloque' filas con tipos explícitos, de modo que la memoria de
+    lectura depende del tamaño del bloque y no del archivo.
+
+    Las filas de un aspirante deben ser contiguas en el archivo (pueden
+    quedar partidas entre dos bloques). Identificaciones y puntajes se
+    infieren en cada bloque como en la carga completa (p. ej. '001' -> 1).
+    """
+    def __init__(
+        self,
+        normativa: Normativa,
+        tamano_bloque: int = 200_000,
+        cache: Optional[CacheEntradas] = None
+    ):
+        super().__init__(normativa, cache)
+        if tamano_bloque <= 0:
+            raise ValueError(f"tamano_bloque debe ser positivo (recibido: {tamano_bloque}).")
+        self.tamano_bloque = tamano_bloque
+
+    def cargar_columnas(self) -> DatosColumnares:
+        try:
+            df_oferta = pd.read_csv(self.ruta_oferta)
+            encabezado = pd.read_csv(self.ruta_postulaciones, nrows=0)
+        except FileNotFoundError as e:
+            print(f"Error fatal: No se encontró el archivo {e.filename}")
+            raise
+
+        self.validador.validar_columnas_oferta(df_oferta)
+        self.validador.validar_columnas_postulaciones(encabezado)
+
+        datos = self._columnas_oferta(df_oferta)
+        parciales: List[DatosColumnares] = []
+        id_col = self.mapeo_post['id_aspirante']
+        pendiente: Optional[pd.DataFrame] = None
+
+        lector = pd.read_csv(
+            self.ruta_postulaciones,
+            usecols=list(self.mapeo_post.values()),
+            dtype=self.validador.tipos_columnas_postulaciones(),
+            chunksize=self.tamano_bloque
+        )
+        with lector:
+            for bloque in lector:
+                if pendiente is not None:
+                    bloque = pd.concat([pendiente, bloque], ignore_index=True)
+                # Las filas del último aspirante pueden continuar en el siguiente bloque
+                es_ultimo = (bloque[id_col] == bloque[id_col].iloc[-1]).to_numpy()
+                pendiente = bloque[es_ultimo]
+                completos = bloque[~es_ultimo]
+                if len(completos):
+                    parciales.append(self._columnas_bloque(datos, completos))
+        if pendiente is not None and len(pendiente):
+            parciales.append(self._columnas_bloque(datos, pendiente))
+
+        return self._unir_parciales(datos, parciales)
+
+    def _columnas_bloque(self, datos_oferta: DatosColumnares, bloque: pd.DataFrame) -> DatosColumnares:
+        parcial = self._columnas_postulaciones(datos_oferta, bloque)
+        # Se internan por bloque para no acumular un str por fila hasta el final
+        parcial.postulacion_carrera = self._internar(parcial.postulacion_carrera)
+        return parcial
+
+    def _unir_parciales(self, datos: DatosColumnares, parciales: List[DatosColumnares]) -> DatosColumnares:
+        """Concatena los bloques y ordena a los aspirantes con _orden_aspirantes."""
+        if not parciales:
+            return datos
+
+        ids = np.concatenate([p.ids_aspirante for p in parciales])
+        largos = np.concatenate([np.diff(p.inicio_postulaciones) for p in parciales])
+        carreras = np.concatenate([p.postulacion_carrera for p in parciales])
+        prioridades = np.concatenate([p.postulacion_prioridad for p in parciales])
+
+        orden = self._orden_aspirantes(ids)
+        inicios_previos = np.concatenate([[0], np.cumsum(largos)[:-1]]).astype(np.int64)
+        largos_ordenados = largos[orden]
+        inicio_postulaciones = np.concatenate([[0], np.cumsum(largos_ordenados)]).astype(np.int64)
+        filas = np.repeat(inicios_previos[orden] - inicio_postulaciones[:-1], largos_ordenados)
+        filas += np.arange(inicio_postulaciones[-1])
+
+        datos.ids_aspirante = ids[orden]
+        datos.antecedentes = np.concatenate([p.antecedentes for p in parciales])[orden]
+        datos.evaluacion = np.concatenate([p.evaluacion for p in parciales])[orden]
+        datos.condiciones = {
+            col: np.concatenate([p.condiciones[col] for p in parciales])[orden]
+            for col in datos.condiciones
+        }
+        datos.inicio_postulaciones = inicio_postulaciones
+        datos.postulacion_carrera = carreras[filas]
+        datos.postulacion_prioridad = prioridades[filas]
+        return datos
+
+    def _orden_aspirantes(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Orden final de los aspirantes leídos: por identificación, de modo que
+        no dependa del tamaño de bloque. Como en la carga completa, que infiere
+        el tipo de la columna, las identificaciones se ordenan por valor si
+        todas son numéricas y como texto en caso contrario.
+        """
+        serie = pd.Series(ids)
+        if serie.duplicated().any():
+            raise ValueError(
+                "Archivo de postulaciones inválido: las filas de un mismo aspirante no son contiguas. "
+                f"Ordene el archivo por {self.mapeo_post['id_aspirante']} o use modo_carga 'columnar'."
+            )
+        numericos = pd.to_numeric(serie, errors='coerce')
+        if not numericos.isna().any():
+            return np.argsort(numericos.to_numpy(), kind='stable')
+        return np.argsort(ids, kind='stable')
+
+    def _internar(self, valores: np.ndarray) -> np.ndarray:
+        """Comparte un único objeto str por OFA_ID distinto."""
+        codigos, unicos = pd.factorize(valores)
+        unicos = np.array([sys.intern(str(u)) for u in unicos], dtype=object)
+        return unicos[codigos]
@@ -0,0 +1,168 @@
+from dataclasses import replace
+from typing import Tuple, List, Dict, Optional
+import numpy as np
+import pandas as pd
+from app.core.services.lector_datos import LectorDatosCSV
+from app.core.models.aspirante import Aspirante
+from app.core.models.carrera import Carrera
+from app.core.models.postulacion import Postulacion
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+from app.core.services.cache_entradas import CacheEntradas
+
+class LectorDatosCSVColumnar(LectorDatosCSV):
+    """
+    Variante de LectorDatosCSV que valida y transforma la matriz de
+    postulaciones en una sola pasada vectorizada (sin groupby/iterrows)
+    y construye los modelos a partir de segmentos de arreglos.
+    Con una CacheEntradas habilitada, las entradas validadas se reutilizan
+    entre ejecuciones mientras los CSV y el mapeo no cambien.
+    """
+    # Las filas del origen llegan ya ordenadas por (aspirante, prioridad)
+    postulaciones_ordenadas = False
+
+    def __init__(self, normativa: Normativa, cache: Optional[CacheEntradas] = None):
+        super().__init__(normativa)
+        self.cache = cache
+
+    def cargar_datos(self) -> Tuple[List[Aspirante], List[Carrera]]:
+        return self.construir_modelos(self.cargar_columnas_validadas())
+
+    def construir_modelos(self, datos: DatosColumnares) -> Tuple[List[Aspirante], List[Carrera]]:
+        carreras = self.construir_carreras(datos)
+        aspirantes = self.construir_aspirantes(datos)
+
+        print(f"Carga de datos finalizada: {len(aspirantes)} aspirantes y {len(carreras)} carreras.")
+        return aspirantes, carreras
+
+    def cargar_columnas_validadas(self) -> DatosColumnares:
+        """Entradas validadas en arreglos, desde la caché cuando está disponible."""
+        if self.cache is None or not self.cache.habilitada:
+            datos = self.cargar_columnas()
+            self.validador.escribir_rechazos()
+            return datos
+
+        clave = self.cache.clave(self.normativa, type(self).__name__)
+        entrada = self.cache.obtener(clave)
+        if entrada is not None:
+            print(f"Entradas cargadas desde caché ({clave}).")
+            # Las incidencias y los rechazos de la validación original se vuelven a reportar
+            for incidencia in entrada['incidencias']:
+                self.normativa.reportar_incidencia(
+                    incidencia['mensaje'], incidencia['categoria'], incidencia['id_aspirante']
+                )
+            self.validador.escribir_rechazos(entrada['rechazos'])
+            return entrada['datos']
+
+        with self.normativa.incidencias.capturar() as incidencias:
+            datos = self.cargar_columnas()
+        rechazos = self.validador.tabla_rechazos()
+        self.cache.guardar(clave, datos, incidencias, rechazos)
+        self.validador.escribir_rechazos(rechazos)
+        return datos
+
+    def cargar_columnas(self) -> DatosColumnares:
+        """Lee, valida y convierte las entradas a DatosColumnares."""
+        df_oferta, df_postulaciones = self._leer_archivos()
+        return self._columnas_desde_frames(df_oferta, df_postulaciones)
+
+    def _columnas_desde_frames(self, df_oferta: pd.DataFrame, df_postulaciones: pd.DataFrame) -> DatosColumnares:
+        return self._columnas_postulaciones(self._columnas_oferta(df_oferta), df_postulaciones)
+
+    def cargar_postulaciones(self, ruta: str, datos_oferta: DatosColumnares) -> DatosColumnares:
+        """
+        Lee y valida un archivo con el formato de la matriz de postulaciones
+        (p. ej. correcciones de unos pocos aspirantes) sobre una oferta ya cargada.
+        """
+        try:
+            df_postulaciones = pd.read_csv(ruta)
+        except FileNotFoundError as e:
+            print(f"Error fatal: No se encontró el archivo {e.filename}")
+            raise
+        self.validador.validar_columnas_postulaciones(df_postulaciones)
+        return self._columnas_postulaciones(datos_oferta, df_postulaciones)
+
+    def _columnas_oferta(self, df_oferta: pd.DataFrame) -> DatosColumnares:
+        """Oferta académica en arreglos; los campos de aspirantes quedan vacíos."""
+        return DatosColumnares(
+            ids_carrera=df_oferta[self.mapeo_oferta['id_carrera']].astype(str).to_numpy(dtype=object),
+            nombres_carrera=df_oferta[self.mapeo_oferta['nombre_carrera']].to_numpy(dtype=object),
+            cupos=df_oferta[self.mapeo_segmentos].to_numpy().astype(np.int64),
+            segmentos=list(self.mapeo_segmentos),
+            condiciones={col: np.empty(0, dtype=bool) for col in self._columnas_condiciones()}
+        )
+
+    def _columnas_postulaciones(self, datos_oferta: DatosColumnares, df_postulaciones: pd.DataFrame) -> DatosColumnares:
+        """Completa 'datos_oferta' con los aspirantes y postulaciones de 'df_postulaciones'."""
+        # Coerción, orden y truncamiento sobre la matriz completa; luego, revisiones de calidad
+        df = self.validador.limpiar_y_validar_postulaciones(df_postulaciones, self.postulaciones_ordenadas)
+        df = self.validador.depurar_postulaciones(df, datos_oferta.ids_carrera)
+        id_col = self.mapeo_post['id_aspirante']
+
+        # Cada aspirante empieza donde cambia la identificación (las filas ya están ordenadas)
+        ids = df[id_col]
+        es_inicio = ids.ne(ids.shift()).to_numpy()
+        inicios = np.flatnonzero(es_inicio)
+        inicio_postulaciones = np.append(inicios, len(df)).astype(np.int64)
+
+        # La fila de menor prioridad aporta los datos personales del aspirante
+        df_base = df.iloc[inicios]
+        condiciones = {
+            col_csv: self.validador.serie_a_bool(df_base[col_csv])
+            for col_csv in self._columnas_condiciones()
+        }
+
+        return replace(
+            datos_oferta,
+            ids_aspirante=df_base[id_col].astype(str).to_numpy(dtype=object),
+            antecedentes=df_base[self.mapeo_post['antecedentes']].to_numpy(dtype=np.float64),
+            evaluacion=df_base[self.mapeo_post['evaluacion']].to_numpy(dtype=np.float64),
+            condiciones=condiciones,
+            inicio_postulaciones=inicio_postulaciones,
+            postulacion_carrera=df[self.mapeo_post['id_carrera']].astype(str).to_numpy(dtype=object),
+            postulacion_prioridad=df[self.mapeo_post['prioridad']].to_numpy().astype(np.int64),
+        )
+
+    def construir_carreras(self, datos: DatosColumnares) -> List[Carrera]:
+        carreras = []
+        for id_carrera, nombre, cupos_fila in zip(datos.ids_carrera, datos.nombres_carrera, datos.cupos.tolist()):
+            carreras.append(Carrera(
+                id=id_carrera,
+                nombre=nombre,
+                cupos_segmentados=dict(zip(datos.segmentos, cupos_fila))
+            ))
+        return carreras
+
+    def construir_aspirantes(self, datos: DatosColumnares) -> List[Aspirante]:
+        mapa_nombres_carrera = dict(zip(datos.ids_carrera, datos.nombres_carrera))
+        registro = self.normativa.registro_condiciones
+
+        # Máscara de condiciones calculada para toda la cohorte; las máscaras
+        # repetidas comparten el mismo objeto int
+        mascaras = np.zeros(datos.num_aspirantes, dtype=np.int64)
+        for columna, valores in datos.condiciones.items():
+            mascaras |= valores.astype(np.int64) << registro.bit(columna)
+        mascaras_compartidas: Dict[int, int] = {}
+        mascaras_lista = [mascaras_compartidas.setdefault(m, m) for m in mascaras.tolist()]
+
+        # Una Postulacion por (carrera, prioridad) distinta, compartida entre aspirantes
+        cache_postulaciones: Dict[Tuple[str, int], Postulacion] = {}
+        postulaciones = [
+            self._postulacion(cache_postulaciones, id_carrera, prioridad, mapa_nombres_carrera)
+            for id_carrera, prioridad in zip(datos.postulacion_carrera.tolist(), datos.postulacion_prioridad.tolist())
+        ]
+        inicio = datos.inicio_postulaciones.tolist()
+
+        aspirantes = []
+        for k, (id_aspirante, antecedentes, evaluacion) in enumerate(zip(
+            datos.ids_aspirante.tolist(), datos.antecedentes.tolist(), datos.evaluacion.tolist()
+        )):
+            aspirantes.append(Aspirante(
+                id=id_aspirante,
+                puntaje_antecedentes=antecedentes,
+                puntaje_evaluacion=evaluacion,
+                mascara_condiciones=mascaras_lista[k],
+                registro=registro,
+                postulaciones=postulaciones[inicio[k]:inicio[k + 1]]
+            ))
+        return aspirantes
@@ -0,0 +1,106 @@
+from contextlib import closing
+from typing import List, Optional
+from urllib.request import pathname2url
+import errno
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+from app.core.services.lector_datos_bloques import LectorDatosCSVPorBloques
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+
+def identificador_sql(nombre: str) -> str:
+    """Nombre de tabla o columna entre comillas dobles para SQLite."""
+    return '"' + nombre.replace('"', '""') + '"'
+
+class LectorDatosSQLite(LectorDatosCSVPorBloques):
+    """
+    Lee la oferta académica y la matriz de postulaciones desde tablas de una
+    base SQLite (columnas con los mismos nombres que en mapeo_columnas).
+
+    La consulta de postulaciones las entrega ordenadas por (aspirante,
+    prioridad), por lo que no se ordenan en memoria, y se recorre con el
+    cursor en lotes de 'tamano_bloque' filas. Un índice sobre
+    (identificación, prioridad) evita que SQLite ordene al consultar.
+    La validación y las incidencias son las de la carga columnar.
+    """
+    postulaciones_ordenadas = True
+
+    def __init__(
+        self,
+        normativa: Normativa,
+        tabla_oferta: str = 'oferta_academica',
+        tabla_postulaciones: str = 'matriz_postulaciones',
+        tamano_bloque: int = 200_000
+    ):
+        super().__init__(normativa, tamano_bloque)
+        self.ruta_base_datos = normativa.rutas['base_datos_entradas']
+        self.tabla_oferta = tabla_oferta
+        self.tabla_postulaciones = tabla_postulaciones
+
+    def validar_encabezados(self) -> None:
+        """Valida las columnas de ambas tablas sin leer sus filas."""
+        with closing(self._conectar()) as conexion:
+            self.validador.validar_columnas_oferta(self._encabezado(conexion, self.tabla_oferta))
+            self.validador.validar_columnas_postulaciones(self._encabezado(conexion, self.tabla_postulaciones))
+
+    def cargar_columnas(self) -> DatosColumnares:
+        with closing(self._conectar()) as conexion:
+            df_oferta = pd.read_sql_query(f"SELECT * FROM {identificador_sql(self.tabla_oferta)}", conexion)
+            self.validador.validar_columnas_oferta(df_oferta)
+            self.validador.validar_columnas_postulaciones(self._encabezado(conexion, self.tabla_postulaciones))
+            datos = self._columnas_oferta(df_oferta)
+            parciales = self._leer_postulaciones(conexion, datos)
+        return self._unir_parciales(datos, parciales)
+
+    def _leer_postulaciones(self, conexion: sqlite3.Connection, datos: DatosColumnares) -> List[DatosColumnares]:
+        columnas = list(self.mapeo_post.values())
+        id_col = identificador_sql(self.mapeo_post['id_aspirante'])
+        prioridad_col = identificador_sql(self.mapeo_post['prioridad'])
+        # rowid desempata prioridades repetidas en el orden de inserción, como el orden estable de la carga CSV
+        cursor = conexion.execute(
+            f"SELECT {', '.join(identificador_sql(c) for c in columnas)} "
+            f"FROM {identificador_sql(self.tabla_postulaciones)} "
+            f"WHERE {id_col} IS NOT NULL ORDER BY {id_col}, {prioridad_col}, rowid"
+        )
+
+        parciales: List[DatosColumnares] = []
+        id_aspirante = self.mapeo_post['id_aspirante']
+        pendiente: Optional[pd.DataFrame] = None
+        while True:
+            filas = cursor.fetchmany(self.tamano_bloque)
+            if not filas:
+                break
+            # Sin inferencia de tipos por columna: la validación convierte lo que necesita
+            bloque = pd.DataFrame(filas, columns=columnas, dtype=object)
+            if pendiente is not None:
+                bloque = pd.concat([pendiente, bloque], ignore_index=True)
+            # Las filas del último aspirante pueden continuar en el siguiente lote
+            es_ultimo = (bloque[id_aspirante] == bloque[id_aspirante].iloc[-1]).to_numpy()
+            pendiente = bloque[es_ultimo]
+            completos = bloque[~es_ultimo]
+            if len(completos):
+                parciales.append(self._columnas_bloque(datos, completos))
+        if pendiente is not None and len(pendiente):
+            parciales.append(self._columnas_bloque(datos, pendiente))
+        return parciales
+
+    def _orden_aspirantes(self, ids: np.ndarray) -> np.ndarray:
+        # La consulta ya entrega a los aspirantes en orden
+        return np.arange(len(ids))
+
+    def _conectar(self) -> sqlite3.Connection:
+        if not os.path.exists(self.ruta_base_datos):
+            print(f"Error fatal: No se encontró el archivo {self.ruta_base_datos}")
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), self.ruta_base_datos)
+        # Solo lectura: la base de entradas no se modifica
+        uri = f"file:{pathname2url(os.path.abspath(self.ruta_base_datos))}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    @staticmethod
+    def _encabezado(conexion: sqlite3.Connection, tabla: str) -> pd.DataFrame:
+        columnas = [fila[1] for fila in conexion.execute(f"PRAGMA table_info({identificador_sql(tabla)})")]
+        if not columnas:
+            raise ValueError(f"La base de datos no contiene la tabla '{tabla}'.")
+        return pd.DataFrame(columns=columnas)
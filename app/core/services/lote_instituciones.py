@@ -0,0 +1,214 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, List, Tuple
+import contextlib
+import copy
+import json
+import os
+import time
+import traceback
+import pandas as pd
+from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import RegistroIncidencias
+
+# Claves admitidas por institución en el manifiesto
+CLAVES_OBLIGATORIAS = ('id_ies',)
+CLAVES_OPCIONALES = ('periodo', 'salida')
+# Entradas obligatorias de cada institución: la base SQLite con modo_carga 'sqlite', los CSV en los demás modos
+ENTRADAS_CSV = ('oferta_academica', 'matriz_postulaciones')
+ENTRADAS_SQLITE = ('base_datos_entradas',)
+
+# Salidas de config.json que se escriben en el directorio de cada institución
+RUTAS_POR_INSTITUCION = (
+    'resultados_asignacion', 'incidencias', 'rechazos', 'estado_asignacion', 'indice_cortes', 'puntos_control'
+)
+
+def _ejecutar_institucion(config: Dict[str, Any], normativa: Normativa) -> Dict[str, Any]:
+    """
+    Ejecuta el proceso completo de una institución con el cableado del
+    contenedor, sustituyendo la configuración y la normativa por las de la
+    institución. La salida de consola (y los errores) quedan en 'proceso.log'
+    de su directorio.
+    """
+    # El contenedor es la raíz de composición; se importa aquí porque también construye este servicio
+    from dependency_injector import providers
+    from app.core.container import Container
+
+    rutas = config['rutas_archivos']
+    ruta_log = os.path.join(os.path.dirname(rutas['resultados_asignacion']), 'proceso.log')
+    inicio = time.perf_counter()
+    resumen: Dict[str, Any] = {'id_ies': normativa.id_ies, 'periodo': normativa.periodo, 'log': ruta_log}
+    with open(ruta_log, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            container = Container()
+            container.config.override(providers.Object(config))
+            container.normativa.override(providers.Object(normativa))
+            exito = container.motor().ejecutar_proceso()
+            instrumentador = container.instrumentador()
+            contadores = dict(instrumentador.contadores)
+            for fase in instrumentador.fases:
+                for nombre, valor in fase['contadores'].items():
+                    contadores.setdefault(nombre, valor)
+            resumen.update(exito=exito, contadores=contadores)
+        except Exception:
+            traceback.print_exc()
+            resumen.update(exito=False, contadores={})
+    resumen['duracion_s'] = round(time.perf_counter() - inicio, 3)
+    return resumen
+
+class ServicioLoteInstituciones:
+    """
+    Ejecuta el proceso completo para varias instituciones (IES) en una sola
+    invocación, a partir de un manifiesto JSON con los archivos de entrada de
+    cada una.
+
+    Cada institución usa la normativa ya cargada con sus propias rutas,
+    registro de incidencias, 'id_ies' y 'periodo', y escribe sus resultados,
+    incidencias, índice de cortes y reporte en su directorio de salida. Las
+    instituciones se reparten en un pool de 'procesos' procesos, que heredan
+    los módulos ya importados; al final se escribe un resumen conjunto.
+    """
+    def __init__(self, normativa: Normativa, config: Dict[str, Any], procesos: int = 0):
+        self.normativa = normativa
+        self.config = config
+        # 0 usa todos los núcleos disponibles; 1 ejecuta en este proceso
+        self.procesos = procesos or os.cpu_count() or 1
+        modo_carga = config['parametros_proceso']['modo_carga']
+        self.claves_entrada = ENTRADAS_SQLITE if modo_carga == 'sqlite' else ENTRADAS_CSV
+
+    def ejecutar(self, ruta_manifiesto: str) -> bool:
+        rutas = self.normativa.rutas
+        try:
+            instituciones = self.cargar_manifiesto(ruta_manifiesto)
+            trabajos = [self._preparar(institucion) for institucion in instituciones]
+            procesos = min(self.procesos, len(trabajos))
+            print(f"\n[PASO 1] Ejecutando {len(trabajos)} institución(es) en {procesos} proceso(s)...")
+            resumenes = self._ejecutar_trabajos(trabajos, procesos)
+
+            print("\n[PASO 2] Escribiendo resumen del lote...")
+            tabla = self._tabla_resumen(resumenes)
+            tabla.to_csv(rutas['resumen_lote'], index=False)
+            print(tabla.to_string(index=False))
+            print(f"\nResumen del lote guardado en: {rutas['resumen_lote']}")
+        except Exception as e:
+            print(f"\n[ERROR FATAL] El lote falló: {e}")
+            traceback.print_exc()
+            return False
+
+        fallidas = [r['id_ies'] for r in resumenes if not r['exito']]
+        if fallidas:
+            print(f"\n[LOTE CON ERRORES] Instituciones fallidas: {fallidas} (ver proceso.log de cada una)")
+            return False
+        print("\n[PROCESO FINALIZADO] El lote se completó exitosamente.")
+        return True
+
+    def cargar_manifiesto(self, ruta: str) -> List[Dict[str, str]]:
+        """
+        Lee una lista JSON de instituciones {'id_ies', 'oferta_academica',
+        'matriz_postulaciones'} con 'periodo' (por omisión, el de config.json)
+        y 'salida' (por omisión, '<directorio_lote>/<id_ies>') opcionales.
+        Con modo_carga 'sqlite', cada institución indica su base de entradas
+        ('base_datos_entradas') en lugar de los CSV.
+        """
+        with open(ruta, 'r', encoding='utf-8') as f:
+            definiciones = json.load(f)
+        if not isinstance(definiciones, list) or not definiciones:
+            raise ValueError(f"El manifiesto debe contener una lista JSON no vacía de instituciones: {ruta}")
+
+        instituciones = []
+        for i, definicion in enumerate(definiciones):
+            faltantes = [clave for clave in CLAVES_OBLIGATORIAS + self.claves_entrada if not definicion.get(clave)]
+            if faltantes:
+                raise ValueError(
+                    f"Institución {i + 1} del manifiesto: faltan las claves {faltantes} "
+                    f"(modo_carga '{self.config['parametros_proceso']['modo_carga']}')."
+                )
+            desconocidas = set(definicion) - set(CLAVES_OBLIGATORIAS + CLAVES_OPCIONALES + self.claves_entrada)
+            if desconocidas:
+                raise ValueError(
+                    f"Institución {definicion['id_ies']}: claves no soportadas {sorted(desconocidas)} "
+                    f"con modo_carga '{self.config['parametros_proceso']['modo_carga']}'."
+                )
+            id_ies = str(definicion['id_ies'])
+            if id_ies in (inst['id_ies'] for inst in instituciones):
+                raise ValueError(f"IES repetida en el manifiesto: '{id_ies}'.")
+            instituciones.append({
+                'id_ies': id_ies,
+                'periodo': str(definicion.get('periodo') or self.normativa.periodo),
+                **{clave: definicion[clave] for clave in self.claves_entrada},
+                'salida': definicion.get('salida') or os.path.join(self.normativa.rutas['directorio_lote'], id_ies),
+            })
+        return instituciones
+
+    def _preparar(self, institucion: Dict[str, str]) -> Tuple[Dict[str, Any], Normativa]:
+        """Configuración y normativa de una institución, derivadas de las cargadas."""
+        os.makedirs(institucion['salida'], exist_ok=True)
+        rutas = dict(self.normativa.rutas)
+        for clave in self.claves_entrada:
+            rutas[clave] = institucion[clave]
+        for clave in RUTAS_POR_INSTITUCION:
+            rutas[clave] = os.path.join(institucion['salida'], os.path.basename(rutas[clave]))
+
+        config = copy.deepcopy(self.config)
+        config['rutas_archivos'] = rutas
+        config['parametros_proceso'].update({
+            'periodo': institucion['periodo'],
+            'id_ies': institucion['id_ies'],
+            # El resumen del lote se arma con los contadores de cada ejecución
+            'instrumentacion': 'activada',
+        })
+        if self.procesos > 1:
+            # Las instituciones ya se reparten entre procesos
+            config['parametros_proceso']['procesos_asignacion'] = 1
+        normativa = replace(
+            self.normativa,
+            rutas=rutas,
+            log_reporte=None,
+            incidencias=RegistroIncidencias(modo=self.normativa.incidencias.modo, ruta=rutas['incidencias']),
+            periodo=institucion['periodo'],
+            id_ies=institucion['id_ies'],
+        )
+        return config, normativa
+
+    def _ejecutar_trabajos(self, trabajos: List[Tuple[Dict[str, Any], Normativa]], procesos: int) -> List[Dict[str, Any]]:
+        if procesos <= 1:
+            resumenes = []
+            for config, normativa in trabajos:
+                resumenes.append(_ejecutar_institucion(config, normativa))
+                self._informar(resumenes[-1])
+            return resumenes
+
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [pool.submit(_ejecutar_institucion, config, normativa) for config, normativa in trabajos]
+            resumenes = []
+            for futuro in futuros:
+                resumenes.append(futuro.result())
+                self._informar(resumenes[-1])
+            return resumenes
+
+    def _informar(self, resumen: Dict[str, Any]) -> None:
+        estado = "OK" if resumen['exito'] else "ERROR"
+        print(f"  {resumen['id_ies']}: {estado} en {resumen['duracion_s']:.2f} s")
+
+    def _tabla_resumen(self, resumenes: List[Dict[str, Any]]) -> pd.DataFrame:
+        filas = []
+        for resumen in resumenes:
+            contadores = resumen['contadores']
+            aspirantes = contadores.get('aspirantes')
+            asignados = contadores.get('cupos_asignados')
+            filas.append({
+                'IES_ID': resumen['id_ies'],
+                'PERIODO': resumen['periodo'],
+                'ESTADO': 'OK' if resumen['exito'] else 'ERROR',
+                'ASPIRANTES': aspirantes,
+                'CARRERAS': contadores.get('carreras'),
+                'ASIGNADOS': asignados,
+                'SIN_CUPO': None if aspirantes is None or asignados is None else aspirantes - asignados,
+                'INCIDENCIAS': contadores.get('incidencias'),
+                'DURACION_S': resumen['duracion_s'],
+                'LOG': resumen['log'],
+            })
+        tabla = pd.DataFrame(filas)
+        for columna in ('ASPIRANTES', 'CARRERAS', 'ASIGNADOS', 'SIN_CUPO', 'INCIDENCIAS'):
+            tabla[columna] = tabla[columna].astype('Int64')
+        return tabla
@@ -0,0 +1,288 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import io
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from app.core.models.aspirante import Aspirante
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import RegistroIncidencias
+from app.core.services.almacen_estado import huella_normativa
+from app.core.services.cache_entradas import arreglos_columnares, columnas_desde_arreglos
+from app.core.services.calculador_puntajes import calcular_puntajes
+
+# Se incrementa cuando cambia el contenido de los registros
+VERSION_PUNTOS_CONTROL = 2
+
+# Cabecera de cada registro: marca, tipo, largo del contenido y su CRC32
+MARCA = b'PCTL'
+CABECERA = struct.Struct('<4sBQI')
+
+# Tipos de registro
+REGISTRO_INICIO = 1
+REGISTRO_CARGA = 2
+REGISTRO_PUNTAJES = 3
+REGISTRO_SEGMENTO = 4
+
+# Entradas cuya modificación invalida los puntos de control
+RUTAS_ENTRADA = ('oferta_academica', 'matriz_postulaciones', 'base_datos_entradas')
+
+Registro = Tuple[Dict[str, np.ndarray], Dict[str, Any]]
+
+def huella_ejecucion(normativa: Normativa, lector: Any, estrategia: Any) -> str:
+    """Resumen de la normativa, las entradas y las implementaciones de una ejecución."""
+    def huella_archivo(clave: str) -> Optional[List[Any]]:
+        ruta = normativa.rutas.get(clave)
+        if not ruta or not os.path.exists(ruta):
+            return None
+        info = os.stat(ruta)
+        return [os.path.abspath(ruta), info.st_size, info.st_mtime_ns]
+
+    descriptor = {
+        'version': VERSION_PUNTOS_CONTROL,
+        'normativa': huella_normativa(normativa),
+        'mapeo_oferta': normativa.mapeo_columnas_oferta,
+        'rango_puntajes': normativa.rango_puntajes,
+        'puntajes_invalidos': normativa.puntajes_invalidos,
+        'lector': type(lector).__name__,
+        'estrategia': type(estrategia).__name__,
+        'entradas': {clave: huella_archivo(clave) for clave in RUTAS_ENTRADA},
+    }
+    texto = json.dumps(descriptor, sort_keys=True)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:32]
+
+class DiarioPuntosControl:
+    """
+    Puntos de control de una ejecución en un único archivo binario en el que
+    solo se agregan registros: tras la carga (entradas validadas), tras el
+    cálculo de puntajes (puntajes y orden de mérito) y tras cada segmento
+    (aspirantes asignados en él con su carrera y posición, y los cupos que
+    le quedan a cada carrera en el segmento; los aspirantes sin cupo son el
+    resto). Cada registro guarda también las incidencias que produjo.
+
+    Cada registro lleva su largo y un CRC32: al reanudar se aceptan los
+    registros hasta el primero incompleto o dañado (p. ej. el que se estaba
+    escribiendo al caer el proceso), y solo si el primero corresponde a la
+    misma normativa, entradas e implementaciones. Al terminar la ejecución
+    con éxito el archivo se elimina.
+
+    Con 'sincronizar' cada registro se lleva al disco con fsync antes de
+    seguir (unos 0.5 s en una ejecución de 9 s), de modo que sobrevive a
+    una caída del sistema; sin él solo se vacía el búfer del proceso y
+    basta para reanudar tras una caída del proceso.
+    """
+    def __init__(self, ruta: str, sincronizar: bool = True):
+        self.ruta = ruta
+        self.sincronizar = sincronizar
+        self._archivo = None
+        self._registros: Dict[int, List[Registro]] = {}
+
+    def abrir(self, huella: str, reanudar: bool = False) -> bool:
+        """
+        Inicia el diario de la ejecución. Con 'reanudar' conserva los
+        registros válidos de la ejecución anterior si su huella coincide.
+        Retorna si se reanuda.
+        """
+        self.cerrar()
+        self._registros = {}
+        if reanudar:
+            registros, fin = self._leer()
+            if registros and registros[0][0] == REGISTRO_INICIO and registros[0][2].get('huella') == huella:
+                for tipo, arreglos, meta in registros[1:]:
+                    self._registros.setdefault(tipo, []).append((arreglos, meta))
+                # Se descarta el registro incompleto, si lo hay, y se sigue agregando
+                with open(self.ruta, 'r+b') as f:
+                    f.truncate(fin)
+                self._archivo = open(self.ruta, 'ab')
+                print(f"Reanudando desde el punto de control '{self.ruta}' ({len(registros) - 1} registro(s)).")
+                return True
+            if registros:
+                print(f"El punto de control '{self.ruta}' no corresponde a esta configuración o entradas.")
+            else:
+                print(f"No hay un punto de control válido en '{self.ruta}'.")
+            print("Se ejecuta el proceso completo.")
+
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._archivo = open(self.ruta, 'wb')
+        self._agregar(REGISTRO_INICIO, {}, {'huella': huella})
+        return False
+
+    def cerrar(self, completado: bool = False) -> None:
+        """Cierra el diario; si la ejecución se completó, lo elimina."""
+        if self._archivo is None:
+            return
+        self._archivo.close()
+        self._archivo = None
+        self._registros = {}
+        if completado:
+            os.remove(self.ruta)
+
+    @contextmanager
+    def capturar_incidencias(self, incidencias: RegistroIncidencias) -> Iterator[Dict[str, Any]]:
+        """
+        Reúne, al salir del bloque, las incidencias nuevas y el número de
+        repetidas omitidas en el diccionario entregado (meta de un registro).
+        """
+        meta: Dict[str, Any] = {}
+        repetidas = incidencias.repetidas
+        with incidencias.capturar() as captura:
+            yield meta
+        meta['incidencias'] = captura
+        meta['repetidas'] = incidencias.repetidas - repetidas
+
+    # --- Carga ---
+
+    def guardar_carga(self, datos: DatosColumnares, meta: Dict[str, Any]) -> None:
+        meta = dict(meta, segmentos=datos.segmentos, condiciones=list(datos.condiciones))
+        self._agregar(REGISTRO_CARGA, arreglos_columnares(datos), meta)
+
+    def recuperar_carga(self, normativa: Normativa) -> Optional[DatosColumnares]:
+        """Entradas validadas del punto de control (y sus incidencias, reportadas de nuevo)."""
+        registro = self._recuperar(REGISTRO_CARGA)
+        if registro is None:
+            return None
+        arreglos, meta = registro
+        self._reproducir_incidencias(normativa, meta)
+        return columnas_desde_arreglos(arreglos.__getitem__, meta['segmentos'], meta['condiciones'])
+
+    # --- Puntajes ---
+
+    def guardar_puntajes(self, puntajes: np.ndarray, orden: np.ndarray) -> None:
+        self._agregar(REGISTRO_PUNTAJES, {'puntajes': puntajes, 'orden': orden}, {})
+
+    def puntajes(
+        self,
+        aspirantes: List[Aspirante],
+        normativa: Normativa,
+        datos: Optional[DatosColumnares] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Puntaje de postulación (guardado también en cada aspirante) y orden de
+        mérito desde el diario, si los tiene, o calculados con calcular_puntajes
+        y guardados en él.
+        """
+        recuperados = self.recuperar_puntajes(len(aspirantes))
+        if recuperados is None:
+            puntajes, orden = calcular_puntajes(aspirantes, normativa, datos)
+            self.guardar_puntajes(puntajes, orden)
+            return puntajes, orden
+        puntajes, orden = recuperados
+        for aspirante, puntaje in zip(aspirantes, puntajes.tolist()):
+            aspirante.puntaje_postulacion = puntaje
+        print("Puntajes de postulación restaurados desde el punto de control.")
+        return puntajes, orden
+
+    def recuperar_puntajes(self, num_aspirantes: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        registro = self._recuperar(REGISTRO_PUNTAJES)
+        if registro is None:
+            return None
+        arreglos, _ = registro
+        if len(arreglos['puntajes']) != num_aspirantes:
+            raise ValueError(
+                f"El punto de control tiene {len(arreglos['puntajes'])} puntajes para {num_aspirantes} aspirantes."
+            )
+        return arreglos['puntajes'], arreglos['orden']
+
+    # --- Segmentos ---
+
+    def guardar_segmento(
+        self,
+        segmento: int,
+        aspirantes: np.ndarray,
+        carreras: np.ndarray,
+        posiciones: np.ndarray,
+        cupos: np.ndarray,
+        meta: Dict[str, Any]
+    ) -> None:
+        """
+        'aspirantes' son los asignados en el segmento en orden de asignación,
+        con el índice de su carrera y la posición de la postulación (en el
+        orden de prioridad); 'cupos' son los que quedan a cada carrera en el segmento.
+        """
+        arreglos = {
+            'aspirantes': np.asarray(aspirantes, dtype=np.int64),
+            'carreras': np.asarray(carreras, dtype=np.int64),
+            'posiciones': np.asarray(posiciones, dtype=np.int64),
+            'cupos': np.asarray(cupos, dtype=np.int64),
+        }
+        self._agregar(REGISTRO_SEGMENTO, arreglos, dict(meta, segmento=segmento))
+
+    @property
+    def segmentos_recuperados(self) -> int:
+        return len(self._registros.get(REGISTRO_SEGMENTO, []))
+
+    def recuperar_segmento(self, segmento: int, normativa: Normativa) -> Optional[Dict[str, np.ndarray]]:
+        """Asignaciones del segmento en el punto de control (y sus incidencias, reportadas de nuevo)."""
+        registro = self._recuperar(REGISTRO_SEGMENTO, segmento)
+        if registro is None:
+            return None
+        arreglos, meta = registro
+        if meta['segmento'] != segmento:
+            raise ValueError(f"El punto de control del segmento {segmento} está fuera de orden.")
+        self._reproducir_incidencias(normativa, meta)
+        return arreglos
+
+    @staticmethod
+    def verificar_cupos(segmento_key: str, restantes: np.ndarray, guardados: np.ndarray) -> None:
+        """Los cupos restantes tras restaurar un segmento deben ser los del punto de control."""
+        if not np.array_equal(np.asarray(restantes, dtype=np.int64), guardados):
+            raise ValueError(
+                f"Los cupos restaurados del segmento {segmento_key} no coinciden con el punto de control."
+            )
+
+    # --- Archivo ---
+
+    def _agregar(self, tipo: int, arreglos: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        texto = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        contenido = io.BytesIO()
+        contenido.write(struct.pack('<I', len(texto)))
+        contenido.write(texto)
+        np.savez(contenido, **arreglos)
+        contenido = contenido.getvalue()
+
+        self._archivo.write(CABECERA.pack(MARCA, tipo, len(contenido), zlib.crc32(contenido)))
+        self._archivo.write(contenido)
+        self._archivo.flush()
+        if self.sincronizar:
+            os.fsync(self._archivo.fileno())
+
+    def _leer(self) -> Tuple[List[Tuple[int, Dict[str, np.ndarray], Dict[str, Any]]], int]:
+        """Registros válidos del archivo y la posición donde termina el último."""
+        registros = []
+        fin = 0
+        if not os.path.exists(self.ruta):
+            return registros, fin
+        with open(self.ruta, 'rb') as f:
+            while True:
+                cabecera = f.read(CABECERA.size)
+                if len(cabecera) < CABECERA.size:
+                    break
+                marca, tipo, largo, crc = CABECERA.unpack(cabecera)
+                if marca != MARCA:
+                    break
+                contenido = f.read(largo)
+                if len(contenido) < largo or zlib.crc32(contenido) != crc:
+                    break
+                largo_meta = struct.unpack_from('<I', contenido)[0]
+                meta = json.loads(contenido[4:4 + largo_meta].decode('utf-8'))
+                with np.load(io.BytesIO(contenido[4 + largo_meta:]), allow_pickle=False) as npz:
+                    arreglos = {nombre: npz[nombre] for nombre in npz.files}
+                registros.append((tipo, arreglos, meta))
+                fin = f.tell()
+        return registros, fin
+
+    def _recuperar(self, tipo: int, indice: int = 0) -> Optional[Registro]:
+        registros = self._registros.get(tipo, [])
+        return registros[indice] if indice < len(registros) else None
+
+    @staticmethod
+    def _reproducir_incidencias(normativa: Normativa, meta: Dict[str, Any]) -> None:
+        for incidencia in meta.get('incidencias', []):
+            normativa.reportar_incidencia(incidencia['mensaje'], incidencia['categoria'], incidencia['id_aspirante'])
+        normativa.incidencias.repetidas += meta.get('repetidas', 0)
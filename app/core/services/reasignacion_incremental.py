@@ -0,0 +1,121 @@
+from typing import Optional
+import traceback
+import numpy as np
+from app.core.interfaces.i_escritor_resultados import IEscritorResultados
+from app.core.interfaces.i_instrumentador import IInstrumentador
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import CATEGORIA_CARRERA_INEXISTENTE, CATEGORIA_GENERAL
+from app.core.services.almacen_estado import AlmacenEstadoAsignacion, huella_normativa
+from app.core.services.calculador_puntajes import CalculadorPuntajes
+from app.core.services.instrumentador import InstrumentadorNulo, ruta_reporte
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.strategy.indice_elegibilidad import evaluar_elegibilidad
+from app.core.strategy.manejadores import crear_manejadores_art_52
+from app.core.strategy.motor_arreglos import CARRERA_INEXISTENTE
+from app.core.strategy.reasignador_incremental import ReasignadorIncremental, codificar_elecciones
+
+class ServicioReasignacionIncremental:
+    """
+    Aplica un archivo de correcciones (mismo formato que la matriz de
+    postulaciones, con todas las filas de cada aspirante corregido) sobre el
+    estado guardado por la última ejecución, y escribe los mismos resultados
+    que daría repetir el proceso completo con los datos corregidos.
+    """
+    def __init__(
+        self,
+        normativa: Normativa,
+        lector: LectorDatosCSVColumnar,
+        escritor: IEscritorResultados,
+        almacen: AlmacenEstadoAsignacion,
+        instrumentador: Optional[IInstrumentador] = None
+    ):
+        self.normativa = normativa
+        self.lector = lector
+        self.escritor = escritor
+        self.almacen = almacen
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+
+    def ejecutar(self, ruta_cambios: str) -> None:
+        instrumentador = self.instrumentador
+        normativa = self.normativa
+        try:
+            print("\n[PASO 1] Cargando estado de la ejecución anterior...")
+            with instrumentador.fase("carga_estado"):
+                estado = self.almacen.cargar()
+                if estado.huella_normativa != huella_normativa(normativa):
+                    raise ValueError(
+                        "La normativa cambió desde la ejecución anterior; se requiere el proceso completo."
+                    )
+                manejadores = crear_manejadores_art_52()
+                if estado.segmentos != [m.get_segmento_key() for m in manejadores]:
+                    raise ValueError("Los segmentos del estado guardado no coinciden con los del Art. 52.")
+            print(f"Estado cargado: {estado.num_aspirantes} aspirantes y {len(estado.ids_carrera)} carreras.")
+
+            print("\n[PASO 2] Leyendo correcciones...")
+            with instrumentador.fase("correcciones"):
+                oferta = DatosColumnares(
+                    ids_carrera=estado.ids_carrera,
+                    nombres_carrera=estado.nombres_carrera,
+                    cupos=estado.cupos_iniciales,
+                    segmentos=estado.segmentos
+                )
+                datos = self.lector.cargar_postulaciones(ruta_cambios, oferta)
+                aspirantes = self.lector.construir_aspirantes(datos)
+
+                posicion_de = {id_aspirante: i for i, id_aspirante in enumerate(estado.ids_aspirante.tolist())}
+                conocidos = []
+                for aspirante in aspirantes:
+                    if aspirante.id in posicion_de:
+                        conocidos.append(aspirante)
+                    else:
+                        normativa.reportar_incidencia(
+                            f"Aspirante {aspirante.id}: No existe en la ejecución anterior; "
+                            "los aspirantes nuevos requieren el proceso completo.",
+                            CATEGORIA_GENERAL, aspirante.id
+                        )
+                aspirantes = conocidos
+
+                puntajes = CalculadorPuntajes(normativa).asignar_puntajes(aspirantes)
+                elegibilidad = evaluar_elegibilidad(aspirantes, manejadores)
+                indice_carrera = {id_carrera: i for i, id_carrera in enumerate(estado.ids_carrera.tolist())}
+                elecciones, prioridades = codificar_elecciones(aspirantes, indice_carrera)
+                for i, posicion in zip(*np.nonzero(elecciones == CARRERA_INEXISTENTE)):
+                    postulacion = aspirantes[i].get_postulaciones_ordenadas()[posicion]
+                    normativa.reportar_incidencia(
+                        f"Aspirante {aspirantes[i].id}: Postulación a carrera inexistente "
+                        f"(OFA_ID: {postulacion.id_carrera}).",
+                        CATEGORIA_CARRERA_INEXISTENTE, aspirantes[i].id
+                    )
+                indices = np.array([posicion_de[a.id] for a in aspirantes], dtype=np.int64)
+                evaluacion = np.array([a.puntaje_evaluacion for a in aspirantes], dtype=np.float64)
+                antecedentes = np.array([a.puntaje_antecedentes for a in aspirantes], dtype=np.float64)
+            print(f"Aspirantes corregidos: {len(aspirantes)}")
+
+            print("\n[PASO 3] Reasignando desde la primera posición afectada...")
+            with instrumentador.fase("reasignacion"):
+                reasignador = ReasignadorIncremental(estado)
+                nuevo_estado = reasignador.aplicar_cambios(
+                    indices, puntajes, elegibilidad, elecciones, prioridades, evaluacion, antecedentes
+                )
+                instrumentador.contar("aspirantes_reprocesados", reasignador.reprocesados)
+                instrumentador.contar("asignaciones_modificadas", reasignador.cambios_asignacion)
+            print(f"Primera posición afectada: {reasignador.inicio + 1}")
+            print(f"Aspirantes reprocesados: {reasignador.reprocesados}")
+            print(f"Asignaciones modificadas: {reasignador.cambios_asignacion}")
+
+            print("\n[PASO 4] Escribiendo resultados de salida...")
+            with instrumentador.fase("escritura"):
+                self.escritor.escribir_resultados(reasignador.resultados())
+                self.almacen.guardar(nuevo_estado)
+
+            print("\n[PROCESO FINALIZADO] La reasignación incremental se completó exitosamente.")
+            normativa.incidencias.finalizar()
+            instrumentador.contar("incidencias", normativa.incidencias.total)
+            instrumentador.escribir_reporte(ruta_reporte(normativa.rutas['resultados_asignacion']))
+            normativa.incidencias.imprimir_resumen()
+
+        except Exception as e:
+            print(f"\n[ERROR FATAL] La reasignación incremental falló: {e}")
+            traceback.print_exc()
+            normativa.incidencias.finalizar()
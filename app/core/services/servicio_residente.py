@@ -0,0 +1,491 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import asyncio
+import hashlib
+import io
+import json
+import math
+import os
+import shutil
+import signal
+import tempfile
+import traceback
+import numpy as np
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.estado_asignacion import EstadoAsignacion
+from app.core.models.indice_cortes import IndiceCortes
+from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import RegistroIncidencias
+from app.core.services.almacen_estado import huella_normativa
+from app.core.services.calculador_puntajes import CalculadorPuntajes
+from app.core.services.escritor_resultados import EscritorResultadosCSV
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.simulador_normativas import abrir_arreglos, asignar_escenario, codificar_entradas, guardar_arreglos
+from app.core.strategy.manejadores import crear_manejadores_art_52
+from app.core.strategy.orden_merito import rango_merito
+from app.core.strategy.reasignador_incremental import resultados_desde_estado
+
+# Claves admitidas en el cuerpo de una solicitud de asignación o de puntajes
+CLAVES_ESCENARIO = ('ponderadores', 'puntos_adicionales')
+
+# Tamaño máximo del cuerpo de una solicitud
+MAX_CUERPO = 1 << 20
+
+ESTADOS_HTTP = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+def _asignar_escenario(normativa: Normativa) -> Dict[str, np.ndarray]:
+    """Asignación Art. 52 de un escenario (ver asignar_escenario) con lo que guarda su EstadoAsignacion."""
+    puntajes, orden, asignador = asignar_escenario(normativa)
+    return {
+        'puntajes': puntajes,
+        'rango_merito': rango_merito(orden),
+        'carrera_asignada': asignador.carrera_asignada,
+        'segmento_asignado': asignador.segmento_asignado,
+        'posicion_asignada': asignador.posicion_asignada,
+    }
+
+@dataclass
+class EjecucionServicio:
+    """Asignación de un escenario conservada por el servicio (y su CSV, al descargarlo)."""
+    clave: str
+    escenario: Dict[str, Dict[str, float]]
+    estado: EstadoAsignacion
+    cortes: IndiceCortes
+    duracion_s: float
+    csv: Optional[bytes] = None
+
+    @cached_property
+    def resumen(self) -> Dict[str, Any]:
+        segmento = self.estado.segmento_asignado
+        asignados = segmento >= 0
+        return {
+            'clave': self.clave,
+            'escenario': self.escenario,
+            'aspirantes': self.estado.num_aspirantes,
+            'asignados': int(asignados.sum()),
+            'sin_cupo': int((~asignados).sum()),
+            'cupos_por_segmento': dict(zip(
+                self.estado.segmentos,
+                np.bincount(segmento[asignados], minlength=len(self.estado.segmentos)).tolist()
+            )),
+            'duracion_s': round(self.duracion_s, 3),
+        }
+
+class SolicitudInvalida(ValueError):
+    """Solicitud HTTP mal formada; se responde con 400."""
+
+class RecursoNoEncontrado(KeyError):
+    """Ruta, asignación, aspirante, carrera o segmento inexistente; se responde con 404."""
+
+class ServicioResidente:
+    """
+    Servicio local de larga duración: carga la normativa, la oferta y las
+    postulaciones una sola vez y atiende por HTTP (TCP o socket Unix)
+    asignaciones de escenarios de 'ponderadores'/'puntos_adicionales',
+    consultas de puntajes y cortes y la descarga de resultados.
+
+    Como en el simulador de normativas (y con sus mismas funciones), las
+    entradas codificadas se guardan como .npy que los procesos de
+    asignación abren con memoria mapeada; la
+    asignación (CPU) corre en esos procesos, fuera del bucle de eventos.
+    Las solicitudes idénticas concurrentes comparten una sola ejecución, y
+    las últimas 'max_ejecuciones' asignaciones quedan en memoria con su
+    índice de cortes, por lo que las consultas sobre ellas son inmediatas.
+    La asignación base (la normativa de config.json) se calcula al iniciar
+    y no se descarta.
+    """
+    def __init__(
+        self,
+        normativa: Normativa,
+        lector: LectorDatosCSVColumnar,
+        host: str = '127.0.0.1',
+        puerto: int = 8765,
+        socket_unix: str = '',
+        procesos: int = 1,
+        max_ejecuciones: int = 8
+    ):
+        self.normativa = normativa
+        self.lector = lector
+        self.host = host
+        self.puerto = puerto
+        self.socket_unix = socket_unix
+        self.procesos = max(1, procesos)
+        self.max_ejecuciones = max(1, max_ejecuciones)
+        self.manejadores_segmento = crear_manejadores_art_52()
+        self.ejecuciones: 'OrderedDict[str, EjecucionServicio]' = OrderedDict()
+        self.ejecuciones_realizadas = 0
+        self.clave_base = self.clave_escenario({})
+        self._en_curso: Dict[Any, 'asyncio.Future[Any]'] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._directorio: Optional[str] = None
+
+    def ejecutar(self) -> None:
+        """Atiende solicitudes hasta recibir SIGINT/SIGTERM."""
+        try:
+            asyncio.run(self.servir())
+        except Exception as e:
+            print(f"\n[ERROR FATAL] El servicio falló: {e}")
+            traceback.print_exc()
+        finally:
+            self.normativa.incidencias.finalizar()
+
+    async def servir(self) -> None:
+        bucle = asyncio.get_running_loop()
+        detener = asyncio.Event()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                bucle.add_signal_handler(senal, detener.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        self._directorio = tempfile.mkdtemp(prefix="servicio-")
+        try:
+            print("\n[PASO 1] Cargando y codificando los datos de entrada...")
+            datos = self.lector.cargar_columnas_validadas()
+            self._preparar(datos)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.procesos, initializer=abrir_arreglos,
+                initargs=(self._directorio, list(datos.condiciones))
+            )
+            print(f"Aspirantes: {datos.num_aspirantes}  carreras: {datos.num_carreras}")
+
+            print("\n[PASO 2] Calculando la asignación base...")
+            base = await self.asignar({})
+            print(f"Asignados: {base.resumen['asignados']}  ({base.duracion_s:.2f} s)")
+
+            if self.socket_unix:
+                servidor = await asyncio.start_unix_server(self._atender, path=self.socket_unix)
+                direccion = f"unix:{self.socket_unix}"
+            else:
+                servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+                host, puerto = servidor.sockets[0].getsockname()[:2]
+                direccion = f"http://{host}:{puerto}"
+            print(f"\n[SERVICIO] Escuchando en {direccion} (Ctrl+C para detener)", flush=True)
+            async with servidor:
+                await detener.wait()
+            print("\n[PROCESO FINALIZADO] Servicio detenido.")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+            shutil.rmtree(self._directorio, ignore_errors=True)
+            if self.socket_unix and os.path.exists(self.socket_unix):
+                os.remove(self.socket_unix)
+
+    # --- Datos ---
+
+    def _preparar(self, datos: DatosColumnares) -> None:
+        """Codifica las entradas (independientes del escenario) como .npy compartidos."""
+        arreglos, prioridades = codificar_entradas(datos, self.manejadores_segmento)
+        self.condiciones = {col: np.asarray(v, dtype=bool) for col, v in datos.condiciones.items()}
+        guardar_arreglos(self._directorio, arreglos, self.condiciones)
+
+        self.datos = datos
+        self.segmentos = [m.get_segmento_key() for m in self.manejadores_segmento]
+        self.arreglos = dict(arreglos, prioridades=prioridades)
+        self.fila_aspirante = {id_aspirante: i for i, id_aspirante in enumerate(datos.ids_aspirante.tolist())}
+
+    # --- Escenarios ---
+
+    def escenario(self, cuerpo: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Ponderadores y puntos adicionales de la normativa base reemplazados por los del cuerpo."""
+        desconocidas = set(cuerpo) - set(CLAVES_ESCENARIO)
+        if desconocidas:
+            raise SolicitudInvalida(f"Claves no soportadas: {sorted(desconocidas)}.")
+        resultado = {}
+        for clave in CLAVES_ESCENARIO:
+            valores = cuerpo.get(clave, {})
+            if not isinstance(valores, dict):
+                raise SolicitudInvalida(f"'{clave}' debe ser un objeto JSON.")
+            for nombre, valor in valores.items():
+                if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+                    raise SolicitudInvalida(f"'{clave}.{nombre}' debe ser un número.")
+            resultado[clave] = {**getattr(self.normativa, clave), **{k: float(v) for k, v in valores.items()}}
+        return resultado
+
+    def clave_escenario(self, cuerpo: Dict[str, Any]) -> str:
+        """Identificador de un escenario: igual para cuerpos que producen la misma normativa."""
+        escenario = self.escenario(cuerpo)
+        descriptor = {clave: {k: float(v) for k, v in valores.items()} for clave, valores in escenario.items()}
+        texto = json.dumps(descriptor, sort_keys=True)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:16]
+
+    def _normativa_escenario(self, escenario: Dict[str, Dict[str, float]]) -> Normativa:
+        # Un registro de incidencias propio: los procesos no reportan incidencias
+        return replace(self.normativa, **escenario, log_reporte=None, incidencias=RegistroIncidencias())
+
+    async def asignar(self, cuerpo: Dict[str, Any]) -> EjecucionServicio:
+        """Asignación del escenario: la conservada, la que está en curso o una nueva."""
+        clave = self.clave_escenario(cuerpo)
+        ejecucion = self.ejecuciones.get(clave)
+        if ejecucion is not None:
+            self.ejecuciones.move_to_end(clave)
+            return ejecucion
+        return await self._unico(('asignacion', clave), lambda: self._nueva_ejecucion(clave, cuerpo))
+
+    async def _nueva_ejecucion(self, clave: str, cuerpo: Dict[str, Any]) -> EjecucionServicio:
+        bucle = asyncio.get_running_loop()
+        escenario = self.escenario(cuerpo)
+        normativa = self._normativa_escenario(escenario)
+        inicio = bucle.time()
+        asignacion = await bucle.run_in_executor(self._pool, _asignar_escenario, normativa)
+        self.ejecuciones_realizadas += 1
+        estado = self._estado(normativa, asignacion)
+        cortes = await bucle.run_in_executor(None, IndiceCortes.desde_estado, estado)
+
+        ejecucion = EjecucionServicio(clave, escenario, estado, cortes, bucle.time() - inicio)
+        self.ejecuciones[clave] = ejecucion
+        # Se descartan las menos usadas, salvo la base
+        while len(self.ejecuciones) > self.max_ejecuciones:
+            antigua = next(c for c in self.ejecuciones if c != self.clave_base)
+            del self.ejecuciones[antigua]
+        return ejecucion
+
+    def _estado(self, normativa: Normativa, asignacion: Dict[str, np.ndarray]) -> EstadoAsignacion:
+        datos = self.datos
+        arreglos = self.arreglos
+        return EstadoAsignacion(
+            huella_normativa=huella_normativa(normativa),
+            criterios_desempate=list(normativa.criterios_desempate),
+            segmentos=self.segmentos,
+            ids_carrera=datos.ids_carrera,
+            nombres_carrera=datos.nombres_carrera,
+            cupos_iniciales=arreglos['cupos'],
+            ids_aspirante=datos.ids_aspirante,
+            evaluacion=arreglos['evaluacion'],
+            antecedentes=arreglos['antecedentes'],
+            elegibilidad=arreglos['elegibilidad'],
+            elecciones=arreglos['elecciones'],
+            prioridades=arreglos['prioridades'],
+            **asignacion
+        )
+
+    def ejecucion(self, clave: str) -> EjecucionServicio:
+        clave = self.clave_base if clave == 'base' else clave
+        ejecucion = self.ejecuciones.get(clave)
+        if ejecucion is None:
+            raise RecursoNoEncontrado(f"No hay una asignación '{clave}' (puede haberse descartado; vuelva a solicitarla).")
+        self.ejecuciones.move_to_end(clave)
+        return ejecucion
+
+    async def resultados_csv(self, ejecucion: EjecucionServicio) -> bytes:
+        """Archivo de resultados de la asignación, en el formato CSV del escritor (generado una vez)."""
+        if ejecucion.csv is None:
+            ejecucion.csv = await self._unico(
+                ('csv', ejecucion.clave),
+                lambda: asyncio.get_running_loop().run_in_executor(None, self._generar_csv, ejecucion)
+            )
+        return ejecucion.csv
+
+    def _generar_csv(self, ejecucion: EjecucionServicio) -> bytes:
+        escritor = EscritorResultadosCSV(self.normativa)
+        archivo = io.StringIO(newline='')
+        escritor.volcar_csv(archivo, escritor.filas(resultados_desde_estado(ejecucion.estado)))
+        return archivo.getvalue().encode('utf-8')
+
+    async def _unico(self, clave: Any, crear: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Resultado de 'crear()', compartido por las solicitudes concurrentes con
+        la misma clave. La tarea sobrevive a la cancelación de quien espera.
+        """
+        tarea = self._en_curso.get(clave)
+        if tarea is None:
+            tarea = asyncio.ensure_future(crear())
+            self._en_curso[clave] = tarea
+            tarea.add_done_callback(lambda _: self._en_curso.pop(clave, None))
+        return await asyncio.shield(tarea)
+
+    # --- Consultas ---
+
+    def puntaje(self, id_aspirante: str) -> Dict[str, Any]:
+        """Puntaje, posición de mérito y asignación base de un aspirante."""
+        fila = self._fila(id_aspirante)
+        estado = self.ejecuciones[self.clave_base].estado
+        return self._aspirante(estado, fila)
+
+    def puntajes_escenario(self, cuerpo: Dict[str, Any]) -> Dict[str, Any]:
+        """Puntajes de los aspirantes de 'ids' bajo el escenario del cuerpo (sin asignar)."""
+        ids = cuerpo.pop('ids', None)
+        if not isinstance(ids, list) or not ids:
+            raise SolicitudInvalida("'ids' debe ser una lista no vacía de identificaciones.")
+        filas = np.array([self._fila(str(i)) for i in ids], dtype=np.int64)
+        normativa = self._normativa_escenario(self.escenario(cuerpo))
+        puntajes = CalculadorPuntajes(normativa).calcular(
+            self.arreglos['evaluacion'][filas], self.arreglos['antecedentes'][filas],
+            {col: valores[filas] for col, valores in self.condiciones.items()}
+        )
+        return {'puntajes': dict(zip((str(i) for i in ids), puntajes.tolist()))}
+
+    def aspirante(self, ejecucion: EjecucionServicio, id_aspirante: str) -> Dict[str, Any]:
+        return self._aspirante(ejecucion.estado, self._fila(id_aspirante))
+
+    def corte(self, ejecucion: EjecucionServicio, consulta: Dict[str, str]) -> Dict[str, Any]:
+        if 'ofa_id' not in consulta or 'segmento' not in consulta:
+            raise SolicitudInvalida("Se requieren los parámetros 'ofa_id' y 'segmento'.")
+        try:
+            respuesta = ejecucion.cortes.consultar(consulta['ofa_id'], consulta['segmento'])
+        except KeyError as e:
+            # Carrera o segmento inexistente en el índice de cortes
+            raise RecursoNoEncontrado(*e.args)
+        if 'puntaje' in consulta:
+            try:
+                puntaje = float(consulta['puntaje'])
+            except ValueError:
+                raise SolicitudInvalida(f"Puntaje inválido: {consulta['puntaje']!r}.")
+            respuesta['puntaje'] = puntaje
+            respuesta['seria_admitido'] = ejecucion.cortes.seria_admitido(
+                puntaje, consulta['ofa_id'], consulta['segmento']
+            )
+        return respuesta
+
+    def _fila(self, id_aspirante: str) -> int:
+        fila = self.fila_aspirante.get(id_aspirante)
+        if fila is None:
+            raise RecursoNoEncontrado(f"El aspirante {id_aspirante} no existe.")
+        return fila
+
+    @staticmethod
+    def _aspirante(estado: EstadoAsignacion, fila: int) -> Dict[str, Any]:
+        respuesta = {
+            'id_aspirante': str(estado.ids_aspirante[fila]),
+            'puntaje_postulacion': float(estado.puntajes[fila]),
+            'rango_merito': int(estado.rango_merito[fila]) + 1,
+            'asignacion': None,
+        }
+        carrera = int(estado.carrera_asignada[fila])
+        if carrera >= 0:
+            respuesta['asignacion'] = {
+                'id_carrera': str(estado.ids_carrera[carrera]),
+                'nombre_carrera': str(estado.nombres_carrera[carrera]),
+                'segmento': estado.segmentos[estado.segmento_asignado[fila]],
+                'prioridad': int(estado.prioridades[fila, estado.posicion_asignada[fila]]),
+            }
+        return respuesta
+
+    def estado_servicio(self) -> Dict[str, Any]:
+        return {
+            'aspirantes': self.datos.num_aspirantes,
+            'carreras': self.datos.num_carreras,
+            'clave_base': self.clave_base,
+            'ejecuciones_realizadas': self.ejecuciones_realizadas,
+            'ejecuciones_conservadas': list(self.ejecuciones),
+            'en_curso': len(self._en_curso),
+        }
+
+    # --- HTTP ---
+
+    async def _despachar(self, metodo: str, ruta: str, consulta: Dict[str, str], cuerpo: bytes) -> Tuple[int, str, bytes]:
+        partes = [unquote(p) for p in ruta.strip('/').split('/') if p]
+        if metodo == 'GET' and partes == ['estado']:
+            return self._json(self.estado_servicio())
+        if metodo == 'GET' and partes == ['puntaje']:
+            if 'id' not in consulta:
+                raise SolicitudInvalida("Se requiere el parámetro 'id'.")
+            return self._json(self.puntaje(consulta['id']))
+        if metodo == 'POST' and partes == ['puntajes']:
+            return self._json(self.puntajes_escenario(self._cuerpo_json(cuerpo)))
+        if metodo == 'POST' and partes == ['asignaciones']:
+            return self._json((await self.asignar(self._cuerpo_json(cuerpo))).resumen)
+        if metodo == 'GET' and len(partes) >= 2 and partes[0] == 'asignaciones':
+            ejecucion = self.ejecucion(partes[1])
+            if len(partes) == 2:
+                return self._json(ejecucion.resumen)
+            if partes[2:] == ['resultados']:
+                return 200, 'text/csv; charset=utf-8', await self.resultados_csv(ejecucion)
+            if partes[2:] == ['cortes']:
+                return self._json(self.corte(ejecucion, consulta))
+            if len(partes) == 4 and partes[2] == 'aspirantes':
+                return self._json(self.aspirante(ejecucion, partes[3]))
+        raise RecursoNoEncontrado(f"Ruta no encontrada: {metodo} {ruta}")
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Conexión HTTP/1.1 con keep-alive: una solicitud a la vez."""
+        try:
+            while True:
+                try:
+                    cabecera = await lector.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lineas = cabecera.decode('latin-1').split('\r\n')
+                try:
+                    metodo, objetivo, version = lineas[0].split(' ', 2)
+                except ValueError:
+                    break
+                encabezados = {}
+                for linea in lineas[1:]:
+                    nombre, _, valor = linea.partition(':')
+                    if nombre:
+                        encabezados[nombre.strip().lower()] = valor.strip()
+                try:
+                    largo = self._largo_cuerpo(encabezados)
+                except SolicitudInvalida as e:
+                    # Sin un largo válido no se sabe dónde empieza la siguiente solicitud
+                    await self._responder(escritor, *self._error(400, str(e)), False)
+                    break
+                cuerpo = await lector.readexactly(largo) if largo else b''
+
+                url = urlsplit(objetivo)
+                consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                try:
+                    respuesta = await self._despachar(metodo.upper(), url.path, consulta, cuerpo)
+                except RecursoNoEncontrado as e:
+                    respuesta = self._error(404, e.args[0] if e.args else str(e))
+                except SolicitudInvalida as e:
+                    respuesta = self._error(400, str(e))
+                except Exception as e:
+                    traceback.print_exc()
+                    respuesta = self._error(500, str(e))
+                mantener = version == 'HTTP/1.1' and encabezados.get('connection', '').lower() != 'close'
+                await self._responder(escritor, *respuesta, mantener)
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    @staticmethod
+    async def _responder(escritor: asyncio.StreamWriter, codigo: int, tipo: str, contenido: bytes, mantener: bool) -> None:
+        cabecera = (
+            f"HTTP/1.1 {codigo} {ESTADOS_HTTP.get(codigo, '')}\r\n"
+            f"Content-Type: {tipo}\r\n"
+            f"Content-Length: {len(contenido)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        escritor.write(cabecera.encode('latin-1') + contenido)
+        await escritor.drain()
+
+    @staticmethod
+    def _largo_cuerpo(encabezados: Dict[str, str]) -> int:
+        """Content-Length de la solicitud: entero no negativo hasta MAX_CUERPO (0 si no viene)."""
+        valor = encabezados.get('content-length') or '0'
+        if not (valor.isascii() and valor.isdigit()):
+            raise SolicitudInvalida(f"Content-Length inválido: {valor!r}.")
+        largo = int(valor)
+        if largo > MAX_CUERPO:
+            raise SolicitudInvalida("El cuerpo de la solicitud es demasiado grande.")
+        return largo
+
+    @staticmethod
+    def _cuerpo_json(cuerpo: bytes) -> Dict[str, Any]:
+        if not cuerpo:
+            return {}
+        try:
+            valor = json.loads(cuerpo.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise SolicitudInvalida(f"El cuerpo no es JSON válido: {e}")
+        if not isinstance(valor, dict):
+            raise SolicitudInvalida("El cuerpo debe ser un objeto JSON.")
+        return valor
+
+    @staticmethod
+    def _json(valor: Any, codigo: int = 200) -> Tuple[int, str, bytes]:
+        return codigo, 'application/json; charset=utf-8', json.dumps(valor, ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def _error(cls, codigo: int, mensaje: str) -> Tuple[int, str, bytes]:
+        return cls._json({'error': mensaje}, codigo)
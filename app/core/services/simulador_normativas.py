@@ -0,0 +1,283 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import tempfile
+import traceback
+import numpy as np
+import pandas as pd
+from app.core.interfaces.i_instrumentador import IInstrumentador
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import RegistroIncidencias
+from app.core.services.calculador_puntajes import CalculadorPuntajes
+from app.core.services.instrumentador import InstrumentadorNulo
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.strategy.i_manejador_segmento import IManejadorSegmento
+from app.core.strategy.indice_elegibilidad import evaluar_elegibilidad_columnas
+from app.core.strategy.manejadores import crear_manejadores_art_52
+from app.core.strategy.motor_arreglos import AsignadorArreglos
+from app.core.strategy.reasignador_incremental import codificar_elecciones_columnas
+from app.core.strategy.orden_merito import orden_merito, codigos_identificacion
+
+# Arreglos compartidos con los procesos de asignación (abiertos con memoria mapeada);
+# los usan la simulación de escenarios y el servicio residente
+ARREGLOS_COMPARTIDOS = ('evaluacion', 'antecedentes', 'codigos_id', 'elegibilidad', 'elecciones', 'cupos')
+
+# Arreglos abiertos por cada proceso de asignación (ver abrir_arreglos)
+_arreglos_proceso: Dict[str, Any] = {}
+
+def codificar_entradas(
+    datos: DatosColumnares,
+    manejadores: List[IManejadorSegmento]
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Arreglos de ARREGLOS_COMPARTIDOS (independientes del escenario) y la
+    matriz de prioridades de las elecciones.
+    """
+    segmentos = [m.get_segmento_key() for m in manejadores]
+    columna_segmento = {s: j for j, s in enumerate(datos.segmentos)}
+    cupos = np.zeros((datos.num_carreras, len(segmentos)), dtype=np.int64)
+    for j, segmento in enumerate(segmentos):
+        if segmento in columna_segmento:
+            cupos[:, j] = datos.cupos[:, columna_segmento[segmento]]
+    elecciones, prioridades = codificar_elecciones_columnas(datos)
+
+    arreglos = {
+        'evaluacion': np.asarray(datos.evaluacion, dtype=np.float64),
+        'antecedentes': np.asarray(datos.antecedentes, dtype=np.float64),
+        'codigos_id': codigos_identificacion(datos.ids_aspirante),
+        'elegibilidad': evaluar_elegibilidad_columnas(datos.condiciones, datos.num_aspirantes, manejadores),
+        'elecciones': elecciones,
+        'cupos': cupos,
+    }
+    return arreglos, prioridades
+
+def guardar_arreglos(directorio: str, arreglos: Dict[str, np.ndarray], condiciones: Dict[str, np.ndarray]) -> None:
+    """Guarda los arreglos compartidos y las columnas de condición como .npy en 'directorio'."""
+    for nombre in ARREGLOS_COMPARTIDOS:
+        np.save(os.path.join(directorio, f"{nombre}.npy"), arreglos[nombre], allow_pickle=False)
+    for i, valores in enumerate(condiciones.values()):
+        np.save(os.path.join(directorio, f"condicion_{i}.npy"), np.asarray(valores, dtype=bool))
+
+def abrir_arreglos(directorio: str, condiciones: List[str], con_bolsas: bool = False) -> None:
+    """
+    Inicializador de cada proceso: abre los .npy compartidos sin copiarlos
+    (con 'con_bolsas', también la matriz de bolsas de la simulación).
+    """
+    _arreglos_proceso.clear()
+    for nombre in ARREGLOS_COMPARTIDOS:
+        _arreglos_proceso[nombre] = np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode='r')
+    _arreglos_proceso['condiciones'] = {
+        col: np.load(os.path.join(directorio, f"condicion_{i}.npy"), mmap_mode='r')
+        for i, col in enumerate(condiciones)
+    }
+    if con_bolsas:
+        _arreglos_proceso['bolsas'] = np.load(os.path.join(directorio, 'bolsas.npy'), mmap_mode='r+')
+
+def asignar_escenario(normativa: Normativa) -> Tuple[np.ndarray, np.ndarray, AsignadorArreglos]:
+    """Puntajes, orden de mérito y asignación Art. 52 de un escenario sobre los arreglos del proceso."""
+    arreglos = _arreglos_proceso
+    puntajes = CalculadorPuntajes(normativa).calcular(
+        arreglos['evaluacion'], arreglos['antecedentes'], arreglos['condiciones']
+    )
+    orden = orden_merito(
+        puntajes, normativa.criterios_desempate,
+        arreglos['evaluacion'], arreglos['antecedentes'], arreglos['codigos_id']
+    )
+    asignador = AsignadorArreglos(
+        puntajes, arreglos['elegibilidad'], arreglos['elecciones'], np.asarray(arreglos['cupos']), orden
+    )
+    for s in range(asignador.cupos.shape[1]):
+        asignador.asignar_segmento(s, asignador.candidatos_segmento(s))
+    return puntajes, orden, asignador
+
+def _simular_escenario(indice: int, normativa: Normativa) -> Dict[str, Any]:
+    """
+    Puntajes y asignación Art. 52 de un escenario sobre los arreglos del
+    proceso. La bolsa (carrera * S + segmento, o -1) de cada aspirante se
+    escribe en la fila 'indice' de la matriz compartida; se retorna solo el
+    resumen por segmento y carrera.
+    """
+    puntajes, _, asignador = asignar_escenario(normativa)
+    num_carreras, num_segmentos = asignador.cupos.shape
+
+    carrera = asignador.carrera_asignada
+    segmento = asignador.segmento_asignado
+    con_cupo = carrera >= 0
+    _arreglos_proceso['bolsas'][indice] = np.where(con_cupo, carrera * num_segmentos + segmento, -1)
+    _arreglos_proceso['bolsas'].flush()
+
+    # Puntaje de corte: el menor puntaje que obtuvo cupo en la carrera
+    cortes = np.full(num_carreras, np.inf)
+    np.minimum.at(cortes, carrera[con_cupo], puntajes[con_cupo])
+    return {
+        'cupos_por_segmento': np.bincount(segmento[con_cupo], minlength=num_segmentos).tolist(),
+        'cortes': np.where(np.isinf(cortes), np.nan, cortes),
+    }
+
+class SimuladorNormativas:
+    """
+    Compara la asignación Art. 52 bajo distintas combinaciones de
+    'ponderadores' y 'puntos_adicionales' (escenarios).
+
+    Las entradas se cargan y codifican una sola vez; los arreglos se guardan
+    como .npy en un directorio temporal y cada proceso los abre con memoria
+    mapeada, de modo que el sistema operativo comparte las páginas entre
+    procesos y solo viajan por pickle los parámetros y resúmenes de cada
+    escenario. La normativa de config.json es el escenario base.
+    """
+    def __init__(
+        self,
+        normativa: Normativa,
+        lector: LectorDatosCSVColumnar,
+        procesos: int = 0,
+        instrumentador: Optional[IInstrumentador] = None
+    ):
+        self.normativa = normativa
+        self.lector = lector
+        # 0 usa todos los núcleos disponibles
+        self.procesos = procesos or os.cpu_count() or 1
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+        self.manejadores_segmento = crear_manejadores_art_52()
+
+    def ejecutar(self, ruta_escenarios: str) -> None:
+        instrumentador = self.instrumentador
+        normativa = self.normativa
+        try:
+            print("\n[PASO 1] Cargando escenarios y datos de entrada...")
+            with instrumentador.fase("carga"):
+                escenarios = self.cargar_escenarios(ruta_escenarios)
+                datos = self.lector.cargar_columnas_validadas()
+            print(f"Escenarios: {len(escenarios)}  aspirantes: {datos.num_aspirantes}  carreras: {datos.num_carreras}")
+
+            with tempfile.TemporaryDirectory(prefix="simulacion-") as directorio:
+                with instrumentador.fase("codificacion"):
+                    self._guardar_arreglos(directorio, datos, len(escenarios))
+
+                procesos = min(self.procesos, len(escenarios))
+                print(f"\n[PASO 2] Simulando {len(escenarios)} escenarios en {procesos} proceso(s)...")
+                with instrumentador.fase("simulacion"):
+                    resumenes = self._simular(directorio, list(datos.condiciones), escenarios, procesos)
+                    bolsas = np.load(os.path.join(directorio, 'bolsas.npy'))
+
+            print("\n[PASO 3] Escribiendo tablas comparativas...")
+            with instrumentador.fase("escritura"):
+                nombres = [nombre for nombre, _ in escenarios]
+                tabla = self._tabla_resumen(nombres, resumenes, bolsas, datos.num_aspirantes)
+                cortes = self._tabla_cortes(nombres, resumenes, datos)
+                tabla.to_csv(normativa.rutas['simulacion_resumen'], index=False)
+                cortes.to_csv(normativa.rutas['simulacion_cortes'], index=False)
+            print(tabla.to_string(index=False))
+            print(f"\nResumen guardado en: {normativa.rutas['simulacion_resumen']}")
+            print(f"Puntajes de corte guardados en: {normativa.rutas['simulacion_cortes']}")
+            print("\n[PROCESO FINALIZADO] La simulación se completó exitosamente.")
+
+        except Exception as e:
+            print(f"\n[ERROR FATAL] La simulación falló: {e}")
+            traceback.print_exc()
+        finally:
+            normativa.incidencias.finalizar()
+
+    def cargar_escenarios(self, ruta: str) -> List[Tuple[str, Normativa]]:
+        """
+        Lee una lista JSON de escenarios {'nombre', 'ponderadores', 'puntos_adicionales'};
+        los valores de cada escenario reemplazan a los de la normativa base.
+        Retorna [(nombre, Normativa)], con el escenario base en primer lugar.
+        """
+        with open(ruta, 'r', encoding='utf-8') as f:
+            definiciones = json.load(f)
+        if not isinstance(definiciones, list):
+            raise ValueError(f"El archivo de escenarios debe contener una lista JSON: {ruta}")
+
+        escenarios = [('base', self._normativa_escenario({}))]
+        for i, definicion in enumerate(definiciones):
+            nombre = str(definicion.get('nombre', f"escenario_{i + 1}"))
+            desconocidas = set(definicion) - {'nombre', 'ponderadores', 'puntos_adicionales'}
+            if desconocidas:
+                raise ValueError(f"Escenario '{nombre}': claves no soportadas {sorted(desconocidas)}.")
+            if nombre in (n for n, _ in escenarios):
+                raise ValueError(f"Nombre de escenario repetido: '{nombre}'.")
+            escenarios.append((nombre, self._normativa_escenario(definicion)))
+        return escenarios
+
+    def _normativa_escenario(self, definicion: Dict[str, Any]) -> Normativa:
+        # Un registro de incidencias propio: los procesos no reportan incidencias
+        return replace(
+            self.normativa,
+            ponderadores={**self.normativa.ponderadores, **definicion.get('ponderadores', {})},
+            puntos_adicionales={**self.normativa.puntos_adicionales, **definicion.get('puntos_adicionales', {})},
+            log_reporte=None,
+            incidencias=RegistroIncidencias()
+        )
+
+    def _guardar_arreglos(self, directorio: str, datos: DatosColumnares, num_escenarios: int) -> None:
+        """Codifica las entradas (independientes del escenario) como .npy compartidos."""
+        arreglos, _ = codificar_entradas(datos, self.manejadores_segmento)
+        guardar_arreglos(directorio, arreglos, datos.condiciones)
+        # Cada proceso escribe en su fila las bolsas asignadas por su escenario
+        np.lib.format.open_memmap(
+            os.path.join(directorio, 'bolsas.npy'), mode='w+', dtype=np.int32,
+            shape=(num_escenarios, datos.num_aspirantes)
+        ).flush()
+
+    def _simular(
+        self,
+        directorio: str,
+        condiciones: List[str],
+        escenarios: List[Tuple[str, Normativa]],
+        procesos: int
+    ) -> List[Dict[str, Any]]:
+        if procesos <= 1:
+            abrir_arreglos(directorio, condiciones, con_bolsas=True)
+            try:
+                return [_simular_escenario(i, n) for i, (_, n) in enumerate(escenarios)]
+            finally:
+                _arreglos_proceso.clear()
+
+        with ProcessPoolExecutor(
+            max_workers=procesos, initializer=abrir_arreglos, initargs=(directorio, condiciones, True)
+        ) as pool:
+            futuros = [pool.submit(_simular_escenario, i, n) for i, (_, n) in enumerate(escenarios)]
+            return [f.result() for f in futuros]
+
+    def _tabla_resumen(
+        self,
+        nombres: List[str],
+        resumenes: List[Dict[str, Any]],
+        bolsas: np.ndarray,
+        num_aspirantes: int
+    ) -> pd.DataFrame:
+        """Cupos por segmento y aspirantes que cambian de carrera respecto del escenario base."""
+        num_segmentos = len(self.manejadores_segmento)
+        carreras = np.where(bolsas >= 0, bolsas // num_segmentos, -1)
+        filas = []
+        for nombre, resumen, carrera in zip(nombres, resumenes, carreras):
+            asignados = sum(resumen['cupos_por_segmento'])
+            fila = {
+                'ESCENARIO': nombre,
+                'ASIGNADOS': asignados,
+                'SIN_CUPO': num_aspirantes - asignados,
+                'CAMBIOS_VS_BASE': int((carrera != carreras[0]).sum()),
+            }
+            for manejador, cupos in zip(self.manejadores_segmento, resumen['cupos_por_segmento']):
+                fila[manejador.get_segmento_key()] = cupos
+            filas.append(fila)
+        return pd.DataFrame(filas)
+
+    def _tabla_cortes(
+        self,
+        nombres: List[str],
+        resumenes: List[Dict[str, Any]],
+        datos: DatosColumnares
+    ) -> pd.DataFrame:
+        """Puntaje de corte de cada carrera (vacío si no asignó cupos) por escenario."""
+        mapeo = self.normativa.mapeo_columnas_oferta
+        tabla = pd.DataFrame({
+            mapeo['id_carrera']: datos.ids_carrera,
+            mapeo['nombre_carrera']: datos.nombres_carrera,
+        })
+        for nombre, resumen in zip(nombres, resumenes):
+            tabla[nombre] = resumen['cortes']
+        return tabla
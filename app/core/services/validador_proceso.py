@@ -1,6 +1,20 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import os
+import numpy as np
 import pandas as pd
 from app.core.models.normativa import Normativa
+from app.core.models.registro_incidencias import (
+    CATEGORIA_POSTULACIONES_EXCEDENTES, CATEGORIA_CARRERA_INEXISTENTE, CATEGORIA_CARRERA_REPETIDA,
+    CATEGORIA_PRIORIDAD_REPETIDA, CATEGORIA_PUNTAJE_FUERA_DE_RANGO, CATEGORIA_PUNTAJES_INCONSISTENTES
+)
+
+# Columnas agregadas a las filas del archivo de rechazos
+COLUMNA_MOTIVO = 'MOTIVO'
+COLUMNA_ACCION = 'ACCION'
+
+# Acción tomada con cada fila del archivo de rechazos
+ACCION_EXCLUIDA = 'EXCLUIDA'    # No llega a la estrategia
+ACCION_OBSERVADA = 'OBSERVADA'  # Se conserva tal como se usaba antes de la revisión
 
 class ValidadorProceso:
     """
@@ -12,6 +26,8 @@ class ValidadorProceso:
         self.mapeo_post = normativa.mapeo_columnas_postulaciones
         self.mapeo_oferta = normativa.mapeo_columnas_oferta
         self.mapeo_segmentos = normativa.mapeo_segmentos_cupos
+        # Filas excluidas u observadas por depurar_postulaciones (ver tabla_rechazos)
+        self.rechazos: List[pd.DataFrame] = []
 
     def validar_columnas_postulaciones(self, df: pd.DataFrame) -> None:
         columnas_necesarias = list(self.mapeo_post.values())
@@ -27,6 +43,30 @@ class ValidadorProceso:
             raise ValueError(f"Archivo de oferta académica inválido. Faltan columnas: {columnas_faltantes}")
         print("Validación de columnas de oferta académica: OK")
 
+    def validar_encabezados(self) -> None:
+        """Valida las columnas de ambos archivos de entrada leyendo solo sus encabezados."""
+        try:
+            df_oferta = pd.read_csv(self.normativa.rutas['oferta_academica'], nrows=0)
+            encabezado = pd.read_csv(self.normativa.rutas['matriz_postulaciones'], nrows=0)
+        except FileNotFoundError as e:
+            print(f"Error fatal: No se encontró el archivo {e.filename}")
+            raise
+        self.validar_columnas_oferta(df_oferta)
+        self.validar_columnas_postulaciones(encabezado)
+
+    def tipos_columnas_postulaciones(self) -> Dict[str, Any]:
+        """
+        Tipos explícitos para leer la matriz de postulaciones: prioridad entera
+        y condiciones como categoría ('SI'/'NO' ocupan un byte por fila).
+        Identificaciones, carreras y puntajes quedan sin tipo fijo: como en la
+        lectura completa, read_csv los infiere por sus valores (enteros,
+        reales o texto), lo que decide cómo se escriben en resultados,
+        incidencias y rechazos.
+        """
+        tipos: Dict[str, Any] = {col: 'category' for col in self.normativa.registro_condiciones.columnas}
+        tipos[self.mapeo_post['prioridad']] = np.int64
+        return tipos
+
     def limpiar_y_validar_postulacion_aspirante(self, df_grupo_aspirante: pd.DataFrame) -> pd.DataFrame:
         """
         Valida las N postulaciones de un aspirante.
@@ -48,12 +88,248 @@ class ValidadorProceso:
             carreras_ignoradas = df_ignorado[self.mapeo_post['id_carrera']].tolist()
             self.normativa.reportar_incidencia(
                 f"Aspirante {id_aspirante}: Se ignoraron {len(df_ignorado)} postulaciones "
-                f"(>{max_post} permitidas). Carreras ignoradas (OFA_ID): {carreras_ignoradas}"
+                f"(>{max_post} permitidas). Carreras ignoradas (OFA_ID): {carreras_ignoradas}",
+                CATEGORIA_POSTULACIONES_EXCEDENTES, id_aspirante
             )
             return df_truncado
             
         return df_ordenado
 
+    def limpiar_y_validar_postulaciones(self, df_postulaciones: pd.DataFrame, ordenadas: bool = False) -> pd.DataFrame:
+        """
+        Versión vectorizada de limpiar_y_validar_postulacion_aspirante sobre la
+        matriz completa: coerción de prioridad, orden y truncamiento en una sola
+        pasada. Retorna las filas ordenadas por (aspirante, prioridad) y reporta
+        las incidencias en el mismo orden que el recorrido por groupby.
+        Con 'ordenadas', las filas ya vienen en ese orden desde el origen (p. ej.
+        una consulta con ORDER BY): solo se verifica, sin volver a ordenar.
+        """
+        id_col = self.mapeo_post['id_aspirante']
+        prioridad_col = self.mapeo_post['prioridad']
+        carrera_col = self.mapeo_post['id_carrera']
+
+        # groupby descarta las filas sin identificación; replicamos ese comportamiento
+        df = df_postulaciones.dropna(subset=[id_col]).copy()
+        df[prioridad_col] = pd.to_numeric(df[prioridad_col])
+        if ordenadas:
+            self._verificar_orden(df[id_col], df[prioridad_col])
+            df_ordenado = df
+        else:
+            df_ordenado = df.sort_values(by=[id_col, prioridad_col], kind='stable')
+
+        max_post = self.normativa.max_postulaciones
+        posicion = df_ordenado.groupby(id_col, sort=False).cumcount().to_numpy()
+        excedentes = posicion >= max_post
+        if not excedentes.any():
+            return df_ordenado
+
+        df_ignorado = df_ordenado[excedentes]
+        ids_ignorados = df_ignorado[id_col].tolist()
+        carreras_ignoradas = df_ignorado[carrera_col].tolist()
+        inicio = 0
+        for fin in range(1, len(ids_ignorados) + 1):
+            if fin < len(ids_ignorados) and ids_ignorados[fin] == ids_ignorados[inicio]:
+                continue
+            self.normativa.reportar_incidencia(
+                f"Aspirante {ids_ignorados[inicio]}: Se ignoraron {fin - inicio} postulaciones "
+                f"(>{max_post} permitidas). Carreras ignoradas (OFA_ID): {carreras_ignoradas[inicio:fin]}",
+                CATEGORIA_POSTULACIONES_EXCEDENTES, ids_ignorados[inicio]
+            )
+            inicio = fin
+
+        return df_ordenado[~excedentes]
+
+    def depurar_postulaciones(self, df: pd.DataFrame, ids_carrera: np.ndarray) -> pd.DataFrame:
+        """
+        Revisiones de calidad sobre la matriz ya ordenada y truncada por
+        limpiar_y_validar_postulaciones, en una sola pasada vectorizada.
+
+        Se excluyen las filas cuyo OFA_ID no está en la oferta o repite una
+        carrera ya elegida por el aspirante. Se conservan, observadas, las
+        filas con prioridad repetida (decide el orden de carga) y las cuyos
+        puntajes difieren de la primera fila del aspirante (la que aporta sus
+        datos). Los aspirantes con evaluación o antecedentes no numéricos o
+        fuera de 'rango_puntajes' se tratan según 'puntajes_invalidos' de la
+        normativa: con 'observar' se reportan y se conservan (los no numéricos
+        quedan sin valor, NaN); con 'excluir' se retiran todas sus filas.
+        Cada fila excluida u observada se reporta como incidencia y se
+        agrega, con su motivo, a la tabla de rechazos. Así la estrategia
+        recibe solo carreras existentes y sin repetir.
+        """
+        if df.empty:
+            return df
+        id_col = self.mapeo_post['id_aspirante']
+        carrera_col = self.mapeo_post['id_carrera']
+        prioridad_col = self.mapeo_post['prioridad']
+
+        # Fila base (la primera) del aspirante de cada fila
+        ids = df[id_col]
+        es_inicio = ids.ne(ids.shift()).to_numpy()
+        grupo = np.cumsum(es_inicio) - 1
+        base = np.flatnonzero(es_inicio)[grupo]
+
+        puntajes = {}
+        fuera_de_rango = np.zeros(len(df), dtype=bool)
+        inconsistentes = np.zeros(len(df), dtype=bool)
+        for clave in ('evaluacion', 'antecedentes'):
+            columna = self.mapeo_post[clave]
+            valores = pd.to_numeric(df[columna], errors='coerce').to_numpy(dtype=np.float64)
+            puntajes[columna] = valores
+            del_aspirante = valores[base]
+            invalidos = np.isnan(del_aspirante)
+            if self.normativa.rango_puntajes is not None:
+                minimo, maximo = self.normativa.rango_puntajes
+                invalidos |= (del_aspirante < minimo) | (del_aspirante > maximo)
+            fuera_de_rango |= invalidos
+            inconsistentes |= (valores != del_aspirante) & ~(np.isnan(valores) & np.isnan(del_aspirante))
+
+        # Los OFA_ID se comparan con la oferta una vez por valor distinto (sin valor: inexistente)
+        codigos_carrera, carreras = pd.factorize(df[carrera_col])
+        en_oferta = np.isin(np.asarray(carreras).astype(str), np.asarray(ids_carrera, dtype=str))
+        inexistente = (codigos_carrera < 0) | ~np.append(en_oferta, False)[codigos_carrera]
+        repetida = pd.Series(grupo * (int(codigos_carrera.max()) + 1) + codigos_carrera).duplicated().to_numpy()
+        prioridades = df[prioridad_col].to_numpy()
+        prioridad_repetida = ~es_inicio & (prioridades == np.roll(prioridades, 1))
+
+        # Cada fila recibe el primer motivo que cumple; los que excluyen van antes que los que observan
+        excluir_invalidos = self.normativa.puntajes_invalidos == 'excluir'
+        motivos = [
+            (inexistente, CATEGORIA_CARRERA_INEXISTENTE),
+            (repetida, CATEGORIA_CARRERA_REPETIDA),
+            (fuera_de_rango, CATEGORIA_PUNTAJE_FUERA_DE_RANGO),
+            (prioridad_repetida, CATEGORIA_PRIORIDAD_REPETIDA),
+            (inconsistentes, CATEGORIA_PUNTAJES_INCONSISTENTES),
+        ]
+        if excluir_invalidos:
+            motivos.insert(0, motivos.pop(2))
+        motivo = np.select([m for m, _ in motivos], [c for _, c in motivos], default='')
+        excluidas = inexistente | repetida
+        if excluir_invalidos:
+            excluidas |= fuera_de_rango
+        marcadas = np.flatnonzero(motivo != '')
+        if len(marcadas) == 0:
+            return df
+
+        tabla = df.iloc[marcadas].copy()
+        tabla[COLUMNA_MOTIVO] = np.char.upper(motivo[marcadas].astype(str))
+        tabla[COLUMNA_ACCION] = np.where(excluidas[marcadas], ACCION_EXCLUIDA, ACCION_OBSERVADA)
+        self.rechazos.append(tabla)
+        self._reportar_rechazos(
+            tabla, motivo[marcadas], excluidas[marcadas],
+            puntajes[self.mapeo_post['evaluacion']][base][marcadas],
+            puntajes[self.mapeo_post['antecedentes']][base][marcadas]
+        )
+
+        df = df[~excluidas]
+        # Los puntajes leídos como texto quedan numéricos (los no numéricos conservados, NaN)
+        no_numericas = {c: v[~excluidas] for c, v in puntajes.items() if not pd.api.types.is_numeric_dtype(df[c])}
+        return df.assign(**no_numericas) if no_numericas else df
+
+    def _reportar_rechazos(
+        self,
+        tabla: pd.DataFrame,
+        motivos: np.ndarray,
+        excluidas: np.ndarray,
+        evaluacion: np.ndarray,
+        antecedentes: np.ndarray
+    ) -> None:
+        """'evaluacion' y 'antecedentes' son los del aspirante de cada fila (su primera fila)."""
+        ids = tabla[self.mapeo_post['id_aspirante']].tolist()
+        carreras = tabla[self.mapeo_post['id_carrera']].tolist()
+        prioridades = tabla[self.mapeo_post['prioridad']].tolist()
+        rango = self.normativa.rango_puntajes
+        ultimo_invalido = None
+        for i, motivo in enumerate(motivos.tolist()):
+            id_aspirante = ids[i]
+            if motivo == CATEGORIA_PUNTAJE_FUERA_DE_RANGO:
+                # Una incidencia por aspirante, en su primera fila con este motivo
+                if id_aspirante == ultimo_invalido:
+                    continue
+                ultimo_invalido = id_aspirante
+                detalle = (
+                    f"(evaluación: {evaluacion[i]}, antecedentes: {antecedentes[i]}"
+                    + (f"; rango admitido: {rango})" if rango else ")")
+                )
+                if excluidas[i]:
+                    mensaje = f"Aspirante {id_aspirante}: Se excluyó por puntajes inválidos {detalle}."
+                else:
+                    mensaje = f"Aspirante {id_aspirante}: Puntajes inválidos {detalle}; se conserva."
+            elif motivo == CATEGORIA_CARRERA_INEXISTENTE:
+                mensaje = f"Aspirante {id_aspirante}: Postulación a carrera inexistente (OFA_ID: {carreras[i]})."
+            elif motivo == CATEGORIA_CARRERA_REPETIDA:
+                mensaje = (
+                    f"Aspirante {id_aspirante}: Se ignoró la postulación repetida a la carrera "
+                    f"(OFA_ID: {carreras[i]}, prioridad {prioridades[i]})."
+                )
+            elif motivo == CATEGORIA_PRIORIDAD_REPETIDA:
+                mensaje = (
+                    f"Aspirante {id_aspirante}: Prioridad {prioridades[i]} repetida (OFA_ID: {carreras[i]}); "
+                    "decide el orden de carga."
+                )
+            else:
+                mensaje = (
+                    f"Aspirante {id_aspirante}: Puntajes distintos a los de su primera postulación "
+                    f"(OFA_ID: {carreras[i]}); se usan los de la primera."
+                )
+            self.normativa.reportar_incidencia(mensaje, motivo, id_aspirante)
+
+    def tabla_rechazos(self) -> pd.DataFrame:
+        """Filas excluidas u observadas hasta ahora, con su MOTIVO y ACCION."""
+        if not self.rechazos:
+            return pd.DataFrame(columns=list(self.mapeo_post.values()) + [COLUMNA_MOTIVO, COLUMNA_ACCION])
+        return pd.concat(self.rechazos, ignore_index=True)
+
+    def escribir_rechazos(self, tabla: Optional[pd.DataFrame] = None) -> None:
+        """
+        Escribe el archivo de rechazos (rutas_archivos.rechazos), con solo el
+        encabezado si no hubo filas excluidas ni observadas.
+        """
+        tabla = self.tabla_rechazos() if tabla is None else tabla
+        ruta = self.normativa.rutas.get('rechazos')
+        if not ruta:
+            return
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        tabla.to_csv(ruta, index=False)
+        if len(tabla):
+            excluidas = int((tabla[COLUMNA_ACCION] == ACCION_EXCLUIDA).sum())
+            print(
+                f"Revisión de calidad: {excluidas} postulaciones excluidas y {len(tabla) - excluidas} "
+                f"observadas. Detalle en: {ruta}"
+            )
+
+    def _verificar_orden(self, ids: pd.Series, prioridades: pd.Series) -> None:
+        mismo_aspirante = ids.eq(ids.shift()).to_numpy()
+        retrocede = mismo_aspirante[1:] & (np.diff(prioridades.to_numpy()) < 0)
+        if not ids.is_monotonic_increasing or retrocede.any():
+            raise ValueError(
+                "Postulaciones inválidas: el origen debe entregarlas ordenadas por "
+                f"({self.mapeo_post['id_aspirante']}, {self.mapeo_post['prioridad']})."
+            )
+
+    def serie_a_bool(self, serie: pd.Series) -> np.ndarray:
+        """
+        Equivalente vectorizado de str_a_bool para una columna completa.
+        Las columnas de condiciones tienen pocos valores distintos ('SI'/'NO'),
+        así que se evalúa str_a_bool una vez por valor único.
+        """
+        codigos, valores_unicos = pd.factorize(serie, use_na_sentinel=False)
+        convertir = self.str_a_bool
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # Leída como categoría, '1'/'0' llega como texto: se evalúa como el número que sería
+            convertir = self._texto_a_bool
+        tabla = np.array([convertir(v) for v in valores_unicos], dtype=bool)
+        return tabla[codigos]
+
+    def _texto_a_bool(self, valor: Any) -> bool:
+        if isinstance(valor, str):
+            try:
+                return self.str_a_bool(pd.to_numeric(valor))
+            except ValueError:
+                pass
+        return self.str_a_bool(valor)
+
     def str_a_bool(self, valor: Any) -> bool:
         """Convierte los 'SI'/'NO' o 1/0 del CSV a booleanos."""
         if isinstance(valor, str):
@@ -0,0 +1,176 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import os
+import numpy as np
+from app.core.strategy.motor_arreglos import AsignadorArreglos
+from app.core.strategy.orden_merito import rango_merito
+
+# Por debajo de este número de aspirantes el arranque del pool no compensa
+MINIMO_ASPIRANTES_PARALELO = 100_000
+
+def etiquetar_componentes(elecciones: np.ndarray, num_carreras: int) -> np.ndarray:
+    """
+    Componente conexa (0..N-1) de cada aspirante en el grafo aspirante–carrera:
+    dos aspirantes comparten componente si sus elecciones quedan unidas por
+    carreras en común. Los aspirantes sin elecciones válidas forman una
+    componente propia, pues no compiten por ningún cupo.
+    """
+    num_aspirantes = len(elecciones)
+    validas = elecciones >= 0
+    # Nodo ficticio 'num_carreras' para quienes no eligieron carreras existentes
+    primera = np.full(num_aspirantes, num_carreras, dtype=np.int64)
+    con_validas = validas.any(axis=1)
+    primera[con_validas] = elecciones[con_validas, validas[con_validas].argmax(axis=1)]
+
+    # Cada elección válida une su carrera con la primera del aspirante
+    filas, columnas = np.nonzero(validas)
+    origen, destino = primera[filas], elecciones[filas, columnas]
+
+    # Unión por la etiqueta menor con compresión de caminos: padre[c] <= c siempre
+    padre = np.arange(num_carreras + 1)
+    while True:
+        raiz_origen, raiz_destino = padre[origen], padre[destino]
+        pendientes = raiz_origen != raiz_destino
+        if not pendientes.any():
+            break
+        raiz_origen, raiz_destino = raiz_origen[pendientes], raiz_destino[pendientes]
+        menor = np.minimum(raiz_origen, raiz_destino)
+        np.minimum.at(padre, raiz_origen, menor)
+        np.minimum.at(padre, raiz_destino, menor)
+        while True:
+            abuelo = padre[padre]
+            if (abuelo == padre).all():
+                break
+            padre = abuelo
+
+    # Etiquetas consecutivas sobre las raíces de las carreras elegidas
+    raices = np.zeros(num_carreras + 1, dtype=bool)
+    raices[padre[primera]] = True
+    return (np.cumsum(raices) - 1)[padre[primera]]
+
+def repartir_componentes(etiquetas: np.ndarray, num_grupos: int) -> List[np.ndarray]:
+    """
+    Agrupa las componentes en hasta 'num_grupos' grupos de tamaño parecido
+    (la mayor primero, en el grupo con menos aspirantes). Retorna los índices
+    de aspirante de cada grupo no vacío, en orden de carga.
+    """
+    tamanos = np.bincount(etiquetas)
+    grupo_componente = np.empty(len(tamanos), dtype=np.int64)
+    cargas = np.zeros(num_grupos, dtype=np.int64)
+    for componente in np.argsort(-tamanos, kind='stable').tolist():
+        grupo = int(cargas.argmin())
+        grupo_componente[componente] = grupo
+        cargas[grupo] += tamanos[componente]
+
+    grupo_aspirante = grupo_componente[etiquetas]
+    grupos = [np.flatnonzero(grupo_aspirante == g) for g in range(num_grupos)]
+    return [g for g in grupos if len(g)]
+
+def _asignar_grupo(
+    puntajes: np.ndarray,
+    elegibilidad: np.ndarray,
+    elecciones: np.ndarray,
+    cupos: np.ndarray,
+    orden: np.ndarray
+) -> Dict[str, Any]:
+    """Recorre todos los segmentos con AsignadorArreglos sobre los aspirantes de un grupo (índices locales)."""
+    asignador = AsignadorArreglos(puntajes, elegibilidad, elecciones, cupos, orden)
+    considerados = []
+    for s in range(cupos.shape[1]):
+        candidatos = asignador.candidatos_segmento(s)
+        considerados.append(len(candidatos))
+        asignador.asignar_segmento(s, candidatos)
+    return {
+        'carrera_asignada': asignador.carrera_asignada,
+        'segmento_asignado': asignador.segmento_asignado,
+        'posicion_asignada': asignador.posicion_asignada,
+        'usados': cupos - asignador.cupos,
+        'considerados_segmento': considerados,
+        'intentos_segmento': asignador.intentos_segmento,
+    }
+
+class AsignadorComponentes:
+    """
+    Asignación del Art. 52 repartida por componentes conexas del grafo
+    aspirante–carrera.
+
+    Los aspirantes de componentes distintas no comparten carreras, así que
+    no compiten por cupos: cada grupo de componentes se asigna por separado
+    (segmentos en orden y mérito global dentro de cada uno) en un pool de
+    'procesos' procesos. Al unir los grupos se reconstruyen la secuencia de
+    asignación y los contadores por segmento de la ejecución secuencial, de
+    modo que el resultado es idéntico.
+
+    Expone los mismos atributos de resultado que AsignadorArreglos
+    (carrera_asignada, segmento_asignado, posicion_asignada, secuencia,
+    intentos_segmento, cupos), más 'considerados_segmento'.
+    """
+    def __init__(
+        self,
+        puntajes: np.ndarray,
+        elegibilidad: np.ndarray,
+        elecciones: np.ndarray,
+        cupos: np.ndarray,
+        orden: Optional[np.ndarray] = None,
+        procesos: int = 0,
+        etiquetas: Optional[np.ndarray] = None
+    ):
+        self.puntajes = puntajes
+        self.elegibilidad = elegibilidad
+        self.elecciones = elecciones
+        self.cupos = cupos.astype(np.int64, copy=True)
+        self.orden = np.argsort(-puntajes, kind='stable') if orden is None else orden
+        # 0 usa todos los núcleos disponibles
+        self.procesos = procesos or os.cpu_count() or 1
+        self.etiquetas = etiquetar_componentes(elecciones, len(cupos)) if etiquetas is None else etiquetas
+
+        num_aspirantes, num_segmentos = len(puntajes), self.cupos.shape[1]
+        self.carrera_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.segmento_asignado = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.posicion_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.secuencia: List[int] = []
+        self.intentos_segmento: List[int] = [0] * num_segmentos
+        self.considerados_segmento: List[int] = [0] * num_segmentos
+
+    @property
+    def num_componentes(self) -> int:
+        return int(self.etiquetas.max(initial=-1)) + 1
+
+    def asignar(self) -> None:
+        """Asigna todos los segmentos."""
+        rango = rango_merito(self.orden)
+        grupos = repartir_componentes(self.etiquetas, self.procesos)
+        trabajos = [
+            (
+                self.puntajes[g], self.elegibilidad[g], self.elecciones[g], self.cupos,
+                np.argsort(rango[g], kind='stable')
+            )
+            for g in grupos
+        ]
+        if len(trabajos) <= 1:
+            parciales = [_asignar_grupo(*trabajo) for trabajo in trabajos]
+        else:
+            with ProcessPoolExecutor(max_workers=len(trabajos)) as pool:
+                parciales = list(pool.map(_asignar_grupo, *zip(*trabajos)))
+
+        for grupo, parcial in zip(grupos, parciales):
+            self.carrera_asignada[grupo] = parcial['carrera_asignada']
+            self.segmento_asignado[grupo] = parcial['segmento_asignado']
+            self.posicion_asignada[grupo] = parcial['posicion_asignada']
+            self.cupos -= parcial['usados']
+            for s in range(len(self.intentos_segmento)):
+                self.intentos_segmento[s] += parcial['intentos_segmento'][s]
+                self.considerados_segmento[s] += parcial['considerados_segmento'][s]
+
+        # Secuencia secuencial: por segmento y, dentro de él, por mérito
+        asignados = np.flatnonzero(self.carrera_asignada >= 0)
+        self.secuencia = asignados[
+            np.lexsort((rango[asignados], self.segmento_asignado[asignados]))
+        ].tolist()
+
+    def asignados_segmento(self, segmento: int) -> int:
+        return int((self.segmento_asignado == segmento).sum())
+
+    @property
+    def num_sin_asignar(self) -> int:
+        return int((self.carrera_asignada < 0).sum())
@@ -0,0 +1,172 @@
+from typing import List, Dict, Optional
+import numpy as np
+from app.core.interfaces.i_instrumentador import IInstrumentador
+from app.core.models.aspirante import Aspirante
+from app.core.models.carrera import Carrera
+from app.core.models.normativa import Normativa
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.postulacion import AsignacionResultado
+from app.core.services.calculador_puntajes import calcular_puntajes
+from app.core.services.instrumentador import InstrumentadorNulo
+from app.core.strategy.estrategia_vectorizada import EstrategiaAsignacionVectorizada
+from app.core.strategy.indice_elegibilidad import evaluar_elegibilidad, evaluar_elegibilidad_columnas
+from app.core.strategy.manejadores import crear_manejadores_art_52
+from app.core.strategy.motor_aceptacion_diferida import (
+    AsignadorAceptacionDiferida, ORDENES_PREFERENCIA, POLITICAS_RECICLAJE
+)
+from app.core.strategy.reasignador_incremental import codificar_elecciones, codificar_elecciones_columnas
+
+class EstrategiaAsignacionAceptacionDiferida(EstrategiaAsignacionVectorizada):
+    """
+    Asignación por aceptación diferida en varias rondas (instancias de
+    postulación), con reciclaje configurable de los cupos reservados que
+    quedan libres. Con orden_preferencias='segmento', reciclaje 'ninguno'
+    y una ronda produce las mismas asignaciones que el Art. 52.
+    Como las demás estrategias, requiere postulaciones depuradas: una
+    carrera inexistente se rechaza al codificar.
+    """
+    # Con rondas y reciclaje el resultado no sigue el recorrido del Art. 52
+    # que reproduce ReasignadorIncremental
+    admite_reasignacion_incremental = False
+    # Recibe del motor las entradas columnares (ver ejecutar_asignacion)
+    admite_columnas = True
+
+    def __init__(
+        self,
+        instrumentador: Optional[IInstrumentador] = None,
+        orden_preferencias: str = 'carrera',
+        reciclaje_cupos: str = 'general',
+        max_rondas: int = 2
+    ):
+        if orden_preferencias not in ORDENES_PREFERENCIA:
+            raise ValueError(f"orden_preferencias no soportado: {orden_preferencias}")
+        if reciclaje_cupos not in POLITICAS_RECICLAJE:
+            raise ValueError(f"Política de reciclaje no soportada: {reciclaje_cupos}")
+        if max_rondas < 1:
+            raise ValueError(f"max_rondas debe ser al menos 1 (recibido: {max_rondas}).")
+        self.orden_preferencias = orden_preferencias
+        self.reciclaje_cupos = reciclaje_cupos
+        self.max_rondas = max_rondas
+        self.manejadores_segmento = crear_manejadores_art_52()
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+        print(f"Estrategia de Asignación por aceptación diferida inicializada "
+              f"(preferencias por {orden_preferencias}, reciclaje '{reciclaje_cupos}', hasta {max_rondas} rondas).")
+
+    def ejecutar_asignacion(
+        self,
+        aspirantes: List[Aspirante],
+        carreras: List[Carrera],
+        normativa: Normativa,
+        datos: Optional[DatosColumnares] = None
+    ) -> List[AsignacionResultado]:
+        """
+        Como en EstrategiaAsignacionVectorizada, con 'datos' los puntajes, la
+        elegibilidad y las elecciones se codifican desde las columnas.
+        """
+        print("Iniciando proceso de asignación...")
+        instrumentador = self.instrumentador
+
+        # 1. Calcular puntaje de postulación y orden de mérito (con desempates) para todos
+        with instrumentador.fase("puntajes"):
+            puntajes, orden = calcular_puntajes(aspirantes, normativa, datos)
+        print("Puntajes de postulación calculados.")
+
+        # 2. Codificar aspirantes y carreras como arreglos
+        with instrumentador.fase("codificacion"):
+            segmentos = [m.get_segmento_key() for m in self.manejadores_segmento]
+            if datos is not None:
+                elegibilidad = evaluar_elegibilidad_columnas(
+                    datos.condiciones, datos.num_aspirantes, self.manejadores_segmento
+                )
+                elecciones, prioridades = codificar_elecciones_columnas(datos)
+            else:
+                indice_carrera: Dict[str, int] = {c.id: i for i, c in enumerate(carreras)}
+                elegibilidad = evaluar_elegibilidad(aspirantes, self.manejadores_segmento)
+                elecciones, prioridades = codificar_elecciones(aspirantes, indice_carrera)
+            self._verificar_elecciones(elecciones, aspirantes)
+            cupos = np.array(
+                [[c.cupos_segmentados.get(s, 0) for s in segmentos] for c in carreras],
+                dtype=np.int64
+            ).reshape(len(carreras), len(segmentos))
+
+            asignador = AsignadorAceptacionDiferida(
+                puntajes, elegibilidad, elecciones, cupos, self.orden_preferencias, orden
+            )
+
+        # 3. Rondas: las asignaciones de cada ronda son definitivas
+        for ronda in range(1, self.max_rondas + 1):
+            print(f"\n--- Ronda {ronda}: aceptación diferida ---")
+            with instrumentador.fase(f"ronda/{ronda}"):
+                propuestas_previas = asignador.propuestas
+                nuevos = asignador.ejecutar_ronda(ronda)
+                instrumentador.contar("cupos_intentados", asignador.propuestas - propuestas_previas)
+                instrumentador.contar("cupos_asignados", len(nuevos))
+            print(f"Cupos asignados en la ronda: {len(nuevos)}")
+
+            if ronda == self.max_rondas or asignador.num_sin_asignar == 0:
+                break
+            movidos = asignador.reciclar(self.reciclaje_cupos)
+            if movidos == 0:
+                # Sin cupos nuevos, otra ronda no cambiaría el resultado
+                break
+            instrumentador.contar("cupos_reciclados", movidos)
+            print(f"Cupos reservados reciclados para la siguiente ronda: {movidos}")
+
+        # 4. Reflejar los cupos en los objetos Carrera
+        self._actualizar_carreras(carreras, segmentos, asignador)
+
+        resultados_finales = self._construir_resultados(asignador, aspirantes, carreras, prioridades, segmentos)
+
+        print(f"\n--- Asignación Finalizada ---")
+        print(f"Total de cupos asignados: {len(resultados_finales)}")
+        print(f"Total de aspirantes sin cupo: {asignador.num_sin_asignar}")
+
+        return resultados_finales
+
+    def _actualizar_carreras(
+        self,
+        carreras: List[Carrera],
+        segmentos: List[str],
+        asignador: AsignadorAceptacionDiferida
+    ) -> None:
+        asignados = asignador.carrera_asignada[asignador.carrera_asignada >= 0]
+        por_carrera = np.bincount(asignados, minlength=len(carreras)).tolist()
+        cupos_finales = asignador.cupos.tolist()
+        for i, carrera in enumerate(carreras):
+            for s, segmento_key in enumerate(segmentos):
+                if segmento_key in carrera.cupos_segmentados or cupos_finales[i][s]:
+                    carrera.cupos_segmentados[segmento_key] = cupos_finales[i][s]
+            carrera.cupos_asignados += por_carrera[i]
+
+    def _construir_resultados(
+        self,
+        asignador: AsignadorAceptacionDiferida,
+        aspirantes: List[Aspirante],
+        carreras: List[Carrera],
+        prioridades: np.ndarray,
+        segmentos: List[str]
+    ) -> List[AsignacionResultado]:
+        # Orden de salida: ronda y, dentro de ella, mérito
+        asignados = asignador.orden[asignador.carrera_asignada[asignador.orden] >= 0]
+        asignados = asignados[np.argsort(asignador.ronda_asignada[asignados], kind='stable')]
+
+        carrera_asignada = asignador.carrera_asignada.tolist()
+        segmento_asignado = asignador.segmento_asignado.tolist()
+        # Prioridad de la elección con que obtuvo cupo cada aspirante
+        prioridad_asignada = prioridades[asignados, asignador.posicion_asignada[asignados]].tolist()
+        ronda_asignada = asignador.ronda_asignada.tolist()
+
+        resultados = []
+        for i, prioridad in zip(asignados.tolist(), prioridad_asignada):
+            aspirante = aspirantes[i]
+            carrera = carreras[carrera_asignada[i]]
+            resultados.append(AsignacionResultado(
+                id_aspirante=aspirante.id,
+                puntaje_postulacion=aspirante.puntaje_postulacion,
+                segmento_asignado=segmentos[segmento_asignado[i]],
+                prioridad_asignada=prioridad,
+                id_carrera_asignada=carrera.id,
+                nombre_carrera_asignada=carrera.nombre,
+                instancia_postulacion=ronda_asignada[i]
+            ))
+        return resultados
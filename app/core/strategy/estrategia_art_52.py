@@ -1,31 +1,50 @@
-from typing import List, Dict, Set
+from contextlib import nullcontext
+from typing import Any, ContextManager, List, Dict, Optional, Tuple
+import os
+import numpy as np
+from app.core.interfaces.i_instrumentador import IInstrumentador
 from app.core.interfaces.i_strategy_asignacion import IStrategyAsignacion
 from app.core.models.aspirante import Aspirante
 from app.core.models.carrera import Carrera
 from app.core.models.normativa import Normativa
 from app.core.models.postulacion import AsignacionResultado
-from app.core.strategy.manejadores import (
-    ManejadorPoliticaCuotas, ManejadorVulnerabilidad, ManejadorMeritoAcademico,
-    ManejadorOtrosReconocimientos, ManejadorBachilleresPN,
-    ManejadorBachilleresCurso, ManejadorGeneral
-)
+from app.core.services.calculador_puntajes import calcular_puntajes
+from app.core.services.instrumentador import InstrumentadorNulo
+from app.core.services.puntos_control import DiarioPuntosControl
+from app.core.strategy.asignacion_componentes import MINIMO_ASPIRANTES_PARALELO
+from app.core.strategy.estrategia_vectorizada import EstrategiaAsignacionVectorizada
+from app.core.strategy.i_manejador_segmento import IManejadorSegmento
+from app.core.strategy.indice_elegibilidad import IndiceElegibilidad
+from app.core.strategy.manejadores import crear_manejadores_art_52
 
 class EstrategiaAsignacionArt52(IStrategyAsignacion):
     """
     Implementación de la estrategia de asignación basada en el Art. 52,
     procesando segmentos en orden.
+
+    Con 'procesos' > 1, las cohortes grandes se asignan con el núcleo de
+    arreglos de EstrategiaAsignacionVectorizada, que reparte las componentes
+    conexas del grafo aspirante–carrera en un pool de procesos (los objetos
+    Aspirante no se envían entre procesos). El resultado es el mismo.
+
+    Con un DiarioPuntosControl, guarda los puntajes y cada segmento
+    procesado, y restaura los que ya tenga el diario al reanudar.
     """
-    def __init__(self):
+    # El estado de sus ejecuciones sirve para ReasignadorIncremental
+    admite_reasignacion_incremental = True
+
+    def __init__(
+        self,
+        instrumentador: Optional[IInstrumentador] = None,
+        procesos: int = 1,
+        puntos_control: Optional[DiarioPuntosControl] = None
+    ):
         # El orden de esta lista es la prioridad de los segmentos
-        self.manejadores_segmento = [
-            ManejadorPoliticaCuotas(),
-            ManejadorVulnerabilidad(),
-            ManejadorMeritoAcademico(),
-            ManejadorOtrosReconocimientos(),
-            ManejadorBachilleresPN(),
-            ManejadorBachilleresCurso(),
-            ManejadorGeneral()
-        ]
+        self.manejadores_segmento = crear_manejadores_art_52()
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+        self.puntos_control = puntos_control
+        # Procesos para asignar por componentes conexas (0 usa todos los núcleos)
+        self.procesos = procesos or os.cpu_count() or 1
         print("Estrategia de Asignación Art. 52 inicializada.")
 
     def ejecutar_asignacion(
@@ -35,51 +54,93 @@ class EstrategiaAsignacionArt52(IStrategyAsignacion):
         normativa: Normativa
     ) -> List[AsignacionResultado]:
         
+        if self.procesos > 1 and len(aspirantes) >= MINIMO_ASPIRANTES_PARALELO:
+            paralela = EstrategiaAsignacionVectorizada(self.instrumentador, self.procesos, self.puntos_control)
+            return paralela.ejecutar_asignacion(aspirantes, carreras, normativa)
+
         print("Iniciando proceso de asignación...")
+        instrumentador = self.instrumentador
+        puntos_control = self.puntos_control
 
-        # 1. Calcular puntaje de postulación para todos
-        for a in aspirantes:
-            a.calcular_puntaje_postulacion(normativa)
+        # 1. Calcular puntaje de postulación y orden de mérito (con desempates) para todos
+        with instrumentador.fase("puntajes"):
+            if puntos_control is not None:
+                puntajes, orden = puntos_control.puntajes(aspirantes, normativa)
+            else:
+                puntajes, orden = calcular_puntajes(aspirantes, normativa)
         print("Puntajes de postulación calculados.")
 
-        # 2. Preparar estructuras de datos
-        aspirantes_sin_asignar_ids: Set[str] = {a.id for a in aspirantes}
-        aspirantes_dict: Dict[str, Aspirante] = {a.id: a for a in aspirantes}
+        # 2. Preparar estructuras de datos: listas de elegibles por segmento,
+        # ya ordenadas por mérito, y marca de cupo obtenido por aspirante
+        with instrumentador.fase("indice_elegibilidad"):
+            indice = IndiceElegibilidad(aspirantes, puntajes, self.manejadores_segmento, orden)
+        con_cupo = np.zeros(len(aspirantes), dtype=bool)
         carreras_dict: Dict[str, Carrera] = {c.id: c for c in carreras}
         resultados_finales: List[AsignacionResultado] = []
 
         # 3. Iterar por cada segmento (manejador) en orden de prioridad
         for i, manejador in enumerate(self.manejadores_segmento):
             segmento_key = manejador.get_segmento_key()
-            print(f"\n--- Procesando Segmento {i+1}: {segmento_key} ---")
-            
-            # 3.a. Obtener aspirantes que aplican a este segmento Y aún no tienen cupo
-            aspirantes_del_segmento = []
-            for aspirante_id in list(aspirantes_sin_asignar_ids):
-                aspirante = aspirantes_dict[aspirante_id]
-                if manejador.cumple_criterio(aspirante):
-                    aspirantes_del_segmento.append(aspirante)
-            
-            if not aspirantes_del_segmento:
-                print(f"No hay aspirantes elegibles o sin asignar para este segmento.")
+            restaurado = puntos_control.recuperar_segmento(i, normativa) if puntos_control is not None else None
+            if restaurado is not None:
+                print(f"\n--- Segmento {i+1}: {segmento_key} (restaurado desde el punto de control) ---")
+                self._restaurar_segmento(segmento_key, restaurado, aspirantes, carreras, con_cupo, resultados_finales)
                 continue
 
-            # 3.b. Ordenar por mérito (puntaje de postulación)
-            aspirantes_del_segmento.sort(key=lambda a: a.puntaje_postulacion, reverse=True)
-            print(f"Procesando {len(aspirantes_del_segmento)} aspirantes para este segmento...")
+            print(f"\n--- Procesando Segmento {i+1}: {segmento_key} ---")
+            with instrumentador.fase(f"segmento/{segmento_key}"):
+                with self._capturar_incidencias(normativa) as meta:
+                    asignaciones = self._procesar_segmento(
+                        manejador, indice.segmento(i), aspirantes, con_cupo,
+                        carreras_dict, resultados_finales
+                    )
+                self._guardar_segmento(i, segmento_key, asignaciones, carreras, resultados_finales, meta)
+
+        print(f"\n--- Asignación Finalizada ---")
+        print(f"Total de cupos asignados: {len(resultados_finales)}")
+        print(f"Total de aspirantes sin cupo: {len(aspirantes) - len(resultados_finales)}")
+        
+        return resultados_finales
+
+    def _procesar_segmento(
+        self,
+        manejador: IManejadorSegmento,
+        elegibles: np.ndarray,
+        aspirantes: List[Aspirante],
+        con_cupo: np.ndarray,
+        carreras_dict: Dict[str, Carrera],
+        resultados_finales: List[AsignacionResultado]
+    ) -> List[Tuple[int, int]]:
+        """
+        Retorna (aspirante, posición de la postulación) de cada asignado, en orden.
+        Las postulaciones llegan depuradas (ValidadorProceso.depurar_postulaciones):
+        toda carrera postulada existe y el recorrido no lo verifica.
+        """
+        segmento_key = manejador.get_segmento_key()
+
+        # 3.a. Aspirantes que aplican a este segmento Y aún no tienen cupo, ya en
+        # orden de mérito (a igual puntaje, criterios de desempate y orden de carga)
+        candidatos = elegibles[~con_cupo[elegibles]].tolist()
+        
+        if not candidatos:
+            print(f"No hay aspirantes elegibles o sin asignar para este segmento.")
+            return []
+
+        print(f"Procesando {len(candidatos)} aspirantes para este segmento...")
+
+        # 3.b. Intentar asignar cupo para cada aspirante en el segmento
+        intentos = 0
+        asignaciones: List[Tuple[int, int]] = []
+        try:
+            for indice_aspirante in candidatos:
+                aspirante = aspirantes[indice_aspirante]
 
-            # 3.c. Intentar asignar cupo para cada aspirante en el segmento
-            for aspirante in aspirantes_del_segmento:
-                
                 # Intentar asignar al aspirante en una de sus N prioridades
-                for postulacion in aspirante.get_postulaciones_ordenadas():
-                    carrera = carreras_dict.get(postulacion.id_carrera)
-                    
-                    if not carrera:
-                        normativa.reportar_incidencia(f"Aspirante {aspirante.id}: Postulación a carrera inexistente (OFA_ID: {postulacion.id_carrera}).")
-                        continue
+                for posicion, postulacion in enumerate(aspirante.get_postulaciones_ordenadas()):
+                    carrera = carreras_dict[postulacion.id_carrera]
 
                     # Intentar tomar un cupo de ESTE segmento
+                    intentos += 1
                     if carrera.asignar_cupo(segmento_key):
                         # ¡ÉXITO!
                         resultado = AsignacionResultado(
@@ -91,15 +152,78 @@ class EstrategiaAsignacionArt52(IStrategyAsignacion):
                             nombre_carrera_asignada=carrera.nombre
                         )
                         resultados_finales.append(resultado)
-                        aspirantes_sin_asignar_ids.remove(aspirante.id) 
+                        con_cupo[indice_aspirante] = True
+                        asignaciones.append((indice_aspirante, posicion))
                         break # Salir del bucle de prioridades
-                
+
                 # Si el aspirante no fue asignado (break no se ejecutó),
-                # no se quita de 'aspirantes_sin_asignar_ids'
+                # no se marca en 'con_cupo'
                 # y será procesado por el siguiente segmento si califica.
+        except KeyError as e:
+            raise ValueError(
+                f"Aspirante {aspirante.id}: Postulación a carrera inexistente (OFA_ID: {e.args[0]}); "
+                "las postulaciones deben depurarse antes de asignar."
+            ) from e
 
-        print(f"\n--- Asignación Finalizada ---")
-        print(f"Total de cupos asignados: {len(resultados_finales)}")
-        print(f"Total de aspirantes sin cupo: {len(aspirantes_sin_asignar_ids)}")
-        
-        return resultados_finales
+        self.instrumentador.contar("aspirantes_considerados", len(candidatos))
+        self.instrumentador.contar("cupos_intentados", intentos)
+        self.instrumentador.contar("cupos_asignados", len(asignaciones))
+        return asignaciones
+
+    def _capturar_incidencias(self, normativa: Normativa) -> ContextManager[Dict[str, Any]]:
+        if self.puntos_control is None:
+            return nullcontext({})
+        return self.puntos_control.capturar_incidencias(normativa.incidencias)
+
+    def _guardar_segmento(
+        self,
+        i: int,
+        segmento_key: str,
+        asignaciones: List[Tuple[int, int]],
+        carreras: List[Carrera],
+        resultados_finales: List[AsignacionResultado],
+        meta: Dict[str, Any]
+    ) -> None:
+        """Punto de control del segmento; sus asignados son los últimos resultados."""
+        if self.puntos_control is None:
+            return
+        indice_carrera = {c.id: k for k, c in enumerate(carreras)}
+        nuevos = resultados_finales[len(resultados_finales) - len(asignaciones):]
+        self.puntos_control.guardar_segmento(
+            i,
+            aspirantes=[a for a, _ in asignaciones],
+            carreras=[indice_carrera[r.id_carrera_asignada] for r in nuevos],
+            posiciones=[p for _, p in asignaciones],
+            cupos=[c.cupos_segmentados.get(segmento_key, 0) for c in carreras],
+            meta=meta
+        )
+
+    def _restaurar_segmento(
+        self,
+        segmento_key: str,
+        restaurado: Dict[str, np.ndarray],
+        aspirantes: List[Aspirante],
+        carreras: List[Carrera],
+        con_cupo: np.ndarray,
+        resultados_finales: List[AsignacionResultado]
+    ) -> None:
+        """Repite las asignaciones del segmento guardadas en el punto de control."""
+        for indice_aspirante, indice_carrera, posicion in zip(
+            restaurado['aspirantes'].tolist(), restaurado['carreras'].tolist(), restaurado['posiciones'].tolist()
+        ):
+            aspirante = aspirantes[indice_aspirante]
+            carrera = carreras[indice_carrera]
+            carrera.cupos_segmentados[segmento_key] -= 1
+            carrera.cupos_asignados += 1
+            resultados_finales.append(AsignacionResultado(
+                id_aspirante=aspirante.id,
+                puntaje_postulacion=aspirante.puntaje_postulacion,
+                segmento_asignado=segmento_key,
+                prioridad_asignada=aspirante.get_postulaciones_ordenadas()[posicion].prioridad,
+                id_carrera_asignada=carrera.id,
+                nombre_carrera_asignada=carrera.nombre
+            ))
+            con_cupo[indice_aspirante] = True
+        DiarioPuntosControl.verificar_cupos(
+            segmento_key, [c.cupos_segmentados.get(segmento_key, 0) for c in carreras], restaurado['cupos']
+        )
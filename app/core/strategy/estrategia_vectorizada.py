@@ -0,0 +1,282 @@
+from contextlib import nullcontext
+from typing import Any, ContextManager, List, Dict, Optional
+import os
+import numpy as np
+from app.core.interfaces.i_instrumentador import IInstrumentador
+from app.core.interfaces.i_strategy_asignacion import IStrategyAsignacion
+from app.core.models.aspirante import Aspirante
+from app.core.models.carrera import Carrera
+from app.core.models.normativa import Normativa
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.postulacion import AsignacionResultado
+from app.core.services.calculador_puntajes import calcular_puntajes
+from app.core.services.instrumentador import InstrumentadorNulo
+from app.core.services.puntos_control import DiarioPuntosControl
+from app.core.strategy.asignacion_componentes import AsignadorComponentes, MINIMO_ASPIRANTES_PARALELO
+from app.core.strategy.indice_elegibilidad import evaluar_elegibilidad, evaluar_elegibilidad_columnas
+from app.core.strategy.manejadores import crear_manejadores_art_52
+from app.core.strategy.motor_arreglos import AsignadorArreglos, CARRERA_INEXISTENTE
+from app.core.strategy.reasignador_incremental import codificar_elecciones, codificar_elecciones_columnas
+
+class EstrategiaAsignacionVectorizada(IStrategyAsignacion):
+    """
+    Estrategia del Art. 52 equivalente a EstrategiaAsignacionArt52, pero que
+    codifica aspirantes y carreras como arreglos NumPy y delega el recorrido
+    de los segmentos en AsignadorArreglos.
+
+    Con 'procesos' > 1 y cohortes grandes, si el grafo aspirante–carrera
+    tiene varias componentes conexas (p. ej. provincias o sedes sin carreras
+    en común), las asigna en paralelo con AsignadorComponentes; el resultado
+    es el mismo que el secuencial.
+
+    Con un DiarioPuntosControl, guarda los puntajes y cada segmento
+    asignado, y al reanudar restaura los segmentos que ya tenga el diario
+    y recorre el resto en secuencia.
+    """
+    # El estado de sus ejecuciones sirve para ReasignadorIncremental
+    admite_reasignacion_incremental = True
+    # Recibe del motor las entradas columnares (ver ejecutar_asignacion)
+    admite_columnas = True
+
+    def __init__(
+        self,
+        instrumentador: Optional[IInstrumentador] = None,
+        procesos: int = 1,
+        puntos_control: Optional[DiarioPuntosControl] = None
+    ):
+        self.manejadores_segmento = crear_manejadores_art_52()
+        self.instrumentador = instrumentador or InstrumentadorNulo()
+        self.puntos_control = puntos_control
+        # Procesos para asignar por componentes conexas (0 usa todos los núcleos)
+        self.procesos = procesos or os.cpu_count() or 1
+        print("Estrategia de Asignación Art. 52 (vectorizada) inicializada.")
+
+    def ejecutar_asignacion(
+        self,
+        aspirantes: List[Aspirante],
+        carreras: List[Carrera],
+        normativa: Normativa,
+        datos: Optional[DatosColumnares] = None
+    ) -> List[AsignacionResultado]:
+        """
+        'datos' son, si se tienen, las entradas columnares de las que se
+        construyeron 'aspirantes' y 'carreras' (en el mismo orden): los
+        puntajes, la elegibilidad y las elecciones se codifican desde esas
+        columnas sin recorrer los objetos.
+        Las postulaciones deben llegar depuradas: una carrera inexistente se
+        rechaza al codificar, con una sola revisión de la matriz de elecciones.
+        """
+        print("Iniciando proceso de asignación...")
+        instrumentador = self.instrumentador
+
+        # 1. Calcular puntaje de postulación y orden de mérito (con desempates) para todos
+        with instrumentador.fase("puntajes"):
+            if self.puntos_control is not None:
+                puntajes, orden = self.puntos_control.puntajes(aspirantes, normativa, datos)
+            else:
+                puntajes, orden = calcular_puntajes(aspirantes, normativa, datos)
+        print("Puntajes de postulación calculados.")
+
+        # 2. Codificar aspirantes y carreras como arreglos
+        with instrumentador.fase("codificacion"):
+            segmentos = [m.get_segmento_key() for m in self.manejadores_segmento]
+            if datos is not None:
+                elegibilidad = evaluar_elegibilidad_columnas(
+                    datos.condiciones, datos.num_aspirantes, self.manejadores_segmento
+                )
+                elecciones, prioridades = codificar_elecciones_columnas(datos)
+            else:
+                indice_carrera: Dict[str, int] = {c.id: i for i, c in enumerate(carreras)}
+                elegibilidad = evaluar_elegibilidad(aspirantes, self.manejadores_segmento)
+                elecciones, prioridades = codificar_elecciones(aspirantes, indice_carrera)
+            self._verificar_elecciones(elecciones, aspirantes)
+            cupos = np.array(
+                [[c.cupos_segmentados.get(s, 0) for s in segmentos] for c in carreras],
+                dtype=np.int64
+            ).reshape(len(carreras), len(segmentos))
+
+            asignador = AsignadorArreglos(puntajes, elegibilidad, elecciones, cupos, orden)
+
+        # 3. Con varios procesos y cohortes grandes, repartir por componentes conexas
+        # (salvo que se reanude con segmentos ya asignados)
+        componentes = None
+        restaurados = self.puntos_control.segmentos_recuperados if self.puntos_control is not None else 0
+        if self.procesos > 1 and len(aspirantes) >= MINIMO_ASPIRANTES_PARALELO and restaurados == 0:
+            with instrumentador.fase("componentes"):
+                componentes = AsignadorComponentes(puntajes, elegibilidad, elecciones, cupos, orden, self.procesos)
+                instrumentador.contar("componentes", componentes.num_componentes)
+            print(f"Componentes independientes del grafo aspirante–carrera: {componentes.num_componentes}")
+            if componentes.num_componentes < 2:
+                componentes = None
+
+        if componentes is not None:
+            asignador = componentes
+            self._asignar_por_componentes(componentes, segmentos)
+        else:
+            self._asignar_por_segmentos(asignador, segmentos, normativa)
+
+        # 4. Reflejar los cupos consumidos en los objetos Carrera
+        self._actualizar_carreras(carreras, segmentos, cupos, asignador.cupos)
+
+        resultados_finales = self._construir_resultados(asignador, aspirantes, carreras, prioridades, segmentos)
+
+        print(f"\n--- Asignación Finalizada ---")
+        print(f"Total de cupos asignados: {len(resultados_finales)}")
+        print(f"Total de aspirantes sin cupo: {asignador.num_sin_asignar}")
+
+        return resultados_finales
+
+    def _asignar_por_segmentos(
+        self,
+        asignador: AsignadorArreglos,
+        segmentos: List[str],
+        normativa: Normativa
+    ) -> None:
+        instrumentador = self.instrumentador
+        for s, segmento_key in enumerate(segmentos):
+            restaurado = (
+                self.puntos_control.recuperar_segmento(s, normativa) if self.puntos_control is not None else None
+            )
+            if restaurado is not None:
+                print(f"\n--- Segmento {s+1}: {segmento_key} (restaurado desde el punto de control) ---")
+                self._restaurar_segmento(asignador, s, segmento_key, restaurado)
+                continue
+
+            print(f"\n--- Procesando Segmento {s+1}: {segmento_key} ---")
+            inicio_secuencia = len(asignador.secuencia)
+            with instrumentador.fase(f"segmento/{segmento_key}"):
+                with self._capturar_incidencias(normativa) as meta:
+                    self._procesar_segmento(asignador, s)
+                asignados = np.array(asignador.secuencia[inicio_secuencia:], dtype=np.int64)
+                self._guardar_segmento(asignador, s, asignados, meta)
+
+    def _procesar_segmento(self, asignador: AsignadorArreglos, s: int) -> None:
+        instrumentador = self.instrumentador
+        candidatos = asignador.candidatos_segmento(s)
+        if len(candidatos) == 0:
+            print(f"No hay aspirantes elegibles o sin asignar para este segmento.")
+            return
+        print(f"Procesando {len(candidatos)} aspirantes para este segmento...")
+        asignados = asignador.asignar_segmento(s, candidatos)
+        instrumentador.contar("aspirantes_considerados", len(candidatos))
+        instrumentador.contar("cupos_intentados", asignador.intentos_segmento[s])
+        instrumentador.contar("cupos_asignados", asignados)
+
+    def _asignar_por_componentes(self, asignador: AsignadorComponentes, segmentos: List[str]) -> None:
+        """
+        Todos los segmentos a la vez en el pool; luego, por segmento, su
+        punto de control y los contadores en su fase, como en el recorrido
+        secuencial.
+        """
+        instrumentador = self.instrumentador
+        print(f"Asignando los segmentos por componentes en {asignador.procesos} proceso(s)...")
+        with instrumentador.fase("asignacion_paralela"):
+            asignador.asignar()
+        secuencia = np.array(asignador.secuencia, dtype=np.int64)
+        for s, segmento_key in enumerate(segmentos):
+            print(f"\n--- Segmento {s+1}: {segmento_key} ---")
+            considerados = asignador.considerados_segmento[s]
+            if considerados == 0:
+                print(f"No hay aspirantes elegibles o sin asignar para este segmento.")
+            else:
+                print(f"Procesados {considerados} aspirantes para este segmento.")
+            with instrumentador.fase(f"segmento/{segmento_key}"):
+                # El recorrido de un segmento no reporta incidencias
+                self._guardar_segmento(asignador, s, secuencia[asignador.segmento_asignado[secuencia] == s], {})
+                if considerados:
+                    instrumentador.contar("aspirantes_considerados", considerados)
+                    instrumentador.contar("cupos_intentados", asignador.intentos_segmento[s])
+                    instrumentador.contar("cupos_asignados", asignador.asignados_segmento(s))
+
+    @staticmethod
+    def _verificar_elecciones(elecciones: np.ndarray, aspirantes: List[Aspirante]) -> None:
+        """Rechaza las postulaciones a carreras inexistentes (entradas sin depurar)."""
+        inexistentes = np.argwhere(elecciones == CARRERA_INEXISTENTE)
+        if len(inexistentes):
+            fila, posicion = inexistentes[0].tolist()
+            aspirante = aspirantes[fila]
+            raise ValueError(
+                f"Aspirante {aspirante.id}: Postulación a carrera inexistente "
+                f"(OFA_ID: {aspirante.get_postulaciones_ordenadas()[posicion].id_carrera}); "
+                "las postulaciones deben depurarse antes de asignar."
+            )
+
+    def _capturar_incidencias(self, normativa: Normativa) -> ContextManager[Dict[str, Any]]:
+        if self.puntos_control is None:
+            return nullcontext({})
+        return self.puntos_control.capturar_incidencias(normativa.incidencias)
+
+    def _guardar_segmento(
+        self,
+        asignador: AsignadorArreglos,
+        s: int,
+        asignados: np.ndarray,
+        meta: Dict[str, Any]
+    ) -> None:
+        """Punto de control del segmento 's' con sus asignados en orden de asignación."""
+        if self.puntos_control is None:
+            return
+        self.puntos_control.guardar_segmento(
+            s, asignados, asignador.carrera_asignada[asignados], asignador.posicion_asignada[asignados],
+            asignador.cupos[:, s], meta
+        )
+
+    def _restaurar_segmento(
+        self,
+        asignador: AsignadorArreglos,
+        s: int,
+        segmento_key: str,
+        restaurado: Dict[str, np.ndarray]
+    ) -> None:
+        """Aplica al asignador las asignaciones del segmento guardadas en el punto de control."""
+        asignados = restaurado['aspirantes']
+        asignador.carrera_asignada[asignados] = restaurado['carreras']
+        asignador.segmento_asignado[asignados] = s
+        asignador.posicion_asignada[asignados] = restaurado['posiciones']
+        asignador.secuencia.extend(asignados.tolist())
+        asignador.cupos[:, s] -= np.bincount(restaurado['carreras'], minlength=len(asignador.cupos))
+        DiarioPuntosControl.verificar_cupos(segmento_key, asignador.cupos[:, s], restaurado['cupos'])
+
+    def _actualizar_carreras(
+        self,
+        carreras: List[Carrera],
+        segmentos: List[str],
+        cupos_iniciales: np.ndarray,
+        cupos_finales: np.ndarray
+    ) -> None:
+        usados = cupos_iniciales - cupos_finales
+        for i in np.flatnonzero(usados.sum(axis=1)):
+            carrera = carreras[i]
+            for s in np.flatnonzero(usados[i]):
+                carrera.cupos_segmentados[segmentos[s]] = int(cupos_finales[i, s])
+            carrera.cupos_asignados += int(usados[i].sum())
+
+    def _construir_resultados(
+        self,
+        asignador: AsignadorArreglos,
+        aspirantes: List[Aspirante],
+        carreras: List[Carrera],
+        prioridades: np.ndarray,
+        segmentos: List[str]
+    ) -> List[AsignacionResultado]:
+        carrera_asignada = asignador.carrera_asignada.tolist()
+        segmento_asignado = asignador.segmento_asignado.tolist()
+        # Prioridad de la elección con que obtuvo cupo cada aspirante
+        asignados = asignador.carrera_asignada >= 0
+        prioridad_asignada = np.zeros(len(prioridades), dtype=np.int64)
+        prioridad_asignada[asignados] = prioridades[asignados, asignador.posicion_asignada[asignados]]
+        prioridad_asignada = prioridad_asignada.tolist()
+
+        resultados = []
+        for i in asignador.secuencia:
+            aspirante = aspirantes[i]
+            carrera = carreras[carrera_asignada[i]]
+            resultados.append(AsignacionResultado(
+                id_aspirante=aspirante.id,
+                puntaje_postulacion=aspirante.puntaje_postulacion,
+                segmento_asignado=segmentos[segmento_asignado[i]],
+                prioridad_asignada=prioridad_asignada[i],
+                id_carrera_asignada=carrera.id,
+                nombre_carrera_asignada=carrera.nombre
+            ))
+        return resultados
@@ -1,5 +1,5 @@
 import abc
-from typing import Protocol
+from typing import List, Optional, Protocol
 from app.core.models.aspirante import Aspirante
 
 class IManejadorSegmento(Protocol):
@@ -15,3 +15,11 @@ class IManejadorSegmento(Protocol):
     def get_segmento_key(self) -> str:
         """Retorna la clave del cupo para este segmento (ej. 'OFERTA_MERITO_ACADEMICO')."""
         ...
+
+    def condiciones_requeridas(self) -> Optional[List[str]]:
+        """
+        Criterio en forma evaluable en bloque: columnas de condición que el
+        aspirante debe tener todas (lista vacía: todos califican).
+        None indica que el criterio solo se evalúa con cumple_criterio.
+        """
+        return None
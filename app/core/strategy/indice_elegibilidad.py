@@ -0,0 +1,89 @@
+from typing import List, Mapping, Optional
+import numpy as np
+from app.core.models.aspirante import Aspirante
+from app.core.strategy.i_manejador_segmento import IManejadorSegmento
+
+def evaluar_elegibilidad(aspirantes: List[Aspirante], manejadores: List[IManejadorSegmento]) -> np.ndarray:
+    """
+    Máscara de bits (A,) donde el bit s indica que el aspirante cumple el
+    criterio del manejador s. Los manejadores que declaran sus condiciones
+    se evalúan en bloque sobre las máscaras de condiciones; el resto, con
+    cumple_criterio por aspirante.
+    """
+    n = len(aspirantes)
+    registro = aspirantes[0].registro if aspirantes else None
+    mascaras = None
+    elegibilidad = np.zeros(n, dtype=np.int64)
+    for s, manejador in enumerate(manejadores):
+        requeridas = manejador.condiciones_requeridas()
+        if requeridas is not None and registro is not None:
+            if any(c not in registro for c in requeridas):
+                # Una condición sin columna nunca se cumple
+                continue
+            if mascaras is None:
+                mascaras = np.fromiter((a.mascara_condiciones for a in aspirantes), dtype=np.int64, count=n)
+            bits = 0
+            for c in requeridas:
+                bits |= 1 << registro.bit(c)
+            cumple = (mascaras & bits) == bits
+        else:
+            cumple = np.fromiter(
+                (bool(manejador.cumple_criterio(a)) for a in aspirantes),
+                dtype=bool, count=n
+            )
+        elegibilidad |= cumple.astype(np.int64) << s
+    return elegibilidad
+
+def evaluar_elegibilidad_columnas(
+    condiciones: Mapping[str, np.ndarray],
+    num_aspirantes: int,
+    manejadores: List[IManejadorSegmento]
+) -> np.ndarray:
+    """
+    Igual que evaluar_elegibilidad, pero sobre las columnas booleanas de
+    condiciones (DatosColumnares.condiciones), sin construir aspirantes.
+    Solo admite manejadores que declaran sus condiciones.
+    """
+    elegibilidad = np.zeros(num_aspirantes, dtype=np.int64)
+    for s, manejador in enumerate(manejadores):
+        requeridas = manejador.condiciones_requeridas()
+        if requeridas is None:
+            raise ValueError(
+                f"El manejador {type(manejador).__name__} no declara sus condiciones; "
+                "no puede evaluarse sobre columnas."
+            )
+        if any(c not in condiciones for c in requeridas):
+            continue
+        cumple = np.ones(num_aspirantes, dtype=bool)
+        for c in requeridas:
+            cumple &= np.asarray(condiciones[c], dtype=bool)
+        elegibilidad |= cumple.astype(np.int64) << s
+    return elegibilidad
+
+class IndiceElegibilidad:
+    """
+    Índice construido una vez por proceso: para cada segmento, los índices
+    de sus aspirantes elegibles en orden de mérito ('orden', de orden_merito;
+    si no se indica, puntaje descendente y, a igual puntaje, orden de carga).
+    Cada pasada de segmento recorre solo su lista.
+    """
+    def __init__(
+        self,
+        aspirantes: List[Aspirante],
+        puntajes: np.ndarray,
+        manejadores: List[IManejadorSegmento],
+        orden: Optional[np.ndarray] = None
+    ):
+        if orden is None:
+            orden = np.argsort(-np.asarray(puntajes, dtype=np.float64), kind='stable')
+        self.orden = orden
+        self.elegibilidad = evaluar_elegibilidad(aspirantes, manejadores)
+        elegibilidad_ordenada = self.elegibilidad[self.orden]
+        self._por_segmento = [
+            self.orden[((elegibilidad_ordenada >> s) & 1).astype(bool)]
+            for s in range(len(manejadores))
+        ]
+
+    def segmento(self, indice_segmento: int) -> np.ndarray:
+        """Aspirantes elegibles del segmento, en orden de mérito."""
+        return self._por_segmento[indice_segmento]
@@ -0,0 +1,131 @@
+from collections import deque
+from dataclasses import replace
+from typing import List, Tuple
+import numpy as np
+from app.core.models.estado_asignacion import EstadoAsignacion
+from app.core.models.listas_espera import ListasEspera
+
+def construir_listas_espera(estado: EstadoAsignacion, profundidad: int) -> ListasEspera:
+    """
+    Listas de espera de una asignación terminada: en cada bolsa (carrera,
+    segmento), los 'profundidad' mejores aspirantes elegibles en el segmento
+    que prefieren esa carrera a la que obtuvieron (o no obtuvieron cupo),
+    en orden de mérito (el rango de mérito del estado).
+    Se procesa un segmento a la vez, truncando antes de unir, para que la
+    memoria dependa de la profundidad y no de las combinaciones posibles.
+    """
+    if profundidad <= 0:
+        raise ValueError(f"La profundidad de las listas de espera debe ser positiva (recibida: {profundidad}).")
+    num_carreras, num_segmentos = estado.cupos_iniciales.shape
+    rango = estado.rango_merito
+    filas, posiciones = np.nonzero(estado.elecciones_preferidas())
+    carreras = estado.elecciones[filas, posiciones]
+
+    partes = []
+    for s in range(num_segmentos):
+        elegibles = ((estado.elegibilidad[filas] >> s) & 1).astype(bool)
+        a, p, c = filas[elegibles], posiciones[elegibles], carreras[elegibles]
+        orden_lista = np.lexsort((rango[a], c))
+        a, p, c = a[orden_lista], p[orden_lista], c[orden_lista]
+        # Posición de cada entrada dentro de la lista de su carrera
+        inicio_carrera = np.searchsorted(c, c, side='left')
+        conservar = np.arange(len(c)) - inicio_carrera < profundidad
+        partes.append((c[conservar] * num_segmentos + s, a[conservar], p[conservar]))
+
+    bolsas = np.concatenate([b for b, _, _ in partes]) if partes else np.empty(0, dtype=np.int64)
+    orden_bolsa = np.argsort(bolsas, kind='stable')
+    inicio = np.zeros(num_carreras * num_segmentos + 1, dtype=np.int64)
+    inicio[1:] = np.cumsum(np.bincount(bolsas, minlength=num_carreras * num_segmentos))
+    return ListasEspera(
+        profundidad=profundidad,
+        inicio=inicio,
+        aspirantes=np.concatenate([a for _, a, _ in partes])[orden_bolsa].astype(np.int64),
+        posiciones=np.concatenate([p for _, _, p in partes])[orden_bolsa].astype(np.int64),
+        siguiente=inicio[:-1].copy(),
+    )
+
+class ProcesadorDeclinaciones:
+    """
+    Cubre los cupos que liberan los aspirantes que declinan promoviendo desde
+    las listas de espera, sin repetir la asignación.
+
+    Cada cupo liberado se ofrece al primer aspirante pendiente de la lista de
+    su bolsa que aún prefiera esa carrera a la que tiene; si tenía cupo, lo
+    libera y ese cupo se ofrece a su vez (cascada). Las entradas recorridas se
+    consumen: un aspirante que ya tiene una elección igual o mejor no vuelve
+    a necesitarla. Si una lista se agota, el cupo queda vacante.
+
+    Quien declina queda sin segmentos elegibles en el nuevo estado, de modo
+    que no vuelve a ser promovido en lotes posteriores ni en una
+    reasignación incremental.
+    """
+    def __init__(self, estado: EstadoAsignacion):
+        if estado.listas_espera is None:
+            raise ValueError(
+                "El estado guardado no tiene listas de espera; ejecute el proceso "
+                "completo con 'profundidad_listas_espera' mayor que 0."
+            )
+        self.estado = estado
+        self.promovidos = 0
+        self.vacantes = 0
+        # (aspirante, bolsa anterior o -1, bolsa nueva)
+        self.movimientos: List[Tuple[int, int, int]] = []
+
+    def procesar(self, declinan: np.ndarray) -> EstadoAsignacion:
+        """'declinan' son índices (orden de carga) de aspirantes que renuncian a su cupo."""
+        estado = self.estado
+        listas = estado.listas_espera
+        num_segmentos = len(estado.segmentos)
+        sin_eleccion = estado.elecciones.shape[1]
+
+        carrera_asignada = estado.carrera_asignada.copy()
+        segmento_asignado = estado.segmento_asignado.copy()
+        posicion_asignada = estado.posicion_asignada.copy()
+        siguiente = listas.siguiente.copy()
+        inicio = listas.inicio.tolist()
+        aspirantes = listas.aspirantes.tolist()
+        posiciones = listas.posiciones.tolist()
+
+        elegibilidad = estado.elegibilidad.copy()
+        elegibilidad[declinan] = 0
+        liberados = deque()
+        for a in declinan.tolist():
+            if carrera_asignada[a] >= 0:
+                liberados.append(int(carrera_asignada[a]) * num_segmentos + int(segmento_asignado[a]))
+                self.movimientos.append((a, liberados[-1], -1))
+                carrera_asignada[a] = segmento_asignado[a] = posicion_asignada[a] = -1
+
+        while liberados:
+            bolsa = liberados.popleft()
+            cubierto = False
+            j = int(siguiente[bolsa])
+            while j < inicio[bolsa + 1] and not cubierto:
+                a, posicion = aspirantes[j], posiciones[j]
+                j += 1
+                if elegibilidad[a] == 0:
+                    continue
+                actual = posicion_asignada[a] if carrera_asignada[a] >= 0 else sin_eleccion
+                if posicion >= actual:
+                    continue
+                anterior = -1
+                if carrera_asignada[a] >= 0:
+                    anterior = int(carrera_asignada[a]) * num_segmentos + int(segmento_asignado[a])
+                    liberados.append(anterior)
+                carrera_asignada[a], segmento_asignado[a] = divmod(bolsa, num_segmentos)
+                posicion_asignada[a] = posicion
+                self.movimientos.append((a, anterior, bolsa))
+                self.promovidos += 1
+                cubierto = True
+            siguiente[bolsa] = j
+            if not cubierto:
+                self.vacantes += 1
+
+        self.estado = replace(
+            estado,
+            elegibilidad=elegibilidad,
+            carrera_asignada=carrera_asignada,
+            segmento_asignado=segmento_asignado,
+            posicion_asignada=posicion_asignada,
+            listas_espera=replace(listas, siguiente=siguiente),
+        )
+        return self.estado
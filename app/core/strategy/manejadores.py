@@ -1,59 +1,73 @@
+from typing import List, Tuple
 from app.core.strategy.i_manejador_segmento import IManejadorSegmento
 from app.core.models.aspirante import Aspirante
 
 """
 Implementaciones de los manejadores para cada segmento del Art. 52.
-Las claves de 'condiciones' y 'segmento_key' provienen del config.json.
+Las columnas de condición y 'segmento_key' provienen del config.json.
 """
 
-class ManejadorPoliticaCuotas(IManejadorSegmento):
-    """Segmento 1: Grupo de política de cuotas."""
+class ManejadorPorCondiciones(IManejadorSegmento):
+    """
+    Manejador cuyo criterio es tener todas las condiciones de CONDICIONES.
+    Al declararse como datos, el criterio puede evaluarse en bloque sobre
+    las máscaras de condiciones de toda la cohorte.
+    """
+    CONDICIONES: Tuple[str, ...] = ()
+    SEGMENTO_KEY: str = ""
+
     def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        # Asumimos que cuotas es para 'PUEBLO_NACIONALIDAD'
-        return aspirante.condiciones.get("PUEBLO_NACIONALIDAD", False)
+        return all(aspirante.tiene_condicion(c) for c in self.CONDICIONES)
     def get_segmento_key(self) -> str:
-        return "OFERTA_POLITICA_CUOTAS"
+        return self.SEGMENTO_KEY
+    def condiciones_requeridas(self) -> List[str]:
+        return list(self.CONDICIONES)
 
-class ManejadorVulnerabilidad(IManejadorSegmento):
+class ManejadorPoliticaCuotas(ManejadorPorCondiciones):
+    """Segmento 1: Grupo de política de cuotas."""
+    # Asumimos que cuotas es para 'PUEBLO_NACIONALIDAD'
+    CONDICIONES = ("PUEBLO_NACIONALIDAD",)
+    SEGMENTO_KEY = "OFERTA_POLITICA_CUOTAS"
+
+class ManejadorVulnerabilidad(ManejadorPorCondiciones):
     """Segmento 2: Grupo de mayor vulnerabilidad socioeconómica."""
-    def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        return aspirante.condiciones.get("CONDICION_SOCIOECONOMICA_POBREZA", False)
-    def get_segmento_key(self) -> str:
-        return "OFERTA_VULNERABILIDAD_SOCIOECONOMICA"
+    CONDICIONES = ("CONDICION_SOCIOECONOMICA_POBREZA",)
+    SEGMENTO_KEY = "OFERTA_VULNERABILIDAD_SOCIOECONOMICA"
 
-class ManejadorMeritoAcademico(IManejadorSegmento):
+class ManejadorMeritoAcademico(ManejadorPorCondiciones):
     """Segmento 3: Grupo de Mérito Académico."""
-    def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        return aspirante.condiciones.get("MERITO_ACADEMICO", False)
-    def get_segmento_key(self) -> str:
-        return "OFERTA_MERITO_ACADEMICO"
+    CONDICIONES = ("MERITO_ACADEMICO",)
+    SEGMENTO_KEY = "OFERTA_MERITO_ACADEMICO"
 
-class ManejadorOtrosReconocimientos(IManejadorSegmento):
+class ManejadorOtrosReconocimientos(ManejadorPorCondiciones):
     """Segmento 4: Grupo de Otros Reconocimientos al Mérito."""
-    def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        return aspirante.condiciones.get("OTROS_RECONOCIMIENTOS", False)
-    def get_segmento_key(self) -> str:
-        return "OFERTA_OTROS_RECONOCIMIENTOS"
+    CONDICIONES = ("OTROS_RECONOCIMIENTOS",)
+    SEGMENTO_KEY = "OFERTA_OTROS_RECONOCIMIENTOS"
 
-class ManejadorBachilleresPN(IManejadorSegmento):
+class ManejadorBachilleresPN(ManejadorPorCondiciones):
     """Segmento 5a: Bachilleres (Pueblos y Nacionalidades)."""
-    def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        es_bachiller_curso = aspirante.condiciones.get("BACHILLER_CURSO_ACTUAL", False)
-        es_pn = aspirante.condiciones.get("PUEBLO_NACIONALIDAD", False)
-        return es_bachiller_curso and es_pn
-    def get_segmento_key(self) -> str:
-        return "OFERTA_BACHILLER_P_N"
+    CONDICIONES = ("BACHILLER_CURSO_ACTUAL", "PUEBLO_NACIONALIDAD")
+    SEGMENTO_KEY = "OFERTA_BACHILLER_P_N"
 
-class ManejadorBachilleresCurso(IManejadorSegmento):
+class ManejadorBachilleresCurso(ManejadorPorCondiciones):
     """Segmento 5b: Bachilleres del último régimen."""
-    def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        return aspirante.condiciones.get("BACHILLER_CURSO_ACTUAL", False)
-    def get_segmento_key(self) -> str:
-        return "OFERTA_BACHILLER_CURSO"
+    CONDICIONES = ("BACHILLER_CURSO_ACTUAL",)
+    SEGMENTO_KEY = "OFERTA_BACHILLER_CURSO"
 
-class ManejadorGeneral(IManejadorSegmento):
+class ManejadorGeneral(ManejadorPorCondiciones):
     """Segmento 6: Población general."""
-    def cumple_criterio(self, aspirante: Aspirante) -> bool:
-        return True # Todos los que quedan pertenecen a este grupo
-    def get_segmento_key(self) -> str:
-        return "OFERTA_GENERAL"
+    # Sin condiciones: todos los que quedan pertenecen a este grupo
+    CONDICIONES = ()
+    SEGMENTO_KEY = "OFERTA_GENERAL"
+
+def crear_manejadores_art_52() -> List[IManejadorSegmento]:
+    """Manejadores del Art. 52; el orden de la lista es la prioridad de los segmentos."""
+    return [
+        ManejadorPoliticaCuotas(),
+        ManejadorVulnerabilidad(),
+        ManejadorMeritoAcademico(),
+        ManejadorOtrosReconocimientos(),
+        ManejadorBachilleresPN(),
+        ManejadorBachilleresCurso(),
+        ManejadorGeneral()
+    ]
@@ -0,0 +1,161 @@
+from heapq import heappush, heapreplace
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Orden en que cada aspirante recorre los pares (carrera, segmento)
+ORDENES_PREFERENCIA = ('carrera', 'segmento')
+# Destino de los cupos reservados que quedan libres al final de una ronda
+POLITICAS_RECICLAJE = ('ninguno', 'general', 'siguiente_segmento')
+
+class AsignadorAceptacionDiferida:
+    """
+    Aceptación diferida (propuesta por los aspirantes) sobre bolsas de cupos
+    (carrera, segmento), en varias rondas.
+
+    - puntajes, elegibilidad, elecciones y cupos tienen el mismo formato que
+      en AsignadorArreglos (elecciones usa SIN_ELECCION / CARRERA_INEXISTENTE).
+    - orden_preferencias 'carrera': el aspirante prueba su 1.ª carrera en
+      todos sus segmentos (en orden del Art. 52) antes de pasar a la 2.ª;
+      'segmento': prueba todas sus carreras en un segmento antes del
+      siguiente, que equivale al recorrido por segmentos del Art. 52.
+    - orden: orden de mérito (de orden_merito); por omisión, puntaje
+      descendente y orden de carga.
+
+    Cada bolsa mantiene un montículo con sus admitidos, cuya cima es el de
+    menor mérito; un proponente mejor lo desplaza y el desplazado continúa
+    desde su siguiente preferencia. Los aspirantes proponen en orden de
+    mérito, así que con la prioridad común (puntaje) no hay desplazamientos
+    y cada propuesta se resuelve en O(log cupos).
+
+    Las asignaciones de una ronda son definitivas; las rondas siguientes
+    reparten entre los aspirantes restantes los cupos que quedan y los que
+    libere reciclar().
+    """
+    def __init__(
+        self,
+        puntajes: np.ndarray,
+        elegibilidad: np.ndarray,
+        elecciones: np.ndarray,
+        cupos: np.ndarray,
+        orden_preferencias: str = 'carrera',
+        orden: Optional[np.ndarray] = None
+    ):
+        if orden_preferencias not in ORDENES_PREFERENCIA:
+            raise ValueError(f"orden_preferencias no soportado: {orden_preferencias}")
+        self.orden_preferencias = orden_preferencias
+        self.elegibilidad = elegibilidad
+        self.elecciones = elecciones
+        self.cupos = cupos.astype(np.int64, copy=True)
+        self.num_segmentos = self.cupos.shape[1]
+
+        num_aspirantes = len(puntajes)
+        self.orden = np.argsort(-puntajes, kind='stable') if orden is None else orden
+        self.carrera_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.segmento_asignado = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.posicion_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.ronda_asignada = np.zeros(num_aspirantes, dtype=np.int64)
+        self.propuestas = 0
+
+    def ejecutar_ronda(self, ronda: int) -> np.ndarray:
+        """
+        Asigna a los aspirantes aún sin cupo con los cupos disponibles.
+        Retorna los nuevos asignados en orden de mérito.
+        """
+        libres = self.orden[self.carrera_asignada[self.orden] < 0]
+        # Índice local i = posición de mérito entre los libres (menor es mejor)
+        filas = self.elecciones[libres].tolist()
+        segmentos_de = self._segmentos_por_aspirante(self.elegibilidad[libres])
+        num_segmentos = self.num_segmentos
+        por_carrera = self.orden_preferencias == 'carrera'
+        capacidad = self.cupos.ravel().tolist()
+
+        montones: Dict[int, List[int]] = {}
+        bolsa_de = [-1] * len(libres)
+        posicion_de = [-1] * len(libres)
+        siguiente = [0] * len(libres)
+        pila = list(range(len(libres) - 1, -1, -1))
+        propuestas = 0
+
+        while pila:
+            i = pila.pop()
+            fila = filas[i]
+            segmentos = segmentos_de[i]
+            num_elecciones = len(fila)
+            num_propios = len(segmentos)
+            p = siguiente[i]
+            total = num_elecciones * num_propios
+            while p < total:
+                if por_carrera:
+                    k, j = divmod(p, num_propios)
+                else:
+                    j, k = divmod(p, num_elecciones)
+                p += 1
+                carrera = fila[k]
+                if carrera < 0:
+                    continue
+                bolsa = carrera * num_segmentos + segmentos[j]
+                cupo = capacidad[bolsa]
+                if cupo == 0:
+                    continue
+                propuestas += 1
+                monton = montones.get(bolsa)
+                if monton is None:
+                    monton = montones[bolsa] = []
+                if len(monton) < cupo:
+                    heappush(monton, -i)
+                elif -monton[0] > i:
+                    # Desplaza al admitido de menor mérito, que vuelve a proponer
+                    desplazado = -heapreplace(monton, -i)
+                    bolsa_de[desplazado] = -1
+                    pila.append(desplazado)
+                else:
+                    continue
+                bolsa_de[i] = bolsa
+                posicion_de[i] = k
+                break
+            siguiente[i] = p
+        self.propuestas += propuestas
+
+        bolsas = np.array(bolsa_de, dtype=np.int64)
+        admitidos = np.flatnonzero(bolsas >= 0)
+        nuevos = libres[admitidos]
+        carreras, segmentos = np.divmod(bolsas[admitidos], num_segmentos)
+        self.carrera_asignada[nuevos] = carreras
+        self.segmento_asignado[nuevos] = segmentos
+        self.posicion_asignada[nuevos] = np.array(posicion_de, dtype=np.int64)[admitidos]
+        self.ronda_asignada[nuevos] = ronda
+        np.subtract.at(self.cupos, (carreras, segmentos), 1)
+        return nuevos
+
+    def reciclar(self, politica: str) -> int:
+        """
+        Mueve los cupos libres de los segmentos reservados (todos menos el
+        último) según la política. Retorna el número de cupos movidos.
+        - 'general': al último segmento (OFERTA_GENERAL).
+        - 'siguiente_segmento': al segmento inmediatamente posterior.
+        """
+        if politica not in POLITICAS_RECICLAJE:
+            raise ValueError(f"Política de reciclaje no soportada: {politica}")
+        reservados = self.cupos[:, :-1].copy()
+        movidos = int(reservados.sum())
+        if politica == 'ninguno' or movidos == 0:
+            return 0
+        self.cupos[:, :-1] = 0
+        if politica == 'general':
+            self.cupos[:, -1] += reservados.sum(axis=1)
+        else:
+            self.cupos[:, 1:] += reservados
+        return movidos
+
+    @property
+    def num_sin_asignar(self) -> int:
+        return int((self.carrera_asignada < 0).sum())
+
+    def _segmentos_por_aspirante(self, elegibilidad: np.ndarray) -> List[Tuple[int, ...]]:
+        """Segmentos de cada aspirante en orden; se comparte una tupla por máscara distinta."""
+        mascaras, codigos = np.unique(elegibilidad, return_inverse=True)
+        tuplas = [
+            tuple(s for s in range(self.num_segmentos) if (int(m) >> s) & 1)
+            for m in mascaras.tolist()
+        ]
+        return [tuplas[c] for c in codigos.tolist()]
@@ -0,0 +1,119 @@
+from typing import List, Optional
+import numpy as np
+
+# Valores especiales en la matriz de elecciones
+SIN_ELECCION = -1       # El aspirante tiene menos postulaciones que columnas
+CARRERA_INEXISTENTE = -2  # El OFA_ID postulado no existe en la oferta
+
+class AsignadorArreglos:
+    """
+    Núcleo de asignación del Art. 52 sobre arreglos NumPy.
+
+    - puntajes: (A,) puntaje de postulación por aspirante.
+    - elegibilidad: (A,) máscara de bits; el bit s indica que el aspirante
+      pertenece al segmento s.
+    - elecciones: (A, K) índices de carrera ordenados por prioridad; las
+      elecciones inválidas (SIN_ELECCION, CARRERA_INEXISTENTE) se saltan sin
+      reportarlas: las postulaciones llegan depuradas.
+    - cupos: (C, S) cupos disponibles por carrera y segmento (se copia).
+
+    El orden de proceso dentro de cada segmento es 'orden' (de orden_merito)
+    o, si no se indica, puntaje descendente y, a igual puntaje, el orden de
+    carga de los aspirantes.
+    """
+    def __init__(
+        self,
+        puntajes: np.ndarray,
+        elegibilidad: np.ndarray,
+        elecciones: np.ndarray,
+        cupos: np.ndarray,
+        orden: Optional[np.ndarray] = None
+    ):
+        self.puntajes = puntajes
+        self.elegibilidad = elegibilidad
+        self.elecciones = elecciones
+        self.cupos = cupos.astype(np.int64, copy=True)
+
+        num_aspirantes = len(puntajes)
+        self.orden = np.argsort(-puntajes, kind='stable') if orden is None else orden
+        self.carrera_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.segmento_asignado = np.full(num_aspirantes, -1, dtype=np.int64)
+        self.posicion_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+        # Índices de aspirantes en el orden en que obtuvieron su cupo
+        self.secuencia: List[int] = []
+        # Intentos de tomar un cupo (elecciones válidas probadas) por segmento
+        self.intentos_segmento: List[int] = [0] * self.cupos.shape[1]
+
+    def candidatos_segmento(self, segmento: int) -> np.ndarray:
+        """Aspirantes elegibles y sin cupo para el segmento, en orden de mérito."""
+        elegibles = ((self.elegibilidad[self.orden] >> segmento) & 1).astype(bool)
+        sin_asignar = self.carrera_asignada[self.orden] < 0
+        return self.orden[elegibles & sin_asignar]
+
+    def asignar_segmento(self, segmento: int, candidatos: np.ndarray) -> int:
+        """
+        Recorre los candidatos en orden e intenta ubicarlos en sus elecciones
+        usando solo los cupos del segmento. Retorna el número de asignados.
+        """
+        if len(candidatos) == 0:
+            return 0
+
+        cupos_segmento = self.cupos[:, segmento].tolist()
+        restantes = sum(cupos_segmento)
+        inicio_secuencia = len(self.secuencia)
+        self._contar_intentos(segmento, candidatos)
+
+        # Descartamos en bloque a quienes no tienen ninguna elección con cupo
+        # (los cupos de un segmento solo disminuyen durante su recorrido)
+        # Los índices negativos (-1, -2) caen en los dos ceros añadidos al final
+        filas = self.elecciones[candidatos]
+        con_cupo = np.append(self.cupos[:, segmento], [0, 0])[filas] > 0
+        utiles = con_cupo.any(axis=1)
+        candidatos = candidatos[utiles]
+        filas = filas[utiles]
+
+        # Una sola lista plana de enteros (fila k en [k*ancho, (k+1)*ancho)): no
+        # crea una lista por candidato que el recolector de basura deba recorrer
+        ancho = filas.shape[1]
+        planas = filas.ravel().tolist()
+        pendientes = candidatos.tolist()
+        asignados = 0
+        procesados = 0
+        for aspirante in pendientes:
+            if restantes == 0:
+                break
+            inicio = procesados * ancho
+            procesados += 1
+            for posicion in range(ancho):
+                carrera = planas[inicio + posicion]
+                if carrera < 0:
+                    continue
+                if cupos_segmento[carrera] > 0:
+                    cupos_segmento[carrera] -= 1
+                    restantes -= 1
+                    self.carrera_asignada[aspirante] = carrera
+                    self.segmento_asignado[aspirante] = segmento
+                    self.posicion_asignada[aspirante] = posicion
+                    self.secuencia.append(aspirante)
+                    asignados += 1
+                    break
+
+        self.cupos[:, segmento] = cupos_segmento
+        self._descontar_intentos(segmento, self.secuencia[inicio_secuencia:])
+        return asignados
+
+    def _contar_intentos(self, segmento: int, candidatos: np.ndarray) -> None:
+        """Todo candidato sin cupo prueba cada una de sus elecciones válidas."""
+        self.intentos_segmento[segmento] += int((self.elecciones[candidatos] >= 0).sum())
+
+    def _descontar_intentos(self, segmento: int, asignados: List[int]) -> None:
+        """Quien obtuvo cupo no llega a probar las elecciones posteriores."""
+        if not asignados:
+            return
+        filas = self.elecciones[asignados]
+        posteriores = np.arange(filas.shape[1]) > self.posicion_asignada[asignados][:, None]
+        self.intentos_segmento[segmento] -= int(((filas >= 0) & posteriores).sum())
+
+    @property
+    def num_sin_asignar(self) -> int:
+        return int((self.carrera_asignada < 0).sum())
@@ -0,0 +1,46 @@
+from typing import Optional, Sequence
+import numpy as np
+
+def orden_merito(
+    puntajes: np.ndarray,
+    criterios_desempate: Sequence[str] = (),
+    evaluacion: Optional[np.ndarray] = None,
+    antecedentes: Optional[np.ndarray] = None,
+    codigos_id: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Índices de los aspirantes en orden de mérito: puntaje descendente y, a
+    igual puntaje, los criterios de desempate en el orden dado
+    ('evaluacion' y 'antecedentes' descendentes, 'id_aspirante' ascendente
+    como texto) y por último el orden de carga. Con 'id_aspirante' el orden
+    no depende del orden de las filas de entrada.
+    Solo se requieren las columnas que usan los criterios; 'codigos_id' son
+    los de codigos_identificacion.
+    """
+    puntajes = np.asarray(puntajes, dtype=np.float64)
+    if not criterios_desempate:
+        return np.argsort(-puntajes, kind='stable')
+
+    columnas = {
+        'evaluacion': lambda: -np.asarray(evaluacion, dtype=np.float64),
+        'antecedentes': lambda: -np.asarray(antecedentes, dtype=np.float64),
+        'id_aspirante': lambda: np.asarray(codigos_id),
+    }
+    # lexsort ordena por la última clave y es estable (conserva el orden de carga)
+    claves = [columnas[criterio]() for criterio in reversed(criterios_desempate)]
+    return np.lexsort(claves + [-puntajes])
+
+def codigos_identificacion(ids_aspirante: np.ndarray) -> np.ndarray:
+    """
+    Código entero de cada identificación que respeta su orden como texto
+    (su posición al ordenarlas; las repetidas conservan el orden de carga).
+    """
+    # Ordenar como arreglo de texto de ancho fijo es varias veces más rápido que como objetos
+    textos = np.asarray(ids_aspirante, dtype=object).astype(str)
+    return rango_merito(np.argsort(textos, kind='stable'))
+
+def rango_merito(orden: np.ndarray) -> np.ndarray:
+    """Posición de mérito (0 es la mejor) de cada aspirante a partir de su orden."""
+    rango = np.empty_like(orden)
+    rango[orden] = np.arange(len(orden))
+    return rango
@@ -0,0 +1,427 @@
+from dataclasses import replace
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from app.core.models.aspirante import Aspirante
+from app.core.models.carrera import Carrera
+from app.core.models.datos_columnares import DatosColumnares
+from app.core.models.estado_asignacion import EstadoAsignacion
+from app.core.models.postulacion import AsignacionResultado
+from app.core.strategy.i_manejador_segmento import IManejadorSegmento
+from app.core.strategy.indice_elegibilidad import evaluar_elegibilidad
+from app.core.strategy.motor_arreglos import SIN_ELECCION, CARRERA_INEXISTENTE
+from app.core.strategy.orden_merito import orden_merito, codigos_identificacion, rango_merito
+
+def codificar_elecciones(
+    aspirantes: List[Aspirante],
+    indice_carrera: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Matrices (A, K) de índices de carrera y de prioridades, por orden de prioridad."""
+    num_aspirantes = len(aspirantes)
+    longitudes = np.fromiter((len(a.postulaciones) for a in aspirantes), dtype=np.int64, count=num_aspirantes)
+    total = int(longitudes.sum())
+    max_elecciones = int(longitudes.max()) if num_aspirantes else 0
+    elecciones = np.full((num_aspirantes, max_elecciones), SIN_ELECCION, dtype=np.int64)
+    prioridades = np.zeros((num_aspirantes, max_elecciones), dtype=np.int64)
+    if total == 0:
+        return elecciones, prioridades
+
+    # Todas las postulaciones en un solo arreglo; los OFA_ID se traducen una vez por valor distinto
+    codigos, ids_distintos = pd.factorize(
+        np.array([p.id_carrera for a in aspirantes for p in a.postulaciones], dtype=object)
+    )
+    traduccion = np.array([indice_carrera.get(c, CARRERA_INEXISTENTE) for c in ids_distintos], dtype=np.int64)
+    prioridad = np.fromiter(
+        (p.prioridad for a in aspirantes for p in a.postulaciones), dtype=np.int64, count=total
+    )
+    fila = np.repeat(np.arange(num_aspirantes), longitudes)
+    # Orden estable por prioridad dentro de cada aspirante, como get_postulaciones_ordenadas
+    orden = np.lexsort((prioridad, fila))
+    columna = np.arange(total) - np.repeat(np.cumsum(longitudes) - longitudes, longitudes)
+    elecciones[fila, columna] = traduccion[codigos[orden]]
+    prioridades[fila, columna] = prioridad[orden]
+    return elecciones, prioridades
+
+def codificar_elecciones_columnas(datos: DatosColumnares) -> Tuple[np.ndarray, np.ndarray]:
+    """Como codificar_elecciones, a partir de DatosColumnares (postulaciones ya ordenadas por prioridad)."""
+    indice_carrera = {id_carrera: i for i, id_carrera in enumerate(datos.ids_carrera.tolist())}
+    codigos, unicos = pd.factorize(datos.postulacion_carrera)
+    indices = np.array([indice_carrera.get(u, CARRERA_INEXISTENTE) for u in unicos.tolist()], dtype=np.int64)
+
+    largos = np.diff(datos.inicio_postulaciones)
+    ancho = int(largos.max(initial=0))
+    elecciones = np.full((datos.num_aspirantes, ancho), SIN_ELECCION, dtype=np.int64)
+    prioridades = np.zeros((datos.num_aspirantes, ancho), dtype=np.int64)
+    filas = np.repeat(np.arange(datos.num_aspirantes), largos)
+    posiciones = np.arange(len(codigos)) - np.repeat(datos.inicio_postulaciones[:-1], largos)
+    elecciones[filas, posiciones] = indices[codigos]
+    prioridades[filas, posiciones] = datos.postulacion_prioridad
+    return elecciones, prioridades
+
+def construir_estado(
+    aspirantes: List[Aspirante],
+    carreras: List[Carrera],
+    resultados: List[AsignacionResultado],
+    manejadores: List[IManejadorSegmento],
+    huella_normativa: str,
+    criterios_desempate: Sequence[str] = ()
+) -> EstadoAsignacion:
+    """
+    Estado de una ejecución terminada. Los aspirantes ya tienen su puntaje y
+    las carreras sus cupos restantes; los cupos iniciales se reconstruyen
+    sumando lo asignado.
+    """
+    segmentos = [m.get_segmento_key() for m in manejadores]
+    indice_segmento = {s: j for j, s in enumerate(segmentos)}
+    indice_carrera = {c.id: i for i, c in enumerate(carreras)}
+    indice_aspirante = {a.id: i for i, a in enumerate(aspirantes)}
+    elecciones, prioridades = codificar_elecciones(aspirantes, indice_carrera)
+
+    num_aspirantes = len(aspirantes)
+    carrera_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+    segmento_asignado = np.full(num_aspirantes, -1, dtype=np.int64)
+    posicion_asignada = np.full(num_aspirantes, -1, dtype=np.int64)
+    if resultados:
+        filas = np.array([indice_aspirante[r.id_aspirante] for r in resultados], dtype=np.int64)
+        carrera_asignada[filas] = [indice_carrera[r.id_carrera_asignada] for r in resultados]
+        segmento_asignado[filas] = [indice_segmento[r.segmento_asignado] for r in resultados]
+        prioridad_asignada = np.array([r.prioridad_asignada for r in resultados], dtype=np.int64)
+        # Primera elección del aspirante con esa carrera y esa prioridad
+        posicion_asignada[filas] = np.argmax(
+            (prioridades[filas] == prioridad_asignada[:, None])
+            & (elecciones[filas] == carrera_asignada[filas][:, None]),
+            axis=1
+        )
+
+    cupos_iniciales = np.array(
+        [[c.cupos_segmentados.get(s, 0) for s in segmentos] for c in carreras], dtype=np.int64
+    ).reshape(len(carreras), len(segmentos))
+    asignados = carrera_asignada >= 0
+    np.add.at(cupos_iniciales, (carrera_asignada[asignados], segmento_asignado[asignados]), 1)
+
+    ids_aspirante = np.array([a.id for a in aspirantes], dtype=object)
+    puntajes = np.fromiter((a.puntaje_postulacion for a in aspirantes), dtype=np.float64, count=num_aspirantes)
+    evaluacion = np.fromiter((a.puntaje_evaluacion for a in aspirantes), dtype=np.float64, count=num_aspirantes)
+    antecedentes = np.fromiter((a.puntaje_antecedentes for a in aspirantes), dtype=np.float64, count=num_aspirantes)
+    codigos_id = codigos_identificacion(ids_aspirante) if 'id_aspirante' in criterios_desempate else None
+    orden = orden_merito(puntajes, criterios_desempate, evaluacion, antecedentes, codigos_id)
+
+    return EstadoAsignacion(
+        huella_normativa=huella_normativa,
+        criterios_desempate=list(criterios_desempate),
+        segmentos=segmentos,
+        ids_carrera=np.array([c.id for c in carreras], dtype=object),
+        nombres_carrera=np.array([c.nombre for c in carreras], dtype=object),
+        cupos_iniciales=cupos_iniciales,
+        ids_aspirante=ids_aspirante,
+        puntajes=puntajes,
+        evaluacion=evaluacion,
+        antecedentes=antecedentes,
+        rango_merito=rango_merito(orden),
+        elegibilidad=evaluar_elegibilidad(aspirantes, manejadores),
+        elecciones=elecciones,
+        prioridades=prioridades,
+        carrera_asignada=carrera_asignada,
+        segmento_asignado=segmento_asignado,
+        posicion_asignada=posicion_asignada,
+    )
+
+def resultados_desde_estado(estado: EstadoAsignacion) -> List[AsignacionResultado]:
+    """Asignaciones en el mismo orden que la estrategia por segmentos: segmento y mérito."""
+    rango = estado.rango_merito
+    asignados = np.flatnonzero(estado.carrera_asignada >= 0)
+    asignados = asignados[np.lexsort((rango[asignados], estado.segmento_asignado[asignados]))]
+
+    ids = estado.ids_aspirante
+    resultados = []
+    for i in asignados.tolist():
+        carrera = int(estado.carrera_asignada[i])
+        resultados.append(AsignacionResultado(
+            id_aspirante=ids[i],
+            puntaje_postulacion=float(estado.puntajes[i]),
+            segmento_asignado=estado.segmentos[estado.segmento_asignado[i]],
+            prioridad_asignada=int(estado.prioridades[i, estado.posicion_asignada[i]]),
+            id_carrera_asignada=estado.ids_carrera[carrera],
+            nombre_carrera_asignada=estado.nombres_carrera[carrera]
+        ))
+    return resultados
+
+class _BuscadorAfectados:
+    """
+    Busca, en orden de mérito, al siguiente aspirante no corregido que antes
+    de llegar a su asignación anterior (incluida; todas si no tenía) recorría
+    una bolsa marcada. Los arreglos vienen en orden de mérito. Se examina en
+    ventanas crecientes y lo encontrado se reutiliza mientras las bolsas
+    marcadas no cambien.
+    """
+    VENTANA_MINIMA = 256
+
+    def __init__(
+        self,
+        elecciones: np.ndarray,
+        elegibilidad: np.ndarray,
+        segmento_anterior: np.ndarray,
+        posicion_anterior: np.ndarray,
+        num_bolsas: int,
+        num_segmentos: int
+    ):
+        self.elecciones = np.maximum(elecciones, 0)
+        self.validas = elecciones >= 0
+        self.elegibilidad = elegibilidad
+        self.segmento_anterior = segmento_anterior
+        self.posicion_anterior = posicion_anterior
+        self.num_segmentos = num_segmentos
+        self.marcadas = np.zeros(num_bolsas, dtype=bool).reshape(-1, num_segmentos)
+        self.version = 0
+        # Última ventana examinada: (versión, inicio, fin, posiciones afectadas)
+        self.examinado = (-1, 0, 0, np.empty(0, dtype=np.int64))
+
+    def marcar(self, bolsa: int, marcada: bool) -> None:
+        carrera, segmento = divmod(bolsa, self.num_segmentos)
+        self.marcadas[carrera, segmento] = marcada
+        self.version += 1
+
+    def siguiente(self, inicio: int, fin: int) -> int:
+        """Primera posición afectada en [inicio, fin), o 'fin' si no hay ninguna."""
+        version, desde, hasta, afectados = self.examinado
+        if version == self.version and desde <= inicio < hasta:
+            k = int(np.searchsorted(afectados, inicio))
+            if k < len(afectados):
+                return min(int(afectados[k]), fin)
+            inicio = hasta
+        ventana = self.VENTANA_MINIMA
+        while inicio < fin:
+            tope = min(fin, inicio + ventana)
+            afectados = inicio + np.flatnonzero(self._afectados(inicio, tope))
+            self.examinado = (self.version, inicio, tope, afectados)
+            if len(afectados):
+                return int(afectados[0])
+            inicio = tope
+            ventana *= 2
+        return fin
+
+    def _afectados(self, inicio: int, fin: int) -> np.ndarray:
+        elecciones = self.elecciones[inicio:fin]
+        validas = self.validas[inicio:fin]
+        segmento = self.segmento_anterior[inicio:fin]
+        posicion = self.posicion_anterior[inicio:fin]
+        elegibilidad = self.elegibilidad[inicio:fin]
+        columnas = np.arange(elecciones.shape[1])
+        afectados = np.zeros(fin - inicio, dtype=bool)
+        for s in range(self.num_segmentos):
+            marcadas = self.marcadas[:, s]
+            if not marcadas.any():
+                continue
+            # Última posición recorrida en el segmento s (-1: no llegaba a él)
+            limite = np.where(
+                (segmento < 0) | (s < segmento), elecciones.shape[1] - 1,
+                np.where(s == segmento, posicion, -1)
+            )
+            alcanza = (marcadas[elecciones] & validas & (columnas <= limite[:, None])).any(axis=1)
+            afectados |= alcanza & ((elegibilidad >> s) & 1).astype(bool)
+        return afectados
+
+class ReasignadorIncremental:
+    """
+    Recalcula el Art. 52 tras corregir a unos pocos aspirantes sin repetir
+    todo el proceso.
+
+    Los pases por segmento equivalen a que cada aspirante, en orden de mérito
+    global, tome el primer cupo libre recorriendo sus segmentos (en orden) y,
+    dentro de cada uno, sus carreras por prioridad. Un aspirante no corregido
+    obtiene lo mismo que antes si las bolsas que recorría hasta su asignación
+    anterior tienen el mismo consumo que entonces; solo se reprocesan los
+    corregidos y quienes alcanzaban alguna bolsa con consumo distinto, y los
+    tramos intermedios se saltan en bloque.
+    """
+    def __init__(self, estado: EstadoAsignacion):
+        self.estado = estado
+        self.inicio = 0
+        self.reprocesados = 0
+        self.cambios_asignacion = 0
+
+    def aplicar_cambios(
+        self,
+        indices: np.ndarray,
+        puntajes: np.ndarray,
+        elegibilidad: np.ndarray,
+        elecciones: np.ndarray,
+        prioridades: np.ndarray,
+        evaluacion: np.ndarray,
+        antecedentes: np.ndarray
+    ) -> EstadoAsignacion:
+        """
+        'indices' son las posiciones (orden de carga) de los aspirantes
+        corregidos; el resto de arreglos trae sus nuevos valores (evaluación
+        y antecedentes intervienen en los criterios de desempate).
+        Retorna un nuevo estado, igual al de una ejecución completa.
+        """
+        anterior = self.estado
+        num_segmentos = len(anterior.segmentos)
+        indices = np.asarray(indices, dtype=np.int64)
+
+        # 1. Nuevos insumos (las matrices se amplían si cambia el máximo de elecciones)
+        ancho = max(anterior.elecciones.shape[1], elecciones.shape[1])
+        nuevas_elecciones = self._ampliar(anterior.elecciones, ancho, SIN_ELECCION)
+        nuevas_prioridades = self._ampliar(anterior.prioridades, ancho, 0)
+        nuevas_elecciones[indices] = self._ampliar(elecciones, ancho, SIN_ELECCION)
+        nuevas_prioridades[indices] = self._ampliar(prioridades, ancho, 0)
+        nuevos_puntajes = anterior.puntajes.copy()
+        nuevos_puntajes[indices] = puntajes
+        nueva_elegibilidad = anterior.elegibilidad.copy()
+        nueva_elegibilidad[indices] = elegibilidad
+        nueva_evaluacion = anterior.evaluacion.copy()
+        nueva_evaluacion[indices] = evaluacion
+        nuevos_antecedentes = anterior.antecedentes.copy()
+        nuevos_antecedentes[indices] = antecedentes
+
+        # 2. Posiciones de mérito antes y después de la corrección (entre los no
+        # corregidos el orden relativo no cambia: sus claves son las mismas)
+        criterios = anterior.criterios_desempate
+        rango_anterior = anterior.rango_merito
+        orden_anterior = np.empty_like(rango_anterior)
+        orden_anterior[rango_anterior] = np.arange(len(rango_anterior))
+        codigos_id = codigos_identificacion(anterior.ids_aspirante) if 'id_aspirante' in criterios else None
+        orden = orden_merito(nuevos_puntajes, criterios, nueva_evaluacion, nuevos_antecedentes, codigos_id)
+        rango = rango_merito(orden)
+        corregido = np.zeros(len(orden), dtype=bool)
+        corregido[indices] = True
+
+        # 3. Eventos del recorrido. Un aspirante no corregido ve los mismos cupos
+        # que antes mientras el consumo de quienes lo preceden ahora coincida con
+        # el de quienes lo precedían antes ('diferencia' vacía). Eso solo puede
+        # cambiar al llegar a la nueva posición de un corregido, o al pasar su
+        # posición anterior (desde ahí su consumo anterior deja de contar).
+        bolsa_anterior = np.where(
+            anterior.carrera_asignada >= 0,
+            anterior.carrera_asignada * num_segmentos + anterior.segmento_asignado, -1
+        )
+        no_corregidos = orden_anterior[~corregido[orden_anterior]]
+        umbrales = np.searchsorted(rango_anterior[no_corregidos], rango_anterior[indices])
+        posicion_umbral = np.append(rango[no_corregidos], len(orden))[umbrales]
+        retiros: Dict[int, List[int]] = {}
+        for posicion, a in zip(posicion_umbral.tolist(), indices.tolist()):
+            retiros.setdefault(posicion, []).append(a)
+        eventos = sorted(set(rango[indices].tolist()) | set(retiros))
+
+        capacidad = anterior.cupos_iniciales.ravel().copy()
+        carrera_asignada = anterior.carrera_asignada.copy()
+        segmento_asignado = anterior.segmento_asignado.copy()
+        posicion_asignada = anterior.posicion_asignada.copy()
+        bolsas_previas = bolsa_anterior.tolist()
+
+        buscador = _BuscadorAfectados(
+            nuevas_elecciones[orden], nueva_elegibilidad[orden],
+            anterior.segmento_asignado[orden], anterior.posicion_asignada[orden],
+            len(capacidad), num_segmentos
+        )
+        diferencia: Dict[int, int] = {}
+        def acumular(bolsa: int, delta: int) -> None:
+            if bolsa < 0:
+                return
+            valor = diferencia.get(bolsa, 0) + delta
+            if valor:
+                if bolsa not in diferencia:
+                    buscador.marcar(bolsa, True)
+                diferencia[bolsa] = valor
+            else:
+                del diferencia[bolsa]
+                buscador.marcar(bolsa, False)
+
+        # 4. Recorrido: se salta en bloque (con el consumo anterior) todo tramo
+        # sin eventos ni aspirantes que alcancen una bolsa de 'diferencia', y se
+        # reprocesa uno a uno el resto
+        segmentos_de: Dict[int, Tuple[int, ...]] = {}
+        reprocesados = 0
+        cambios = 0
+        inicio = eventos[0] if eventos else len(orden)
+        siguiente_evento = 0
+        i = 0
+        while i < len(orden):
+            while siguiente_evento < len(eventos) and eventos[siguiente_evento] <= i:
+                siguiente_evento += 1
+            for a in retiros.get(i, ()):
+                acumular(bolsas_previas[a], -1)
+
+            a = int(orden[i])
+            if not corregido[a]:
+                if not diferencia and siguiente_evento == len(eventos):
+                    break
+                fin_tramo = eventos[siguiente_evento] if siguiente_evento < len(eventos) else len(orden)
+                if diferencia:
+                    fin_tramo = buscador.siguiente(i, fin_tramo)
+                if fin_tramo > i:
+                    saltados = bolsa_anterior[orden[i:fin_tramo]]
+                    capacidad -= np.bincount(saltados[saltados >= 0], minlength=len(capacidad))
+                    i = fin_tramo
+                    continue
+
+            reprocesados += 1
+            mascara = int(nueva_elegibilidad[a])
+            segmentos = segmentos_de.get(mascara)
+            if segmentos is None:
+                segmentos = segmentos_de[mascara] = tuple(
+                    s for s in range(num_segmentos) if (mascara >> s) & 1
+                )
+            bolsa, posicion = self._primer_cupo(nuevas_elecciones[a].tolist(), segmentos, capacidad, num_segmentos)
+            if bolsa >= 0:
+                capacidad[bolsa] -= 1
+
+            bolsa_previa = bolsas_previas[a]
+            if corregido[a]:
+                # Su consumo anterior se retira en su umbral
+                acumular(bolsa, 1)
+            elif bolsa != bolsa_previa:
+                acumular(bolsa, 1)
+                acumular(bolsa_previa, -1)
+            if bolsa != bolsa_previa or posicion != posicion_asignada[a]:
+                cambios += 1
+                if bolsa >= 0:
+                    carrera_asignada[a], segmento_asignado[a] = divmod(bolsa, num_segmentos)
+                else:
+                    carrera_asignada[a] = segmento_asignado[a] = -1
+                posicion_asignada[a] = posicion
+            i += 1
+
+        self.inicio = inicio
+        self.reprocesados = reprocesados
+        self.cambios_asignacion = cambios
+        self.estado = replace(
+            anterior,
+            puntajes=nuevos_puntajes,
+            evaluacion=nueva_evaluacion,
+            antecedentes=nuevos_antecedentes,
+            rango_merito=rango,
+            elegibilidad=nueva_elegibilidad,
+            elecciones=nuevas_elecciones,
+            prioridades=nuevas_prioridades,
+            carrera_asignada=carrera_asignada,
+            segmento_asignado=segmento_asignado,
+            posicion_asignada=posicion_asignada,
+        )
+        return self.estado
+
+    def resultados(self) -> List[AsignacionResultado]:
+        return resultados_desde_estado(self.estado)
+
+    @staticmethod
+    def _primer_cupo(
+        fila: List[int],
+        segmentos: Tuple[int, ...],
+        capacidad: np.ndarray,
+        num_segmentos: int
+    ) -> Tuple[int, int]:
+        """Primera bolsa (carrera, segmento) con cupo en orden de segmento y prioridad."""
+        for s in segmentos:
+            for posicion, carrera in enumerate(fila):
+                if carrera >= 0 and capacidad[carrera * num_segmentos + s] > 0:
+                    return carrera * num_segmentos + s, posicion
+        return -1, -1
+
+    @staticmethod
+    def _ampliar(matriz: np.ndarray, ancho: int, relleno: int) -> np.ndarray:
+        if matriz.shape[1] == ancho:
+            return matriz.copy()
+        ampliada = np.full((matriz.shape[0], ancho), relleno, dtype=np.int64)
+        ampliada[:, :matriz.shape[1]] = matriz
+        return ampliada
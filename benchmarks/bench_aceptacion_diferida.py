@@ -0,0 +1,113 @@
+"""
+Aceptación diferida en rondas: pruebas diferenciales y tiempos.
+
+1. orden 'segmento', sin reciclaje, 1 ronda == EstrategiaAsignacionArt52;
+   codificada desde las columnas de la carga == desde los objetos.
+2. orden 'carrera' == dictadura serial de referencia (con prioridad común
+   por puntaje, la aceptación diferida coincide con ella).
+3. Tiempo por ronda con reciclaje hacia OFERTA_GENERAL.
+Uso: python -m benchmarks.bench_aceptacion_diferida --aspirantes 1000000
+"""
+import argparse
+import contextlib
+import copy
+import io
+import tempfile
+import time
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.models.registro_incidencias import RegistroIncidencias
+from app.core.services.calculador_puntajes import CalculadorPuntajes
+from app.core.services.instrumentador import Instrumentador
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.strategy.estrategia_aceptacion_diferida import EstrategiaAsignacionAceptacionDiferida
+from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
+
+def ejecutar(estrategia, normativa, aspirantes, carreras, datos=None):
+    aspirantes = copy.deepcopy(aspirantes)
+    carreras = copy.deepcopy(carreras)
+    normativa.incidencias = RegistroIncidencias(modo='resumen')
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        columnas = {'datos': datos} if datos is not None else {}
+        resultados = estrategia.ejecutar_asignacion(aspirantes, carreras, normativa, **columnas)
+        duracion = time.perf_counter() - inicio
+    asignaciones = {
+        r.id_aspirante: (r.segmento_asignado, r.id_carrera_asignada, r.prioridad_asignada, r.instancia_postulacion)
+        for r in resultados
+    }
+    cupos = {c.id: (dict(c.cupos_segmentados), c.cupos_asignados) for c in carreras}
+    return duracion, asignaciones, cupos
+
+def dictadura_serial(normativa, aspirantes, carreras, segmentos, manejadores):
+    """Referencia directa: cada aspirante, por mérito, toma el primer par (carrera, segmento) libre."""
+    calculador = CalculadorPuntajes(normativa)
+    orden = calculador.orden_merito(aspirantes, calculador.asignar_puntajes(aspirantes))
+    cupos = {c.id: dict(c.cupos_segmentados) for c in carreras}
+    asignaciones = {}
+    for aspirante in (aspirantes[i] for i in orden.tolist()):
+        propios = [s for s, m in zip(segmentos, manejadores) if m.cumple_criterio(aspirante)]
+        for postulacion in aspirante.get_postulaciones_ordenadas():
+            bolsa = cupos.get(postulacion.id_carrera)
+            segmento = next((s for s in propios if bolsa and bolsa.get(s, 0) > 0), None) if bolsa else None
+            if segmento is not None:
+                bolsa[segmento] -= 1
+                asignaciones[aspirante.id] = (segmento, postulacion.id_carrera, postulacion.prioridad, 1)
+                break
+    return asignaciones
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=1_000_000)
+    parser.add_argument('--carreras', type=int, default=1000)
+    parser.add_argument('--inexistentes', type=float, default=0.001)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras,
+                        fraccion_inexistentes=args.inexistentes)
+        normativa = normativa_desde_config(config, directorio)
+        with contextlib.redirect_stdout(io.StringIO()):
+            lector = LectorDatosCSVColumnar(normativa)
+            datos = lector.cargar_columnas_validadas()
+            aspirantes, carreras = lector.construir_modelos(datos)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        art52 = EstrategiaAsignacionArt52()
+        equivalente = EstrategiaAsignacionAceptacionDiferida(None, 'segmento', 'ninguno', 1)
+        por_carrera = EstrategiaAsignacionAceptacionDiferida(None, 'carrera', 'ninguno', 1)
+        instrumentador = Instrumentador()
+        con_reciclaje = EstrategiaAsignacionAceptacionDiferida(instrumentador, 'carrera', 'general', 3)
+
+    t_art52, asig_art52, cupos_art52 = ejecutar(art52, normativa, aspirantes, carreras)
+    t_eq, asig_eq, cupos_eq = ejecutar(equivalente, normativa, aspirantes, carreras)
+    t_col, asig_col, cupos_col = ejecutar(equivalente, normativa, aspirantes, carreras, datos)
+    t_car, asig_car, _ = ejecutar(por_carrera, normativa, aspirantes, carreras)
+    t_rec, asig_rec, _ = ejecutar(con_reciclaje, normativa, aspirantes, carreras)
+
+    referencia = dictadura_serial(
+        normativa, copy.deepcopy(aspirantes), carreras,
+        [m.get_segmento_key() for m in por_carrera.manejadores_segmento], por_carrera.manejadores_segmento
+    )
+
+    print(f"Aspirantes: {args.aspirantes}  carreras: {args.carreras}")
+    print(f"Art. 52:                              {t_art52:7.2f} s  asignados {len(asig_art52)}")
+    print(f"Diferida (segmento, sin reciclaje):   {t_eq:7.2f} s  asignados {len(asig_eq)}")
+    print(f"Diferida (segmento, columnas):        {t_col:7.2f} s  asignados {len(asig_col)}")
+    print(f"Diferida (carrera, sin reciclaje):    {t_car:7.2f} s  asignados {len(asig_car)}")
+    print(f"Diferida (carrera, reciclaje general):{t_rec:7.2f} s  asignados {len(asig_rec)}")
+    for fase in instrumentador.fases:
+        if fase['nombre'].startswith('ronda/'):
+            print(f"  {fase['nombre']}: {fase['tiempo_s']:.2f} s  {fase['contadores']}")
+    print(f"Segmento == Art. 52:          {asig_eq == asig_art52 and cupos_eq == cupos_art52}")
+    print(f"Columnas == objetos:          {asig_col == asig_eq and cupos_col == cupos_eq}")
+    print(f"Carrera == dictadura serial:  {asig_car == referencia}")
+    primeras = sum(1 for r in asig_car.values() if r[2] == 1)
+    print(f"Obtienen su 1.ª opción: Art. 52 {sum(1 for r in asig_art52.values() if r[2] == 1)}, "
+          f"diferida por carrera {primeras}")
+    if not (asig_eq == asig_art52 and cupos_eq == cupos_art52 and asig_col == asig_eq
+            and cupos_col == cupos_eq and asig_car == referencia):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
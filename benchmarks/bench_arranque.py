@@ -0,0 +1,73 @@
+"""
+Tiempo de arranque de la línea de comandos, cada caso en un proceso nuevo:
+importar el contenedor, 'main.py --help', 'main.py --solo-validar' y (con
+--completo) el proceso completo, sobre una cohorte sintética. Informa la
+mediana de varias repeticiones y si el caso llegó a importar pandas.
+Uso: python -m benchmarks.bench_arranque --aspirantes 200000 --repeticiones 5 --completo
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(RAIZ, 'main.py')
+
+# Importa el contenedor e informa si eso cargó pandas
+IMPORTAR_CONTENEDOR = (
+    "import sys; sys.path.insert(0, %r); from app.core.container import Container; "
+    "print('pandas' in sys.modules)" % RAIZ
+)
+
+def medir(comando, directorio: str, repeticiones: int):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        proceso = subprocess.run(comando, cwd=directorio, capture_output=True, text=True)
+        tiempos.append(time.perf_counter() - inicio)
+        if proceso.returncode != 0:
+            print(proceso.stdout[-2000:], proceso.stderr[-2000:], sep="\n")
+            raise SystemExit(f"Falló: {' '.join(comando)}")
+    return statistics.median(tiempos), proceso.stdout
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=200_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--completo', action='store_true', help="Mide también el proceso completo (una vez).")
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras)
+        config['rutas_archivos'].update({
+            clave: os.path.join(directorio, os.path.basename(ruta))
+            for clave, ruta in config['rutas_archivos'].items()
+        })
+        config['rutas_archivos']['oferta_academica'] = os.path.join(directorio, 'oferta_academica.csv')
+        config['rutas_archivos']['matriz_postulaciones'] = os.path.join(directorio, 'matriz_postulaciones.csv')
+        config['parametros_proceso']['usar_cache_entradas'] = False
+        with open(os.path.join(directorio, 'config.json'), 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False)
+
+        print(f"Aspirantes: {args.aspirantes}  repeticiones: {args.repeticiones}")
+        t, salida = medir([sys.executable, '-c', 'pass'], directorio, args.repeticiones)
+        print(f"Intérprete solo:            {t:.3f} s")
+        t, salida = medir([sys.executable, '-c', IMPORTAR_CONTENEDOR], directorio, args.repeticiones)
+        print(f"Importar el contenedor:     {t:.3f} s  (carga pandas: {salida.strip()})")
+        t, _ = medir([sys.executable, MAIN, '--help'], directorio, args.repeticiones)
+        print(f"main.py --help:             {t:.3f} s")
+        t, _ = medir([sys.executable, MAIN, '--solo-validar'], directorio, args.repeticiones)
+        print(f"main.py --solo-validar:     {t:.3f} s")
+        if args.completo:
+            t, _ = medir([sys.executable, MAIN], directorio, 1)
+            print(f"main.py (proceso completo): {t:.3f} s")
+
+if __name__ == "__main__":
+    main()
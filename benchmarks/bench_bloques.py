@@ -0,0 +1,50 @@
+"""
+Lectura por bloques frente a la lectura completa: tiempo, pico de memoria
+de la fase columnar y equivalencia de los modelos construidos.
+Uso: python -m benchmarks.bench_bloques --aspirantes 500000 --bloques 50000 200000
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.lector_datos_bloques import LectorDatosCSVPorBloques
+
+def medir(lector):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        datos = lector.cargar_columnas()
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    aspirantes = lector.construir_aspirantes(datos)
+    # En orden de carga: el orden de los aspirantes decide los empates de mérito
+    firma = [(a.id, a.puntaje_antecedentes, a.puntaje_evaluacion, a.mascara_condiciones,
+              tuple(a.postulaciones)) for a in aspirantes]
+    return duracion, pico, firma
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=500_000)
+    parser.add_argument('--bloques', type=int, nargs='+', default=[50_000, 200_000])
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes)
+        normativa = normativa_desde_config(config, directorio)
+
+        t, pico, referencia = medir(LectorDatosCSVColumnar(normativa))
+        print(f"Aspirantes: {args.aspirantes}")
+        print(f"Completo:            {t:7.2f} s  pico {pico / 2**20:8.1f} MiB")
+        for tamano in args.bloques:
+            t, pico, firma = medir(LectorDatosCSVPorBloques(normativa, tamano))
+            print(f"Bloques de {tamano:>8}: {t:7.2f} s  pico {pico / 2**20:8.1f} MiB  "
+                  f"idéntico: {firma == referencia}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Tiempo de carga columnar sin caché, con caché vacía (se escribe) y con
+acierto de caché (sin leer los CSV).
+Uso: python -m benchmarks.bench_cache --aspirantes 500000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.cache_entradas import CacheEntradas
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+
+def medir(lector):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        aspirantes, _ = lector.cargar_datos()
+    return time.perf_counter() - inicio, [(a.id, a.mascara_condiciones, a.postulaciones) for a in aspirantes]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=500_000)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes)
+        normativa = normativa_desde_config(config, directorio)
+        cache = CacheEntradas(os.path.join(directorio, 'cache'))
+
+        t_sin, referencia = medir(LectorDatosCSVColumnar(normativa))
+        t_escritura, _ = medir(LectorDatosCSVColumnar(normativa, cache))
+        t_acierto, firma = medir(LectorDatosCSVColumnar(normativa, cache))
+
+    print(f"Aspirantes: {args.aspirantes}")
+    print(f"Sin caché:         {t_sin:7.2f} s")
+    print(f"Caché (escritura): {t_escritura:7.2f} s")
+    print(f"Caché (acierto):   {t_acierto:7.2f} s  (x{t_sin / t_acierto:.1f})  idéntico: {firma == referencia}")
+
+if __name__ == "__main__":
+    main()
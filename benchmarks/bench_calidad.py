@@ -0,0 +1,130 @@
+"""
+Revisión de calidad de la matriz de postulaciones (depurar_postulaciones).
+
+Genera una cohorte con OFA_ID inexistentes y carreras repetidas e inyecta
+aspirantes con puntajes fuera de rango, puntajes distintos entre sus filas
+y prioridades repetidas. Mide la carga columnar y la revisión por separado,
+verifica que el archivo de rechazos tenga las filas inyectadas con su motivo
+y que la estrategia no reciba carreras inexistentes ni a los excluidos
+(puntajes_invalidos = 'excluir'); con 'observar', que los aspirantes con
+puntajes fuera de rango se conserven y queden observados.
+Uso: python -m benchmarks.bench_calidad --aspirantes 300000 --afectados 1000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.models.registro_incidencias import RegistroIncidencias, CATEGORIA_CARRERA_INEXISTENTE
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.validador_proceso import ValidadorProceso
+from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
+
+def inyectar_problemas(ruta: str, mapeo_post, afectados: int, semilla: int = 7):
+    """Altera tres grupos disjuntos de 'afectados' aspirantes; retorna sus identificaciones."""
+    df = pd.read_csv(ruta)
+    id_col = mapeo_post['id_aspirante']
+    ids = df[id_col].unique()
+    elegidos = np.random.default_rng(semilla).choice(ids, 3 * afectados, replace=False)
+    fuera, inconsistentes, prioridad = np.split(elegidos, 3)
+
+    df.loc[df[id_col].isin(fuera), mapeo_post['evaluacion']] = 1500
+    # Solo las filas posteriores a la primera: la primera aporta los datos del aspirante
+    posteriores = df.groupby(id_col).cumcount().to_numpy() > 0
+    df.loc[df[id_col].isin(inconsistentes) & posteriores, mapeo_post['antecedentes']] = 123
+    df.loc[df[id_col].isin(prioridad), mapeo_post['prioridad']] = 1
+    df.to_csv(ruta, index=False)
+    return set(fuera.astype(str)), set(inconsistentes.astype(str)), set(prioridad.astype(str))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=300_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--afectados', type=int, default=1000, help="Aspirantes alterados por cada problema.")
+    args = parser.parse_args()
+
+    config = cargar_config()
+    mapeo_post = config['mapeo_columnas']['postulaciones']
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras, fraccion_inexistentes=0.01)
+        fuera, inconsistentes, prioridad = inyectar_problemas(
+            os.path.join(directorio, 'matriz_postulaciones.csv'), mapeo_post, args.afectados
+        )
+        normativa = normativa_desde_config(config, directorio)
+        normativa.rango_puntajes = config['parametros_proceso']['rango_puntajes']
+        normativa.puntajes_invalidos = 'excluir'
+        normativa.rutas['rechazos'] = os.path.join(directorio, 'rechazos.csv')
+        normativa.incidencias = RegistroIncidencias(modo='resumen')
+
+        # Revisión aislada sobre la matriz ya ordenada y truncada
+        lector = LectorDatosCSVColumnar(normativa)
+        with contextlib.redirect_stdout(io.StringIO()):
+            df_oferta, df_postulaciones = lector._leer_archivos()
+            df = lector.validador.limpiar_y_validar_postulaciones(df_postulaciones)
+        ids_carrera = lector._columnas_oferta(df_oferta).ids_carrera
+        inicio = time.perf_counter()
+        depurado = ValidadorProceso(normativa).depurar_postulaciones(df, ids_carrera)
+        t_revision = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            aspirantes, carreras = LectorDatosCSVColumnar(normativa).cargar_datos()
+        t_carga = time.perf_counter() - inicio
+        rechazos = pd.read_csv(normativa.rutas['rechazos'], dtype=str)
+
+        normativa.incidencias = RegistroIncidencias(modo='resumen')
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados = EstrategiaAsignacionArt52().ejecutar_asignacion(aspirantes, carreras, normativa)
+        t_asignacion = time.perf_counter() - inicio
+
+        # Política por omisión: los puntajes fuera de rango solo se reportan
+        normativa_observar = normativa_desde_config(config, directorio)
+        normativa_observar.rango_puntajes = normativa.rango_puntajes
+        normativa_observar.incidencias = RegistroIncidencias(modo='resumen')
+        lector_observar = LectorDatosCSVColumnar(normativa_observar)
+        with contextlib.redirect_stdout(io.StringIO()):
+            observados, _ = lector_observar.cargar_datos()
+        rechazos_observar = lector_observar.validador.tabla_rechazos()
+
+    def aspirantes_con(motivo):
+        return set(rechazos.loc[rechazos['MOTIVO'] == motivo, mapeo_post['id_aspirante']])
+
+    # Las observaciones solo aplican a las filas posteriores a la primera que no se excluyeron por otro motivo
+    id_col = mapeo_post['id_aspirante']
+    conservadas = depurado[id_col].astype(str)[depurado.groupby(id_col).cumcount().to_numpy() > 0]
+    con_posteriores = set(conservadas)
+    ids_cargados = {a.id for a in aspirantes}
+    invalidos_observar = rechazos_observar[rechazos_observar['MOTIVO'] == 'PUNTAJE_FUERA_DE_RANGO']
+    verificaciones = {
+        'Excluidos por puntaje = inyectados': aspirantes_con('PUNTAJE_FUERA_DE_RANGO') == fuera,
+        'Excluidos ausentes de la carga': not (fuera & ids_cargados),
+        "Con 'observar', fuera de rango conservados": fuera <= {a.id for a in observados},
+        "Con 'observar', fuera de rango observados": (
+            set(invalidos_observar[id_col].astype(str)) == fuera and (invalidos_observar['ACCION'] == 'OBSERVADA').all()
+        ),
+        'Puntajes inconsistentes = inyectados': aspirantes_con('PUNTAJES_INCONSISTENTES') == inconsistentes & con_posteriores,
+        'Prioridades repetidas = inyectadas': aspirantes_con('PRIORIDAD_REPETIDA') == prioridad & con_posteriores,
+        'Sin carreras inexistentes en la estrategia': CATEGORIA_CARRERA_INEXISTENTE not in normativa.incidencias.conteo,
+        'Sin carreras repetidas en la estrategia': all(
+            len({p.id_carrera for p in a.postulaciones}) == len(a.postulaciones) for a in aspirantes
+        ),
+    }
+
+    print(f"Aspirantes: {args.aspirantes}  filas: {len(df)}  afectados por problema: {args.afectados}")
+    print(f"Revisión de calidad:  {t_revision:6.2f} s  ({len(df) - len(depurado)} filas excluidas)")
+    print(f"Carga columnar:       {t_carga:6.2f} s  (incluye la revisión)")
+    print(f"Asignación Art. 52:   {t_asignacion:6.2f} s  ({len(resultados)} asignados)")
+    for motivo, cantidad in rechazos.groupby(['MOTIVO', 'ACCION']).size().items():
+        print(f"  {motivo[0]:<24} {motivo[1]:<10} {cantidad:8d}")
+    for nombre, correcto in verificaciones.items():
+        print(f"{nombre}: {correcto}")
+    if not all(verificaciones.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
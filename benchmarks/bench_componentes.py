@@ -0,0 +1,68 @@
+"""
+Asignación Art. 52 por componentes conexas del grafo aspirante–carrera:
+una cohorte sintética con regiones sin carreras en común, asignada en forma
+secuencial y con 'procesos' procesos. Verifica que resultados, incidencias,
+cupos y contadores sean idénticos.
+Uso: python -m benchmarks.bench_componentes --aspirantes 1000000 --regiones 24 --procesos 8
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import tempfile
+import time
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.models.registro_incidencias import RegistroIncidencias
+from app.core.services.instrumentador import Instrumentador
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
+from app.core.strategy.estrategia_vectorizada import EstrategiaAsignacionVectorizada
+
+def ejecutar(estrategia_cls, procesos, normativa, aspirantes, carreras):
+    aspirantes = copy.deepcopy(aspirantes)
+    carreras = copy.deepcopy(carreras)
+    normativa.log_reporte = []
+    normativa.incidencias = RegistroIncidencias()
+    with contextlib.redirect_stdout(io.StringIO()):
+        instrumentador = Instrumentador()
+        estrategia = estrategia_cls(instrumentador, procesos)
+        inicio = time.perf_counter()
+        resultados = estrategia.ejecutar_asignacion(aspirantes, carreras, normativa)
+        duracion = time.perf_counter() - inicio
+    cupos = [(c.id, c.cupos_segmentados, c.cupos_asignados) for c in carreras]
+    contadores = {f['nombre']: f['contadores'] for f in instrumentador.fases if 'segmento/' in f['nombre']}
+    componentes = next((f['contadores'].get('componentes') for f in instrumentador.fases if f['nombre'] == 'componentes'), None)
+    return duracion, componentes, ([r.__dict__ for r in resultados], list(normativa.log_reporte), cupos, contadores)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=300_000)
+    parser.add_argument('--carreras', type=int, default=480)
+    parser.add_argument('--regiones', type=int, default=24)
+    parser.add_argument('--inexistentes', type=float, default=0.001)
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras,
+                        fraccion_inexistentes=args.inexistentes, regiones=args.regiones)
+        normativa = normativa_desde_config(config, directorio)
+        with contextlib.redirect_stdout(io.StringIO()):
+            aspirantes, carreras = LectorDatosCSVColumnar(normativa).cargar_datos()
+
+    print(f"Aspirantes: {args.aspirantes}  regiones: {args.regiones}  procesos: {args.procesos}")
+    referencia = None
+    for estrategia_cls, nombre in ((EstrategiaAsignacionArt52, "Art. 52 (objetos)"), (EstrategiaAsignacionVectorizada, "Art. 52 (vectorial)")):
+        t_sec, _, salida_sec = ejecutar(estrategia_cls, 1, normativa, aspirantes, carreras)
+        t_par, componentes, salida_par = ejecutar(estrategia_cls, args.procesos, normativa, aspirantes, carreras)
+        referencia = referencia or salida_sec
+        identicos = salida_sec == salida_par == referencia
+        print(f"{nombre}: secuencial {t_sec:7.2f} s  por componentes {t_par:7.2f} s  (x{t_sec / t_par:.1f})"
+              f"  componentes: {componentes}  idénticos: {identicos}")
+        if not identicos:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Escritura de resultados: DataFrame de __dict__ (implementación anterior)
+frente al escritor por flujo. Compara tiempo, pico de memoria y bytes.
+Uso: python -m benchmarks.bench_escritor --resultados 1000000
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, normativa_desde_config
+from app.core.models.postulacion import AsignacionResultado
+from app.core.services.escritor_resultados import EscritorResultadosCSV
+
+def escribir_con_dataframe(escritor: EscritorResultadosCSV, resultados, ruta: str) -> None:
+    """Réplica de la escritura anterior basada en pandas."""
+    mapeo_nombres = {
+        "periodo": "PERIODO", "id_ies": "IES_ID", "id_aspirante": "IDENTIFICACION",
+        "fecha_postulacion": "FECHA_POSTULACION", "puntaje_postulacion": "PUNTAJE_POSTULACION",
+        "segmento_asignado": "SEGMENTO_ASPIRANTE", "instancia_postulacion": "INSTANCIA_POSTULACION",
+        "prioridad_asignada": "PRIORIDAD_ELECCION_CARRERA",
+        "nombre_carrera_asignada": "NOMBRE_CARRERA", "id_carrera_asignada": "OFA_ID",
+        "cus_id": "CUS_ID"
+    }
+    df = pd.DataFrame([r.__dict__ for r in resultados]).rename(columns=mapeo_nombres)
+    df[escritor._get_columnas_formato()].to_csv(ruta, index=False)
+
+def medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcion()
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracion, pico
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resultados', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    resultados = [
+        AsignacionResultado(
+            id_aspirante=str(i), puntaje_postulacion=round(500 + (i % 50000) / 100, 2),
+            segmento_asignado="OFERTA_GENERAL", prioridad_asignada=1 + i % 3,
+            id_carrera_asignada=str(1001 + i % 200), nombre_carrera_asignada=f"CARRERA {1001 + i % 200}"
+        )
+        for i in range(args.resultados)
+    ]
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        normativa = normativa_desde_config(config, directorio)
+        escritor = EscritorResultadosCSV(normativa)
+        ruta_anterior = os.path.join(directorio, 'anterior.csv')
+
+        t_df, pico_df = medir(lambda: escribir_con_dataframe(escritor, resultados, ruta_anterior))
+        t_flujo, pico_flujo = medir(lambda: escritor.escribir_resultados(resultados))
+        identicos = filecmp.cmp(ruta_anterior, escritor.ruta_salida, shallow=False)
+
+        gzip = EscritorResultadosCSV(normativa, formato='csv_gzip')
+        t_gz, pico_gz = medir(lambda: gzip.escribir_resultados(resultados))
+
+    print(f"Resultados: {args.resultados}")
+    print(f"DataFrame:  {t_df:6.2f} s  pico {pico_df / 2**20:8.1f} MiB")
+    print(f"Flujo CSV:  {t_flujo:6.2f} s  pico {pico_flujo / 2**20:8.1f} MiB  bytes idénticos: {identicos}")
+    print(f"Flujo gzip: {t_gz:6.2f} s  pico {pico_gz / 2**20:8.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Prueba diferencial y de rendimiento: EstrategiaAsignacionArt52 frente a
+EstrategiaAsignacionVectorizada sobre la misma cohorte sintética.
+
+Las postulaciones a carreras inexistentes se depuran en la carga y ya no
+llegan a las estrategias: se verifica que el archivo de rechazos y las
+incidencias de la carga contengan exactamente las esperadas, calculadas
+aparte desde el CSV crudo (OFA_ID fuera de la oferta dentro del máximo de
+postulaciones), con el mismo mensaje que reportaban antes las estrategias,
+y que estas no reporten ninguna.
+Uso: python -m benchmarks.bench_estrategia --aspirantes 100000 --inexistentes 0.05
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import tempfile
+import time
+from collections import Counter
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.models.registro_incidencias import RegistroIncidencias, CATEGORIA_CARRERA_INEXISTENTE
+from app.core.services.instrumentador import Instrumentador
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.validador_proceso import COLUMNA_MOTIVO
+from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
+from app.core.strategy.estrategia_vectorizada import EstrategiaAsignacionVectorizada
+
+def ejecutar(estrategia_cls, normativa, aspirantes, carreras, datos=None):
+    aspirantes = copy.deepcopy(aspirantes)
+    carreras = copy.deepcopy(carreras)
+    normativa.log_reporte = []
+    normativa.incidencias = RegistroIncidencias()
+    # Como en el motor: la estrategia vectorial recibe las columnas de la carga
+    columnas = {'datos': datos} if getattr(estrategia_cls, 'admite_columnas', False) else {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        instrumentador = Instrumentador()
+        estrategia = estrategia_cls(instrumentador)
+        inicio = time.perf_counter()
+        resultados = estrategia.ejecutar_asignacion(aspirantes, carreras, normativa, **columnas)
+        duracion = time.perf_counter() - inicio
+    cupos = [(c.id, c.cupos_segmentados, c.cupos_asignados) for c in carreras]
+    contadores = {f['nombre']: f['contadores'] for f in instrumentador.fases if 'segmento/' in f['nombre']}
+    return duracion, [r.__dict__ for r in resultados], list(normativa.log_reporte), cupos, contadores
+
+def inexistentes_esperadas(normativa) -> Counter:
+    """(aspirante, OFA_ID) de las postulaciones a carreras fuera de la oferta, desde los CSV crudos."""
+    mapeo = normativa.mapeo_columnas_postulaciones
+    oferta = pd.read_csv(normativa.rutas['oferta_academica'], dtype=str)
+    df = pd.read_csv(normativa.rutas['matriz_postulaciones'], dtype=str)
+    # Máximo de postulaciones por aspirante: las de menor prioridad (a igual prioridad, orden de carga)
+    df = df.iloc[pd.to_numeric(df[mapeo['prioridad']]).argsort(kind='stable')]
+    df = df[df.groupby(mapeo['id_aspirante']).cumcount() < normativa.max_postulaciones]
+    fuera = df[~df[mapeo['id_carrera']].isin(oferta[normativa.mapeo_columnas_oferta['id_carrera']])]
+    return Counter(zip(fuera[mapeo['id_aspirante']], fuera[mapeo['id_carrera']]))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=100_000)
+    parser.add_argument('--carreras', type=int, default=200)
+    parser.add_argument('--inexistentes', type=float, default=0.001)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    mapeo = config['mapeo_columnas']['postulaciones']
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras,
+                        fraccion_inexistentes=args.inexistentes)
+        normativa = normativa_desde_config(config, directorio)
+        normativa.rutas['rechazos'] = os.path.join(directorio, 'rechazos.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            lector = LectorDatosCSVColumnar(normativa)
+            datos = lector.cargar_columnas_validadas()
+            aspirantes, carreras = lector.construir_modelos(datos)
+
+        esperadas = inexistentes_esperadas(normativa)
+        rechazos = pd.read_csv(normativa.rutas['rechazos'], dtype=str)
+        rechazos = rechazos[rechazos[COLUMNA_MOTIVO] == CATEGORIA_CARRERA_INEXISTENTE.upper()]
+        en_rechazos = Counter(zip(rechazos[mapeo['id_aspirante']], rechazos[mapeo['id_carrera']]))
+    # Mismo mensaje que reportaban las estrategias al intentar una carrera inexistente
+    mensajes_esperados = Counter({
+        f"Aspirante {id_aspirante}: Postulación a carrera inexistente (OFA_ID: {id_carrera}).": n
+        for (id_aspirante, id_carrera), n in esperadas.items()
+    })
+    mensajes_carga = Counter(m for m in normativa.log_reporte if 'carrera inexistente' in m)
+
+    t_obj, res_obj, log_obj, cupos_obj, cont_obj = ejecutar(EstrategiaAsignacionArt52, normativa, aspirantes, carreras)
+    t_vec, res_vec, log_vec, cupos_vec, cont_vec = ejecutar(
+        EstrategiaAsignacionVectorizada, normativa, aspirantes, carreras, datos
+    )
+
+    comprobaciones = {
+        'Resultados idénticos': res_obj == res_vec,
+        'Cupos idénticos': cupos_obj == cupos_vec,
+        'Contadores idénticos': cont_obj == cont_vec,
+        f"Rechazos por carrera inexistente = esperados ({sum(esperadas.values())})": en_rechazos == esperadas,
+        'Incidencias de la carga = esperadas': mensajes_carga == mensajes_esperados,
+        'Sin incidencias en las estrategias': not log_obj and not log_vec,
+    }
+    print(f"Aspirantes: {args.aspirantes}  asignados: {len(res_obj)}")
+    print(f"Art. 52 (objetos):   {t_obj:8.2f} s")
+    print(f"Art. 52 (vectorial): {t_vec:8.2f} s  (x{t_obj / t_vec:.1f})")
+    for nombre, correcto in comprobaciones.items():
+        print(f"{nombre}: {correcto}")
+    if not all(comprobaciones.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
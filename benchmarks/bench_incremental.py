@@ -0,0 +1,104 @@
+"""
+Reasignación incremental frente al proceso completo tras corregir a unos
+pocos aspirantes: compara tiempos y verifica que el CSV de resultados sea
+idéntico byte a byte.
+Uso: python -m benchmarks.bench_incremental --aspirantes 500000 --corregidos 10
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.almacen_estado import AlmacenEstadoAsignacion, huella_normativa
+from app.core.services.escritor_resultados import EscritorResultadosCSV
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.reasignacion_incremental import ServicioReasignacionIncremental
+from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
+from app.core.strategy.reasignador_incremental import construir_estado
+
+def proceso_completo(normativa, con_estado: bool = False):
+    """Carga, asignación Art. 52 y escritura; retorna el estado si se pide."""
+    lector = LectorDatosCSVColumnar(normativa)
+    estrategia = EstrategiaAsignacionArt52()
+    aspirantes, carreras = lector.cargar_datos()
+    resultados = estrategia.ejecutar_asignacion(aspirantes, carreras, normativa)
+    EscritorResultadosCSV(normativa).escribir_resultados(resultados)
+    if con_estado:
+        return construir_estado(aspirantes, carreras, resultados,
+                                estrategia.manejadores_segmento, huella_normativa(normativa),
+                                normativa.criterios_desempate)
+    return None
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=500_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--corregidos', type=int, default=10)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    mapeo = config['mapeo_columnas']['postulaciones']
+    rng = np.random.default_rng(7)
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras)
+        normativa = normativa_desde_config(config, directorio)
+        almacen = AlmacenEstadoAsignacion(os.path.join(directorio, 'estado.npz'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            almacen.guardar(proceso_completo(normativa, con_estado=True))
+
+        # Correcciones: nuevos puntajes y una condición invertida por aspirante
+        ruta_matriz = normativa.rutas['matriz_postulaciones']
+        df = pd.read_csv(ruta_matriz)
+        corregidos = rng.choice(df[mapeo['id_aspirante']].unique(), args.corregidos, replace=False)
+        filas = df[mapeo['id_aspirante']].isin(corregidos)
+        for id_aspirante in corregidos:
+            del_aspirante = df[mapeo['id_aspirante']] == id_aspirante
+            df.loc[del_aspirante, mapeo['antecedentes']] = int(rng.integers(400, 1001))
+            df.loc[del_aspirante, mapeo['evaluacion']] = int(rng.integers(400, 1001))
+            columna = mapeo[rng.choice(['pobreza', 'merito_academico', 'bachiller_curso_actual'])]
+            df.loc[del_aspirante, columna] = np.where(df.loc[del_aspirante, columna] == 'SI', 'NO', 'SI')
+        ruta_cambios = os.path.join(directorio, 'cambios.csv')
+        df[filas].to_csv(ruta_cambios, index=False)
+        df.to_csv(ruta_matriz, index=False)
+
+        normativa_incremental = normativa_desde_config(config, directorio)
+        normativa_incremental.rutas['resultados_asignacion'] = os.path.join(directorio, 'incremental.csv')
+        servicio = ServicioReasignacionIncremental(
+            normativa_incremental, LectorDatosCSVColumnar(normativa_incremental),
+            EscritorResultadosCSV(normativa_incremental), almacen
+        )
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            inicio = time.perf_counter()
+            servicio.ejecutar(ruta_cambios)
+            t_incremental = time.perf_counter() - inicio
+
+        normativa_completa = normativa_desde_config(config, directorio)
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            proceso_completo(normativa_completa)
+            t_completo = time.perf_counter() - inicio
+
+        identicos = filecmp.cmp(
+            normativa_completa.rutas['resultados_asignacion'],
+            normativa_incremental.rutas['resultados_asignacion'], shallow=False
+        )
+
+    reprocesados = [l for l in salida.getvalue().splitlines() if l.startswith(("Aspirantes reprocesados", "Asignaciones"))]
+    print(f"Aspirantes: {args.aspirantes}  corregidos: {args.corregidos}")
+    print(f"Proceso completo:       {t_completo:7.2f} s")
+    print(f"Reasignación incremental:{t_incremental:7.2f} s  (x{t_completo / t_incremental:.1f})")
+    for linea in reprocesados:
+        print(f"  {linea}")
+    print(f"Resultados idénticos: {identicos}")
+    if not identicos:
+        print(salida.getvalue())
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
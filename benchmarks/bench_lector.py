@@ -0,0 +1,62 @@
+"""
+Compara el cargador clásico (groupby/iterrows) con el columnar y, con
+--procesos N, con el clásico validando en N procesos (mismos modelos,
+mismas incidencias en el mismo orden y mismos rechazos).
+Uso: python -m benchmarks.bench_lector --aspirantes 100000 --procesos 4 --postulaciones 4
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.lector_datos import LectorDatosCSV
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+
+def medir(lector_cls, normativa, **opciones):
+    lector = lector_cls(normativa, **opciones)
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        aspirantes, carreras = lector.cargar_datos()
+    return time.perf_counter() - inicio, aspirantes, carreras, lector.validador.tabla_rechazos()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=100_000)
+    parser.add_argument('--carreras', type=int, default=200)
+    parser.add_argument('--postulaciones', type=int, default=3, help="Postulaciones por aspirante (más del máximo genera incidencias).")
+    parser.add_argument('--inexistentes', type=float, default=0.01, help="Fracción de postulaciones a carreras inexistentes.")
+    parser.add_argument('--procesos', type=int, default=0, help="Mide también la carga clásica con N procesos.")
+    args = parser.parse_args()
+
+    def modelos(aspirantes):
+        return [(a.id, a.puntaje_antecedentes, a.puntaje_evaluacion, a.condiciones, a.postulaciones) for a in aspirantes]
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras, postulaciones_por_aspirante=args.postulaciones,
+                        fraccion_inexistentes=args.inexistentes)
+
+        normativa_clasico = normativa_desde_config(config, directorio)
+        t_clasico, asp_c, car_c, rech_c = medir(LectorDatosCSV, normativa_clasico)
+        t_columnar, asp_v, car_v, _ = medir(LectorDatosCSVColumnar, normativa_desde_config(config, directorio))
+        if args.procesos:
+            normativa_paralelo = normativa_desde_config(config, directorio)
+            t_paralelo, asp_p, car_p, rech_p = medir(LectorDatosCSV, normativa_paralelo, procesos=args.procesos)
+
+    iguales = car_c == car_v and modelos(asp_c) == modelos(asp_v)
+    print(f"Aspirantes: {args.aspirantes}")
+    print(f"Clásico:  {t_clasico:8.2f} s")
+    print(f"Columnar: {t_columnar:8.2f} s  (x{t_clasico / t_columnar:.1f})")
+    print(f"Modelos idénticos: {iguales}")
+    if args.procesos:
+        iguales_paralelo = car_c == car_p and modelos(asp_c) == modelos(asp_p)
+        incidencias_iguales = normativa_clasico.log_reporte == normativa_paralelo.log_reporte
+        print(f"Clásico con {args.procesos} procesos: {t_paralelo:8.2f} s  (x{t_clasico / t_paralelo:.1f})")
+        print(f"Modelos idénticos (paralelo): {iguales_paralelo}")
+        print(f"Incidencias idénticas y en el mismo orden (paralelo): {incidencias_iguales} "
+              f"({len(normativa_paralelo.log_reporte)})")
+        print(f"Rechazos idénticos (paralelo): {rech_c.equals(rech_p)} ({len(rech_p)})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Listas de espera: tamaño según la profundidad, tiempo de procesar un lote
+de declinaciones frente a repetir la asignación, y verificación de
+invariantes (ningún cupo excedido, cada promoción mejora la elección del
+aspirante y quien declina queda sin cupo).
+Uso: python -m benchmarks.bench_listas_espera --aspirantes 500000 --declinan 1000 --profundidad 50
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import numpy as np
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.almacen_estado import huella_normativa
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.strategy.estrategia_art_52 import EstrategiaAsignacionArt52
+from app.core.strategy.listas_espera import ProcesadorDeclinaciones, construir_listas_espera
+from app.core.strategy.reasignador_incremental import construir_estado
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=500_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--declinan', type=int, default=1000)
+    parser.add_argument('--profundidad', type=int, default=50)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras)
+        normativa = normativa_desde_config(config, directorio)
+        with contextlib.redirect_stdout(io.StringIO()):
+            aspirantes, carreras = LectorDatosCSVColumnar(normativa).cargar_datos()
+            estrategia = EstrategiaAsignacionArt52()
+            inicio = time.perf_counter()
+            resultados = estrategia.ejecutar_asignacion(aspirantes, carreras, normativa)
+            t_asignacion = time.perf_counter() - inicio
+
+    estado = construir_estado(
+        aspirantes, carreras, resultados, estrategia.manejadores_segmento,
+        huella_normativa(normativa), normativa.criterios_desempate
+    )
+    inicio = time.perf_counter()
+    estado.listas_espera = construir_listas_espera(estado, args.profundidad)
+    t_listas = time.perf_counter() - inicio
+    listas = estado.listas_espera
+    largos = np.diff(listas.inicio)
+
+    rng = np.random.default_rng(3)
+    declinan = rng.choice(np.flatnonzero(estado.carrera_asignada >= 0), args.declinan, replace=False)
+    procesador = ProcesadorDeclinaciones(estado)
+    inicio = time.perf_counter()
+    nuevo = procesador.procesar(declinan)
+    t_declinaciones = time.perf_counter() - inicio
+
+    sin_exceso = bool((nuevo.cupos_restantes >= 0).all())
+    declinados_fuera = bool((nuevo.carrera_asignada[declinan] < 0).all())
+    promovidos = np.unique([a for a, _, bolsa in procesador.movimientos if bolsa >= 0])
+    limite_original = np.where(estado.carrera_asignada >= 0, estado.posicion_asignada, estado.elecciones.shape[1])
+    mejora = bool((nuevo.posicion_asignada[promovidos] < limite_original[promovidos]).all())
+    print(f"Aspirantes: {args.aspirantes}  profundidad: {args.profundidad}  declinan: {args.declinan}")
+    print(f"Asignación Art. 52:        {t_asignacion:7.2f} s")
+    print(f"Construcción de listas:    {t_listas:7.2f} s  ({listas.num_entradas} entradas, "
+          f"{(listas.aspirantes.nbytes + listas.posiciones.nbytes + listas.inicio.nbytes) / 2**20:.1f} MiB, "
+          f"lista más larga {int(largos.max(initial=0))})")
+    print(f"Procesar declinaciones:    {t_declinaciones:7.3f} s  "
+          f"(promovidos {procesador.promovidos}, vacantes {procesador.vacantes})")
+    print(f"Invariantes: sin cupos excedidos {sin_exceso}; declinados sin cupo {declinados_fuera}; "
+          f"promociones mejoran la elección {mejora}")
+    if not (sin_exceso and declinados_fuera and mejora and int(largos.max(initial=0)) <= args.profundidad):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Varias instituciones (IES) pequeñas: una invocación de main.py por
+institución frente a una sola invocación con --lote (secuencial y con
+--procesos N). Verifica que los resultados de cada institución coincidan
+salvo por IES_ID/PERIODO. Con --sqlite, cada institución lee su propia base
+de entradas (modo_carga 'sqlite', 'base_datos_entradas' en el manifiesto).
+Uso: python -m benchmarks.bench_lote --instituciones 20 --aspirantes 5000 --procesos 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+from benchmarks.bench_sqlite import crear_base
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(RAIZ, 'main.py')
+
+def escribir_config(config, directorio: str, rutas_salida: str, procesos: int, **rutas) -> None:
+    config = json.loads(json.dumps(config))
+    config['rutas_archivos'].update({
+        clave: os.path.join(rutas_salida, os.path.basename(ruta))
+        for clave, ruta in config['rutas_archivos'].items()
+    })
+    config['rutas_archivos'].update(rutas)
+    config['parametros_proceso'].update({'usar_cache_entradas': False, 'procesos_lote': procesos})
+    with open(os.path.join(directorio, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False)
+
+def ejecutar(directorio: str, *argumentos: str) -> float:
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, MAIN, *argumentos], cwd=directorio, capture_output=True, text=True)
+    if "[ERROR FATAL]" in proceso.stdout or "[LOTE CON ERRORES]" in proceso.stdout:
+        print(proceso.stdout[-3000:], proceso.stderr[-3000:], sep="\n")
+        raise SystemExit(f"Falló: main.py {' '.join(argumentos)}")
+    return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instituciones', type=int, default=20)
+    parser.add_argument('--aspirantes', type=int, default=5_000)
+    parser.add_argument('--carreras', type=int, default=50)
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--sqlite', action='store_true', help="Entradas de cada institución en una base SQLite.")
+    args = parser.parse_args()
+
+    config = cargar_config()
+    if args.sqlite:
+        config['parametros_proceso']['modo_carga'] = 'sqlite'
+    with tempfile.TemporaryDirectory() as raiz:
+        manifiesto = []
+        for i in range(args.instituciones):
+            entradas = os.path.join(raiz, f"ies_{i}")
+            generar_cohorte(config, entradas, args.aspirantes, args.carreras, semilla=i)
+            if args.sqlite:
+                ruta_base = os.path.join(entradas, 'entradas.sqlite')
+                crear_base(entradas, ruta_base, config['mapeo_columnas']['postulaciones'])
+                manifiesto.append({'id_ies': f"IES_{i}", 'base_datos_entradas': ruta_base})
+            else:
+                manifiesto.append({
+                    'id_ies': f"IES_{i}",
+                    'oferta_academica': os.path.join(entradas, 'oferta_academica.csv'),
+                    'matriz_postulaciones': os.path.join(entradas, 'matriz_postulaciones.csv'),
+                })
+        ruta_manifiesto = os.path.join(raiz, 'manifiesto.json')
+        with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f)
+
+        # Una invocación por institución, cada una con su config.json
+        t_individual = 0.0
+        for institucion in manifiesto:
+            directorio = os.path.join(raiz, f"individual_{institucion['id_ies']}")
+            os.makedirs(directorio)
+            entradas = {clave: ruta for clave, ruta in institucion.items() if clave != 'id_ies'}
+            escribir_config(config, directorio, directorio, 1, **entradas)
+            t_individual += ejecutar(directorio)
+
+        tiempos = {}
+        for procesos in sorted({1, args.procesos}):
+            directorio = os.path.join(raiz, f"lote_{procesos}")
+            os.makedirs(directorio)
+            escribir_config(config, directorio, directorio, procesos, directorio_lote=os.path.join(directorio, 'lote'))
+            tiempos[procesos] = ejecutar(directorio, '--lote', ruta_manifiesto)
+
+        columnas = ['IDENTIFICACION', 'OFA_ID', 'SEGMENTO_ASPIRANTE', 'PRIORIDAD_ELECCION_CARRERA']
+        identicos = all(
+            pd.read_csv(os.path.join(raiz, f"individual_{inst['id_ies']}", 'asignacion_resultados.csv'))[columnas].equals(
+                pd.read_csv(os.path.join(raiz, f"lote_{args.procesos}", 'lote', inst['id_ies'], 'asignacion_resultados.csv'))[columnas]
+            )
+            for inst in manifiesto
+        )
+
+    print(f"Instituciones: {args.instituciones}  aspirantes por institución: {args.aspirantes}")
+    print(f"Una invocación por institución: {t_individual:.2f} s")
+    for procesos, t in tiempos.items():
+        print(f"--lote con {procesos} proceso(s):       {t:.2f} s  (x{t_individual / t:.1f})")
+    print(f"Resultados idénticos: {identicos}")
+    if not identicos:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
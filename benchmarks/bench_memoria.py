@@ -0,0 +1,83 @@
+"""
+Memoria por aspirante de los modelos de dominio, comparada con la
+representación anterior (dataclasses con __dict__, condiciones en un
+diccionario y una Postulacion por fila).
+Uso: python -m benchmarks.bench_memoria --aspirantes 200000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+
+@dataclass(frozen=True)
+class _PostulacionAnterior:
+    id_carrera: str
+    prioridad: int
+    nombre_carrera_debug: str
+
+@dataclass
+class _AspiranteAnterior:
+    id: str
+    puntaje_antecedentes: float
+    puntaje_evaluacion: float
+    condiciones: Dict[str, bool] = field(default_factory=dict)
+    postulaciones: List[_PostulacionAnterior] = field(default_factory=list)
+    puntaje_postulacion: float = 0.0
+
+def construir_anterior(datos) -> List[_AspiranteAnterior]:
+    columnas = list(datos.condiciones)
+    valores = list(zip(*(datos.condiciones[c].tolist() for c in columnas)))
+    nombres = dict(zip(datos.ids_carrera, datos.nombres_carrera))
+    carreras = datos.postulacion_carrera.tolist()
+    prioridades = datos.postulacion_prioridad.tolist()
+    inicio = datos.inicio_postulaciones.tolist()
+    aspirantes = []
+    for k, (id_aspirante, ant, ev) in enumerate(zip(
+        datos.ids_aspirante.tolist(), datos.antecedentes.tolist(), datos.evaluacion.tolist()
+    )):
+        aspirante = _AspiranteAnterior(id_aspirante, ant, ev, dict(zip(columnas, valores[k])))
+        for j in range(inicio[k], inicio[k + 1]):
+            # str(fila[...]) creaba un objeto nuevo por fila
+            id_carrera = carreras[j].encode().decode()
+            aspirante.postulaciones.append(
+                _PostulacionAnterior(id_carrera, prioridades[j], nombres.get(carreras[j], "CARRERA_DESCONOCIDA"))
+            )
+        aspirantes.append(aspirante)
+    return aspirantes
+
+def medir(construir, datos) -> int:
+    gc.collect()
+    tracemalloc.start()
+    resultado = construir(datos)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return actual
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=200_000)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes)
+        lector = LectorDatosCSVColumnar(normativa_desde_config(config, directorio))
+        with contextlib.redirect_stdout(io.StringIO()):
+            datos = lector.cargar_columnas()
+
+    antes = medir(construir_anterior, datos)
+    despues = medir(lector.construir_aspirantes, datos)
+    n = datos.num_aspirantes
+    print(f"Aspirantes: {n}")
+    print(f"Antes:   {antes / n:8.0f} bytes/aspirante")
+    print(f"Después: {despues / n:8.0f} bytes/aspirante  ({despues / antes:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Verifica que CalculadorPuntajes reproduce bit a bit
+Aspirante.calcular_puntaje_postulacion y compara tiempos.
+Uso: python -m benchmarks.bench_puntajes --aspirantes 1000000
+"""
+import argparse
+import time
+import numpy as np
+from benchmarks.datos_sinteticos import cargar_config, normativa_desde_config
+from app.core.models.aspirante import Aspirante
+from app.core.services.calculador_puntajes import CalculadorPuntajes
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=1_000_000)
+    parser.add_argument('--semilla', type=int, default=2025)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    normativa = normativa_desde_config(config, '.')
+    calculador = CalculadorPuntajes(normativa)
+    rng = np.random.default_rng(args.semilla)
+    n = args.aspirantes
+
+    # Mitad puntajes continuos, mitad valores iguales de la forma k/1000 + 0.005:
+    # su promedio ponderado queda en el punto medio del redondeo a 2 decimales,
+    # donde np.round difiere de round()
+    limite = rng.integers(0, 1_000_000, n) / 1000 + 0.005
+    continuo = rng.random(n) < 0.5
+    evaluacion = np.where(continuo, rng.uniform(0, 1000, n), limite)
+    antecedentes = np.where(continuo, rng.uniform(0, 1000, n), limite)
+    condiciones = {c: rng.random(n) < 0.3 for c in calculador.condiciones_requeridas()}
+
+    inicio = time.perf_counter()
+    por_lote = calculador.calcular(evaluacion, antecedentes, condiciones)
+    t_lote = time.perf_counter() - inicio
+
+    aspirantes = [
+        Aspirante.desde_condiciones(
+            id=str(i), puntaje_antecedentes=a, puntaje_evaluacion=e,
+            condiciones={c: bool(v[i]) for c, v in condiciones.items()},
+            registro=normativa.registro_condiciones
+        )
+        for i, (e, a) in enumerate(zip(evaluacion.tolist(), antecedentes.tolist()))
+    ]
+    inicio = time.perf_counter()
+    for aspirante in aspirantes:
+        aspirante.calcular_puntaje_postulacion(normativa)
+    t_individual = time.perf_counter() - inicio
+    individuales = np.array([a.puntaje_postulacion for a in aspirantes])
+
+    identicos = np.array_equal(por_lote.view(np.int64), individuales.view(np.int64))
+    print(f"Aspirantes: {n}")
+    print(f"Individual: {t_individual:8.3f} s")
+    print(f"Por lote:   {t_lote:8.3f} s  (x{t_individual / t_lote:.0f})")
+    print(f"Bit a bit idénticos: {identicos}")
+    if not identicos:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
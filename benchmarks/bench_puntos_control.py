@@ -0,0 +1,159 @@
+"""
+Puntos de control y reanudación del proceso completo (MotorAsignacion).
+
+Por estrategia: ejecuta el motor sin y con puntos de control (costo de
+escribirlos, con y sin fsync por registro), luego una ejecución que se interrumpe bruscamente tras
+guardar el segmento indicado (con un registro a medio escribir al final
+del diario) y su reanudación con reanudar=True. Verifica que resultados,
+incidencias y resumen de incidencias de la ejecución reanudada sean
+idénticos a los de la ejecución sin interrupción.
+Cada ejecución corre en un proceso propio con el cableado del Container.
+Uso: python -m benchmarks.bench_puntos_control --aspirantes 300000 --segmento 4
+     python -m benchmarks.bench_puntos_control --aspirantes 200000 --procesos 2 --regiones 4
+"""
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte
+
+def config_ejecucion(
+    config: Dict[str, Any], directorio: str, estrategia: str, puntos_control: str, procesos: int,
+    sincronizar: bool = True
+) -> Dict[str, Any]:
+    config = copy.deepcopy(config)
+    config['rutas_archivos'].update({
+        clave: os.path.join(directorio, os.path.basename(ruta))
+        for clave, ruta in config['rutas_archivos'].items()
+    })
+    config['parametros_proceso'].update({
+        'modo_carga': 'columnar',
+        'estrategia': estrategia,
+        'usar_cache_entradas': False,
+        'instrumentacion': 'desactivada',
+        'modo_incidencias': 'resumen',
+        'guardar_estado': 'desactivado',
+        'indice_cortes': 'desactivado',
+        'puntos_control': puntos_control,
+        'sincronizar_puntos_control': sincronizar,
+        'procesos_asignacion': procesos,
+    })
+    return config
+
+def ejecutar(ruta_config: str, reanudar: bool = False, interrumpir: int = -1) -> None:
+    """Ejecuta el motor (en el proceso hijo); con 'interrumpir' >= 0 termina tras guardar ese segmento."""
+    from dependency_injector import providers
+    from app.core.container import Container
+    from app.core.services.puntos_control import CABECERA, DiarioPuntosControl
+
+    with open(ruta_config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if interrumpir >= 0:
+        guardar_segmento = DiarioPuntosControl.guardar_segmento
+
+        def guardar_e_interrumpir(diario, segmento, *args, **kwargs):
+            guardar_segmento(diario, segmento, *args, **kwargs)
+            if segmento == interrumpir:
+                # Registro a medio escribir, como si el proceso cayera durante la escritura
+                diario._archivo.write(CABECERA.pack(b'PCTL', 4, 1 << 20, 0) + b'\0' * 1000)
+                diario._archivo.flush()
+                os._exit(1)
+
+        DiarioPuntosControl.guardar_segmento = guardar_e_interrumpir
+
+    container = Container()
+    container.config.override(providers.Object(config))
+    if not container.motor().ejecutar_proceso(reanudar=reanudar):
+        sys.exit(1)
+
+def lanzar(ruta_config: str, *opciones: str):
+    inicio = time.perf_counter()
+    proceso = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_puntos_control', '--ejecutar', ruta_config, *opciones],
+        capture_output=True, text=True
+    )
+    return time.perf_counter() - inicio, proceso
+
+def salidas(config: Dict[str, Any], proceso: subprocess.CompletedProcess) -> Dict[str, Any]:
+    rutas = config['rutas_archivos']
+    with open(rutas['resultados_asignacion'], 'rb') as f:
+        resultados = f.read()
+    with open(rutas['incidencias'], 'rb') as f:
+        incidencias = f.read()
+    resumen = [linea for linea in proceso.stdout.splitlines() if linea.startswith('Se registraron')]
+    return {'resultados': resultados, 'incidencias': incidencias, 'resumen': resumen}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=300_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--segmento', type=int, default=4, help="Segmento (desde 0) tras el cual se interrumpe.")
+    parser.add_argument('--estrategias', nargs='+', default=['art52', 'vectorizada'])
+    parser.add_argument('--procesos', type=int, default=1, help="procesos_asignacion (con >1, por componentes).")
+    parser.add_argument('--regiones', type=int, default=1)
+    parser.add_argument('--ejecutar', metavar='CONFIG_JSON', help=argparse.SUPPRESS)
+    parser.add_argument('--reanudar', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--interrumpir', type=int, default=-1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.ejecutar:
+        ejecutar(args.ejecutar, args.reanudar, args.interrumpir)
+        return
+
+    config = cargar_config()
+    identicos = True
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(
+            config, directorio, args.aspirantes, args.carreras,
+            fraccion_inexistentes=0.01, regiones=args.regiones
+        )
+        print(f"Aspirantes: {args.aspirantes}  carreras: {args.carreras}  interrupción tras el segmento {args.segmento}")
+        for estrategia in args.estrategias:
+            configs = {}
+            for puntos_control in ('desactivado', 'activado'):
+                configs[puntos_control] = config_ejecucion(config, directorio, estrategia, puntos_control, args.procesos)
+                with open(os.path.join(directorio, f"config_{puntos_control}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(configs[puntos_control], f, ensure_ascii=False)
+            configs['sin_fsync'] = config_ejecucion(
+                config, directorio, estrategia, 'activado', args.procesos, sincronizar=False
+            )
+            with open(os.path.join(directorio, "config_sin_fsync.json"), 'w', encoding='utf-8') as f:
+                json.dump(configs['sin_fsync'], f, ensure_ascii=False)
+            ruta_sin = os.path.join(directorio, 'config_desactivado.json')
+            ruta_con = os.path.join(directorio, 'config_activado.json')
+            ruta_sin_fsync = os.path.join(directorio, 'config_sin_fsync.json')
+
+            t_sin, proceso = lanzar(ruta_sin)
+            esperado = salidas(configs['desactivado'], proceso)
+            t_con, proceso = lanzar(ruta_con)
+            con_puntos = salidas(configs['activado'], proceso)
+            diario_eliminado = not os.path.exists(configs['activado']['rutas_archivos']['puntos_control'])
+            t_sin_fsync, proceso = lanzar(ruta_sin_fsync)
+            sin_fsync = salidas(configs['sin_fsync'], proceso)
+
+            t_interrumpida, proceso = lanzar(ruta_con, '--interrumpir', str(args.segmento))
+            interrumpida = proceso.returncode != 0
+            tamano_diario = os.path.getsize(configs['activado']['rutas_archivos']['puntos_control'])
+            t_reanudada, proceso = lanzar(ruta_con, '--reanudar')
+            reanudada = salidas(configs['activado'], proceso)
+            restaurados = sum('restaurado desde el punto de control' in linea for linea in proceso.stdout.splitlines())
+
+            iguales = con_puntos == esperado and sin_fsync == esperado and reanudada == esperado and interrumpida and diario_eliminado
+            identicos &= iguales
+            print(f"\n[{estrategia}]")
+            print(f"Sin puntos de control: {t_sin:6.2f} s")
+            print(f"Con puntos de control: {t_con:6.2f} s  ({t_con - t_sin:+.2f} s)")
+            print(f"  sin fsync:           {t_sin_fsync:6.2f} s  ({t_sin_fsync - t_sin:+.2f} s)")
+            print(f"Interrumpida:          {t_interrumpida:6.2f} s  (diario de {tamano_diario / 1e6:.1f} MB)")
+            print(f"Reanudada:             {t_reanudada:6.2f} s  ({restaurados} segmento(s) restaurado(s))")
+            print(f"Resultados e incidencias idénticos: {iguales}")
+    if not identicos:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Servicio residente frente a ejecuciones sueltas de main.py.
+
+Inicia 'main.py --servicio' sobre una cohorte sintética y mide: una
+ejecución completa de main.py (carga, asignación y escritura), la primera
+asignación de un escenario nuevo por HTTP y la misma solicitud repetida
+(en caché), y las consultas de puntaje y de corte. Envía además solicitudes
+idénticas concurrentes de otro escenario y verifica que compartan una sola
+ejecución, que el CSV de la asignación base descargado sea idéntico al
+archivo de resultados de main.py, y que las solicitudes inválidas (400) y
+las de recursos inexistentes (404) se respondan con su código.
+Uso: python -m benchmarks.bench_servicio --aspirantes 300000 --concurrentes 8
+"""
+import argparse
+import copy
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Tuple
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def config_servicio(config: Dict[str, Any], directorio: str, puerto: int) -> Dict[str, Any]:
+    config = copy.deepcopy(config)
+    config['rutas_archivos'].update({
+        clave: os.path.join(directorio, os.path.basename(ruta))
+        for clave, ruta in config['rutas_archivos'].items()
+    })
+    config['parametros_proceso'].update({
+        'modo_carga': 'columnar',
+        'estrategia': 'vectorizada',
+        'usar_cache_entradas': False,
+        'instrumentacion': 'desactivada',
+        'modo_incidencias': 'resumen',
+        'guardar_estado': 'desactivado',
+        'indice_cortes': 'desactivado',
+        'puntos_control': 'desactivado',
+    })
+    config['servicio'].update({'host': '127.0.0.1', 'puerto': puerto, 'socket_unix': ''})
+    return config
+
+def solicitar(puerto: int, metodo: str, ruta: str, cuerpo: Any = None) -> Tuple[float, int, bytes]:
+    conexion = http.client.HTTPConnection('127.0.0.1', puerto, timeout=600)
+    datos = json.dumps(cuerpo).encode('utf-8') if cuerpo is not None else None
+    inicio = time.perf_counter()
+    conexion.request(metodo, ruta, body=datos, headers={'Content-Type': 'application/json'})
+    respuesta = conexion.getresponse()
+    contenido = respuesta.read()
+    duracion = time.perf_counter() - inicio
+    conexion.close()
+    return duracion, respuesta.status, contenido
+
+def estado_crudo(puerto: int, solicitud: bytes) -> int:
+    """Código de estado de una solicitud enviada tal cual (0 si se cierra sin responder)."""
+    with socket.create_connection(('127.0.0.1', puerto), timeout=60) as conexion:
+        conexion.sendall(solicitud)
+        linea = conexion.makefile('rb').readline().split()
+    return int(linea[1]) if len(linea) > 1 else 0
+
+def mejor(puerto: int, ruta: str, repeticiones: int = 20) -> float:
+    return min(solicitar(puerto, 'GET', ruta)[0] for _ in range(repeticiones))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=300_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--concurrentes', type=int, default=8)
+    parser.add_argument('--puerto', type=int, default=8799)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    correcto = True
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras, fraccion_inexistentes=0.01)
+        configuracion = config_servicio(config, directorio, args.puerto)
+        with open(os.path.join(directorio, 'config.json'), 'w', encoding='utf-8') as f:
+            json.dump(configuracion, f, ensure_ascii=False)
+        principal = os.path.join(RAIZ, 'main.py')
+        entorno = dict(os.environ, PYTHONPATH=RAIZ)
+
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, principal], cwd=directorio, env=entorno, capture_output=True, check=True)
+        t_main = time.perf_counter() - inicio
+        with open(configuracion['rutas_archivos']['resultados_asignacion'], 'rb') as f:
+            esperado = f.read()
+
+        inicio = time.perf_counter()
+        servicio = subprocess.Popen(
+            [sys.executable, principal, '--servicio'], cwd=directorio, env=entorno,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        try:
+            for linea in servicio.stdout:
+                if '[SERVICIO] Escuchando' in linea:
+                    break
+            else:
+                raise SystemExit("El servicio terminó sin iniciar.")
+            t_inicio = time.perf_counter() - inicio
+            # Se consume la salida para que el servicio no se bloquee al escribir
+            threading.Thread(target=servicio.stdout.read, daemon=True).start()
+
+            escenario = {'ponderadores': {'EVALUACION_CAPACIDAD': 0.6, 'ANTECEDENTE_ACADEMICO': 0.4}}
+            t_nuevo, estado, _ = solicitar(args.puerto, 'POST', '/asignaciones', escenario)
+            correcto &= estado == 200
+            t_cache = min(solicitar(args.puerto, 'POST', '/asignaciones', escenario)[0] for _ in range(20))
+
+            ejecuciones = json.loads(solicitar(args.puerto, 'GET', '/estado')[2])['ejecuciones_realizadas']
+            concurrente = {'puntos_adicionales': {'RURALIDAD': 8}}
+            respuestas = [None] * args.concurrentes
+
+            def enviar(i):
+                respuestas[i] = solicitar(args.puerto, 'POST', '/asignaciones', concurrente)
+
+            hilos = [threading.Thread(target=enviar, args=(i,)) for i in range(args.concurrentes)]
+            inicio = time.perf_counter()
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            t_concurrentes = time.perf_counter() - inicio
+            nuevas = json.loads(solicitar(args.puerto, 'GET', '/estado')[2])['ejecuciones_realizadas'] - ejecuciones
+            claves = {json.loads(r[2])['clave'] for r in respuestas}
+            correcto &= nuevas == 1 and len(claves) == 1
+
+            t_descarga, estado, descargado = solicitar(args.puerto, 'GET', '/asignaciones/base/resultados')
+            t_descarga_cache = mejor(args.puerto, '/asignaciones/base/resultados', 5)
+            identico = estado == 200 and descargado == esperado
+            correcto &= identico
+
+            primera = json.loads(
+                solicitar(args.puerto, 'GET', f"/asignaciones/base/aspirantes/{_primer_id(esperado)}")[2]
+            )['asignacion']
+            t_puntaje = mejor(args.puerto, f"/puntaje?id={_primer_id(esperado)}")
+            t_corte = mejor(
+                args.puerto,
+                f"/asignaciones/base/cortes?ofa_id={primera['id_carrera']}&segmento={primera['segmento']}&puntaje=700"
+            )
+
+            errores = {
+                'Content-Length no numérico': (estado_crudo(
+                    args.puerto, b"POST /asignaciones HTTP/1.1\r\nContent-Length: abc\r\n\r\n"), 400),
+                'Content-Length negativo': (estado_crudo(
+                    args.puerto, b"POST /asignaciones HTTP/1.1\r\nContent-Length: -5\r\n\r\n"), 400),
+                'Carrera inexistente': (solicitar(
+                    args.puerto, 'GET', f"/asignaciones/base/cortes?ofa_id=NO_EXISTE&segmento={primera['segmento']}")[1], 404),
+                'Asignación inexistente': (solicitar(args.puerto, 'GET', '/asignaciones/no_existe')[1], 404),
+                'Ruta inexistente': (solicitar(args.puerto, 'GET', '/no_existe')[1], 404),
+            }
+            errores_correctos = all(obtenido == esperado_codigo for obtenido, esperado_codigo in errores.values())
+            correcto &= errores_correctos
+        finally:
+            servicio.terminate()
+            servicio.wait(timeout=60)
+
+    print(f"Aspirantes: {args.aspirantes}  carreras: {args.carreras}")
+    print(f"main.py (proceso completo):         {t_main:8.2f} s")
+    print(f"Inicio del servicio (carga y base): {t_inicio:8.2f} s")
+    print(f"Asignación de un escenario nuevo:   {t_nuevo * 1e3:8.1f} ms")
+    print(f"Misma asignación (en caché):        {t_cache * 1e3:8.2f} ms")
+    print(f"{args.concurrentes} solicitudes idénticas concurrentes: {t_concurrentes * 1e3:8.1f} ms  "
+          f"({nuevas} ejecución(es))")
+    print(f"Descarga de resultados:             {t_descarga * 1e3:8.1f} ms  (en caché {t_descarga_cache * 1e3:.1f} ms)")
+    print(f"Consulta de puntaje:                {t_puntaje * 1e3:8.2f} ms")
+    print(f"Consulta de corte:                  {t_corte * 1e3:8.2f} ms")
+    print(f"Resultados idénticos a main.py:     {identico}")
+    print(f"Códigos de error esperados:         {errores_correctos}")
+    if not errores_correctos:
+        for nombre, (obtenido, esperado_codigo) in errores.items():
+            print(f"  {nombre}: {obtenido} (esperado {esperado_codigo})")
+    if not correcto:
+        raise SystemExit(1)
+
+def _primer_id(csv: bytes) -> str:
+    """Identificación del primer asignado del archivo de resultados."""
+    return csv.split(b'\n', 2)[1].decode('utf-8').split(',')[2]
+
+if __name__ == "__main__":
+    main()
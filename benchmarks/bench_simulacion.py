@@ -0,0 +1,97 @@
+"""
+Simulación de escenarios de normativa: tiempo con 1 y con N procesos, y
+verificación de que el escenario base reproduce la estrategia vectorizada
+(cupos por segmento y puntajes de corte por carrera).
+Uso: python -m benchmarks.bench_simulacion --aspirantes 200000 --escenarios 8 --procesos 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.simulador_normativas import SimuladorNormativas
+from app.core.strategy.estrategia_vectorizada import EstrategiaAsignacionVectorizada
+
+def simular(config, directorio: str, ruta_escenarios: str, procesos: int):
+    normativa = normativa_desde_config(config, directorio)
+    normativa.rutas['simulacion_resumen'] = os.path.join(directorio, f'resumen_{procesos}.csv')
+    normativa.rutas['simulacion_cortes'] = os.path.join(directorio, f'cortes_{procesos}.csv')
+    simulador = SimuladorNormativas(normativa, LectorDatosCSVColumnar(normativa), procesos=procesos)
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        inicio = time.perf_counter()
+        simulador.ejecutar(ruta_escenarios)
+        tiempo = time.perf_counter() - inicio
+    if "ERROR FATAL" in salida.getvalue():
+        print(salida.getvalue())
+        raise SystemExit(1)
+    resumen = pd.read_csv(normativa.rutas['simulacion_resumen'])
+    cortes = pd.read_csv(normativa.rutas['simulacion_cortes'], dtype={config['mapeo_columnas']['oferta']['id_carrera']: str})
+    return tiempo, resumen, cortes
+
+def referencia(config, directorio: str):
+    """Cupos por segmento y cortes por carrera de la estrategia vectorizada."""
+    normativa = normativa_desde_config(config, directorio)
+    with contextlib.redirect_stdout(io.StringIO()):
+        aspirantes, carreras = LectorDatosCSVColumnar(normativa).cargar_datos()
+        resultados = EstrategiaAsignacionVectorizada().ejecutar_asignacion(aspirantes, carreras, normativa)
+    df = pd.DataFrame({
+        'segmento': [r.segmento_asignado for r in resultados],
+        'carrera': [r.id_carrera_asignada for r in resultados],
+        'puntaje': [r.puntaje_postulacion for r in resultados],
+    })
+    return df['segmento'].value_counts(), df.groupby('carrera')['puntaje'].min()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=200_000)
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--escenarios', type=int, default=8)
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    rng = np.random.default_rng(11)
+    escenarios = []
+    for i in range(args.escenarios - 1):
+        peso = round(float(rng.uniform(0.3, 0.7)), 2)
+        escenarios.append({
+            'nombre': f"escenario_{i + 1}",
+            'ponderadores': {'EVALUACION_CAPACIDAD': peso, 'ANTECEDENTE_ACADEMICO': round(1 - peso, 2)},
+            'puntos_adicionales': {'RURALIDAD': int(rng.integers(0, 20)), 'TERRITORIALIDAD': int(rng.integers(0, 20))},
+        })
+
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras)
+        ruta_escenarios = os.path.join(directorio, 'escenarios.json')
+        with open(ruta_escenarios, 'w', encoding='utf-8') as f:
+            json.dump(escenarios, f)
+
+        t_serial, resumen_serial, cortes_serial = simular(config, directorio, ruta_escenarios, 1)
+        t_paralelo, resumen_paralelo, cortes_paralelo = simular(config, directorio, ruta_escenarios, args.procesos)
+        cupos_ref, cortes_ref = referencia(config, directorio)
+
+    base = resumen_serial.iloc[0]
+    cupos_ok = all(int(base[s]) == int(cupos_ref.get(s, 0)) for s in config['mapeo_columnas']['segmentos_cupos'])
+    id_col = config['mapeo_columnas']['oferta']['id_carrera']
+    cortes_base = cortes_serial.set_index(id_col)['base'].dropna()
+    cortes_ok = cortes_base.sort_index().equals(cortes_ref.sort_index().rename('base').rename_axis(id_col))
+    iguales = resumen_serial.equals(resumen_paralelo) and cortes_serial.equals(cortes_paralelo)
+
+    print(f"Aspirantes: {args.aspirantes}  escenarios: {args.escenarios}  núcleos: {os.cpu_count()}")
+    print(f"1 proceso:   {t_serial:7.2f} s")
+    print(f"{args.procesos} procesos: {t_paralelo:7.2f} s  (x{t_serial / t_paralelo:.2f})")
+    print(f"Base = estrategia vectorizada (cupos por segmento): {cupos_ok}")
+    print(f"Base = estrategia vectorizada (cortes por carrera): {cortes_ok}")
+    print(f"Resultados serial = paralelo: {iguales}")
+    if not (cupos_ok and cortes_ok and iguales):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
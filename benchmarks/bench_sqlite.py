@@ -0,0 +1,122 @@
+"""
+Entradas y resultados en SQLite frente al ida y vuelta por CSV: exportar
+las tablas de la base a CSV y cargarlas con LectorDatosCSVColumnar, y
+escribir los resultados en CSV para importarlos a la base; frente a
+LectorDatosSQLite y EscritorResultadosSQLite directamente sobre la base.
+Verifica que las entradas cargadas y las filas escritas coincidan.
+Uso: python -m benchmarks.bench_sqlite --aspirantes 333334 --resultados 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte, normativa_desde_config
+from app.core.models.postulacion import AsignacionResultado
+from app.core.services.escritor_resultados import EscritorResultadosCSV
+from app.core.services.escritor_resultados_sqlite import EscritorResultadosSQLite
+from app.core.services.lector_datos_columnar import LectorDatosCSVColumnar
+from app.core.services.lector_datos_sqlite import LectorDatosSQLite
+
+TABLAS = {'oferta_academica': 'oferta_academica.csv', 'matriz_postulaciones': 'matriz_postulaciones.csv'}
+
+def crear_base(directorio: str, ruta_base: str, mapeo_post) -> None:
+    """Base de entradas como la de una exportación: tablas con el índice (aspirante, prioridad)."""
+    with contextlib.closing(sqlite3.connect(ruta_base)) as conexion:
+        for tabla, archivo in TABLAS.items():
+            pd.read_csv(os.path.join(directorio, archivo)).to_sql(tabla, conexion, index=False)
+        conexion.execute(
+            f"CREATE INDEX idx_postulaciones ON matriz_postulaciones "
+            f"({mapeo_post['id_aspirante']}, {mapeo_post['prioridad']})"
+        )
+        conexion.commit()
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        valor = funcion()
+    return time.perf_counter() - inicio, valor
+
+def exportar_csv(ruta_base: str, directorio: str) -> None:
+    with contextlib.closing(sqlite3.connect(ruta_base)) as conexion:
+        for tabla, archivo in TABLAS.items():
+            pd.read_sql_query(f"SELECT * FROM {tabla}", conexion).to_csv(os.path.join(directorio, archivo), index=False)
+
+def importar_csv(ruta_csv: str, ruta_base: str) -> None:
+    with contextlib.closing(sqlite3.connect(ruta_base)) as conexion:
+        pd.read_csv(ruta_csv).to_sql('asignacion_resultados', conexion, index=False, if_exists='replace')
+
+def datos_iguales(a, b) -> bool:
+    campos = ['ids_carrera', 'nombres_carrera', 'cupos', 'ids_aspirante', 'antecedentes', 'evaluacion',
+              'inicio_postulaciones', 'postulacion_carrera', 'postulacion_prioridad']
+    return (
+        all(np.array_equal(np.asarray(getattr(a, c)), np.asarray(getattr(b, c))) for c in campos)
+        and a.condiciones.keys() == b.condiciones.keys()
+        and all(np.array_equal(a.condiciones[c], b.condiciones[c]) for c in a.condiciones)
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--aspirantes', type=int, default=333_334, help="Con 3 postulaciones, ~1M filas.")
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--resultados', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    config = cargar_config()
+    mapeo_post = config['mapeo_columnas']['postulaciones']
+    resultados = [
+        AsignacionResultado(
+            id_aspirante=str(i), puntaje_postulacion=round(500 + (i % 50000) / 100, 2),
+            segmento_asignado="OFERTA_GENERAL", prioridad_asignada=1 + i % 3,
+            id_carrera_asignada=str(1001 + i % 200), nombre_carrera_asignada=f"CARRERA {1001 + i % 200}"
+        )
+        for i in range(args.resultados)
+    ]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        generar_cohorte(config, directorio, args.aspirantes, args.carreras)
+        ruta_base = os.path.join(directorio, 'entradas.sqlite')
+        crear_base(directorio, ruta_base, mapeo_post)
+
+        normativa = normativa_desde_config(config, directorio)
+        normativa.rutas['base_datos_entradas'] = ruta_base
+
+        # Ida y vuelta por CSV
+        t_exportar, _ = cronometrar(lambda: exportar_csv(ruta_base, directorio))
+        t_lectura_csv, datos_csv = cronometrar(lambda: LectorDatosCSVColumnar(normativa).cargar_columnas())
+        escritor_csv = EscritorResultadosCSV(normativa)
+        t_escritura_csv, _ = cronometrar(lambda: escritor_csv.escribir_resultados(resultados))
+        ruta_importada = os.path.join(directorio, 'importados.sqlite')
+        t_importar, _ = cronometrar(lambda: importar_csv(escritor_csv.ruta_salida, ruta_importada))
+
+        # Directo sobre SQLite
+        t_lectura_sqlite, datos_sqlite = cronometrar(lambda: LectorDatosSQLite(normativa).cargar_columnas())
+        escritor_sqlite = EscritorResultadosSQLite(normativa)
+        t_escritura_sqlite, _ = cronometrar(lambda: escritor_sqlite.escribir_resultados(resultados))
+
+        filas_csv = pd.read_csv(escritor_csv.ruta_salida, dtype=str, keep_default_na=False)
+        with contextlib.closing(sqlite3.connect(escritor_sqlite.ruta_salida)) as conexion:
+            filas_sqlite = pd.read_sql_query("SELECT * FROM asignacion_resultados", conexion)
+        filas_sqlite = filas_sqlite.astype(object).where(filas_sqlite.notna(), '').astype(str)
+        entradas_iguales = datos_iguales(datos_csv, datos_sqlite)
+        resultados_iguales = filas_csv.equals(filas_sqlite)
+
+    t_csv = t_exportar + t_lectura_csv + t_escritura_csv + t_importar
+    t_sqlite = t_lectura_sqlite + t_escritura_sqlite
+    print(f"Aspirantes: {datos_sqlite.num_aspirantes}  postulaciones: {len(datos_sqlite.postulacion_carrera)}  "
+          f"resultados: {args.resultados}")
+    print(f"CSV:    exportar {t_exportar:6.2f} s  leer {t_lectura_csv:6.2f} s  "
+          f"escribir {t_escritura_csv:6.2f} s  importar {t_importar:6.2f} s  total {t_csv:6.2f} s")
+    print(f"SQLite: leer {t_lectura_sqlite:6.2f} s  escribir {t_escritura_sqlite:6.2f} s  "
+          f"total {t_sqlite:6.2f} s  (x{t_csv / t_sqlite:.1f})")
+    print(f"Entradas idénticas:   {entradas_iguales}")
+    print(f"Resultados idénticos: {resultados_iguales}")
+    if not (entradas_iguales and resultados_iguales):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
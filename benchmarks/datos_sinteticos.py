@@ -0,0 +1,117 @@
+"""
+Generador reproducible de cohortes sintéticas con el mismo formato
+(columnas de mapeo_columnas) que los archivos de inputs/.
+"""
+import json
+import os
+from typing import Dict, Any, Optional, Union
+import numpy as np
+import pandas as pd
+from app.core.models.normativa import Normativa
+
+def cargar_config(ruta: str = 'config.json') -> Dict[str, Any]:
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def normativa_desde_config(config: Dict[str, Any], directorio: str) -> Normativa:
+    """Crea una Normativa cuyas rutas apuntan a los archivos de 'directorio'."""
+    return Normativa(
+        ponderadores=config['ponderadores'],
+        puntos_adicionales=config['puntos_adicionales'],
+        max_postulaciones=config['parametros_proceso']['max_postulaciones_permitidas'],
+        rutas={
+            'oferta_academica': os.path.join(directorio, 'oferta_academica.csv'),
+            'matriz_postulaciones': os.path.join(directorio, 'matriz_postulaciones.csv'),
+            'resultados_asignacion': os.path.join(directorio, 'asignacion_resultados.csv'),
+        },
+        mapeo_columnas_oferta=config['mapeo_columnas']['oferta'],
+        mapeo_columnas_postulaciones=config['mapeo_columnas']['postulaciones'],
+        mapeo_segmentos_cupos=config['mapeo_columnas']['segmentos_cupos'],
+        criterios_desempate=config['parametros_proceso']['criterios_desempate']
+    )
+
+def generar_cohorte(
+    config: Dict[str, Any],
+    directorio: str,
+    num_aspirantes: int,
+    num_carreras: int = 200,
+    postulaciones_por_aspirante: int = 3,
+    fraccion_inexistentes: float = 0.0,
+    semilla: int = 2025,
+    cupos_por_carrera: Optional[int] = None,
+    prevalencia_condiciones: Union[float, Dict[str, float]] = 0.1,
+    sesgo_popularidad: float = 1.0,
+    regiones: int = 1
+) -> None:
+    """
+    Escribe oferta_academica.csv y matriz_postulaciones.csv en 'directorio'.
+
+    - cupos_por_carrera: cupos máximos del segmento general por carrera
+      (por defecto, la mitad de la demanda media); los demás segmentos
+      reciben hasta una cuarta parte.
+    - prevalencia_condiciones: fracción de aspirantes con cada condición,
+      global o por clave de mapeo_columnas (p. ej. {'pobreza': 0.3}).
+    - sesgo_popularidad: la carrera de rango r se elige con peso 1/r**sesgo
+      (0 = uniforme).
+    - regiones: con más de una, las carreras se reparten entre regiones y
+      cada aspirante elige solo carreras de la suya (grafo aspirante–carrera
+      con una componente conexa por región).
+    """
+    rng = np.random.default_rng(semilla)
+    mapeo_oferta = config['mapeo_columnas']['oferta']
+    mapeo_post = config['mapeo_columnas']['postulaciones']
+    segmentos = config['mapeo_columnas']['segmentos_cupos']
+    os.makedirs(directorio, exist_ok=True)
+
+    # 1. Oferta: cupos por segmento proporcionales a la demanda esperada
+    ids_carrera = np.arange(1001, 1001 + num_carreras)
+    oferta = pd.DataFrame({
+        mapeo_oferta['id_carrera']: ids_carrera,
+        mapeo_oferta['nombre_carrera']: [f"CARRERA {i}" for i in ids_carrera],
+    })
+    if cupos_por_carrera is None:
+        cupos_por_carrera = max(1, num_aspirantes // num_carreras // 2)
+    for segmento in segmentos:
+        oferta[segmento] = rng.integers(0, max(2, cupos_por_carrera // 4), num_carreras)
+    oferta[segmentos[-1]] = rng.integers(1, cupos_por_carrera + 1, num_carreras)
+    oferta.to_csv(os.path.join(directorio, 'oferta_academica.csv'), index=False)
+
+    # 2. Postulaciones: elecciones sesgadas hacia las carreras más populares
+    n = num_aspirantes
+    k = postulaciones_por_aspirante
+    elecciones = np.empty((n, k), dtype=np.int64)
+    if regiones <= 1:
+        popularidad = 1.0 / np.arange(1, num_carreras + 1) ** sesgo_popularidad
+        popularidad /= popularidad.sum()
+        for j in range(k):
+            elecciones[:, j] = rng.choice(ids_carrera, size=n, p=popularidad)
+    else:
+        region = rng.integers(0, regiones, n)
+        for r in range(regiones):
+            carreras_region = ids_carrera[r::regiones]
+            popularidad = 1.0 / np.arange(1, len(carreras_region) + 1) ** sesgo_popularidad
+            popularidad /= popularidad.sum()
+            miembros = np.flatnonzero(region == r)
+            for j in range(k):
+                elecciones[miembros, j] = rng.choice(carreras_region, size=len(miembros), p=popularidad)
+    # OFA_ID que no existen en la oferta (se reportan como incidencia)
+    elecciones[rng.random((n, k)) < fraccion_inexistentes] = 9_999_999
+
+    excluidas = {'id_aspirante', 'id_carrera', 'prioridad', 'antecedentes', 'evaluacion'}
+    columnas = {
+        mapeo_post['id_aspirante']: np.repeat(np.arange(1, n + 1), k),
+        mapeo_post['prioridad']: np.tile(np.arange(1, k + 1), n),
+        mapeo_post['id_carrera']: elecciones.ravel(),
+        mapeo_post['antecedentes']: np.repeat(rng.integers(400, 1001, n), k),
+        mapeo_post['evaluacion']: np.repeat(rng.integers(400, 1001, n), k),
+    }
+    for key_mapeo, col_csv in mapeo_post.items():
+        if key_mapeo in excluidas:
+            continue
+        prevalencia = (
+            prevalencia_condiciones.get(key_mapeo, 0.1)
+            if isinstance(prevalencia_condiciones, dict) else prevalencia_condiciones
+        )
+        tiene = rng.random(n) < prevalencia
+        columnas[col_csv] = np.repeat(np.where(tiene, 'SI', 'NO'), k)
+    pd.DataFrame(columnas).to_csv(os.path.join(directorio, 'matriz_postulaciones.csv'), index=False)
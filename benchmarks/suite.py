@@ -0,0 +1,194 @@
+"""
+Suite de rendimiento del proceso completo (MotorAsignacion) sobre cohortes
+sintéticas de varios tamaños.
+
+Cada tamaño se ejecuta en un proceso propio (así el pico de memoria es el
+de esa ejecución) con el cableado real del Container, la caché de entradas
+desactivada y la instrumentación activada. El reporte JSON reúne, por
+tamaño, el tiempo, el tiempo de CPU y la memoria de cada fase, y puede
+compararse con un reporte anterior para detectar regresiones.
+
+Uso:
+  python -m benchmarks.suite --tamanos 10000 100000 1000000 --salida reporte_suite.json
+  python -m benchmarks.suite --tamanos 10000 100000 --comparar reporte_suite.json --tolerancia 0.25
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from benchmarks.datos_sinteticos import cargar_config, generar_cohorte
+
+# Diferencias absolutas por debajo de estos valores no se consideran regresión
+TIEMPO_MINIMO_S = 0.1
+MEMORIA_MINIMA_MB = 20.0
+
+def config_ejecucion(config: Dict[str, Any], directorio: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """config.json con las rutas en 'directorio' y los parámetros de la suite."""
+    config = copy.deepcopy(config)
+    config['rutas_archivos'].update({
+        clave: os.path.join(directorio, os.path.basename(ruta))
+        for clave, ruta in config['rutas_archivos'].items()
+    })
+    config['rutas_archivos']['oferta_academica'] = os.path.join(directorio, 'oferta_academica.csv')
+    config['rutas_archivos']['matriz_postulaciones'] = os.path.join(directorio, 'matriz_postulaciones.csv')
+    config['parametros_proceso'].update({
+        'modo_carga': args.modo_carga,
+        'estrategia': args.estrategia,
+        'usar_cache_entradas': False,
+        'instrumentacion': 'activada',
+        'modo_incidencias': 'resumen',
+    })
+    return config
+
+def medir(ruta_config: str) -> None:
+    """Ejecuta el motor con la configuración dada (en el proceso hijo)."""
+    from dependency_injector import providers
+    from app.core.container import Container
+
+    with open(ruta_config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    container = Container()
+    container.config.override(providers.Object(config))
+    container.motor().ejecutar_proceso()
+
+def ejecutar_tamano(config: Dict[str, Any], tamano: int, args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix=f"suite-{tamano}-") as directorio:
+        inicio = time.perf_counter()
+        generar_cohorte(
+            config, directorio, tamano, args.carreras,
+            prevalencia_condiciones=args.prevalencia, sesgo_popularidad=args.sesgo, semilla=args.semilla
+        )
+        t_generacion = time.perf_counter() - inicio
+
+        config_tamano = config_ejecucion(config, directorio, args)
+        ruta_config = os.path.join(directorio, 'config.json')
+        with open(ruta_config, 'w', encoding='utf-8') as f:
+            json.dump(config_tamano, f, ensure_ascii=False)
+
+        proceso = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.suite', '--medir', ruta_config],
+            capture_output=True, text=True
+        )
+        ruta_resultados = config_tamano['rutas_archivos']['resultados_asignacion']
+        ruta_reporte = os.path.splitext(ruta_resultados)[0] + '_reporte.json'
+        if proceso.returncode != 0 or "[ERROR FATAL]" in proceso.stdout or not os.path.exists(ruta_reporte):
+            print(proceso.stdout[-4000:], proceso.stderr[-4000:], sep="\n")
+            raise SystemExit(f"La ejecución con {tamano} aspirantes falló.")
+        with open(ruta_reporte, 'r', encoding='utf-8') as f:
+            reporte = json.load(f)
+
+    return {
+        'generacion_s': round(t_generacion, 3),
+        'duracion_total_s': reporte['duracion_total_s'],
+        'rss_pico_mb': reporte['rss_pico_mb'],
+        'contadores': reporte['contadores'],
+        'fases': {
+            fase['nombre']: {
+                'tiempo_s': fase['tiempo_s'],
+                'cpu_s': fase['cpu_s'],
+                'rss_pico_mb': fase['rss_pico_mb'],
+                'contadores': fase['contadores'],
+            }
+            for fase in reporte['fases']
+        },
+    }
+
+def comparar(actual: Dict[str, Any], referencia: Dict[str, Any], tolerancia: float) -> List[str]:
+    """Fases (y totales) cuyo tiempo o memoria empeoraron más que 'tolerancia'."""
+    regresiones = []
+
+    def revisar(etiqueta: str, valor, anterior, minimo: float, unidad: str) -> None:
+        if valor is None or anterior is None:
+            return
+        if valor > anterior * (1 + tolerancia) and valor - anterior > minimo:
+            regresiones.append(f"{etiqueta}: {anterior:.3f} -> {valor:.3f} {unidad} (+{(valor / anterior - 1) * 100:.0f}%)")
+
+    for tamano, resultado in actual['resultados'].items():
+        previo = referencia.get('resultados', {}).get(tamano)
+        if previo is None:
+            continue
+        revisar(f"[{tamano}] total", resultado['duracion_total_s'], previo['duracion_total_s'], TIEMPO_MINIMO_S, "s")
+        revisar(f"[{tamano}] memoria pico", resultado['rss_pico_mb'], previo['rss_pico_mb'], MEMORIA_MINIMA_MB, "MiB")
+        for nombre, fase in resultado['fases'].items():
+            fase_previa = previo['fases'].get(nombre)
+            if fase_previa is not None:
+                revisar(f"[{tamano}] {nombre}", fase['tiempo_s'], fase_previa['tiempo_s'], TIEMPO_MINIMO_S, "s")
+    return regresiones
+
+def imprimir_tabla(reporte: Dict[str, Any]) -> None:
+    filas = []
+    for tamano, resultado in reporte['resultados'].items():
+        fila = {'aspirantes': int(tamano), 'total_s': resultado['duracion_total_s'], 'pico_mb': resultado['rss_pico_mb']}
+        for nombre in ('carga', 'asignacion', 'escritura'):
+            fila[f"{nombre}_s"] = resultado['fases'].get(nombre, {}).get('tiempo_s')
+        filas.append(fila)
+    print(pd.DataFrame(filas).to_string(index=False))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--carreras', type=int, default=500)
+    parser.add_argument('--prevalencia', type=float, default=0.1, help="Fracción de aspirantes con cada condición.")
+    parser.add_argument('--sesgo', type=float, default=1.0, help="Sesgo de elección hacia carreras populares (1/r**sesgo).")
+    parser.add_argument('--semilla', type=int, default=2025)
+    parser.add_argument('--modo-carga', default='columnar', choices=['clasico', 'columnar', 'bloques'])
+    parser.add_argument('--estrategia', default='art52', choices=['art52', 'vectorizada', 'aceptacion_diferida'])
+    parser.add_argument('--salida', default='reporte_suite.json')
+    parser.add_argument('--comparar', metavar='REPORTE_JSON', help="Reporte anterior con el cual comparar.")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="Empeoramiento relativo admitido (0.25 = 25%%).")
+    parser.add_argument('--medir', metavar='CONFIG_JSON', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir(args.medir)
+        return
+
+    config = cargar_config()
+    reporte = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'entorno': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'nucleos': os.cpu_count(),
+        },
+        'parametros': {
+            'carreras': args.carreras, 'prevalencia': args.prevalencia, 'sesgo': args.sesgo,
+            'semilla': args.semilla, 'modo_carga': args.modo_carga, 'estrategia': args.estrategia,
+        },
+        'resultados': {},
+    }
+    for tamano in args.tamanos:
+        print(f"Ejecutando con {tamano} aspirantes...", flush=True)
+        reporte['resultados'][str(tamano)] = ejecutar_tamano(config, tamano, args)
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    imprimir_tabla(reporte)
+    print(f"Reporte guardado en: {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            referencia = json.load(f)
+        if referencia.get('parametros') != reporte['parametros']:
+            print("Advertencia: los parámetros del reporte de referencia son distintos.")
+        regresiones = comparar(reporte, referencia, args.tolerancia)
+        if regresiones:
+            print(f"Regresiones (tolerancia {args.tolerancia:.0%}):")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            raise SystemExit(1)
+        print("Sin regresiones respecto de la referencia.")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,58 @@
 from app.core.container import Container
+import argparse
 import sys
 import json
+import math
 
 def main():
     """
     Punto de entrada principal de la aplicación.
-    Inicializa el contenedor y ejecuta el motor.
+    Inicializa el contenedor y ejecuta el motor (o la reasignación
+    incremental si se indica un archivo de correcciones, la simulación
+    de escenarios de normativa, un lote de instituciones o el servicio
+    residente).
     """
+    parser = argparse.ArgumentParser(description="Motor de Asignación de Cupos")
+    parser.add_argument(
+        '--incremental', metavar='CORRECCIONES_CSV',
+        help="Reasigna a partir del estado guardado aplicando las correcciones del archivo."
+    )
+    parser.add_argument(
+        '--simular', metavar='ESCENARIOS_JSON',
+        help="Compara la asignación bajo los escenarios de ponderadores/puntos del archivo."
+    )
+    parser.add_argument(
+        '--declinaciones', metavar='DECLINACIONES_CSV',
+        help="Cubre los cupos declinados desde las listas de espera del estado guardado."
+    )
+    parser.add_argument(
+        '--consultar-corte', nargs=3, metavar=('OFA_ID', 'SEGMENTO', 'PUNTAJE'),
+        help="Consulta el índice de cortes de la última ejecución: ¿el puntaje habría sido admitido? "
+             "(la ejecución debe haberse hecho con 'indice_cortes' activado en config.json)."
+    )
+    parser.add_argument(
+        '--procesos-carga', type=int, metavar='N',
+        help="Procesos para validar aspirantes en la carga clásica (reemplaza 'procesos_carga' del config.json); sin efecto en los demás modos de carga."
+    )
+    parser.add_argument(
+        '--lote', metavar='MANIFIESTO_JSON',
+        help="Ejecuta el proceso completo para cada institución (IES) del manifiesto."
+    )
+    parser.add_argument(
+        '--servicio', action='store_true',
+        help="Inicia el servicio local que conserva las entradas cargadas y atiende asignaciones y consultas por HTTP."
+    )
+    parser.add_argument(
+        '--reanudar', '--resume', action='store_true',
+        help="Reanuda una ejecución interrumpida desde su último punto de control "
+             "(la ejecución interrumpida debe haberse hecho con 'puntos_control' activado en config.json)."
+    )
+    parser.add_argument(
+        '--solo-validar', '--validate-only', action='store_true',
+        help="Solo revisa config.json y los encabezados de las entradas, sin cargar los datos."
+    )
+    args = parser.parse_args()
+
     print("==============================================")
     print("==       Motor de Asignación de Cupos       ==")
     print("==============================================")
@@ -23,9 +69,115 @@ def main():
     except json.JSONDecodeError:
         print("Error fatal: El archivo 'config.json' tiene un formato JSON inválido.")
         sys.exit(1)
+
+    if args.procesos_carga is not None:
+        container.config()['parametros_proceso']['procesos_carga'] = args.procesos_carga
+    advertir_procesos_carga(container)
         
+    if args.solo_validar:
+        sys.exit(0 if validar_entradas(container) else 1)
+
+    if args.lote:
+        sys.exit(0 if container.lote_instituciones().ejecutar(args.lote) else 1)
+
+    if args.incremental:
+        container.reasignacion_incremental().ejecutar(args.incremental)
+        return
+
+    if args.declinaciones:
+        container.declinaciones().ejecutar(args.declinaciones)
+        return
+
+    if args.consultar_corte:
+        sys.exit(0 if consultar_corte(container, *args.consultar_corte) else 1)
+
+    if args.simular:
+        container.simulador_normativas().ejecutar(args.simular)
+        return
+
+    if args.servicio:
+        container.servicio_residente().ejecutar()
+        return
+
     motor = container.motor()
-    motor.ejecutar_proceso()
+    motor.ejecutar_proceso(reanudar=args.reanudar)
+
+# Parámetros de config.json que eligen una implementación en el contenedor
+SELECTORES = {
+    'modo_carga': 'lector_datos',
+    'formato_resultados': 'escritor_resultados',
+    'estrategia': 'estrategia_asignacion',
+    'instrumentacion': 'instrumentador',
+    'guardar_estado': 'almacen_estado',
+    'indice_cortes': 'almacen_cortes',
+    'puntos_control': 'puntos_control',
+}
+
+def advertir_procesos_carga(container: Container) -> None:
+    """'procesos_carga' solo reparte la validación de la carga clásica; en los demás modos no tiene efecto."""
+    parametros = container.config().get('parametros_proceso', {})
+    procesos = parametros.get('procesos_carga', 1)
+    if procesos > 1 and parametros.get('modo_carga') != 'clasico':
+        print(
+            f"[ADVERTENCIA] 'procesos_carga' = {procesos} no tiene efecto con "
+            f"modo_carga = {parametros.get('modo_carga')!r}; solo se usa en la carga 'clasico'."
+        )
+
+def validar_entradas(container: Container) -> bool:
+    """Revisa config.json y los encabezados de las entradas (CSV o tablas SQLite), sin cargar los datos."""
+    errores = []
+    parametros = container.config().get('parametros_proceso', {})
+    for clave, proveedor in SELECTORES.items():
+        opciones = list(getattr(container, proveedor).providers)
+        if parametros.get(clave) not in opciones:
+            errores.append(f"'{clave}' = {parametros.get(clave)!r} no es válido; opciones: {opciones}")
+    try:
+        if parametros.get('modo_carga') == 'sqlite':
+            container.lector_datos().validar_encabezados()
+        else:
+            container.validador_proceso().validar_encabezados()
+    except KeyError as e:
+        errores.append(f"Falta la clave {e} en config.json")
+    except (FileNotFoundError, ValueError) as e:
+        errores.append(str(e))
+
+    for error in errores:
+        print(f"[ERROR] {error}")
+    print("Validación: OK" if not errores else f"Validación: {len(errores)} error(es)")
+    return not errores
+
+def consultar_corte(container: Container, id_carrera: str, segmento: str, puntaje: str) -> bool:
+    """
+    Responde con el índice de cortes guardado, sin volver a asignar.
+    Retorna False (tras un mensaje [ERROR]) si el puntaje no es numérico, el
+    índice no existe o no se puede leer, o la carrera o el segmento no están en él.
+    """
+    try:
+        valor_puntaje = float(puntaje)
+    except ValueError:
+        valor_puntaje = math.nan
+    if not math.isfinite(valor_puntaje):
+        print(f"[ERROR] El puntaje '{puntaje}' no es un número válido.")
+        return False
+
+    try:
+        indice = container.almacen_indice_cortes().cargar()
+        consulta = indice.consultar(id_carrera, segmento)
+        admitido = indice.seria_admitido(valor_puntaje, id_carrera, segmento)
+    except KeyError as e:
+        print(f"[ERROR] {e.args[0] if e.args else e}")
+        return False
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}")
+        return False
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] No se pudo leer el índice de cortes: {e}")
+        return False
+
+    for clave, valor in consulta.items():
+        print(f"{clave}: {valor}")
+    print(f"Puntaje {puntaje}: {'ADMITIDO' if admitido else 'NO ADMITIDO'}")
+    return True
 
 if __name__ == "__main__":
     main()
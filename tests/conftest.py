@@ -0,0 +1,70 @@
+import contextlib
+import copy
+import io
+import os
+import sqlite3
+from typing import Any, Callable, Dict
+import pandas as pd
+import pytest
+from dependency_injector import providers
+from app.core.container import Container, cargar_config
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Salidas de config.json que cada prueba escribe en su directorio temporal
+RUTAS_SALIDA = (
+    'resultados_asignacion', 'incidencias', 'rechazos', 'estado_asignacion',
+    'indice_cortes', 'puntos_control', 'cache_entradas',
+)
+
+@pytest.fixture(scope='session')
+def config_base() -> Dict[str, Any]:
+    """config.json del proyecto con las entradas de ejemplo de inputs/ en rutas absolutas."""
+    config = cargar_config(os.path.join(RAIZ, 'config.json'))
+    rutas = config['rutas_archivos']
+    for clave in ('oferta_academica', 'matriz_postulaciones'):
+        rutas[clave] = os.path.join(RAIZ, rutas[clave])
+    return config
+
+def crear_base_entradas(config: Dict[str, Any], ruta_base: str) -> None:
+    """Base SQLite con las tablas de entrada importadas de los CSV de ejemplo."""
+    rutas, tablas = config['rutas_archivos'], config['sqlite']
+    with contextlib.closing(sqlite3.connect(ruta_base)) as conexion:
+        pd.read_csv(rutas['oferta_academica']).to_sql(tablas['tabla_oferta'], conexion, index=False)
+        pd.read_csv(rutas['matriz_postulaciones']).to_sql(tablas['tabla_postulaciones'], conexion, index=False)
+        conexion.commit()
+
+@pytest.fixture
+def ejecutar(config_base, tmp_path) -> Callable[..., Dict[str, Any]]:
+    """
+    Ejecuta el proceso completo (MotorAsignacion) sobre las entradas de
+    ejemplo con los 'parametros_proceso' indicados y retorna las salidas:
+    {'resultados': DataFrame, 'incidencias': [líneas], 'config': dict}.
+    Las claves de 'aceptacion_diferida' se pasan en 'aceptacion_diferida'.
+    """
+    def ejecutar_proceso(aceptacion_diferida: Dict[str, Any] = None, reanudar: bool = False, **parametros):
+        config = copy.deepcopy(config_base)
+        rutas = config['rutas_archivos']
+        for clave in RUTAS_SALIDA:
+            rutas[clave] = str(tmp_path / os.path.basename(rutas[clave]))
+        config['parametros_proceso'].update(parametros)
+        config['aceptacion_diferida'].update(aceptacion_diferida or {})
+        if config['parametros_proceso']['modo_carga'] == 'sqlite':
+            rutas['base_datos_entradas'] = str(tmp_path / 'entradas.sqlite')
+            if not os.path.exists(rutas['base_datos_entradas']):
+                crear_base_entradas(config, rutas['base_datos_entradas'])
+
+        container = Container()
+        container.config.override(providers.Object(config))
+        with contextlib.redirect_stdout(io.StringIO()):
+            container.motor().ejecutar_proceso(reanudar=reanudar)
+
+        with open(rutas['incidencias'], 'r', encoding='utf-8') as f:
+            incidencias = f.read().splitlines()
+        return {
+            'resultados': pd.read_csv(rutas['resultados_asignacion'], dtype=str, keep_default_na=False),
+            'incidencias': incidencias,
+            'config': config,
+        }
+
+    return ejecutar_proceso
@@ -0,0 +1,75 @@
+"""
+Regresión de extremo a extremo: cada estrategia y cada modo de carga sobre
+las entradas de ejemplo de inputs/, comparados con la salida de referencia
+de tests/datos (asignacion_art52.csv es la salida del proceso original).
+"""
+import os
+import pandas as pd
+import pytest
+
+DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datos')
+
+MODOS_CARGA = ['clasico', 'columnar', 'bloques', 'sqlite']
+
+# La matriz de ejemplo tiene un aspirante con más postulaciones que las permitidas
+INCIDENCIAS_ESPERADAS = [
+    '{"categoria": "postulaciones_excedentes", "id_aspirante": "3", "mensaje": '
+    '"Aspirante 3: Se ignoraron 1 postulaciones (>3 permitidas). Carreras ignoradas (OFA_ID): [1001]"}'
+]
+
+def resultados_esperados(nombre: str) -> pd.DataFrame:
+    """Salida de referencia de tests/datos, leída como texto para compararla celda a celda."""
+    return pd.read_csv(os.path.join(DATOS, nombre), dtype=str, keep_default_na=False)
+
+def comparar(resultados: pd.DataFrame, nombre_esperado: str) -> None:
+    pd.testing.assert_frame_equal(resultados, resultados_esperados(nombre_esperado))
+
+@pytest.mark.parametrize('modo_carga', MODOS_CARGA)
+@pytest.mark.parametrize('estrategia', ['art52', 'vectorizada'])
+def test_art52_igual_a_salida_original(ejecutar, estrategia, modo_carga):
+    salida = ejecutar(estrategia=estrategia, modo_carga=modo_carga, usar_cache_entradas=False)
+    comparar(salida['resultados'], 'asignacion_art52.csv')
+    assert salida['incidencias'] == INCIDENCIAS_ESPERADAS
+
+@pytest.mark.parametrize('modo_carga', MODOS_CARGA)
+def test_aceptacion_diferida(ejecutar, modo_carga):
+    salida = ejecutar(estrategia='aceptacion_diferida', modo_carga=modo_carga, usar_cache_entradas=False)
+    comparar(salida['resultados'], 'asignacion_aceptacion_diferida.csv')
+    assert salida['incidencias'] == INCIDENCIAS_ESPERADAS
+
+@pytest.mark.parametrize('modo_carga', ['clasico', 'columnar'])
+def test_aceptacion_diferida_equivalente_a_art52(ejecutar, modo_carga):
+    """Preferencias por segmento, sin reciclaje y en una ronda: las asignaciones del Art. 52."""
+    salida = ejecutar(
+        estrategia='aceptacion_diferida', modo_carga=modo_carga, usar_cache_entradas=False,
+        aceptacion_diferida={'orden_preferencias': 'segmento', 'reciclaje_cupos': 'ninguno', 'max_rondas': 1},
+    )
+    esperados = resultados_esperados('asignacion_art52.csv')
+    # El orden de las filas sigue el recorrido de cada estrategia
+    claves = ['IDENTIFICACION']
+    pd.testing.assert_frame_equal(
+        salida['resultados'].sort_values(claves, ignore_index=True),
+        esperados.sort_values(claves, ignore_index=True),
+    )
+
+def test_carga_clasica_en_paralelo(ejecutar):
+    salida = ejecutar(modo_carga='clasico', procesos_carga=2, usar_cache_entradas=False)
+    comparar(salida['resultados'], 'asignacion_art52.csv')
+    assert salida['incidencias'] == INCIDENCIAS_ESPERADAS
+
+@pytest.mark.parametrize('estrategia', ['art52', 'vectorizada', 'aceptacion_diferida'])
+def test_cache_entradas(ejecutar, estrategia):
+    """La segunda ejecución lee la caché y repite resultados e incidencias."""
+    esperado = 'asignacion_aceptacion_diferida.csv' if estrategia == 'aceptacion_diferida' else 'asignacion_art52.csv'
+    for _ in range(2):
+        salida = ejecutar(estrategia=estrategia, modo_carga='columnar', usar_cache_entradas=True)
+        comparar(salida['resultados'], esperado)
+        assert salida['incidencias'] == INCIDENCIAS_ESPERADAS
+
+@pytest.mark.parametrize('estrategia', ['art52', 'vectorizada'])
+def test_puntos_control_y_reanudacion(ejecutar, estrategia):
+    """Con puntos de control, la ejecución y su reanudación repiten la salida original."""
+    for reanudar in (False, True):
+        salida = ejecutar(estrategia=estrategia, puntos_control='activado', usar_cache_entradas=False, reanudar=reanudar)
+        comparar(salida['resultados'], 'asignacion_art52.csv')
+        assert salida['incidencias'] == INCIDENCIAS_ESPERADAS